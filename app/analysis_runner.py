@@ -15,9 +15,9 @@ from standards.en16798.analysis import EN16798Calculator, VentilationType as ENV
 
 
 def _room_dataframe(room: Room) -> Optional[pd.DataFrame]:
-    if not room.timeseries_data:
+    if not room.has_data:
         return None
-    df = pd.DataFrame(room.timeseries_data)
+    df = pd.DataFrame(room.get_timeseries_data())
     if room.timestamps and len(room.timestamps) == len(df.index):
         idx = pd.to_datetime(room.timestamps, errors="coerce")
         df.index = idx
@@ -298,7 +298,7 @@ def render_analysis_section(store: PortfolioStore) -> None:
         st.info("Add rooms to run analyses.")
         return
 
-    rooms_with_data = [room for room in rooms if room.timeseries_data]
+    rooms_with_data = [room for room in rooms if room.has_data]
     if not rooms_with_data:
         st.info("Upload time series data for at least one room.")
         return
@@ -5,7 +5,7 @@ Loads environmental data from CSV files and creates proper model objects.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from pathlib import Path
 from datetime import datetime
 import csv
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.spacial_entity import SpatialEntity
 from core.entities import Room, Building, Floor
 from core.enums import SpatialEntityType
+from core.data_quality import DataQualityProfile
 from core.metering import (
     MeteringPoint,
     TimeSeries,
@@ -75,16 +76,28 @@ class CSVDataLoader:
         """
         csv_path = Path(csv_path)
 
-        # Read CSV file
-        with open(csv_path, 'r') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        # Read CSV file once and transpose it into columns
+        with open(csv_path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            rows = [row for row in reader if row]
 
         if not rows:
             raise ValueError(f"No data found in {csv_path}")
 
+        # Short rows read as empty cells; a repeated header name keeps its last column
+        width = len(header)
+        for row in rows:
+            if len(row) < width:
+                row.extend([''] * (width - len(row)))
+        cells = {col: [row[i] for row in rows] for i, col in enumerate(header)}
+
         # Get column names (excluding timestamp)
-        columns = [col for col in rows[0].keys() if col != timestamp_column]
+        columns = [col for col in cells if col != timestamp_column]
+
+        # All metrics of the file share one timestamps list and one profile
+        timestamps = cells.get(timestamp_column, [])
+        profile: Optional[DataQualityProfile] = None
 
         # Map columns to metrics
         if metric_columns is None:
@@ -130,21 +143,16 @@ class CSVDataLoader:
             metering_points[point_id] = point
             self.metering_points[point_id] = point
 
-            # Extract time series data
-            timestamps = []
-            values = []
-
-            for row in rows:
-                try:
-                    timestamps.append(row[timestamp_column])
-                    value = float(row[csv_col])
-                    values.append(value)
-                except (ValueError, KeyError):
-                    continue
+            # Extract time series data (unparseable cells are skipped)
+            values = self._parse_floats(cells[csv_col])
 
-            if not values:
+            if not values or not timestamps:
                 continue
 
+            # Profile the timestamps once; consumers read the step from it
+            if profile is None:
+                profile = DataQualityProfile.from_timestamps(timestamps)
+
             # Create time series
             ts_id = f"{point_id}_ts"
             ts = TimeSeries(
@@ -155,7 +163,8 @@ class CSVDataLoader:
                 unit=self._get_unit(metric_name),
                 start=datetime.fromisoformat(timestamps[0]) if timestamps else None,
                 end=datetime.fromisoformat(timestamps[-1]) if timestamps else None,
-                granularity_seconds=self._estimate_granularity(timestamps),
+                granularity_seconds=profile.resolution_seconds,
+                quality_profile=profile,
                 source="csv",
                 metadata={
                     'csv_file': str(csv_path),
@@ -173,6 +182,20 @@ class CSVDataLoader:
 
         return entity, metering_points, timeseries_dict
 
+    @staticmethod
+    def _parse_floats(cells: Sequence[str]) -> List[float]:
+        """Parse a column of cells, dropping those that are not numbers."""
+        try:
+            return [float(cell) for cell in cells]
+        except ValueError:
+            values = []
+            for cell in cells:
+                try:
+                    values.append(float(cell))
+                except ValueError:
+                    continue
+            return values
+
     def load_long_format(
         self,
         csv_path: Path | str,
@@ -285,6 +308,7 @@ class CSVDataLoader:
                 data_points.sort(key=lambda x: x[0])
                 timestamps = [dp[0] for dp in data_points]
                 values = [dp[1] for dp in data_points]
+                profile = DataQualityProfile.from_timestamps(timestamps)
 
                 # Create time series
                 ts_id = f"{point_id}_ts"
@@ -296,7 +320,8 @@ class CSVDataLoader:
                     unit=self._get_unit(metric_name),
                     start=datetime.fromisoformat(timestamps[0]) if timestamps else None,
                     end=datetime.fromisoformat(timestamps[-1]) if timestamps else None,
-                    granularity_seconds=self._estimate_granularity(timestamps),
+                    granularity_seconds=profile.resolution_seconds,
+                    quality_profile=profile,
                     source="csv",
                     metadata={
                         'csv_file': str(csv_path),
@@ -369,19 +394,6 @@ class CSVDataLoader:
         else:
             return ""
 
-    def _estimate_granularity(self, timestamps: List[str]) -> Optional[int]:
-        """Estimate granularity in seconds from timestamps."""
-        if len(timestamps) < 2:
-            return None
-
-        try:
-            dt1 = datetime.fromisoformat(timestamps[0])
-            dt2 = datetime.fromisoformat(timestamps[1])
-            diff = (dt2 - dt1).total_seconds()
-            return int(diff)
-        except Exception:
-            return None
-
     def get_timeseries_data(self, ts_id: str) -> Tuple[List[str], List[float]]:
         """
         Get timestamps and values for a time series.
@@ -11,7 +11,8 @@ from pathlib import Path
 from datetime import datetime
 import json
 import sys
-from dataclasses import dataclass
+import pandas as pd
+from dataclasses import dataclass, field
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -28,10 +29,14 @@ from core.metering import (
     SensorDefinition,
     SensorSourceType,
 )
+from core.weather import WeatherService, WeatherStation, get_weather_service
 
 from .data_loader import CSVDataLoader
 
 
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+
 @dataclass
 class PortfolioLoadResult:
     entities: Dict[str, SpatialEntity]
@@ -41,6 +46,7 @@ class PortfolioLoadResult:
     buildings: Dict[str, Building]
     floors: Dict[str, Floor]
     rooms: Dict[str, Room]
+    weather_stations: Dict[str, WeatherStation] = field(default_factory=dict)
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
         yield self.entities
@@ -56,11 +62,23 @@ class PortfolioLoader:
     1. hoeje-taastrup: building-X/sensors/room.csv + building-X/climate/climate.csv
     2. dummy_data: building_X/level_Y/room.csv + building_X/climate_data.csv + metadata.json
     3. Simple: building_sample.csv (single file)
+    4. SQLite: a series store database file (see ``connectors.sqlite``)
     """
 
-    def __init__(self):
-        """Initialize portfolio loader."""
+    def __init__(self, weather_service: Optional[WeatherService] = None, build_rollups: bool = False):
+        """
+        Initialize portfolio loader.
+
+        Args:
+            weather_service: Service storing shared outdoor climate series
+                (defaults to the global weather service)
+            build_rollups: Roll room series up into pyramids at ingest (see
+                ``Room.build_rollup_pyramids``); otherwise rooms build them
+                on their first ``aggregate_timeseries`` call
+        """
         self.loader = CSVDataLoader()
+        self.weather = weather_service or get_weather_service()
+        self.build_rollups = build_rollups
         self._reset_state()
 
     def _reset_state(self) -> None:
@@ -69,6 +87,7 @@ class PortfolioLoader:
         self.buildings: Dict[str, Building] = {}
         self.floors: Dict[str, Floor] = {}
         self.rooms: Dict[str, Room] = {}
+        self.weather_stations: Dict[str, WeatherStation] = {}
 
     def load_portfolio(
         self,
@@ -85,7 +104,8 @@ class PortfolioLoader:
             auto_detect: Auto-detect folder structure
             
         Returns:
-            Tuple of (entities dict, metering points dict, timeseries dict)
+            PortfolioLoadResult (unpacks as the legacy tuple of entities,
+            metering points and timeseries dicts)
         """
         data_path = Path(data_path)
         
@@ -106,15 +126,20 @@ class PortfolioLoader:
         if structure_type == "hoeje-taastrup":
             return self._wrap_legacy_result(self._load_hoeje_taastrup(data_path))
         elif structure_type == "dummy_data":
-            return self._load_dummy_data(data_path)
+            return self._wrap_legacy_result(self._load_dummy_data(data_path))
         elif structure_type == "simple":
             return self._wrap_legacy_result(self._load_simple(data_path))
+        elif structure_type == "sqlite":
+            return self._load_sqlite(data_path)
         else:
             # Try to auto-detect and load
             return self._wrap_legacy_result(self._load_generic(data_path))
 
     def _detect_structure(self, data_path: Path) -> str:
         """Detect the folder structure type."""
+        if data_path.is_file() and data_path.suffix in SQLITE_SUFFIXES:
+            return "sqlite"
+
         # Check for hoeje-taastrup pattern
         building_dirs = list(data_path.glob("building-*"))
         if building_dirs:
@@ -173,7 +198,7 @@ class PortfolioLoader:
             all_entities[building.id] = building
             self.buildings[building.id] = building
             
-            # Load climate data if available
+            # Load climate data if available; identical station files are stored once
             climate_dir = building_dir / "climate"
             if climate_dir.exists():
                 climate_files = list(climate_dir.glob("*.csv"))
@@ -190,9 +215,13 @@ class PortfolioLoader:
                             "Fugtighed": "outdoor_humidity",
                         }
                     )
-                    all_entities.update({entity.id: entity})
-                    all_points.update(points)
-                    all_ts.update(ts)
+                    is_new = self._register_weather_station(
+                        building, points, ts, source_file=str(climate_files[0])
+                    )
+                    if is_new:
+                        all_entities.update({entity.id: entity})
+                        all_points.update(points)
+                        all_ts.update(ts)
             
             # Load sensor/room data
             sensors_dir = building_dir / "sensors"
@@ -219,6 +248,7 @@ class PortfolioLoader:
                                 "Tilstedeværelse": "occupancy",
                             },
                             building_id=building.id,
+                            weather_station_id=building.weather_station_id,
                         )
                         
                         all_entities[entity.id] = entity
@@ -240,6 +270,7 @@ class PortfolioLoader:
             buildings=self.buildings,
             floors=self.floors,
             rooms=self.rooms,
+            weather_stations=self.weather_stations,
         )
 
     def _load_dummy_data(
@@ -307,6 +338,9 @@ class PortfolioLoader:
                         entity_type=SpatialEntityType.BUILDING,
                         timestamp_column="timestamp",
                     )
+                    self._register_weather_station(
+                        building, points, ts, source_file=str(climate_file)
+                    )
                     new_points, new_ts = self._attach_building_dataset(
                         building,
                         points,
@@ -379,6 +413,7 @@ class PortfolioLoader:
                             timestamp_column="timestamp",
                             floor_id=floor.id,
                             building_id=building.id,
+                            weather_station_id=building.weather_station_id,
                         )
                         
                         all_entities[entity.id] = entity
@@ -448,6 +483,7 @@ class PortfolioLoader:
         timeseries: Dict[str, TimeSeries],
     ) -> None:
         """Attach room-level sensors/time series directly to Room objects."""
+        rooms: Dict[str, Room] = {}
         for point in metering_points.values():
             target = entities.get(point.spatial_entity_id)
             if not isinstance(target, Room):
@@ -483,8 +519,67 @@ class PortfolioLoader:
                     "point_id": point.id,
                     "timeseries_id": ts.id,
                     "label": csv_column,
+                    "quality_profile": ts.quality_profile,
                 }
-                target.add_timeseries(csv_column, values, timestamps)
+                target.add_timeseries(csv_column, values, timestamps, quality_profile=ts.quality_profile)
+                rooms[target.id] = target
+
+        if self.build_rollups:
+            for room in rooms.values():
+                room.build_rollup_pyramids()
+
+    def _register_weather_station(
+        self,
+        building: Building,
+        dataset_points: Dict[str, MeteringPoint],
+        dataset_timeseries: Dict[str, TimeSeries],
+        source_file: Optional[str] = None,
+    ) -> bool:
+        """
+        Register a climate dataset with the weather service and reference it from the building.
+
+        Returns:
+            True when no other building of the current load registered the
+            same series (the shared service may already hold it from
+            earlier loads)
+        """
+        series: Dict[MetricType, TimeSeries] = {}
+        for point in dataset_points.values():
+            for ts_id in point.timeseries_ids:
+                ts = dataset_timeseries.get(ts_id)
+                if ts is not None:
+                    series.setdefault(point.metric, ts)
+
+        temperature = series.get(MetricType.OUTDOOR_TEMPERATURE) or series.get(MetricType.TEMPERATURE)
+        if temperature is None:
+            return True
+        timestamps = temperature.metadata.get("timestamps", [])
+        values = temperature.metadata.get("values", [])
+        if not values or len(timestamps) != len(values):
+            return True
+
+        humidity_ts = series.get(MetricType.OUTDOOR_HUMIDITY) or series.get(MetricType.HUMIDITY)
+        humidity = None
+        if humidity_ts is not None:
+            humidity_values = humidity_ts.metadata.get("values", [])
+            humidity_stamps = humidity_ts.metadata.get("timestamps", [])
+            if humidity_values and len(humidity_stamps) == len(humidity_values):
+                humidity = pd.Series(humidity_values, index=pd.to_datetime(humidity_stamps))
+
+        station = self.weather.register(
+            values,
+            timestamps=timestamps,
+            humidity=humidity,
+            metadata={"source_file": source_file} if source_file else None,
+        )
+        station.metadata.setdefault("building_ids", [])
+        if building.id not in station.metadata["building_ids"]:
+            station.metadata["building_ids"].append(building.id)
+
+        building.weather_station_id = station.station_id
+        is_new = station.station_id not in self.weather_stations
+        self.weather_stations[station.station_id] = station
+        return is_new
 
     def _attach_building_dataset(
         self,
@@ -496,6 +591,10 @@ class PortfolioLoader:
     ) -> Tuple[Dict[str, MeteringPoint], Dict[str, TimeSeries]]:
         """
         Attach a building-level dataset (climate/energy) as sensor groups on the building.
+
+        The dataset's series are re-identified under building point ids as
+        shallow copies: the sample lists are shared, not copied, and the
+        caller's series are left unchanged.
         """
         registered_points: Dict[str, MeteringPoint] = {}
         registered_ts: Dict[str, TimeSeries] = {}
@@ -546,22 +645,15 @@ class PortfolioLoader:
 
                 suffix = f"_ts{idx}" if idx else "_ts"
                 ts_id = f"{point_id}{suffix}"
-                new_ts = TimeSeries(
-                    id=ts_id,
-                    point_id=point_id,
-                    type=src_ts.type,
-                    metric=src_ts.metric,
-                    unit=src_ts.unit,
-                    start=src_ts.start,
-                    end=src_ts.end,
-                    granularity_seconds=src_ts.granularity_seconds,
-                    source=src_ts.source,
-                    metadata={
+                new_ts = src_ts.model_copy(update={
+                    "id": ts_id,
+                    "point_id": point_id,
+                    "metadata": {
                         **src_ts.metadata,
                         "dataset": dataset_key,
                         "source_file": source_file or src_ts.metadata.get("csv_file"),
                     },
-                )
+                })
                 registered_ts[ts_id] = new_ts
                 new_point.timeseries_ids.append(ts_id)
 
@@ -571,10 +663,24 @@ class PortfolioLoader:
                     "point_id": point_id,
                     "timeseries_id": ts_id,
                     "source_file": source_file or new_ts.metadata.get("csv_file"),
+                    "quality_profile": new_ts.quality_profile,
                 }
 
         return registered_points, registered_ts
 
+    def _load_sqlite(self, data_path: Path) -> PortfolioLoadResult:
+        """Hydrate from a SQLite series store written by ``write_portfolio``."""
+        from ..sqlite.portfolio_loader import SQLitePortfolioLoader
+
+        store_loader = SQLitePortfolioLoader(self.weather, build_rollups=self.build_rollups)
+        result = store_loader.load_portfolio(data_path)
+        self.portfolio = store_loader.portfolio
+        self.buildings = store_loader.buildings
+        self.floors = store_loader.floors
+        self.rooms = store_loader.rooms
+        self.weather_stations = store_loader.weather_stations
+        return result
+
     def _load_simple(
         self, 
         data_path: Path
@@ -625,6 +731,7 @@ class PortfolioLoader:
             buildings=self.buildings,
             floors=self.floors,
             rooms=self.rooms,
+            weather_stations=self.weather_stations,
         )
     def _load_generic(
         self, 
@@ -0,0 +1,58 @@
+"""
+Test that repeated portfolio loads keep their climate datasets.
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def _write_portfolio(root: Path) -> None:
+    """Two hoeje-taastrup buildings sharing one climate file."""
+    climate = "DateTime,Temperatur,Fugtighed\n" + "".join(
+        f"2024-01-01 {hour:02d}:00:00,{5 + hour * 0.1:.1f},{80 - hour:.1f}\n" for hour in range(24)
+    )
+    sensors = "DateTime,Temperatur,Fugtighed,CO2\n" + "".join(
+        f"2024-01-01 {hour:02d}:00:00,{21 + hour * 0.05:.2f},40.0,{450 + hour * 10}\n" for hour in range(24)
+    )
+    for building in ("building-1", "building-2"):
+        (root / building / "climate").mkdir(parents=True)
+        (root / building / "sensors").mkdir()
+        (root / building / "climate" / "climate.csv").write_text(climate)
+        (root / building / "sensors" / "room_1.csv").write_text(sensors)
+
+
+def _climate_view(result):
+    entities = sorted(entity_id for entity_id in result.entities if entity_id.endswith("_climate"))
+    series = sorted(ts_id for ts_id in result.timeseries if "_climate_" in ts_id)
+    return entities, series, sorted(result.weather_stations)
+
+
+def test_repeated_loads_keep_climate():
+    """A reload (same or new loader) returns the same climate entities and series."""
+    from connectors.csv.portfolio_loader import PortfolioLoader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "portfolio"
+        _write_portfolio(root)
+
+        loader = PortfolioLoader()
+        first = _climate_view(loader.load_portfolio(root))
+        again = _climate_view(loader.load_portfolio(root))
+        fresh = _climate_view(PortfolioLoader().load_portfolio(root))
+
+    entities, series, stations = first
+    # The identical file of the second building is stored once
+    assert entities == ["building-1_climate"], entities
+    assert len(series) == 2, series
+    assert len(stations) == 1, stations
+    assert again == first, again
+    assert fresh == first, fresh
+
+
+if __name__ == "__main__":
+    test_repeated_loads_keep_climate()
+    print("Repeated-load climate test passed!")
@@ -0,0 +1,29 @@
+"""
+Parquet Ingestion Module
+
+Loads building environmental data from Parquet files with column
+projection and time-window pruning, and converts CSV portfolio trees into
+partitioned Parquet datasets. Requires the optional ``pyarrow`` package.
+"""
+
+from .data_loader import (
+    PYARROW_AVAILABLE,
+    ParquetDataLoader,
+    load_from_parquet,
+    metrics_for_standards,
+    read_parquet_frame,
+)
+from .portfolio_loader import ParquetPortfolioLoader, load_portfolio_from_parquet
+from .converter import ConversionResult, convert_csv_tree
+
+__all__ = [
+    "PYARROW_AVAILABLE",
+    "ParquetDataLoader",
+    "load_from_parquet",
+    "metrics_for_standards",
+    "read_parquet_frame",
+    "ParquetPortfolioLoader",
+    "load_portfolio_from_parquet",
+    "ConversionResult",
+    "convert_csv_tree",
+]
@@ -0,0 +1,286 @@
+"""
+CSV to Parquet Converter
+
+Converts the CSV portfolio trees understood by ``PortfolioLoader`` into a
+partitioned Parquet dataset:
+
+    <dest>/
+      manifest.json                     portfolio/building/floor/room records
+      sensors/building=<id>/room=<id>/month=YYYY-MM/part-0.parquet
+      climate/building=<id>/month=YYYY-MM/part-0.parquet
+      energy/building=<id>/month=YYYY-MM/part-0.parquet
+
+Every table is wide (``timestamp`` plus one float column per metric, named
+with the canonical metric names), sorted by time and written in bounded
+row groups, so readers can prune months and row groups by timestamp and
+decode only the metric columns they need. CSV files are streamed in
+chunks and never held in memory whole.
+
+    python -m connectors.parquet.converter data/samples/dummy_data out/dummy_parquet
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+from pathlib import Path
+from dataclasses import dataclass, field
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.chunked_evaluation import iter_csv_chunks
+from connectors.csv.portfolio_loader import PortfolioLoader
+
+from .data_loader import PYARROW_AVAILABLE, _require_pyarrow
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+MANIFEST_FILE = "manifest.json"
+TIMESTAMP_COLUMN = "timestamp"
+DEFAULT_ROW_GROUP_ROWS = 10_000
+DEFAULT_CHUNK_ROWS = 200_000
+
+HOEJE_TAASTRUP_SENSOR_COLUMNS = {
+    "Temperatur": "temperature",
+    "Fugtighed": "humidity",
+    "CO2": "co2",
+    "Lys": "illuminance",
+    "Tilstedeværelse": "occupancy",
+}
+HOEJE_TAASTRUP_CLIMATE_COLUMNS = {
+    "Temperatur": "outdoor_temperature",
+    "Fugtighed": "outdoor_humidity",
+}
+
+
+@dataclass
+class CSVTable:
+    """One CSV file of the source tree and where it goes in the dataset."""
+
+    csv_path: Path
+    dataset: str  # "sensors", "climate" or "energy"
+    building_id: str
+    room_id: Optional[str] = None
+    timestamp_column: str = TIMESTAMP_COLUMN
+    column_map: Optional[Dict[str, str]] = None  # CSV column -> metric name
+
+    def partition_dir(self, dest: Path) -> Path:
+        path = dest / self.dataset / f"building={self.building_id}"
+        return path / f"room={self.room_id}" if self.room_id else path
+
+
+@dataclass
+class ConversionResult:
+    """Summary of a CSV tree conversion."""
+
+    dest: Path
+    structure: str
+    manifest: Dict[str, Any]
+    files_written: List[Path] = field(default_factory=list)
+    rows_written: int = 0
+    skipped: Dict[str, str] = field(default_factory=dict)  # csv path -> reason
+
+
+def _discover_hoeje_taastrup(source: Path, manifest: Dict[str, Any]) -> Iterator[CSVTable]:
+    for building_dir in sorted(source.glob("building-*")):
+        building_id = building_dir.name
+        manifest["buildings"][building_id] = {"name": building_id.replace("-", " ").title(), "metadata": {}}
+
+        climate_files = sorted((building_dir / "climate").glob("*.csv"))
+        if climate_files:
+            yield CSVTable(climate_files[0], "climate", building_id, timestamp_column="DateTime",
+                           column_map=HOEJE_TAASTRUP_CLIMATE_COLUMNS)
+
+        for sensor_file in sorted((building_dir / "sensors").glob("*.csv")):
+            room_id = f"{building_id}_{sensor_file.stem}"
+            manifest["rooms"][room_id] = {"name": sensor_file.stem, "building_id": building_id, "floor_id": None}
+            yield CSVTable(sensor_file, "sensors", building_id, room_id, timestamp_column="DateTime",
+                           column_map=HOEJE_TAASTRUP_SENSOR_COLUMNS)
+
+
+def _discover_dummy_data(source: Path, manifest: Dict[str, Any]) -> Iterator[CSVTable]:
+    for building_dir in sorted(source.glob("building_*")):
+        building_id = building_dir.name
+        metadata: Dict[str, Any] = {}
+        metadata_file = building_dir / "metadata.json"
+        if metadata_file.exists():
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        manifest["buildings"][building_id] = {
+            "name": metadata.get("name", building_id.replace("_", " ").title()),
+            "metadata": metadata,
+        }
+
+        for dataset, file_name in (("climate", "climate_data.csv"), ("energy", "energy_data.csv")):
+            if (building_dir / file_name).exists():
+                yield CSVTable(building_dir / file_name, dataset, building_id)
+
+        for level_dir in sorted(building_dir.glob("level_*")):
+            floor_id = f"{building_id}_{level_dir.name}"
+            manifest["floors"][floor_id] = {
+                "name": level_dir.name.replace("_", " ").title(),
+                "building_id": building_id,
+            }
+            for room_file in sorted(level_dir.glob("*.csv")):
+                room_id = f"{floor_id}_{room_file.stem}"
+                manifest["rooms"][room_id] = {
+                    "name": room_file.stem.replace("_", " ").title(),
+                    "building_id": building_id,
+                    "floor_id": floor_id,
+                }
+                yield CSVTable(room_file, "sensors", building_id, room_id)
+
+
+def _discover_simple(source: Path, manifest: Dict[str, Any]) -> Iterator[CSVTable]:
+    building_id = source.name
+    manifest["buildings"][building_id] = {"name": building_id.replace("_", " ").title(), "metadata": {}}
+    for csv_file in sorted(source.glob("*.csv")):
+        manifest["rooms"][csv_file.stem] = {
+            "name": csv_file.stem.replace("_", " ").title(),
+            "building_id": building_id,
+            "floor_id": None,
+        }
+        yield CSVTable(csv_file, "sensors", building_id, csv_file.stem)
+
+
+def _month_tables(
+    table: CSVTable,
+    chunk_rows: int,
+) -> Iterator[Tuple[str, Any]]:
+    """Yield (month, arrow table) pieces of a CSV file in time order."""
+    columns = None
+    if table.column_map:
+        header = set(pd.read_csv(table.csv_path, nrows=0).columns)
+        columns = [col for col in table.column_map if col in header]
+    for chunk in iter_csv_chunks(table.csv_path, table.timestamp_column, chunk_rows, columns=columns):
+        if table.column_map:
+            chunk = chunk.rename(columns=table.column_map)
+        chunk = chunk.astype(float)
+        chunk.index.name = TIMESTAMP_COLUMN
+        months = chunk.index.strftime("%Y-%m")
+        for month in pd.unique(months):
+            piece = chunk[months == month].reset_index()
+            yield month, pa.Table.from_pandas(piece, preserve_index=False)
+
+
+def _write_table(
+    table: CSVTable,
+    dest: Path,
+    row_group_rows: int,
+    chunk_rows: int,
+    compression: str,
+) -> Tuple[List[Path], int]:
+    """Stream one CSV into month partitions; returns (files, rows)."""
+    files: List[Path] = []
+    rows = 0
+    writer = None
+    current_month = None
+    try:
+        for month, piece in _month_tables(table, chunk_rows):
+            if month != current_month:
+                if writer is not None:
+                    writer.close()
+                month_dir = table.partition_dir(dest) / f"month={month}"
+                month_dir.mkdir(parents=True, exist_ok=True)
+                target = month_dir / "part-0.parquet"
+                writer = pq.ParquetWriter(target, piece.schema, compression=compression)
+                files.append(target)
+                current_month = month
+            writer.write_table(piece.cast(writer.schema), row_group_size=row_group_rows)
+            rows += piece.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return files, rows
+
+
+def convert_csv_tree(
+    source: Path | str,
+    dest: Path | str,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    compression: str = "zstd",
+) -> ConversionResult:
+    """
+    Convert a CSV portfolio tree into a partitioned Parquet dataset.
+
+    Args:
+        source: CSV tree (hoeje-taastrup, dummy_data or simple layout)
+        dest: Output directory
+        row_group_rows: Maximum rows per Parquet row group
+        chunk_rows: CSV rows read per chunk
+        compression: Parquet compression codec
+
+    Returns:
+        ConversionResult with the manifest and the files written
+
+    Raises:
+        ValueError: If the source layout is not recognised
+    """
+    _require_pyarrow()
+    source, dest = Path(source), Path(dest)
+    if not source.exists():
+        raise ValueError(f"Data path does not exist: {source}")
+
+    structure = PortfolioLoader()._detect_structure(source)
+    discover = {
+        "hoeje-taastrup": _discover_hoeje_taastrup,
+        "dummy_data": _discover_dummy_data,
+        "simple": _discover_simple,
+    }.get(structure)
+    if discover is None:
+        raise ValueError(f"Unsupported CSV layout in {source}")
+
+    manifest: Dict[str, Any] = {
+        "portfolio": {"id": f"{source.name}_portfolio", "name": source.name.replace("_", " ").title()},
+        "source_structure": structure,
+        "timestamp_column": TIMESTAMP_COLUMN,
+        "buildings": {},
+        "floors": {},
+        "rooms": {},
+    }
+    result = ConversionResult(dest=dest, structure=structure, manifest=manifest)
+    dest.mkdir(parents=True, exist_ok=True)
+
+    for table in discover(source, manifest):
+        try:
+            files, rows = _write_table(table, dest, row_group_rows, chunk_rows, compression)
+        except Exception as e:
+            print(f"Warning: Failed to convert {table.csv_path}: {e}")
+            result.skipped[str(table.csv_path)] = str(e)
+            if table.room_id:
+                manifest["rooms"].pop(table.room_id, None)
+            continue
+        result.files_written.extend(files)
+        result.rows_written += rows
+
+    with open(dest / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert a CSV portfolio tree to partitioned Parquet")
+    parser.add_argument("source", type=Path, help="CSV tree (hoeje-taastrup, dummy_data or simple layout)")
+    parser.add_argument("dest", type=Path, help="Output directory")
+    parser.add_argument("--row-group-rows", type=int, default=DEFAULT_ROW_GROUP_ROWS)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--compression", default="zstd")
+    args = parser.parse_args(argv)
+
+    result = convert_csv_tree(args.source, args.dest, args.row_group_rows, args.chunk_rows, args.compression)
+    print(f"Converted {result.structure} tree: {len(result.manifest['rooms'])} rooms, "
+          f"{len(result.files_written)} files, {result.rows_written:,} rows -> {result.dest}")
+    for path, reason in result.skipped.items():
+        print(f"  skipped {path}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+"""
+Parquet Data Loader
+
+Loads environmental data from Parquet files and creates the same model
+objects as the CSV loader. Reads are pushed down to the file:
+
+- Column projection: only the timestamp column and the requested metrics
+  (or the metrics a standard lists in its registry ``required_inputs``)
+  are decoded.
+- Time-window pruning: ``month=YYYY-MM`` partition directories and row
+  groups whose timestamp statistics fall outside ``[start, end]`` are
+  skipped without being read.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Any
+from pathlib import Path
+from datetime import datetime
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.spacial_entity import SpatialEntity
+from core.entities import Room, Building, Floor
+from core.enums import SpatialEntityType
+from core.data_quality import DataQualityProfile
+from core.standards_registry import metrics_for_standards
+from core.metering import (
+    MeteringPoint,
+    TimeSeries,
+    PointType,
+    TimeSeriesType,
+)
+
+from connectors.csv.data_loader import CSVDataLoader
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
+
+TimeBound = Optional[Any]  # str, datetime or pd.Timestamp
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError(
+            "pyarrow is required for the Parquet connector. Install with: pip install pyarrow"
+        )
+
+
+def _to_timestamp(value: TimeBound) -> Optional[pd.Timestamp]:
+    """Naive timestamp of a bound or statistic (tz-aware values in UTC)."""
+    if value is None:
+        return None
+    stamp = pd.Timestamp(value)
+    if stamp.tz is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return stamp
+
+
+def _month_in_window(path: Path, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> bool:
+    """Whether a ``month=YYYY-MM`` partition directory on the path overlaps the window."""
+    for part in path.parts:
+        if not part.startswith("month="):
+            continue
+        try:
+            month_start = pd.Timestamp(f"{part[len('month='):]}-01")
+        except ValueError:
+            return True
+        if end is not None and month_start > end:
+            return False
+        if start is not None and month_start + pd.offsets.MonthBegin(1) <= start:
+            return False
+    return True
+
+
+def _row_groups_in_window(
+    parquet_file: Any,
+    timestamp_column: str,
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+) -> List[int]:
+    """Row groups whose timestamp min/max statistics overlap the window."""
+    metadata = parquet_file.metadata
+    groups = list(range(metadata.num_row_groups))
+    if start is None and end is None:
+        return groups
+    names = parquet_file.schema_arrow.names
+    if timestamp_column not in names:
+        return groups
+    column_index = names.index(timestamp_column)
+
+    selected = []
+    for group in groups:
+        stats = metadata.row_group(group).column(column_index).statistics
+        if stats is None or not stats.has_min_max:
+            selected.append(group)
+            continue
+        try:
+            group_min, group_max = _to_timestamp(stats.min), _to_timestamp(stats.max)
+        except (TypeError, ValueError):
+            selected.append(group)
+            continue
+        if end is not None and group_min > end:
+            continue
+        if start is not None and group_max < start:
+            continue
+        selected.append(group)
+    return selected
+
+
+def parquet_files(path: Path | str) -> List[Path]:
+    """A Parquet file, or all Parquet files below a (partitioned) directory."""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(p for p in path.rglob("*.parquet") if not p.name.startswith(("_", ".")))
+
+
+def read_parquet_frame(
+    path: Path | str,
+    columns: Optional[Sequence[str]] = None,
+    timestamp_column: str = 'timestamp',
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet file or partitioned directory with projection and pruning.
+
+    Args:
+        path: Parquet file or directory of (``month=YYYY-MM``) partitions
+        columns: Columns to read besides the timestamp (default: all)
+        timestamp_column: Name of the timestamp column
+        start: Inclusive window start
+        end: Inclusive window end
+
+    Returns:
+        DataFrame with the timestamp column and the projected columns that
+        exist in the files, restricted to the window and sorted by time
+    """
+    _require_pyarrow()
+    start, end = _to_timestamp(start), _to_timestamp(end)
+
+    frames = []
+    for file_path in parquet_files(path):
+        if not _month_in_window(file_path, start, end):
+            continue
+        parquet_file = pq.ParquetFile(file_path)
+        names = parquet_file.schema_arrow.names
+        if columns is None:
+            read_columns = names
+        else:
+            read_columns = [timestamp_column] + [c for c in columns if c in names and c != timestamp_column]
+        groups = _row_groups_in_window(parquet_file, timestamp_column, start, end)
+        if not groups:
+            continue
+        frames.append(parquet_file.read_row_groups(groups, columns=read_columns).to_pandas())
+
+    if not frames:
+        return pd.DataFrame(columns=[timestamp_column, *(columns or [])])
+
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    stamps = pd.to_datetime(frame[timestamp_column], errors="coerce")
+    if getattr(stamps.dt, "tz", None) is not None:
+        stamps = stamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    keep = stamps.notna()
+    if start is not None:
+        keep &= stamps >= start
+    if end is not None:
+        keep &= stamps <= end
+    frame = frame.loc[keep].copy()
+    frame[timestamp_column] = stamps[keep]
+    return frame.sort_values(timestamp_column, kind="stable").reset_index(drop=True)
+
+
+def _iso_timestamps(stamps: pd.Series) -> List[str]:
+    """Timestamp strings (space-separated, as in the CSV and SQLite loaders) used by the room store."""
+    return np.char.replace(
+        np.datetime_as_string(stamps.to_numpy(dtype="datetime64[ns]"), unit="s"), "T", " "
+    ).tolist()
+
+
+class ParquetDataLoader(CSVDataLoader):
+    """
+    Loads environmental data from Parquet files.
+
+    Supports the same layouts as the CSV loader:
+    1. Wide format: timestamp, temperature, co2, humidity, ...
+    2. Long format: timestamp, room_id, metric, value
+
+    Every load accepts ``metrics``/``standards`` for column projection and
+    ``start``/``end`` for time-window pruning.
+    """
+
+    def _projected_metrics(
+        self,
+        metrics: Optional[Iterable[str]],
+        standards: Optional[Iterable[str]],
+    ) -> Optional[Set[str]]:
+        """Metric names to read, or None for all."""
+        if metrics is None and standards is None:
+            return None
+        selected = set(metrics or [])
+        if standards is not None:
+            selected |= metrics_for_standards(standards)
+        return selected
+
+    def _build_series(
+        self,
+        entity: SpatialEntity,
+        metric_name: str,
+        timestamps: List[str],
+        values: List[float],
+        parquet_path: Path,
+        column: Optional[str] = None,
+    ) -> Tuple[MeteringPoint, Optional[TimeSeries]]:
+        """Create the metering point and time series of one metric."""
+        metric_type = self._get_metric_type(metric_name)
+        point_id = f"{entity.id}_{metric_name}"
+        point = MeteringPoint(
+            id=point_id,
+            name=f"{entity.name} {metric_name}",
+            type=PointType.SENSOR,
+            spatial_entity_id=entity.id,
+            metric=metric_type,
+            unit=self._get_unit(metric_name),
+            timeseries_ids=[],
+        )
+        self.metering_points[point_id] = point
+        if not values:
+            return point, None
+
+        profile = DataQualityProfile.from_timestamps(timestamps)
+        ts_id = f"{point_id}_ts"
+        metadata = {
+            'parquet_file': str(parquet_path),
+            'data_points': len(values),
+            'timestamps': timestamps,
+            'values': values,
+        }
+        if column is not None:
+            metadata['csv_column'] = column  # label the room store keys the series by
+        ts = TimeSeries(
+            id=ts_id,
+            point_id=point_id,
+            type=TimeSeriesType.MEASURED,
+            metric=metric_type,
+            unit=self._get_unit(metric_name),
+            start=datetime.fromisoformat(timestamps[0]),
+            end=datetime.fromisoformat(timestamps[-1]),
+            granularity_seconds=profile.resolution_seconds,
+            quality_profile=profile,
+            source="parquet",
+            metadata=metadata,
+        )
+        self.timeseries[ts_id] = ts
+        point.timeseries_ids.append(ts_id)
+        return point, ts
+
+    def load_wide_format(
+        self,
+        parquet_path: Path | str,
+        spatial_entity_id: str,
+        spatial_entity_name: str,
+        entity_type: SpatialEntityType = SpatialEntityType.ROOM,
+        timestamp_column: str = 'timestamp',
+        metric_columns: Optional[Dict[str, str]] = None,
+        metrics: Optional[Iterable[str]] = None,
+        standards: Optional[Iterable[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        **entity_kwargs
+    ) -> Tuple[SpatialEntity, Dict[str, MeteringPoint], Dict[str, TimeSeries]]:
+        """
+        Load data from a wide-format Parquet file or partitioned directory.
+
+        Args:
+            parquet_path: Parquet file or directory of month partitions
+            spatial_entity_id: ID for the spatial entity
+            spatial_entity_name: Name for the spatial entity
+            entity_type: Type of spatial entity
+            timestamp_column: Name of timestamp column
+            metric_columns: Dict mapping Parquet columns to metric names
+                          If None, uses column names as metric names
+            metrics: Only read these metrics
+            standards: Only read the metrics these standards use
+            start: Inclusive window start
+            end: Inclusive window end
+            **entity_kwargs: Additional properties for spatial entity
+
+        Returns:
+            Tuple of (SpatialEntity, dict of MeteringPoints, dict of TimeSeries)
+        """
+        parquet_path = Path(parquet_path)
+        wanted = self._projected_metrics(metrics, standards)
+
+        columns = None
+        if metric_columns is not None:
+            columns = [col for col, metric in metric_columns.items() if wanted is None or metric in wanted]
+        elif wanted is not None:
+            columns = sorted(wanted)
+
+        frame = read_parquet_frame(parquet_path, columns, timestamp_column, start, end)
+        if frame.empty:
+            raise ValueError(f"No data found in {parquet_path}")
+
+        if metric_columns is None:
+            metric_columns = {col: col for col in frame.columns if col != timestamp_column}
+
+        entity_class = {
+            SpatialEntityType.ROOM: Room,
+            SpatialEntityType.BUILDING: Building,
+            SpatialEntityType.FLOOR: Floor,
+        }.get(entity_type, SpatialEntity)
+
+        entity = entity_class(
+            id=spatial_entity_id,
+            name=spatial_entity_name,
+            type=entity_type,
+            **entity_kwargs
+        )
+        self.spatial_entities[entity.id] = entity
+
+        metering_points = {}
+        timeseries_dict = {}
+        for column, metric_name in metric_columns.items():
+            if column not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[column], errors="coerce")
+            valid = values.notna()
+            point, ts = self._build_series(
+                entity,
+                metric_name,
+                _iso_timestamps(frame.loc[valid, timestamp_column]),
+                values[valid].astype(float).tolist(),
+                parquet_path,
+                column=column,
+            )
+            metering_points[point.id] = point
+            if ts is not None:
+                timeseries_dict[ts.id] = ts
+
+        return entity, metering_points, timeseries_dict
+
+    def load_long_format(
+        self,
+        parquet_path: Path | str,
+        timestamp_column: str = 'timestamp',
+        entity_id_column: str = 'room_id',
+        metric_column: str = 'metric',
+        value_column: str = 'value',
+        entity_name_column: Optional[str] = None,
+        entity_type: SpatialEntityType = SpatialEntityType.ROOM,
+        metrics: Optional[Iterable[str]] = None,
+        standards: Optional[Iterable[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> Tuple[Dict[str, SpatialEntity], Dict[str, MeteringPoint], Dict[str, TimeSeries]]:
+        """
+        Load data from a long-format Parquet file or partitioned directory.
+
+        Only the key columns are decoded; rows of unwanted metrics are
+        dropped right after the read.
+
+        Args:
+            parquet_path: Parquet file or directory of month partitions
+            timestamp_column: Name of timestamp column
+            entity_id_column: Name of entity ID column
+            metric_column: Name of metric column
+            value_column: Name of value column
+            entity_name_column: Name of entity name column (optional)
+            entity_type: Type of spatial entities
+            metrics: Only load these metrics
+            standards: Only load the metrics these standards use
+            start: Inclusive window start
+            end: Inclusive window end
+
+        Returns:
+            Tuple of (entities dict, metering points dict, timeseries dict)
+        """
+        parquet_path = Path(parquet_path)
+        wanted = self._projected_metrics(metrics, standards)
+
+        columns = [entity_id_column, metric_column, value_column]
+        if entity_name_column:
+            columns.append(entity_name_column)
+        frame = read_parquet_frame(parquet_path, columns, timestamp_column, start, end)
+        if frame.empty:
+            raise ValueError(f"No data found in {parquet_path}")
+        if wanted is not None:
+            frame = frame[frame[metric_column].isin(wanted)]
+
+        frame = frame.assign(**{value_column: pd.to_numeric(frame[value_column], errors="coerce")})
+        dropped = int(frame[value_column].isna().sum())
+        if dropped:
+            print(f"Warning: Skipping {dropped} rows without a numeric value")
+            frame = frame[frame[value_column].notna()]
+
+        entity_class = {
+            SpatialEntityType.ROOM: Room,
+            SpatialEntityType.BUILDING: Building,
+            SpatialEntityType.FLOOR: Floor,
+        }.get(entity_type, SpatialEntity)
+
+        entities = {}
+        all_metering_points = {}
+        all_timeseries = {}
+        for entity_id, entity_rows in frame.groupby(entity_id_column, sort=False):
+            entity_id = str(entity_id)
+            entity_name = entity_id
+            if entity_name_column and entity_name_column in entity_rows.columns:
+                entity_name = str(entity_rows[entity_name_column].iloc[-1])
+            entity = entity_class(id=entity_id, name=entity_name, type=entity_type)
+            entities[entity_id] = entity
+            self.spatial_entities[entity_id] = entity
+
+            for metric_name, metric_rows in entity_rows.groupby(metric_column, sort=False):
+                point, ts = self._build_series(
+                    entity,
+                    str(metric_name),
+                    _iso_timestamps(metric_rows[timestamp_column]),
+                    metric_rows[value_column].astype(float).tolist(),
+                    parquet_path,
+                )
+                all_metering_points[point.id] = point
+                if ts is not None:
+                    all_timeseries[ts.id] = ts
+
+        return entities, all_metering_points, all_timeseries
+
+    def load_into_room(
+        self,
+        room: Room,
+        parquet_path: Path | str,
+        timestamp_column: str = 'timestamp',
+        metric_columns: Optional[Dict[str, str]] = None,
+        metrics: Optional[Iterable[str]] = None,
+        standards: Optional[Iterable[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        build_rollups: bool = False,
+    ) -> List[str]:
+        """
+        Read a wide-format room table straight into ``room.timeseries_data``.
+
+        Skips the metering point/time series objects: each projected column
+        becomes one aligned room series over the shared timestamps, with
+        missing values as NaN. With ``build_rollups`` the added series are
+        also rolled up into the room's pyramids (see
+        ``Room.build_rollup_pyramids``).
+
+        Returns:
+            Metric names added to the room
+        """
+        wanted = self._projected_metrics(metrics, standards)
+        if metric_columns is None:
+            columns = sorted(wanted) if wanted is not None else None
+        else:
+            columns = [col for col, metric in metric_columns.items() if wanted is None or metric in wanted]
+
+        frame = read_parquet_frame(parquet_path, columns, timestamp_column, start, end)
+        if frame.empty:
+            return []
+        if metric_columns is None:
+            metric_columns = {col: col for col in frame.columns if col != timestamp_column}
+
+        timestamps = _iso_timestamps(frame[timestamp_column])
+        profile = DataQualityProfile.from_timestamps(timestamps)
+        added = []
+        for column, metric_name in metric_columns.items():
+            if column not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+            room.add_timeseries(metric_name, values.tolist(), timestamps, quality_profile=profile)
+            added.append(metric_name)
+        if build_rollups and added:
+            room.build_rollup_pyramids(added)
+        return added
+
+
+def load_from_parquet(
+    parquet_path: Path | str,
+    format: str = 'wide',
+    **kwargs
+) -> Tuple[Any, Dict[str, MeteringPoint], Dict[str, TimeSeries]]:
+    """
+    Convenience function to load data from Parquet.
+
+    Args:
+        parquet_path: Parquet file or partitioned directory
+        format: 'wide' or 'long'
+        **kwargs: Additional arguments for the loader, including
+            ``metrics``, ``standards``, ``start`` and ``end``
+
+    Returns:
+        Tuple of (entities, metering points, timeseries)
+    """
+    loader = ParquetDataLoader()
+    if format == 'wide':
+        return loader.load_wide_format(parquet_path, **kwargs)
+    if format == 'long':
+        return loader.load_long_format(parquet_path, **kwargs)
+    raise ValueError(f"Unknown format: {format}")
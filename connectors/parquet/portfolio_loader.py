@@ -0,0 +1,236 @@
+"""
+Portfolio Parquet Data Loader
+
+Loads building portfolios from the partitioned Parquet datasets written by
+``convert_csv_tree`` (``manifest.json`` plus ``sensors/``, ``climate/`` and
+``energy/`` partitions) into a ``PortfolioLoadResult`` shaped like the CSV
+portfolio loader's. Room reads are projected to the requested metrics or
+standards and pruned to the requested time window.
+
+The converter names every column with its canonical metric name, so room
+series are keyed ``temperature``/``humidity``/``co2``/... for every source
+layout. The CSV loader keeps the raw hoeje-taastrup column names
+(``Temperatur``, ``Fugtighed``, ``CO2``) as keys, so for that layout the
+two results differ in those keys.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Optional, Any
+from pathlib import Path
+import json
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.entities import Room, Building, Floor, Portfolio
+from core.enums import SpatialEntityType
+from core.weather import WeatherService
+
+from connectors.csv.portfolio_loader import PortfolioLoader, PortfolioLoadResult
+
+from .converter import MANIFEST_FILE
+from .data_loader import ParquetDataLoader, TimeBound
+
+
+class ParquetPortfolioLoader(PortfolioLoader):
+    """
+    Loads building portfolios from partitioned Parquet datasets.
+
+    Dataset layout:
+    - manifest.json
+    - sensors/building=<id>/room=<id>/month=YYYY-MM/*.parquet
+    - climate/building=<id>/month=YYYY-MM/*.parquet
+    - energy/building=<id>/month=YYYY-MM/*.parquet
+    """
+
+    def __init__(self, weather_service: Optional[WeatherService] = None, build_rollups: bool = False):
+        """
+        Initialize portfolio loader.
+
+        Args:
+            weather_service: Service storing shared outdoor climate series
+                (defaults to the global weather service)
+            build_rollups: Roll room series up into pyramids at ingest
+        """
+        super().__init__(weather_service, build_rollups=build_rollups)
+        self.loader = ParquetDataLoader()
+
+    def load_portfolio(
+        self,
+        data_path: Path | str,
+        metrics: Optional[Iterable[str]] = None,
+        standards: Optional[Iterable[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        building_ids: Optional[Iterable[str]] = None,
+    ) -> PortfolioLoadResult:
+        """
+        Load a portfolio from a partitioned Parquet dataset.
+
+        Args:
+            data_path: Dataset directory containing ``manifest.json``
+            metrics: Only read these room metrics
+            standards: Only read the room metrics these standards use
+            start: Inclusive window start
+            end: Inclusive window end
+            building_ids: Only load these buildings
+
+        Returns:
+            PortfolioLoadResult. Climate is always read (it feeds the weather
+            stations); building energy series are only read when neither
+            ``metrics`` nor ``standards`` is given.
+        """
+        data_path = Path(data_path)
+        manifest_file = data_path / MANIFEST_FILE
+        if not manifest_file.exists():
+            raise ValueError(f"No {MANIFEST_FILE} in Parquet dataset: {data_path}")
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+
+        self._reset_state()
+        self.loader = ParquetDataLoader()
+        timestamp_column = manifest.get("timestamp_column", "timestamp")
+        selected = set(building_ids) if building_ids is not None else None
+        window = {"start": start, "end": end, "timestamp_column": timestamp_column}
+
+        all_entities: Dict[str, Any] = {}
+        all_points: Dict[str, Any] = {}
+        all_ts: Dict[str, Any] = {}
+
+        portfolio_info = manifest.get("portfolio", {})
+        self.portfolio = Portfolio(
+            id=portfolio_info.get("id", f"{data_path.name}_portfolio"),
+            name=portfolio_info.get("name", data_path.name.replace("_", " ").title()),
+            type=SpatialEntityType.PORTFOLIO,
+        )
+
+        for building_id, info in manifest.get("buildings", {}).items():
+            if selected is not None and building_id not in selected:
+                continue
+            building = Building(
+                id=building_id,
+                name=info.get("name", building_id),
+                type=SpatialEntityType.BUILDING,
+            )
+            self._apply_building_metadata(building, info.get("metadata", {}))
+            all_entities[building.id] = building
+            self.buildings[building.id] = building
+            self.portfolio.add_building(building.id)
+            if self.portfolio.id not in building.parent_ids:
+                building.parent_ids.append(self.portfolio.id)
+
+            # Climate feeds the weather station, so it is read whatever the projection
+            climate_dir = data_path / "climate" / f"building={building_id}"
+            if climate_dir.exists():
+                try:
+                    entity, points, ts = self.loader.load_wide_format(
+                        climate_dir,
+                        spatial_entity_id=f"{building_id}_climate",
+                        spatial_entity_name=f"{building.name} Climate",
+                        entity_type=SpatialEntityType.BUILDING,
+                        **window,
+                    )
+                    self._register_weather_station(building, points, ts, source_file=str(climate_dir))
+                    new_points, new_ts = self._attach_building_dataset(
+                        building, points, ts, dataset_key="climate", source_file=str(climate_dir)
+                    )
+                    all_points.update(new_points)
+                    all_ts.update(new_ts)
+                except Exception as e:
+                    print(f"Warning: Failed to load climate data: {e}")
+
+            energy_dir = data_path / "energy" / f"building={building_id}"
+            if energy_dir.exists() and metrics is None and standards is None:
+                try:
+                    entity, points, ts = self.loader.load_wide_format(
+                        energy_dir,
+                        spatial_entity_id=f"{building_id}_energy",
+                        spatial_entity_name=f"{building.name} Energy",
+                        entity_type=SpatialEntityType.BUILDING,
+                        **window,
+                    )
+                    new_points, new_ts = self._attach_building_dataset(
+                        building, points, ts, dataset_key="energy", source_file=str(energy_dir)
+                    )
+                    all_points.update(new_points)
+                    all_ts.update(new_ts)
+                except Exception as e:
+                    print(f"Warning: Failed to load energy data: {e}")
+
+        for floor_id, info in manifest.get("floors", {}).items():
+            if info.get("building_id") not in self.buildings:
+                continue
+            floor = Floor(
+                id=floor_id,
+                name=info.get("name", floor_id),
+                type=SpatialEntityType.FLOOR,
+                building_id=info["building_id"],
+            )
+            all_entities[floor.id] = floor
+            self.floors[floor.id] = floor
+            self.buildings[floor.building_id].add_floor(floor.id)
+            if floor.building_id not in floor.parent_ids:
+                floor.parent_ids.append(floor.building_id)
+
+        for room_id, info in manifest.get("rooms", {}).items():
+            building = self.buildings.get(info.get("building_id"))
+            if building is None:
+                continue
+            room_dir = data_path / "sensors" / f"building={building.id}" / f"room={room_id}"
+            if not room_dir.exists():
+                continue
+            room_kwargs: Dict[str, Any] = {
+                "building_id": building.id,
+                "weather_station_id": building.weather_station_id,
+            }
+            if info.get("floor_id"):
+                room_kwargs["floor_id"] = info["floor_id"]
+            try:
+                entity, points, ts = self.loader.load_wide_format(
+                    room_dir,
+                    spatial_entity_id=room_id,
+                    spatial_entity_name=info.get("name", room_id),
+                    entity_type=SpatialEntityType.ROOM,
+                    metrics=metrics,
+                    standards=standards,
+                    **window,
+                    **room_kwargs,
+                )
+            except Exception as e:
+                print(f"Warning: Failed to load {room_dir}: {e}")
+                continue
+
+            all_entities[entity.id] = entity
+            all_points.update(points)
+            all_ts.update(ts)
+            if isinstance(entity, Room):
+                self.rooms[entity.id] = entity
+                self._link_room(entity)
+
+        self._attach_room_sensors(all_entities, all_points, all_ts)
+        return self._wrap_legacy_result((all_entities, all_points, all_ts))
+
+
+def load_portfolio_from_parquet(
+    data_path: Path | str,
+    metrics: Optional[Iterable[str]] = None,
+    standards: Optional[Iterable[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> PortfolioLoadResult:
+    """
+    Load a portfolio from a partitioned Parquet dataset.
+
+    Args:
+        data_path: Dataset directory written by ``convert_csv_tree``
+        metrics: Only read these room metrics
+        standards: Only read the room metrics these standards use
+        start: Inclusive window start
+        end: Inclusive window end
+
+    Returns:
+        PortfolioLoadResult
+    """
+    loader = ParquetPortfolioLoader()
+    return loader.load_portfolio(data_path, metrics=metrics, standards=standards, start=start, end=end)
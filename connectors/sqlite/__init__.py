@@ -0,0 +1,19 @@
+"""
+SQLite Time-Series Store Module
+
+Embedded store for continuously growing portfolios: bulk inserts from the
+CSV loaders, bulk multi-series range reads returning arrays, pooled
+connections for concurrent readers, and portfolio hydration.
+"""
+
+from .store import SAMPLE_DTYPE, DEFAULT_POOL_SIZE, SQLiteSeriesStore
+from .portfolio_loader import SQLitePortfolioLoader, load_portfolio_from_store, write_portfolio
+
+__all__ = [
+    "SAMPLE_DTYPE",
+    "DEFAULT_POOL_SIZE",
+    "SQLiteSeriesStore",
+    "SQLitePortfolioLoader",
+    "load_portfolio_from_store",
+    "write_portfolio",
+]
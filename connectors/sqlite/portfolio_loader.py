@@ -0,0 +1,355 @@
+"""
+Portfolio SQLite Loader
+
+Persists loaded portfolios into a ``SQLiteSeriesStore`` and hydrates them
+back into the same ``PortfolioLoadResult`` the CSV portfolio loader
+returns, reading all selected series with bulk range queries instead of
+re-parsing the file tree.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+from datetime import datetime
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.spacial_entity import SpatialEntity
+from core.entities import Room, Building, Floor, Portfolio
+from core.enums import SpatialEntityType
+from core.data_quality import DataQualityProfile
+from core.metering import (
+    MeteringPoint,
+    TimeSeries,
+    MetricType,
+    PointType,
+    TimeSeriesType,
+)
+from core.standards_registry import metrics_for_standards
+
+from connectors.csv.portfolio_loader import PortfolioLoader, PortfolioLoadResult
+
+from .store import SQLiteSeriesStore
+
+
+# Derived or bulky fields rebuilt on hydration rather than stored with the entity
+_EXCLUDED_FIELDS = {"timeseries_data", "timestamps", "quality_profile", "sensor_groups", "computed_metrics"}
+
+_ENTITY_CLASSES = {
+    SpatialEntityType.PORTFOLIO.value: Portfolio,
+    SpatialEntityType.BUILDING.value: Building,
+    SpatialEntityType.FLOOR.value: Floor,
+    SpatialEntityType.ROOM.value: Room,
+}
+
+SENSOR_DATASET = "sensors"
+
+# (int64 ns stamps, timestamp strings, profile), shared by series read on the same stamps
+_TimeAxis = Tuple[np.ndarray, List[str], DataQualityProfile]
+
+
+def _entity_record(entity: SpatialEntity) -> Dict[str, Any]:
+    record = entity.model_dump(mode="json", exclude=_EXCLUDED_FIELDS)
+    # Building datasets keep copies of their series under "<dataset>_timeseries"
+    record["metadata"] = {
+        key: value for key, value in record.get("metadata", {}).items() if not key.endswith("_timeseries")
+    }
+    return record
+
+
+def write_portfolio(store: SQLiteSeriesStore, result: PortfolioLoadResult) -> int:
+    """
+    Bulk-insert a loaded portfolio (e.g. from ``PortfolioLoader``) into a store.
+
+    Entities are upserted and series samples merged by timestamp, so
+    writing a newer load of the same tree appends the new readings.
+
+    Args:
+        store: Target store
+        result: Loaded portfolio
+
+    Returns:
+        Number of samples written
+    """
+    entities: Dict[str, SpatialEntity] = {}
+    if result.portfolio is not None:
+        entities[result.portfolio.id] = result.portfolio
+    for group in (result.buildings, result.floors, result.rooms):
+        entities.update(group)
+
+    records = []
+    for entity in entities.values():
+        parent = getattr(entity, "floor_id", None) or getattr(entity, "building_id", None)
+        if parent is None and entity.parent_ids:
+            parent = entity.parent_ids[0]
+        records.append((entity.id, entity.type.value, parent, _entity_record(entity)))
+    store.write_entities(records)
+
+    series = []
+    for point in result.metering_points.values():
+        building_id, dataset = _series_owner(point, entities, result.buildings)
+        if building_id is None:
+            continue
+        for ts_id in point.timeseries_ids:
+            ts = result.timeseries.get(ts_id)
+            if ts is None or not ts.metadata.get("values"):
+                continue
+            series.append((
+                ts.id,
+                ts.metadata["timestamps"],
+                ts.metadata["values"],
+                {
+                    "point_id": point.id,
+                    "entity_id": point.spatial_entity_id,
+                    "building_id": building_id,
+                    "dataset": dataset,
+                    "metric": point.metric.value,
+                    "unit": point.unit,
+                    "label": ts.metadata.get("csv_column") or point.parameter or point.metric.value,
+                    "source": ts.source,
+                },
+            ))
+    return store.write_many(series)
+
+
+def _series_owner(
+    point: MeteringPoint,
+    entities: Dict[str, SpatialEntity],
+    buildings: Dict[str, Building],
+) -> Tuple[Optional[str], Optional[str]]:
+    """(building id, dataset) a metering point belongs to, or (None, None)."""
+    owner = entities.get(point.spatial_entity_id)
+    if isinstance(owner, Room):
+        return owner.building_id, SENSOR_DATASET
+    if isinstance(owner, Building):
+        return owner.id, point.metadata.get("dataset") or "building"
+    # Stand-alone dataset entities such as "<building>_climate"
+    building_id, _, dataset = point.spatial_entity_id.rpartition("_")
+    if building_id in buildings:
+        return building_id, dataset
+    return None, None
+
+
+class SQLitePortfolioLoader(PortfolioLoader):
+    """
+    Loads building portfolios from a ``SQLiteSeriesStore``.
+
+    Room series are read for the requested metrics and time window only;
+    climate series always load, as they feed the weather stations.
+
+    The store keeps timestamps as int64 ns (UTC for tz-aware sources), so
+    hydrated series carry naive ``"YYYY-MM-DD HH:MM:SS"`` strings, the
+    format of the CSV layouts; offsets and sub-second parts are not restored.
+    """
+
+    def load_portfolio(
+        self,
+        data_path: Path | str | SQLiteSeriesStore,
+        metrics: Optional[Iterable[str]] = None,
+        standards: Optional[Iterable[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        building_ids: Optional[Iterable[str]] = None,
+    ) -> PortfolioLoadResult:
+        """
+        Hydrate a portfolio from a store.
+
+        Args:
+            data_path: Store, or path of its database file
+            metrics: Only read these room metrics
+            standards: Only read the room metrics these standards use
+            start: Inclusive window start
+            end: Inclusive window end
+            building_ids: Only load these buildings
+
+        Returns:
+            PortfolioLoadResult
+        """
+        if isinstance(data_path, SQLiteSeriesStore):
+            return self._load_store(data_path, metrics, standards, start, end, building_ids)
+        if not Path(data_path).exists():
+            raise ValueError(f"Data path does not exist: {data_path}")
+        store = SQLiteSeriesStore(data_path)
+        try:
+            return self._load_store(store, metrics, standards, start, end, building_ids)
+        finally:
+            store.close()
+
+    def _load_store(
+        self,
+        store: SQLiteSeriesStore,
+        metrics: Optional[Iterable[str]],
+        standards: Optional[Iterable[str]],
+        start: Any,
+        end: Any,
+        building_ids: Optional[Iterable[str]],
+    ) -> PortfolioLoadResult:
+        """Hydrate a portfolio from an open store; see ``load_portfolio``."""
+        self._reset_state()
+        selected = set(building_ids) if building_ids is not None else None
+
+        wanted = None
+        if metrics is not None or standards is not None:
+            wanted = set(metrics or [])
+            if standards is not None:
+                wanted |= metrics_for_standards(standards)
+
+        all_entities: Dict[str, SpatialEntity] = {}
+        for entity_id, kind, _, record in store.entities():
+            entity_class = _ENTITY_CLASSES.get(kind)
+            if entity_class is None:
+                continue
+            building_id = entity_id if kind == SpatialEntityType.BUILDING.value else record.get("building_id")
+            if selected is not None and entity_class is not Portfolio and building_id not in selected:
+                continue
+            entity = entity_class.model_validate(record)
+            if isinstance(entity, Portfolio):
+                self.portfolio = entity
+                continue
+            all_entities[entity.id] = entity
+            {Building: self.buildings, Floor: self.floors, Room: self.rooms}[entity_class][entity.id] = entity
+
+        records = [
+            record for record in store.series(building_ids=sorted(selected) if selected is not None else None)
+            if self._wanted_series(record, wanted)
+        ]
+        samples = store.read_many([record["key"] for record in records], start, end)
+
+        all_points: Dict[str, MeteringPoint] = {}
+        all_ts: Dict[str, TimeSeries] = {}
+        datasets: Dict[Tuple[str, str], Tuple[Dict[str, MeteringPoint], Dict[str, TimeSeries]]] = {}
+        axes: Dict[str, _TimeAxis] = {}
+        for record in records:
+            stamps, values = samples[record["key"]]
+            if not values.size:
+                continue
+            axis = axes.get(record["entity_id"])
+            if axis is None or not np.array_equal(axis[0], stamps):
+                axis = axes[record["entity_id"]] = self._time_axis(stamps)
+            point, ts = self._build_series(record, axis, values, str(store.path))
+            if record["dataset"] == SENSOR_DATASET:
+                all_points[point.id] = point
+                all_ts[ts.id] = ts
+            else:
+                points, series = datasets.setdefault((record["building_id"], record["dataset"]), ({}, {}))
+                points[point.id] = point
+                series[ts.id] = ts
+
+        for (building_id, dataset), (points, series) in datasets.items():
+            building = self.buildings[building_id]
+            if dataset == "climate":
+                self._register_weather_station(building, points, series, source_file=str(store.path))
+            new_points, new_ts = self._attach_building_dataset(
+                building, points, series, dataset_key=dataset, source_file=str(store.path)
+            )
+            all_points.update(new_points)
+            all_ts.update(new_ts)
+
+        for floor in self.floors.values():
+            if floor.building_id in self.buildings:
+                self.buildings[floor.building_id].add_floor(floor.id)
+        for room in self.rooms.values():
+            self._link_room(room)
+        if self.portfolio is not None:
+            for building_id in self.buildings:
+                self.portfolio.add_building(building_id)
+
+        self._attach_room_sensors(all_entities, all_points, all_ts)
+        return self._wrap_legacy_result((all_entities, all_points, all_ts))
+
+    def _wanted_series(self, record: Dict[str, Any], wanted: Optional[set]) -> bool:
+        """Whether a stored series is part of the requested projection."""
+        if record["building_id"] not in self.buildings:
+            return False
+        if record["dataset"] == SENSOR_DATASET:
+            if record["entity_id"] not in self.rooms:
+                return False
+            return wanted is None or record["metric"] in wanted or record["label"] in wanted
+        # Climate feeds the weather stations; other building datasets only load unprojected
+        return record["dataset"] == "climate" or wanted is None
+
+    @staticmethod
+    def _time_axis(stamps: np.ndarray) -> _TimeAxis:
+        """Timestamp strings (space-separated, as in the CSV sources) and quality profile of stored stamps."""
+        timestamps: List[str] = np.char.replace(
+            np.datetime_as_string(stamps.astype("datetime64[ns]"), unit="s"), "T", " "
+        ).tolist()
+        return stamps, timestamps, DataQualityProfile.from_timestamps(timestamps)
+
+    def _build_series(
+        self,
+        record: Dict[str, Any],
+        axis: _TimeAxis,
+        values: np.ndarray,
+        store_path: str,
+    ) -> Tuple[MeteringPoint, TimeSeries]:
+        """Metering point and time series of one stored series."""
+        label = record["label"] or record["metric"]
+        try:
+            metric = MetricType(record["metric"])
+        except ValueError:
+            metric = self.loader._get_metric_type(label)
+        unit = record["unit"] or self.loader._get_unit(label)
+
+        point_id = record["point_id"] or f"{record['entity_id']}_{label}"
+        point = MeteringPoint(
+            id=point_id,
+            name=f"{record['entity_id']} {label}",
+            type=PointType.SENSOR,
+            spatial_entity_id=record["entity_id"],
+            metric=metric,
+            unit=unit,
+            parameter=label,
+            timeseries_ids=[record["key"]],
+            metadata={"dataset": record["dataset"]},
+        )
+
+        _, timestamps, profile = axis
+        ts = TimeSeries(
+            id=record["key"],
+            point_id=point_id,
+            type=TimeSeriesType.MEASURED,
+            metric=metric,
+            unit=unit,
+            start=datetime.fromisoformat(timestamps[0]),
+            end=datetime.fromisoformat(timestamps[-1]),
+            granularity_seconds=profile.resolution_seconds,
+            quality_profile=profile,
+            source=record["source"] or "sqlite",
+            metadata={
+                'sqlite_store': store_path,
+                'csv_column': label,
+                'data_points': int(values.size),
+                'timestamps': timestamps,
+                'values': values.tolist(),
+            },
+        )
+        return point, ts
+
+
+def load_portfolio_from_store(
+    data_path: Path | str | SQLiteSeriesStore,
+    metrics: Optional[Iterable[str]] = None,
+    standards: Optional[Iterable[str]] = None,
+    start: Any = None,
+    end: Any = None,
+) -> PortfolioLoadResult:
+    """
+    Hydrate a portfolio from a SQLite series store.
+
+    Args:
+        data_path: Store, or path of its database file
+        metrics: Only read these room metrics
+        standards: Only read the room metrics these standards use
+        start: Inclusive window start
+        end: Inclusive window end
+
+    Returns:
+        PortfolioLoadResult
+    """
+    loader = SQLitePortfolioLoader()
+    return loader.load_portfolio(data_path, metrics=metrics, standards=standards, start=start, end=end)
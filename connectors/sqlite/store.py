@@ -0,0 +1,386 @@
+"""
+SQLite Time-Series Store
+
+Embedded, file-backed store for a continuously growing portfolio. Samples
+live in one clustered table keyed by ``(series_id, ts)`` (a WITHOUT ROWID
+table, so each series is stored contiguously in timestamp order), series
+and entity records in small side tables:
+
+    entities(id, kind, parent_id, record)            record: entity JSON
+    series(series_id, key, point_id, entity_id, building_id, dataset,
+           metric, unit, label, source, first_ts, last_ts, count)
+    samples(series_id, ts, value)                    ts: int64 ns (UTC)
+
+Inserts are bulk ``executemany`` upserts; range reads fetch many series in
+one query and return NumPy arrays. Connections come from a small pool, and
+the database runs in WAL mode so readers never block each other or the
+single writer. The store pickles as its path, so it can be handed to
+process-pool workers.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    parent_id TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    point_id TEXT,
+    entity_id TEXT,
+    building_id TEXT,
+    dataset TEXT,
+    metric TEXT,
+    unit TEXT,
+    label TEXT,
+    source TEXT,
+    first_ts INTEGER,
+    last_ts INTEGER,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS series_entity ON series (entity_id);
+CREATE INDEX IF NOT EXISTS series_building ON series (building_id, dataset);
+CREATE TABLE IF NOT EXISTS samples (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+"""
+
+SERIES_FIELDS = ("point_id", "entity_id", "building_id", "dataset", "metric", "unit", "label", "source")
+
+SAMPLE_DTYPE = np.dtype([("series_id", "<i8"), ("ts", "<i8"), ("value", "<f8")])
+
+DEFAULT_POOL_SIZE = 4
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER of older builds (999)
+_MAX_PARAMS = 900
+
+
+def _to_ns(value: Any) -> Optional[int]:
+    """Nanoseconds since epoch of a bound (tz-aware values in UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    stamp = pd.Timestamp(value)
+    if stamp.tz is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return stamp.as_unit("ns").value
+
+
+def _timestamps_to_ns(timestamps: Any) -> np.ndarray:
+    """int64 ns of timestamp strings, datetimes or datetime64 arrays (UTC for tz-aware)."""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "i":
+        return timestamps.astype(np.int64, copy=False)
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+class SQLiteSeriesStore:
+    """
+    Time-series store backed by a local SQLite database.
+
+    Thread-safe: every call checks a connection out of the pool, writes are
+    serialised by a lock.
+    """
+
+    def __init__(self, path: Path | str, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = 30.0):
+        """
+        Open (and create if needed) a store.
+
+        Args:
+            path: Database file
+            pool_size: Maximum number of pooled connections
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = Path(path)
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "pool_size": self.pool_size, "timeout": self.timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"], state["pool_size"], state["timeout"])
+
+    # ------------------------------------------------------------------ connections
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check a connection out of the pool; blocks while all are in use."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        with self._pool_lock:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+
+    # ------------------------------------------------------------------ writes
+    def write_entities(self, records: Iterable[Tuple[str, str, Optional[str], Dict[str, Any]]]) -> int:
+        """
+        Upsert entity records.
+
+        Args:
+            records: (id, kind, parent_id, record dict) tuples
+
+        Returns:
+            Number of records written
+        """
+        rows = [(eid, kind, parent, json.dumps(record, default=str)) for eid, kind, parent, record in records]
+        with self._write_lock, self.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entities (id, kind, parent_id, record) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def write_series(
+        self,
+        key: str,
+        timestamps: Any,
+        values: Any,
+        **attributes: Optional[str],
+    ) -> int:
+        """
+        Upsert the samples of one series; see ``write_many``.
+
+        Returns:
+            Number of samples written
+        """
+        return self.write_many([(key, timestamps, values, attributes)])
+
+    def write_many(
+        self,
+        series: Iterable[Tuple[str, Any, Any, Dict[str, Optional[str]]]],
+    ) -> int:
+        """
+        Upsert many series in one transaction.
+
+        Samples with an existing (series, timestamp) are replaced, so
+        re-ingesting an overlapping file only appends what is new. NaN
+        values are not stored.
+
+        Args:
+            series: (key, timestamps, values, attributes) tuples; attributes
+                may set any of point_id, entity_id, building_id, dataset,
+                metric, unit, label and source
+
+        Returns:
+            Number of samples written
+        """
+        written = 0
+        with self._write_lock, self.connection() as conn, conn:
+            for key, timestamps, values, attributes in series:
+                stamps = _timestamps_to_ns(timestamps)
+                values = np.asarray(values, dtype=np.float64)
+                if stamps.size != values.size:
+                    raise ValueError(f"{key}: timestamps and values differ in length")
+                valid = ~np.isnan(values)
+                stamps, values = stamps[valid], values[valid]
+
+                series_id = self._upsert_series(conn, key, attributes)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO samples (series_id, ts, value) VALUES (?, ?, ?)",
+                    zip([series_id] * stamps.size, stamps.tolist(), values.tolist()),
+                )
+                conn.execute(
+                    "UPDATE series SET (first_ts, last_ts, count) = "
+                    "(SELECT MIN(ts), MAX(ts), COUNT(*) FROM samples WHERE series_id = ?) "
+                    "WHERE series_id = ?",
+                    (series_id, series_id),
+                )
+                written += int(stamps.size)
+        return written
+
+    @staticmethod
+    def _upsert_series(conn: sqlite3.Connection, key: str, attributes: Dict[str, Optional[str]]) -> int:
+        fields = {name: attributes[name] for name in SERIES_FIELDS if attributes.get(name) is not None}
+        row = conn.execute("SELECT series_id FROM series WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            columns = ", ".join(["key", *fields])
+            placeholders = ", ".join("?" * (len(fields) + 1))
+            cursor = conn.execute(f"INSERT INTO series ({columns}) VALUES ({placeholders})", (key, *fields.values()))
+            return int(cursor.lastrowid)
+        if fields:
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            conn.execute(f"UPDATE series SET {assignments} WHERE series_id = ?", (*fields.values(), row[0]))
+        return int(row[0])
+
+    def delete_series(self, keys: Iterable[str]) -> int:
+        """Remove series and their samples; returns the number removed."""
+        removed = 0
+        with self._write_lock, self.connection() as conn, conn:
+            for key in keys:
+                row = conn.execute("SELECT series_id FROM series WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+                conn.execute("DELETE FROM samples WHERE series_id = ?", row)
+                conn.execute("DELETE FROM series WHERE series_id = ?", row)
+                removed += 1
+        return removed
+
+    # ------------------------------------------------------------------ reads
+    def entities(self, kind: Optional[str] = None) -> List[Tuple[str, str, Optional[str], Dict[str, Any]]]:
+        """(id, kind, parent_id, record) of stored entities, optionally of one kind."""
+        query = "SELECT id, kind, parent_id, record FROM entities"
+        params: Tuple[Any, ...] = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        with self.connection() as conn:
+            rows = conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [(eid, k, parent, json.loads(record)) for eid, k, parent, record in rows]
+
+    def series(
+        self,
+        entity_ids: Optional[Sequence[str]] = None,
+        building_ids: Optional[Sequence[str]] = None,
+        metrics: Optional[Sequence[str]] = None,
+        datasets: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Series records matching all given filters.
+
+        Matching is on the stored ``metric`` and ``label`` (source column)
+        for ``metrics``.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, wanted in (("entity_id", entity_ids), ("building_id", building_ids), ("dataset", datasets)):
+            if wanted is not None:
+                wanted = list(wanted)
+                clauses.append(f"{column} IN ({', '.join('?' * len(wanted))})")
+                params.extend(wanted)
+        if metrics is not None:
+            metrics = list(metrics)
+            marks = ", ".join("?" * len(metrics))
+            clauses.append(f"(metric IN ({marks}) OR label IN ({marks}))")
+            params.extend(metrics * 2)
+
+        query = "SELECT * FROM series"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self.connection() as conn:
+            cursor = conn.execute(query + " ORDER BY series_id", params)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def read_many(
+        self,
+        keys: Sequence[str],
+        start: Any = None,
+        end: Any = None,
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Bulk range read of many series.
+
+        One query per ~900 series walks the clustered (series_id, ts) key,
+        so each series comes back already sorted by time.
+
+        Args:
+            keys: Series keys
+            start: Inclusive window start (timestamp or int ns)
+            end: Inclusive window end
+
+        Returns:
+            Mapping key -> (int64 ns timestamps, float64 values); keys with
+            no samples in the window map to empty arrays
+        """
+        keys = list(keys)
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        result: Dict[str, Tuple[np.ndarray, np.ndarray]] = {key: empty for key in keys}
+
+        with self.connection() as conn:
+            ids: Dict[int, str] = {}
+            for offset in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[offset: offset + _MAX_PARAMS]
+                rows = conn.execute(
+                    f"SELECT series_id, key FROM series WHERE key IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall()
+                ids.update(rows)
+
+            series_ids = sorted(ids)
+            for offset in range(0, len(series_ids), _MAX_PARAMS):
+                batch = series_ids[offset: offset + _MAX_PARAMS]
+                query = f"SELECT series_id, ts, value FROM samples WHERE series_id IN ({', '.join('?' * len(batch))})"
+                params: List[Any] = list(batch)
+                if start_ns is not None:
+                    query += " AND ts >= ?"
+                    params.append(start_ns)
+                if end_ns is not None:
+                    query += " AND ts <= ?"
+                    params.append(end_ns)
+                samples = np.fromiter(conn.execute(query + " ORDER BY series_id, ts", params), dtype=SAMPLE_DTYPE)
+                if not samples.size:
+                    continue
+
+                owners = samples["series_id"]
+                bounds = np.flatnonzero(owners[1:] != owners[:-1]) + 1
+                for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, owners.size]):
+                    result[ids[int(owners[lo])]] = (samples["ts"][lo:hi].copy(), samples["value"][lo:hi].copy())
+        return result
+
+    def read_series(self, key: str, start: Any = None, end: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(int64 ns timestamps, values) of one series in the window."""
+        return self.read_many([key], start, end)[key]
+
+    def read_frame(self, keys: Sequence[str], start: Any = None, end: Any = None) -> pd.DataFrame:
+        """Series aligned on the union of their timestamps, one column per key."""
+        columns = {
+            key: pd.Series(values, index=pd.DatetimeIndex(stamps.astype("datetime64[ns]")))
+            for key, (stamps, values) in self.read_many(keys, start, end).items()
+        }
+        return pd.DataFrame(columns)
+
+
+__all__ = [
+    "SAMPLE_DTYPE",
+    "DEFAULT_POOL_SIZE",
+    "SQLiteSeriesStore",
+]
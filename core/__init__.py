@@ -8,7 +8,12 @@ Models are organized into separate modules:
 - base_entities: Base SpatialEntity and Zone
 - entities: Enhanced Portfolio, Building, Floor, Room
 - metering: MeteringPoint and TimeSeries
+- data_quality: Timestamp data-quality profiles computed at ingest
+- weather: Shared weather stations with cached derived series
 - aggregators: Aggregator
+- rollup_pyramid: Multi-resolution rollups answering aggregation queries
+- summary_stats: Mergeable statistics for hierarchy aggregation
+- compliance_sketch: Threshold-agnostic compliance sketches and sweeps
 - rules: ApplicabilityCondition, TestRule, RuleSet
 - analysis: All analysis types
 - simulation: Simulation models and runs
@@ -65,11 +70,58 @@ from .metering import (
     TimeSeries,
 )
 
+# Sensor ring buffers
+from .sensor_buffer import (
+    SensorRingBuffer,
+    SensorWindow,
+    BinarySpillStore,
+)
+
+# Compressed series blocks
+from .series_codec import (
+    SeriesBlock,
+    CompressedSeries,
+)
+
+# Timestamp data-quality profiles
+from .data_quality import (
+    DataQualityProfile,
+    get_quality_profile,
+)
+
+# Meter reading ingestion
+from .meter_ingestion import (
+    MeterReadingBatch,
+    MeterIntervals,
+    MeterRollups,
+    readings_to_intervals,
+    ingest_meter_readings,
+)
+
+# Shared weather stations
+from .weather import (
+    WeatherStation,
+    WeatherService,
+    get_weather_service,
+)
+
 # Import aggregators
 from .aggregators import (
     Aggregator,
 )
 
+# Multi-resolution rollups
+from .rollup_pyramid import (
+    RollupPyramid,
+)
+
+# Import mergeable summaries
+from .summary_stats import (
+    QuantileSketch,
+    StatisticalSummary,
+    TimeseriesSummary,
+)
+
 # Import access control
 from .access import (
     UserProfile,
@@ -116,6 +168,8 @@ from .energy import (
     EnergyUse,
     PrimaryEnergyComponent,
     PrimaryEnergyBreakdown,
+    PrimaryFactorTable,
+    PrimaryEnergyArrays,
     EnergyConversionService,
 )
 
@@ -142,6 +196,27 @@ from .filters import (
     TimeRange,
     OpeningHoursFilter,
     SeasonalFilter,
+    FilterPlan,
+)
+
+# Threshold-agnostic compliance
+from .compliance_sketch import (
+    ValueSketch,
+    ComplianceSketch,
+    PortfolioComplianceSketches,
+)
+
+# Out-of-core chunked evaluation
+from .chunked_evaluation import (
+    iter_csv_chunks,
+    evaluate_chunked,
+    evaluate_csv_chunked,
+)
+
+# Streaming compliance
+from .streaming_compliance import (
+    StreamingBands,
+    StreamingComplianceEngine,
 )
 
 
@@ -188,11 +263,32 @@ __all__ = [
     "SensorGroup",
     "MeteringPoint",
     "SensorSeries",
+    "SensorRingBuffer",
+    "SensorWindow",
+    "BinarySpillStore",
+    "SeriesBlock",
+    "CompressedSeries",
     "TimeSeriesRecord",
     "TimeSeries",
+    "DataQualityProfile",
+    "get_quality_profile",
+    "MeterReadingBatch",
+    "MeterIntervals",
+    "MeterRollups",
+    "readings_to_intervals",
+    "ingest_meter_readings",
+
+    # Weather
+    "WeatherStation",
+    "WeatherService",
+    "get_weather_service",
 
     # Aggregators
     "Aggregator",
+    "RollupPyramid",
+    "QuantileSketch",
+    "StatisticalSummary",
+    "TimeseriesSummary",
 
     # Access
     "UserProfile",
@@ -231,6 +327,8 @@ __all__ = [
     "EnergyUse",
     "PrimaryEnergyComponent",
     "PrimaryEnergyBreakdown",
+    "PrimaryFactorTable",
+    "PrimaryEnergyArrays",
     "EnergyConversionService",
 
     # Schedules
@@ -251,4 +349,17 @@ __all__ = [
     "TimeRange",
     "OpeningHoursFilter",
     "SeasonalFilter",
+    "FilterPlan",
+
+    # Compliance sketches
+    "ValueSketch",
+    "ComplianceSketch",
+    "PortfolioComplianceSketches",
+    # Chunked evaluation
+    "iter_csv_chunks",
+    "evaluate_chunked",
+    "evaluate_csv_chunked",
+    # Streaming compliance
+    "StreamingBands",
+    "StreamingComplianceEngine",
 ]
@@ -0,0 +1,433 @@
+"""
+Threshold-Agnostic Compliance Sketches
+
+A ``ValueSketch`` stores the distinct values of a series with their
+cumulative counts, so the number of samples inside any threshold band is two
+``searchsorted`` lookups. A ``ComplianceSketch`` keeps one value sketch per
+(occupied, in-season) cell of a room parameter, and a
+``PortfolioComplianceSketches`` collection sweeps thousands of threshold
+combinations across all rooms without revisiting raw data.
+
+Bands are inclusive on both ends, like the BR18 ``between`` rule and the
+EN16798 category limits. Thresholds that vary per sample (the EN16798
+adaptive model) cannot be answered from a value distribution.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .filters.filter_plan import FilterPlan
+
+
+# (occupied, in_season) cell of a ComplianceSketch
+Cell = Tuple[bool, bool]
+
+ThresholdArray = Union[float, Sequence[float], np.ndarray, None]
+
+
+def _bounds(lower: ThresholdArray, upper: ThresholdArray) -> Tuple[np.ndarray, np.ndarray]:
+    """Broadcast optional lower/upper thresholds to float arrays (None is open)."""
+    low = np.asarray(-np.inf if lower is None else lower, dtype=float)
+    high = np.asarray(np.inf if upper is None else upper, dtype=float)
+    low = np.where(np.isnan(low), -np.inf, low)
+    high = np.where(np.isnan(high), np.inf, high)
+    return np.broadcast_arrays(low, high)
+
+
+@dataclass
+class ValueSketch:
+    """
+    Distinct sorted values with cumulative sample counts (an exact CDF).
+
+    With a ``resolution`` values are rounded to that step first, which bounds
+    the size of the sketch at the cost of band edges snapping to the grid.
+    """
+
+    support: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=float))
+    cumulative: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_values(
+        cls,
+        values: Iterable[float],
+        resolution: Optional[float] = None,
+    ) -> "ValueSketch":
+        """Build a sketch from raw samples (NaNs are ignored)."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if resolution:
+            arr = np.round(arr / resolution) * resolution
+        support, counts = np.unique(arr, return_counts=True)
+        return cls(support=support, cumulative=np.cumsum(counts))
+
+    @property
+    def count(self) -> int:
+        return int(self.cumulative[-1]) if self.cumulative.size else 0
+
+    def _count_below(self, threshold: np.ndarray, inclusive: bool) -> np.ndarray:
+        """Samples ``<= threshold`` (``inclusive``) or ``< threshold``."""
+        position = np.searchsorted(self.support, threshold, side="right" if inclusive else "left")
+        padded = np.concatenate(([0], self.cumulative))
+        return padded[position]
+
+    def count_between(self, lower: ThresholdArray = None, upper: ThresholdArray = None) -> np.ndarray:
+        """Samples with ``lower <= value <= upper``; thresholds broadcast elementwise."""
+        low, high = _bounds(lower, upper)
+        counts = self._count_below(high, inclusive=True) - self._count_below(low, inclusive=False)
+        return np.maximum(counts, 0)
+
+    def fraction_between(self, lower: ThresholdArray = None, upper: ThresholdArray = None) -> np.ndarray:
+        """Share of samples inside the band (NaN for an empty sketch)."""
+        counts = self.count_between(lower, upper)
+        if self.count == 0:
+            return np.full(np.shape(counts), np.nan)
+        return counts / self.count
+
+    def merge(self, other: "ValueSketch") -> "ValueSketch":
+        """Return a new sketch combining this sketch with another."""
+        return ValueSketch.combine([self, other])
+
+    @classmethod
+    def combine(cls, sketches: Sequence["ValueSketch"]) -> "ValueSketch":
+        """Combine several sketches into one."""
+        parts = [s for s in sketches if s.support.size]
+        if not parts:
+            return cls()
+        if len(parts) == 1:
+            return parts[0]
+        values = np.concatenate([s.support for s in parts])
+        counts = np.concatenate([np.diff(s.cumulative, prepend=0) for s in parts])
+        support, inverse = np.unique(values, return_inverse=True)
+        return cls(support=support, cumulative=np.cumsum(np.bincount(inverse, weights=counts).astype(np.int64)))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Lower quantile (0 <= q <= 1): the smallest value with at least ``q`` of the samples at or below it."""
+        if self.count == 0:
+            return None
+        rank = max(int(np.ceil(q * self.count)), 1)
+        return float(self.support[np.searchsorted(self.cumulative, rank)])
+
+    def _value_at(self, rank: int) -> float:
+        """Value of the sample at 0-based ``rank`` in sorted order."""
+        return float(self.support[np.searchsorted(self.cumulative, rank, side="right")])
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Linearly interpolated quantile (0 <= q <= 1), computed like
+        ``numpy.percentile``/``Series.quantile`` on the raw samples.
+        """
+        if self.count == 0:
+            return None
+        virtual = (self.count - 1) * q
+        if virtual >= self.count - 1:
+            return float(self.support[-1])
+        below = int(np.floor(virtual))
+        gamma = virtual - below
+        a, b = self._value_at(below), self._value_at(below + 1)
+        # Same two-sided lerp as numpy, so results match bit for bit
+        if gamma >= 0.5:
+            return float(b - (b - a) * (1 - gamma))
+        return float(a + (b - a) * gamma)
+
+
+@dataclass
+class ComplianceSketch:
+    """
+    Value sketches of one room parameter split by occupancy and season.
+
+    Queries select cells with ``occupied``/``in_season`` (None means both)
+    and add up the band counts of the selected cells.
+    """
+
+    entity_id: str
+    parameter: str
+    cells: Dict[Cell, ValueSketch] = field(default_factory=dict)
+    season: Optional[str] = None
+    step_hours: Optional[float] = None
+
+    @classmethod
+    def from_series(
+        cls,
+        entity_id: str,
+        parameter: str,
+        values: Sequence[float],
+        occupied: Optional[np.ndarray] = None,
+        in_season: Optional[np.ndarray] = None,
+        season: Optional[str] = None,
+        step_hours: Optional[float] = None,
+        resolution: Optional[float] = None,
+    ) -> "ComplianceSketch":
+        """
+        Build the sketch from aligned value and mask arrays.
+
+        Args:
+            entity_id: Room (or other entity) ID
+            parameter: Parameter name, e.g. ``"co2"``
+            values: Samples
+            occupied: Optional boolean occupancy per sample (default: all occupied)
+            in_season: Optional boolean season membership per sample (default: all in season)
+            season: Name of the season behind ``in_season``
+            step_hours: Sampling step, to convert counts to hours
+            resolution: Optional rounding step of the value sketches
+        """
+        arr = np.asarray(values, dtype=float)
+        occupied_mask = np.ones(arr.size, dtype=bool) if occupied is None else np.asarray(occupied, dtype=bool)
+        season_mask = np.ones(arr.size, dtype=bool) if in_season is None else np.asarray(in_season, dtype=bool)
+        if occupied_mask.size != arr.size or season_mask.size != arr.size:
+            raise ValueError("Masks must have one entry per sample")
+
+        cells: Dict[Cell, ValueSketch] = {}
+        for is_occupied in (True, False):
+            for is_in_season in (True, False):
+                selected = (occupied_mask == is_occupied) & (season_mask == is_in_season)
+                if selected.any():
+                    cells[(is_occupied, is_in_season)] = ValueSketch.from_values(arr[selected], resolution)
+        return cls(entity_id=entity_id, parameter=parameter, cells=cells, season=season, step_hours=step_hours)
+
+    def select(self, occupied: Optional[bool] = True, in_season: Optional[bool] = None) -> List[ValueSketch]:
+        """Value sketches of the matching cells."""
+        return [
+            sketch
+            for (is_occupied, is_in_season), sketch in self.cells.items()
+            if (occupied is None or is_occupied == occupied)
+            and (in_season is None or is_in_season == in_season)
+        ]
+
+    def sketch(self, occupied: Optional[bool] = True, in_season: Optional[bool] = None) -> ValueSketch:
+        """The matching cells combined into one value sketch."""
+        return ValueSketch.combine(self.select(occupied, in_season))
+
+    def count(self, occupied: Optional[bool] = True, in_season: Optional[bool] = None) -> int:
+        return sum(s.count for s in self.select(occupied, in_season))
+
+    def count_between(
+        self,
+        lower: ThresholdArray = None,
+        upper: ThresholdArray = None,
+        occupied: Optional[bool] = True,
+        in_season: Optional[bool] = None,
+    ) -> np.ndarray:
+        """Samples inside the band for each threshold pair."""
+        low, high = _bounds(lower, upper)
+        counts = np.zeros(low.shape, dtype=np.int64)
+        for sketch in self.select(occupied, in_season):
+            counts = counts + sketch.count_between(low, high)
+        return counts
+
+    def fraction_between(
+        self,
+        lower: ThresholdArray = None,
+        upper: ThresholdArray = None,
+        occupied: Optional[bool] = True,
+        in_season: Optional[bool] = None,
+    ) -> np.ndarray:
+        """Compliance fraction (0-1) for each threshold pair; NaN without samples."""
+        total = self.count(occupied, in_season)
+        counts = self.count_between(lower, upper, occupied, in_season)
+        if total == 0:
+            return np.full(counts.shape, np.nan)
+        return counts / total
+
+    def hours_outside(
+        self,
+        lower: ThresholdArray = None,
+        upper: ThresholdArray = None,
+        occupied: Optional[bool] = True,
+        in_season: Optional[bool] = None,
+    ) -> np.ndarray:
+        """Hours outside the band, using the sampling step (1 h when unknown)."""
+        outside = self.count(occupied, in_season) - self.count_between(lower, upper, occupied, in_season)
+        return outside * (self.step_hours or 1.0)
+
+
+@dataclass
+class ThresholdSweep:
+    """Compliance fractions of many rooms for many threshold bands."""
+
+    parameter: str
+    entity_ids: List[str]
+    lower: np.ndarray
+    upper: np.ndarray
+    fractions: np.ndarray  # (rooms, bands)
+    samples: np.ndarray    # samples per room behind each fraction
+
+    def pass_rate(self, min_fraction: float) -> np.ndarray:
+        """Share of rooms (with data) reaching ``min_fraction`` for each band."""
+        with_data = self.samples > 0
+        if not with_data.any():
+            return np.full(self.lower.size, np.nan)
+        return (self.fractions[with_data] >= min_fraction).mean(axis=0)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table: one row per (room, band)."""
+        rooms, bands = self.fractions.shape
+        return pd.DataFrame({
+            "entity_id": np.repeat(self.entity_ids, bands),
+            "lower": np.tile(self.lower, rooms),
+            "upper": np.tile(self.upper, rooms),
+            "fraction": self.fractions.ravel(),
+        })
+
+
+class PortfolioComplianceSketches:
+    """
+    Compliance sketches of many rooms, keyed by (entity ID, parameter).
+
+    Example:
+        sketches = PortfolioComplianceSketches.from_rooms(rooms, ["co2", "temperature"])
+        sweep = sketches.sweep("co2", upper=np.arange(700, 1400, 10))
+        sweep.pass_rate(0.95)
+    """
+
+    def __init__(self, sketches: Optional[Iterable[ComplianceSketch]] = None):
+        self.sketches: Dict[Tuple[str, str], ComplianceSketch] = {}
+        for sketch in sketches or []:
+            self.add(sketch)
+
+    def add(self, sketch: ComplianceSketch) -> None:
+        self.sketches[(sketch.entity_id, sketch.parameter)] = sketch
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    def get(self, entity_id: str, parameter: str) -> Optional[ComplianceSketch]:
+        return self.sketches.get((entity_id, parameter))
+
+    @classmethod
+    def from_rooms(
+        cls,
+        rooms: Iterable[Any],
+        parameters: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> "PortfolioComplianceSketches":
+        """
+        Collect the sketches of each room; see ``Room.build_compliance_sketches``.
+
+        A room's cached sketches are reused only when no build arguments are
+        given and they cover every requested parameter (all loaded metrics
+        when ``parameters`` is None); otherwise they are rebuilt.
+        """
+        collection = cls()
+        for room in rooms:
+            sketches = room.computed_metrics.get("compliance_sketches")
+            wanted = set(parameters) if parameters is not None else set(room.available_metrics)
+            if sketches is None or kwargs or not wanted.issubset(sketches):
+                sketches = room.build_compliance_sketches(parameters, **kwargs)
+            for parameter, sketch in sketches.items():
+                if parameters is None or parameter in parameters:
+                    collection.add(sketch)
+        return collection
+
+    def sweep(
+        self,
+        parameter: str,
+        lower: ThresholdArray = None,
+        upper: ThresholdArray = None,
+        occupied: Optional[bool] = True,
+        in_season: Optional[bool] = None,
+    ) -> ThresholdSweep:
+        """
+        Compliance fraction of every room for every threshold band.
+
+        Args:
+            parameter: Parameter to sweep
+            lower: Lower band limits (scalar or array; None is open)
+            upper: Upper band limits, broadcast against ``lower``
+            occupied: Occupancy cell filter (None: all samples)
+            in_season: Season cell filter (None: all samples)
+
+        Returns:
+            ThresholdSweep with one row per room
+        """
+        low, high = _bounds(lower, upper)
+        low, high = np.atleast_1d(low).ravel(), np.atleast_1d(high).ravel()
+        members = [s for (_, name), s in self.sketches.items() if name == parameter]
+
+        fractions = np.full((len(members), low.size), np.nan)
+        samples = np.zeros(len(members), dtype=np.int64)
+        for row, member in enumerate(members):
+            sketch = member.sketch(occupied, in_season)
+            samples[row] = sketch.count
+            if sketch.count:
+                fractions[row] = sketch.count_between(low, high) / sketch.count
+
+        return ThresholdSweep(
+            parameter=parameter,
+            entity_ids=[s.entity_id for s in members],
+            lower=low,
+            upper=high,
+            fractions=fractions,
+            samples=samples,
+        )
+
+    def sweep_grid(
+        self,
+        parameter: str,
+        lower_values: Sequence[float],
+        upper_values: Sequence[float],
+        **kwargs: Any,
+    ) -> ThresholdSweep:
+        """Sweep every (lower, upper) combination of two threshold lists."""
+        low, high = np.meshgrid(np.asarray(lower_values, dtype=float), np.asarray(upper_values, dtype=float), indexing="ij")
+        return self.sweep(parameter, low.ravel(), high.ravel(), **kwargs)
+
+
+def build_compliance_sketch(
+    entity_id: str,
+    parameter: str,
+    values: Sequence[float],
+    index: Optional[pd.DatetimeIndex] = None,
+    occupancy_mask: Union[pd.Series, np.ndarray, FilterPlan, None] = None,
+    season: Optional[str] = "heating",
+    step_hours: Optional[float] = None,
+    resolution: Optional[float] = None,
+) -> ComplianceSketch:
+    """
+    Build a ComplianceSketch, deriving the cell masks from a timestamp index.
+
+    Args:
+        entity_id: Room (or other entity) ID
+        parameter: Parameter name
+        values: Samples aligned with ``index``
+        index: Timestamps of the samples (without one, all samples are occupied and in season)
+        occupancy_mask: Boolean mask/Series aligned with ``index`` or a FilterPlan
+        season: Season or country period for the in-season cell (None: all year)
+        step_hours: Sampling step, to convert counts to hours
+        resolution: Optional rounding step of the value sketches
+    """
+    occupied = None
+    in_season = None
+    if isinstance(index, pd.DatetimeIndex) and len(index) == len(values):
+        if isinstance(occupancy_mask, FilterPlan):
+            occupied = occupancy_mask.mask(index)
+        elif occupancy_mask is not None:
+            occupied = np.asarray(occupancy_mask, dtype=bool)
+        if season:
+            in_season = FilterPlan.for_season(season).mask(index)
+    elif occupancy_mask is not None and not isinstance(occupancy_mask, FilterPlan):
+        occupied = np.asarray(occupancy_mask, dtype=bool)
+
+    return ComplianceSketch.from_series(
+        entity_id,
+        parameter,
+        values,
+        occupied=occupied,
+        in_season=in_season,
+        season=season,
+        step_hours=step_hours,
+        resolution=resolution,
+    )
+
+
+__all__ = [
+    "ValueSketch",
+    "ComplianceSketch",
+    "ThresholdSweep",
+    "PortfolioComplianceSketches",
+    "build_compliance_sketch",
+]
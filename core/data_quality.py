@@ -0,0 +1,172 @@
+"""
+Timestamp Data-Quality Profiles
+
+A ``DataQualityProfile`` summarises the timestamps of a series once, at
+ingest: dominant sampling step, gaps, duplicates, out-of-order samples,
+coverage and monotonicity. Loaders store it with the series and analyses
+read the step from it instead of diffing the index again.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+
+# A step longer than this multiple of the dominant step is a gap
+GAP_FACTOR = 1.5
+
+_PROFILE_CACHE_SIZE = 256
+_PROFILE_CACHE: "OrderedDict[Tuple[Any, ...], DataQualityProfile]" = OrderedDict()
+
+
+def _to_index(timestamps: Union[pd.DatetimeIndex, Sequence[Any]]) -> pd.DatetimeIndex:
+    if isinstance(timestamps, pd.DatetimeIndex):
+        return timestamps
+    return pd.DatetimeIndex(pd.to_datetime(list(timestamps), errors="coerce"))
+
+
+class DataQualityProfile(BaseModel):
+    """
+    Sampling characteristics of a series' timestamps.
+
+    Steps are measured between consecutive distinct timestamps in time
+    order; the dominant step is the most frequent one (the smallest on ties).
+    """
+
+    sample_count: int = 0
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    dominant_step_seconds: Optional[float] = None
+    median_step_seconds: Optional[float] = None
+
+    gaps: List[Tuple[datetime, datetime]] = Field(
+        default_factory=list,
+        description="(last sample before, first sample after) for steps longer than GAP_FACTOR x the dominant step",
+    )
+    duplicate_count: int = 0
+    out_of_order_count: int = 0
+    invalid_count: int = 0
+    coverage_pct: float = Field(default=0.0, ge=0, le=100)
+    is_monotonic: bool = True
+
+    @property
+    def gap_count(self) -> int:
+        return len(self.gaps)
+
+    @property
+    def resolution_seconds(self) -> Optional[int]:
+        """Dominant step in whole seconds (None when it cannot be determined)."""
+        return int(self.dominant_step_seconds) if self.dominant_step_seconds is not None else None
+
+    @property
+    def step_hours(self) -> Optional[float]:
+        """Dominant step in hours."""
+        return self.dominant_step_seconds / 3600.0 if self.dominant_step_seconds is not None else None
+
+    @classmethod
+    def from_timestamps(
+        cls,
+        timestamps: Union[pd.DatetimeIndex, Sequence[Any]],
+        gap_factor: float = GAP_FACTOR,
+    ) -> "DataQualityProfile":
+        """
+        Profile a set of timestamps in one pass over their integer values.
+
+        Args:
+            timestamps: DatetimeIndex or sequence of datetimes/strings
+            gap_factor: Multiple of the dominant step above which a step is a gap
+
+        Returns:
+            DataQualityProfile
+        """
+        index = _to_index(timestamps)
+        invalid = int(index.isna().sum())
+        if invalid:
+            index = index[~index.isna()]
+
+        size = len(index)
+        if size == 0:
+            return cls(invalid_count=invalid)
+
+        stamps = index.as_unit("ns").asi8
+        steps = np.diff(stamps)
+        out_of_order = int(np.count_nonzero(steps < 0))
+        if out_of_order:
+            stamps = np.sort(stamps)
+            steps = np.diff(stamps)
+
+        positive = steps[steps > 0]
+        duplicates = int(steps.size - positive.size)
+        bounds = index[[int(np.argmin(index.asi8)), int(np.argmax(index.asi8))]]
+
+        profile = cls(
+            sample_count=size,
+            start=bounds[0].to_pydatetime(),
+            end=bounds[1].to_pydatetime(),
+            duplicate_count=duplicates,
+            out_of_order_count=out_of_order,
+            invalid_count=invalid,
+            is_monotonic=out_of_order == 0,
+            coverage_pct=100.0 if size - duplicates == 1 else 0.0,
+        )
+        if positive.size == 0:
+            return profile
+
+        values, counts = np.unique(positive, return_counts=True)
+        dominant = int(values[int(np.argmax(counts))])
+        profile.dominant_step_seconds = dominant / 1e9
+        profile.median_step_seconds = float(np.median(positive)) / 1e9
+
+        expected = (int(stamps[-1]) - int(stamps[0])) // dominant + 1
+        profile.coverage_pct = float(min(100.0, 100.0 * (size - duplicates) / expected))
+
+        gap_at = np.flatnonzero(steps > gap_factor * dominant)
+        if gap_at.size:
+            edges = pd.DatetimeIndex(stamps[np.concatenate([gap_at, gap_at + 1])].astype("datetime64[ns]"))
+            if index.tz is not None:
+                edges = edges.tz_localize("UTC").tz_convert(index.tz)
+            edges = edges.to_pydatetime()
+            profile.gaps = list(zip(edges[: gap_at.size], edges[gap_at.size:]))
+        return profile
+
+
+def get_quality_profile(timestamps: Union[pd.DatetimeIndex, Sequence[Any]]) -> DataQualityProfile:
+    """
+    Profile of a timestamp index, cached per index fingerprint.
+
+    For series that do not carry a profile from ingest; repeated calls on
+    the same index return the cached profile.
+    """
+    from .filters.filter_plan import index_fingerprint
+
+    index = _to_index(timestamps)
+    key = index_fingerprint(index)
+    cached = _PROFILE_CACHE.get(key)
+    if cached is not None:
+        _PROFILE_CACHE.move_to_end(key)
+        return cached
+    profile = DataQualityProfile.from_timestamps(index)
+    _PROFILE_CACHE[key] = profile
+    if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+        _PROFILE_CACHE.popitem(last=False)
+    return profile
+
+
+def clear_profile_cache() -> None:
+    """Drop all cached profiles."""
+    _PROFILE_CACHE.clear()
+
+
+__all__ = [
+    "DataQualityProfile",
+    "GAP_FACTOR",
+    "get_quality_profile",
+    "clear_profile_cache",
+]
@@ -7,9 +7,11 @@ and helper methods to convert between delivered, fuel, and primary energy.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from .enums import EnergyCarrier, FuelUnit, PrimaryEnergyScope
@@ -74,6 +76,56 @@ class PrimaryEnergyBreakdown(BaseModel):
     components: List[PrimaryEnergyComponent] = Field(default_factory=list)
 
 
+@dataclass
+class PrimaryFactorTable:
+    """
+    Primary energy factors compiled once for a set of (country, carrier) pairs.
+
+    Each scope is an array aligned with ``keys``; the fallback chain of
+    ``EnergyConversionService.get_primary_factor`` has already been applied.
+    """
+
+    keys: List[Tuple[str, EnergyCarrier]]
+    total: np.ndarray
+    non_renewable: np.ndarray
+    renewable: np.ndarray
+
+    def __post_init__(self) -> None:
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+
+    def row(self, country_code: str, carrier: EnergyCarrier) -> Optional[int]:
+        """Row index of a (country, carrier) pair, or None when not compiled."""
+        return self._rows.get((country_code.upper(), carrier))
+
+    def rows(
+        self,
+        country_codes: Sequence[str],
+        carriers: Sequence[EnergyCarrier],
+    ) -> np.ndarray:
+        """Row index in the table for each (country, carrier) pair."""
+        return np.array(
+            [self._rows[(country.upper(), carrier)] for country, carrier in zip(country_codes, carriers)],
+            dtype=np.intp,
+        )
+
+
+@dataclass
+class PrimaryEnergyArrays:
+    """Primary energy for many meters, each array shaped like the delivered input (M, T)."""
+
+    total: np.ndarray
+    renewable: np.ndarray
+    non_renewable: np.ndarray
+
+    def totals(self) -> Dict[str, np.ndarray]:
+        """Per-meter sums over time."""
+        return {
+            "total_primary_kwh": self.total.sum(axis=-1),
+            "renewable_primary_kwh": self.renewable.sum(axis=-1),
+            "non_renewable_primary_kwh": self.non_renewable.sum(axis=-1),
+        }
+
+
 def _build_fuel_index(properties: Iterable[FuelProperty]) -> Dict[Tuple[EnergyCarrier, FuelUnit], FuelProperty]:
     return {
         (prop.carrier, prop.unit): prop
@@ -315,6 +367,119 @@ class EnergyConversionService:
                 return fallback_total.factor
         return default
 
+    def _breakdown_factors(self, country_code: str, carrier: EnergyCarrier) -> Tuple[float, float, float]:
+        """
+        (total, non-renewable, renewable) factors as used in primary breakdowns.
+
+        A renewable factor that resolves to zero is derived as total minus
+        non-renewable.
+        """
+        total = self.get_primary_factor(country_code, carrier, PrimaryEnergyScope.TOTAL)
+        non_renewable = self.get_primary_factor(country_code, carrier, PrimaryEnergyScope.NON_RENEWABLE)
+        renewable = self.get_primary_factor(country_code, carrier, PrimaryEnergyScope.RENEWABLE)
+        if renewable == 0 and total > non_renewable:
+            renewable = max(0.0, total - non_renewable)
+        return total, non_renewable, renewable
+
+    def compile_primary_factors(
+        self,
+        pairs: Iterable[Tuple[str, EnergyCarrier]],
+    ) -> PrimaryFactorTable:
+        """
+        Resolve factors for each distinct (country, carrier) pair once.
+
+        Args:
+            pairs: (country code, carrier) pairs; duplicates are ignored
+
+        Returns:
+            PrimaryFactorTable with one row per distinct pair
+        """
+        keys = list(dict.fromkeys((country.upper(), carrier) for country, carrier in pairs))
+        factors = np.array(
+            [self._breakdown_factors(country, carrier) for country, carrier in keys],
+            dtype=float,
+        ).reshape(len(keys), 3)
+        return PrimaryFactorTable(
+            keys=keys,
+            total=factors[:, 0],
+            non_renewable=factors[:, 1],
+            renewable=factors[:, 2],
+        )
+
+    def convert_arrays_to_primary(
+        self,
+        delivered_kwh: np.ndarray,
+        carriers: Sequence[Union[EnergyCarrier, str]],
+        country_codes: Union[str, Sequence[str]],
+        time_varying_factors: Optional[
+            Mapping[Tuple[str, EnergyCarrier], Union[np.ndarray, Mapping[PrimaryEnergyScope, np.ndarray]]]
+        ] = None,
+        table: Optional[PrimaryFactorTable] = None,
+    ) -> PrimaryEnergyArrays:
+        """
+        Convert delivered energy time series for many meters in one step.
+
+        Static factors are looked up once per (country, carrier) and applied
+        row-wise. Time-varying factors (e.g. hourly grid electricity factors)
+        replace them for the matching meters; when only a TOTAL series is
+        given, the non-renewable and renewable series keep the static
+        proportions of that pair.
+
+        Args:
+            delivered_kwh: Delivered kWh per meter and step, shape (M, T) or (M,)
+            carriers: Energy carrier of each meter (M,)
+            country_codes: One country code for all meters, or one per meter
+            time_varying_factors: Mapping of (country, carrier) to a TOTAL
+                factor series (T,) or to {scope: series (T,)}
+            table: Precompiled factor table (compiled on the fly when None)
+
+        Returns:
+            PrimaryEnergyArrays with total, renewable and non-renewable arrays
+        """
+        delivered = np.asarray(delivered_kwh, dtype=float)
+        carriers = [EnergyCarrier(carrier) for carrier in carriers]
+        if isinstance(country_codes, str):
+            countries = [country_codes] * len(carriers)
+        else:
+            countries = list(country_codes)
+        if len(carriers) != delivered.shape[0] or len(countries) != delivered.shape[0]:
+            raise ValueError("carriers and country_codes must have one entry per meter")
+
+        if table is None:
+            table = self.compile_primary_factors(zip(countries, carriers))
+        rows = table.rows(countries, carriers)
+
+        expand = (slice(None),) + (None,) * (delivered.ndim - 1)
+        total = delivered * table.total[rows][expand]
+        non_renewable = delivered * table.non_renewable[rows][expand]
+        renewable = delivered * table.renewable[rows][expand]
+
+        for (country, carrier), series in (time_varying_factors or {}).items():
+            row = table.row(country, EnergyCarrier(carrier))
+            meters = np.flatnonzero(rows == row) if row is not None else []
+            if len(meters) == 0:
+                continue
+            if not isinstance(series, Mapping):
+                series = {PrimaryEnergyScope.TOTAL: series}
+            total_series = np.asarray(
+                series.get(PrimaryEnergyScope.TOTAL, table.total[row]), dtype=float
+            )
+            # Scopes missing from the series keep the static proportion of the total
+            static_total = table.total[row]
+            scale = total_series / static_total if static_total else np.zeros_like(total_series)
+            nr_series = np.asarray(
+                series.get(PrimaryEnergyScope.NON_RENEWABLE, table.non_renewable[row] * scale), dtype=float
+            )
+            r_series = np.asarray(
+                series.get(PrimaryEnergyScope.RENEWABLE, table.renewable[row] * scale), dtype=float
+            )
+            block = delivered[meters]
+            total[meters] = block * total_series
+            non_renewable[meters] = block * nr_series
+            renewable[meters] = block * r_series
+
+        return PrimaryEnergyArrays(total=total, renewable=renewable, non_renewable=non_renewable)
+
     def convert_to_primary(
         self,
         country_code: str,
@@ -356,18 +521,15 @@ class EnergyConversionService:
         renewable_primary = 0.0
         non_renewable_primary = 0.0
 
+        factors: Dict[EnergyCarrier, Tuple[float, float, float]] = {}
         for use in energy_uses:
-            total = self.convert_to_primary(country_code, use.carrier, use.delivered_kwh, scope=PrimaryEnergyScope.TOTAL)
-            non_renewable = self.convert_to_primary(
-                country_code, use.carrier, use.delivered_kwh, scope=PrimaryEnergyScope.NON_RENEWABLE
-            )
-            renewable = self.convert_to_primary(
-                country_code, use.carrier, use.delivered_kwh, scope=PrimaryEnergyScope.RENEWABLE
-            )
+            if use.carrier not in factors:
+                factors[use.carrier] = self._breakdown_factors(country_code, use.carrier)
+            total_factor, non_renewable_factor, renewable_factor = factors[use.carrier]
+            total = use.delivered_kwh * total_factor
+            non_renewable = use.delivered_kwh * non_renewable_factor
+            renewable = use.delivered_kwh * renewable_factor
             total_primary += total
-            # If explicit renewable factor not available, derive as difference
-            if renewable == 0 and total > non_renewable:
-                renewable = max(0.0, total - non_renewable)
             renewable_primary += renewable
             non_renewable_primary += non_renewable
             components.append(
@@ -442,6 +604,8 @@ __all__ = [
     "EnergyUse",
     "PrimaryEnergyComponent",
     "PrimaryEnergyBreakdown",
+    "PrimaryFactorTable",
+    "PrimaryEnergyArrays",
     "EnergyConversionService",
     "DEFAULT_FUEL_PROPERTIES",
     "DEFAULT_PRIMARY_ENERGY_FACTORS",
@@ -6,10 +6,13 @@ Provides data structures for tracking energy prices with period and currency sup
 
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import Dict, List, Optional, Any
+import heapq
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Mapping, Tuple, Union
 
-from pydantic import BaseModel, Field
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .enums import EnergyCarrier
 
@@ -84,24 +87,254 @@ class YearlyEnergyPrice(EnergyPrice):
     year: int
 
 
+# Priority: hourly > daily > monthly > yearly
+PERIOD_PRIORITY = {"hourly": 4, "daily": 3, "monthly": 2, "yearly": 1}
+
+_OPEN_END = np.iinfo(np.int64).max
+
+
+def _day_start_ns(value: date) -> int:
+    return pd.Timestamp(value.year, value.month, value.day).value
+
+
+def _flatten_intervals(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    values: np.ndarray,
+    refs: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn possibly overlapping intervals into sorted, disjoint segments.
+
+    Where intervals overlap, the one that starts latest wins (a newer
+    tariff supersedes an older one until it expires).
+    """
+    order = np.lexsort((np.arange(starts.size), starts))
+    starts, ends, values, refs = starts[order], ends[order], values[order], refs[order]
+    if starts.size < 2 or np.all(ends[:-1] <= starts[1:]):
+        return starts, ends, values, refs
+
+    boundaries = np.unique(np.concatenate([starts, ends[ends != _OPEN_END]]))
+    seg_starts, seg_ends, seg_values, seg_refs = [], [], [], []
+    active: List[Tuple[int, int]] = []  # max-heap on (start, insertion order)
+    cursor = 0
+    for position, left in enumerate(boundaries):
+        while cursor < starts.size and starts[cursor] <= left:
+            heapq.heappush(active, (-int(starts[cursor]), -cursor))
+            cursor += 1
+        while active and ends[-active[0][1]] <= left:
+            heapq.heappop(active)
+        if not active:
+            continue
+        winner = -active[0][1]
+        right = boundaries[position + 1] if position + 1 < boundaries.size else _OPEN_END
+        right = min(right, ends[winner])
+        if seg_ends and seg_refs[-1] == refs[winner] and seg_values[-1] == values[winner] and seg_ends[-1] == left:
+            seg_ends[-1] = right
+        else:
+            seg_starts.append(left)
+            seg_ends.append(right)
+            seg_values.append(values[winner])
+            seg_refs.append(refs[winner])
+    return (
+        np.asarray(seg_starts, dtype=np.int64),
+        np.asarray(seg_ends, dtype=np.int64),
+        np.asarray(seg_values, dtype=float),
+        np.asarray(seg_refs, dtype=np.int64),
+    )
+
+
+class _PriceLevel:
+    """Disjoint price intervals for one period granularity."""
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, values: np.ndarray, refs: np.ndarray):
+        self.starts, self.ends, self.values, self.refs = _flatten_intervals(starts, ends, values, refs)
+        self.latest_start = int(starts.max()) if starts.size else np.iinfo(np.int64).min
+
+    def push(self, start: int, end: int, value: float, ref: int) -> bool:
+        """
+        Add an interval that starts after every indexed one.
+
+        Such an interval wins wherever it overlaps, so only ``[start, end)``
+        changes. Returns False (nothing changed) otherwise; the level then
+        needs a rebuild.
+        """
+        if start <= self.latest_start:
+            return False
+        before = self.starts < start
+        after = self.ends > end
+        self.starts = np.concatenate([self.starts[before], [start], np.maximum(self.starts[after], end)])
+        self.ends = np.concatenate([np.minimum(self.ends[before], start), [end], self.ends[after]])
+        self.values = np.concatenate([self.values[before], [value], self.values[after]])
+        self.refs = np.concatenate([self.refs[before], [ref], self.refs[after]]).astype(np.int64)
+        self.latest_start = start
+        return True
+
+    def lookup(self, timestamps_ns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Price and source reference per timestamp (NaN / -1 where uncovered)."""
+        position = np.searchsorted(self.starts, timestamps_ns, side="right") - 1
+        clipped = np.maximum(position, 0)
+        covered = (position >= 0) & (timestamps_ns < self.ends[clipped])
+        values = np.where(covered, self.values[clipped], np.nan)
+        refs = np.where(covered, self.refs[clipped], -1)
+        return values, refs
+
+
 class EnergyPriceRegistry(BaseModel):
     """
     Registry of energy prices for different carriers and periods.
+
+    Lookups go through an interval index per (carrier, currency), built on
+    first use and kept up to date by ``add_price``. Replacing, extending or
+    shortening ``prices`` directly is detected and rebuilds the index; after
+    editing a listed price in place, call ``reindex()``. Where tariffs of
+    different periods overlap the most specific wins (hourly > daily >
+    monthly > yearly); within a period the most recent tariff wins.
+    Bulk series (e.g. hourly spot prices) can be registered as arrays with
+    ``add_price_series``; they take part in lookups but are not stored in
+    ``prices``.
     """
     prices: List[EnergyPrice] = Field(default_factory=list)
 
+    _positions: Dict[tuple, int] = PrivateAttr(default_factory=dict)
+    _series: Dict[tuple, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = PrivateAttr(default_factory=dict)
+    _index: Dict[tuple, Dict[str, _PriceLevel]] = PrivateAttr(default_factory=dict)
+    _indexed: Optional[Tuple[int, int]] = PrivateAttr(default=None)  # (id, len) of the indexed list
+
+    @staticmethod
+    def _price_key(price: EnergyPrice) -> tuple:
+        return (price.carrier, price.valid_from, price.currency)
+
+    @staticmethod
+    def _interval(price: EnergyPrice) -> Tuple[int, int]:
+        end = _day_start_ns(price.valid_to + timedelta(days=1)) if price.valid_to is not None else _OPEN_END
+        return _day_start_ns(price.valid_from), end
+
+    def reindex(self) -> None:
+        """Rebuild the key map and drop the interval index (e.g. after editing listed prices in place)."""
+        self._positions = {self._price_key(p): i for i, p in enumerate(self.prices)}
+        self._index.clear()
+        self._indexed = (id(self.prices), len(self.prices))
+
+    def _sync(self) -> None:
+        """Reindex if ``prices`` was replaced, extended or shortened outside ``add_price``."""
+        if self._indexed != (id(self.prices), len(self.prices)):
+            self.reindex()
+
     def add_price(self, price: EnergyPrice) -> None:
-        """Add or update an energy price."""
-        # Remove existing price for same carrier and period if it exists
-        self.prices = [
-            p for p in self.prices
-            if not (
-                p.carrier == price.carrier
-                and p.valid_from == price.valid_from
-                and p.currency == price.currency
-            )
-        ]
+        """Add or update an energy price (same carrier, start date and currency)."""
+        self._sync()
+        key = self._price_key(price)
+        position = self._positions.get(key)
+        index_key = (price.carrier, price.currency)
+        if position is not None:
+            previous = self.prices[position]
+            self.prices[position] = price
+            self._index.pop(index_key, None)
+            self._index.pop((previous.carrier, previous.currency), None)
+            return
+
+        position = self._positions[key] = len(self.prices)
         self.prices.append(price)
+        self._indexed = (id(self.prices), len(self.prices))
+        levels = self._index.get(index_key)
+        if levels is None:
+            return
+        start, end = self._interval(price)
+        level = levels.get(price.period)
+        if level is None:
+            levels[price.period] = _PriceLevel(
+                np.array([start]), np.array([end]), np.array([price.total_price_per_kwh]), np.array([position])
+            )
+        elif not level.push(start, end, price.total_price_per_kwh, position):
+            del self._index[index_key]
+
+    def add_price_series(
+        self,
+        carrier: EnergyCarrier,
+        prices: pd.Series,
+        currency: str = "EUR",
+        period: str = "hourly",
+    ) -> None:
+        """
+        Register a price series without creating EnergyPrice objects.
+
+        Each value applies from its timestamp for one ``period`` (hourly,
+        daily, monthly or yearly), which suits spot-price tariffs with
+        thousands of points per year.
+
+        Args:
+            carrier: Energy carrier
+            prices: Total price per kWh indexed by period start
+            currency: Currency code
+            period: Granularity of each price point
+        """
+        if period not in PERIOD_PRIORITY:
+            raise ValueError(f"Unknown pricing period: {period}")
+        index = pd.DatetimeIndex(prices.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        offsets = {
+            "hourly": pd.Timedelta(hours=1),
+            "daily": pd.Timedelta(days=1),
+            "monthly": pd.offsets.MonthBegin(1),
+            "yearly": pd.offsets.YearBegin(1),
+        }
+        starts = index.as_unit("ns").asi8
+        ends = (index + offsets[period]).as_unit("ns").asi8
+        values = prices.to_numpy(dtype=float)
+        self._series.setdefault((carrier, currency, period), []).append((starts, ends, values))
+        self._index.pop((carrier, currency), None)
+
+    def _levels(self, carrier: EnergyCarrier, currency: str) -> Dict[str, _PriceLevel]:
+        """Interval index for one (carrier, currency), built lazily."""
+        self._sync()
+        key = (carrier, currency)
+        if key in self._index:
+            return self._index[key]
+
+        collected: Dict[str, List[tuple]] = {}
+        for i, p in enumerate(self.prices):
+            if p.carrier != carrier or p.currency != currency:
+                continue
+            start, end = self._interval(p)
+            collected.setdefault(p.period, []).append(
+                (np.array([start]), np.array([end]), np.array([p.total_price_per_kwh]), i)
+            )
+        for (series_carrier, series_currency, period), parts in self._series.items():
+            if series_carrier == carrier and series_currency == currency:
+                for starts, ends, values in parts:
+                    collected.setdefault(period, []).append((starts, ends, values, -1))
+
+        levels = {}
+        for period, parts in collected.items():
+            levels[period] = _PriceLevel(
+                np.concatenate([part[0] for part in parts]).astype(np.int64),
+                np.concatenate([part[1] for part in parts]).astype(np.int64),
+                np.concatenate([part[2] for part in parts]).astype(float),
+                np.concatenate([np.full(part[0].size, part[3]) for part in parts]).astype(np.int64),
+            )
+        self._index[key] = levels
+        return levels
+
+    def _resolve(
+        self,
+        carrier: EnergyCarrier,
+        timestamps_ns: np.ndarray,
+        currency: str,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Price, source reference and period priority for each timestamp."""
+        prices = np.full(timestamps_ns.size, np.nan)
+        refs = np.full(timestamps_ns.size, -1, dtype=np.int64)
+        priority = np.zeros(timestamps_ns.size, dtype=np.int8)
+        levels = self._levels(carrier, currency)
+        for period in sorted(levels, key=lambda name: PERIOD_PRIORITY.get(name, 0)):
+            values, level_refs = levels[period].lookup(timestamps_ns)
+            covered = ~np.isnan(values)
+            prices[covered] = values[covered]
+            refs[covered] = level_refs[covered]
+            priority[covered] = PERIOD_PRIORITY.get(period, 0)
+        return prices, refs, priority
 
     def get_price(
         self,
@@ -118,27 +351,95 @@ class EnergyPriceRegistry(BaseModel):
             currency: Currency code
 
         Returns:
-            Applicable EnergyPrice or None if not found
-        """
-        applicable_prices = [
-            p for p in self.prices
-            if (
-                p.carrier == carrier
-                and p.currency == currency
-                and p.valid_from <= date_
-                and (p.valid_to is None or p.valid_to >= date_)
-            )
-        ]
-
-        if not applicable_prices:
+            Applicable EnergyPrice or None if not found. When the price
+            comes from a series registered with ``add_price_series``, a
+            new EnergyPrice is returned for that date (valid_from and
+            valid_to set to ``date_``, period of the series); it is not
+            added to ``prices``.
+        """
+        prices, refs, priority = self._resolve(carrier, np.array([_day_start_ns(date_)]), currency)
+        if np.isnan(prices[0]):
             return None
+        if refs[0] >= 0:
+            return self.prices[refs[0]]
+
+        # Price comes from a registered series
+        period = next(name for name, rank in PERIOD_PRIORITY.items() if rank == priority[0])
+        return EnergyPrice(
+            carrier=carrier,
+            price_per_kwh=float(prices[0]),
+            currency=currency,
+            valid_from=date_,
+            valid_to=date_,
+            period=period,
+        )
+
+    def price_series(
+        self,
+        carrier: EnergyCarrier,
+        index: pd.DatetimeIndex,
+        currency: str = "EUR",
+    ) -> np.ndarray:
+        """
+        Total price per kWh applicable at each timestamp (NaN where unpriced).
+
+        Timezone-aware indexes are priced on their local wall-clock time.
+        """
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return self._resolve(carrier, index.as_unit("ns").asi8, currency)[0]
+
+    def calculate_costs(
+        self,
+        consumption_kwh: Union[pd.DataFrame, pd.Series],
+        carriers: Union[EnergyCarrier, Mapping[str, EnergyCarrier]],
+        currency: str = "EUR",
+    ) -> "EnergyCostSummary":
+        """
+        Price interval consumption for many meters against all applicable tariffs.
+
+        Prices are resolved once per carrier on the shared timestamp index
+        and applied to every meter column in one vectorized step.
+
+        Args:
+            consumption_kwh: kWh per interval; one column per meter (or a
+                single Series) on a DatetimeIndex
+            carriers: Carrier for all meters, or per meter column
+            currency: Currency code
 
-        # Return the most specific period price
-        # Priority: hourly > daily > monthly > yearly
-        period_priority = {"hourly": 4, "daily": 3, "monthly": 2, "yearly": 1}
-        return max(
-            applicable_prices,
-            key=lambda p: period_priority.get(p.period, 0)
+        Returns:
+            EnergyCostSummary with costs by carrier and by meter
+        """
+        frame = consumption_kwh.to_frame() if isinstance(consumption_kwh, pd.Series) else consumption_kwh
+        columns = [str(column) for column in frame.columns]
+        if isinstance(carriers, Mapping):
+            meter_carriers = [carriers[column] for column in columns]
+        else:
+            meter_carriers = [carriers] * len(columns)
+
+        values = np.nan_to_num(frame.to_numpy(dtype=float))  # (T, M)
+        codes, unique_carriers = pd.factorize(pd.Series(meter_carriers, dtype=object))
+
+        # One price column per carrier; unpriced intervals get weight 0
+        prices = np.column_stack([
+            self.price_series(carrier, frame.index, currency) for carrier in unique_carriers
+        ])
+        priced = ~np.isnan(prices)
+        meters = np.arange(len(columns))
+        costs = (values.T @ np.where(priced, prices, 0.0))[meters, codes]
+        priced_kwh = (values.T @ priced.astype(float))[meters, codes]
+
+        index = pd.DatetimeIndex(frame.index)
+        return EnergyCostSummary.from_arrays(
+            period_start=index.min().date(),
+            period_end=index.max().date(),
+            meter_ids=columns,
+            carriers=meter_carriers,
+            consumption_kwh=priced_kwh,
+            costs=costs,
+            unpriced_consumption_kwh=float(values.sum() - priced_kwh.sum()),
+            currency=currency,
         )
 
     def calculate_energy_cost(
@@ -168,6 +469,26 @@ class EnergyPriceRegistry(BaseModel):
 
         return kwh * price.total_price_per_kwh
 
+    def calculate_energy_cost_series(
+        self,
+        carrier: EnergyCarrier,
+        consumption_kwh: pd.Series,
+        currency: str = "EUR",
+    ) -> pd.Series:
+        """
+        Cost of each consumption interval (NaN where no price applies).
+
+        Args:
+            carrier: Energy carrier
+            consumption_kwh: kWh per interval on a DatetimeIndex
+            currency: Currency code
+
+        Returns:
+            Cost series aligned with ``consumption_kwh``
+        """
+        price = self.price_series(carrier, consumption_kwh.index, currency)
+        return pd.Series(consumption_kwh.to_numpy(dtype=float) * price, index=consumption_kwh.index)
+
 
 class EnergyCostSummary(BaseModel):
     """
@@ -185,6 +506,55 @@ class EnergyCostSummary(BaseModel):
 
     average_price_per_kwh: Optional[float] = None
 
+    costs_by_meter: Dict[str, float] = Field(default_factory=dict)
+    unpriced_consumption_kwh: float = 0.0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        period_start: date,
+        period_end: date,
+        meter_ids: List[str],
+        carriers: List[EnergyCarrier],
+        consumption_kwh: np.ndarray,
+        costs: np.ndarray,
+        unpriced_consumption_kwh: float = 0.0,
+        currency: str = "EUR",
+    ) -> "EnergyCostSummary":
+        """
+        Build a summary from per-meter priced consumption and cost arrays (M,).
+
+        Args:
+            period_start: First day covered
+            period_end: Last day covered
+            meter_ids: Meter identifiers
+            carriers: Carrier of each meter
+            consumption_kwh: Priced consumption per meter
+            costs: Cost per meter
+            unpriced_consumption_kwh: Consumption without an applicable price
+            currency: Currency code
+        """
+        consumption = np.asarray(consumption_kwh, dtype=float)
+        costs = np.asarray(costs, dtype=float)
+        summary = cls(
+            period_start=period_start,
+            period_end=period_end,
+            currency=currency,
+            costs_by_meter={meter: float(cost) for meter, cost in zip(meter_ids, costs)},
+            unpriced_consumption_kwh=float(unpriced_consumption_kwh),
+        )
+        codes, carrier_keys = pd.factorize(pd.Series([c.value for c in carriers], dtype=object))
+        carrier_costs = np.bincount(codes, weights=costs, minlength=len(carrier_keys))
+        carrier_consumption = np.bincount(codes, weights=consumption, minlength=len(carrier_keys))
+        for key, cost, kwh in zip(carrier_keys, carrier_costs, carrier_consumption):
+            summary.costs_by_carrier[key] = float(cost)
+            summary.consumption_by_carrier[key] = float(kwh)
+        summary.total_cost = float(carrier_costs.sum())
+        summary.total_consumption_kwh = float(carrier_consumption.sum())
+        if summary.total_consumption_kwh > 0:
+            summary.average_price_per_kwh = summary.total_cost / summary.total_consumption_kwh
+        return summary
+
     def add_carrier_cost(
         self,
         carrier: EnergyCarrier,
@@ -209,6 +579,7 @@ __all__ = [
     "EnergyPrice",
     "MonthlyEnergyPrice",
     "YearlyEnergyPrice",
+    "PERIOD_PRIORITY",
     "EnergyPriceRegistry",
     "EnergyCostSummary",
 ]
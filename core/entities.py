@@ -6,15 +6,21 @@ with domain-specific methods, aggregation capabilities, and self-analysis.
 """
 
 from __future__ import annotations
+import math
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
-from pydantic import Field
+from typing import Any, Dict, List, Optional, Callable, Tuple, Union
+from pydantic import Field, PrivateAttr
 
 from .spacial_entity import SpatialEntity
 from .energy import EnergyConversionService, EnergyUse
-from .enums import SpatialEntityType, VentilationType, EnergyCarrier
+from .enums import SpatialEntityType, VentilationType, EnergyCarrier, MetricType, TimeResolution, AggregationMethod
 from .metering import EnergyMeter, AggregatedEnergyData
-from simulations.models.real_epc import calculate_epc_rating
+from .data_quality import DataQualityProfile
+from .series_codec import DEFAULT_BLOCK_SIZE, CompressedSeries
+from .rollup_pyramid import RollupPyramid
+from .meter_ingestion import MeterReadingBatch, ingest_meter_readings
+from simulations.models.real_epc import calculate_epc_rating, calculate_epc_ratings
+from simulations.models.energy_signature import fit_energy_signature, fit_portfolio_signatures
 
 
 # ============================================================
@@ -560,6 +566,43 @@ class Building(SpatialEntity):
 
         return total_primary / self.area_m2 if self.area_m2 else None
 
+    def calculate_primary_energy_from_readings(
+        self,
+        readings: MeterReadingBatch,
+        year: Optional[int] = None,
+        country_code: Optional[str] = None,
+        conversion_service: Optional[EnergyConversionService] = None,
+    ) -> Optional[float]:
+        """
+        Calculate primary energy per m² directly from raw meter readings.
+
+        Readings of this building's energy meters are converted to intervals,
+        rolled up in one pass and passed on as yearly AggregatedEnergyData.
+
+        Args:
+            readings: Bulk readings (cumulative, interval or instantaneous)
+            year: Calendar year to evaluate (latest year with data if None)
+            country_code: Country code for primary energy factors
+            conversion_service: Energy conversion service (uses default if None)
+
+        Returns:
+            Primary energy consumption per m² for that year (kWh/m²/year) or None
+        """
+        meters = {meter.id: meter for meter in self.energy_meters}
+        rollups = ingest_meter_readings(readings, meters=meters)
+        years = rollups.years()
+        if not years:
+            return None
+        target_year = year if year is not None else years[-1]
+
+        aggregated = rollups.to_aggregated_energy_data(meters, year=target_year, include_profiles=False)
+        self.computed_metrics["meter_rollup_year"] = target_year
+        return self.calculate_primary_energy_from_meters(
+            aggregated,
+            country_code=country_code,
+            conversion_service=conversion_service,
+        )
+
     def add_energy_meter(self, meter: EnergyMeter) -> None:
         """Add an energy meter to this building."""
         # Remove existing meter with same ID if exists
@@ -681,6 +724,115 @@ class Building(SpatialEntity):
 
         return self.epc_rating
 
+    @classmethod
+    def calculate_epc_for_buildings(
+        cls,
+        buildings: List["Building"],
+        primary_energy_kwh_m2: Optional[Dict[str, Optional[float]]] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Rate many buildings in one vectorized pass and update their EPC ratings.
+
+        Args:
+            buildings: Buildings to rate
+            primary_energy_kwh_m2: Primary energy intensity per building ID; when
+                omitted, the last meter-based intensity or calculate_primary_energy_per_m2
+                is used
+
+        Returns:
+            Dictionary mapping building ID to EPC rating (or None)
+        """
+        intensities = []
+        for building in buildings:
+            if primary_energy_kwh_m2 is not None:
+                value = primary_energy_kwh_m2.get(building.id)
+            else:
+                value = building.computed_metrics.get("epc_primary_energy_kwh_m2")
+                if value is None:
+                    value = building.calculate_primary_energy_per_m2()
+            intensities.append(value)
+
+        ratings = calculate_epc_ratings(
+            intensities,
+            country_codes=[building._resolve_country_code() for building in buildings],
+        )
+
+        results: Dict[str, Optional[str]] = {}
+        for building, value, rating in zip(buildings, intensities, ratings):
+            if rating is not None:
+                building.epc_rating = str(rating)
+                building.computed_metrics["epc_primary_energy_kwh_m2"] = value
+            results[building.id] = building.epc_rating if rating is not None else None
+        return results
+
+    def compute_energy_signature(
+        self,
+        energy: "pd.Series",
+        outdoor_temperature: "pd.Series",
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fit the building's change-point energy signature and cache it.
+
+        Args:
+            energy: Building energy use series (kWh), daily or finer
+            outdoor_temperature: Outdoor temperature series (°C)
+            **kwargs: Passed to fit_energy_signature (balance_points, min_heating_days)
+
+        Returns:
+            Signature parameters, or None when energy and temperature do not overlap
+        """
+        result = fit_energy_signature(energy, outdoor_temperature, **kwargs)
+        if result is None:
+            return None
+        signature = result.to_dict()
+        self._store_energy_signature(signature)
+        return signature
+
+    def _store_energy_signature(self, signature: Dict[str, Any]) -> None:
+        """Cache a signature, also under simulation_results for portfolio rollups."""
+        self.computed_metrics["energy_signature"] = signature
+        self.computed_metrics.setdefault("simulation_results", {})["energy_signature"] = signature
+
+    @classmethod
+    def compute_energy_signatures_for_buildings(
+        cls,
+        buildings: List["Building"],
+        energy: Dict[str, "pd.Series"],
+        outdoor_temperature: Union["pd.Series", Dict[str, "pd.Series"]],
+        **kwargs: Any,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fit energy signatures for many buildings in one batched pass.
+
+        Args:
+            buildings: Buildings to analyse
+            energy: Energy use series per building ID (kWh)
+            outdoor_temperature: Shared outdoor temperature series, or one per building ID
+            **kwargs: Passed to fit_portfolio_signatures (balance_points, min_heating_days)
+
+        Returns:
+            Dictionary mapping building ID to signature parameters (or None)
+        """
+        selected = {
+            building.id: energy[building.id]
+            for building in buildings
+            if building.id in energy
+        }
+        batch = fit_portfolio_signatures(selected, outdoor_temperature, **kwargs)
+        fitted = batch.results()
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for building in buildings:
+            result = fitted.get(building.id)
+            if result is None:
+                results[building.id] = None
+                continue
+            signature = result.to_dict()
+            building._store_energy_signature(signature)
+            results[building.id] = signature
+        return results
+
     def get_energy_summary(self) -> Dict[str, Any]:
         """Get summary of building energy consumption and performance."""
         summary = {
@@ -1563,6 +1715,10 @@ class Room(SpatialEntity):
         default_factory=list,
         description="Timestamps for time series data"
     )
+    quality_profile: Optional[DataQualityProfile] = Field(
+        default=None,
+        description="Data-quality profile of the timestamps, computed at ingest"
+    )
 
     # Computed metrics cache
     computed_metrics: Dict[str, Any] = Field(
@@ -1571,30 +1727,257 @@ class Room(SpatialEntity):
     )
     metrics_computed_at: Optional[datetime] = None
 
+    # Compressed copies of metric series, see compress_timeseries()
+    _compressed: Dict[str, CompressedSeries] = PrivateAttr(default_factory=dict)
+    # Rollup pyramids of metric series, see build_rollup_pyramids()
+    _pyramids: Dict[str, RollupPyramid] = PrivateAttr(default_factory=dict)
+
     @property
     def has_data(self) -> bool:
         """Check if room has time series data loaded."""
-        return len(self.timeseries_data) > 0
+        return len(self.timeseries_data) > 0 or len(self._compressed) > 0
 
     @property
     def available_metrics(self) -> List[str]:
         """Get list of available metric names in data."""
-        return list(self.timeseries_data.keys())
+        return list(dict.fromkeys([*self.timeseries_data, *self._compressed]))
 
     def add_timeseries(
         self,
         metric_name: str,
         values: List[float],
-        timestamps: Optional[List[str]] = None
+        timestamps: Optional[List[str]] = None,
+        quality_profile: Optional[DataQualityProfile] = None,
     ) -> None:
         """Add time series data for a metric."""
         self.timeseries_data[metric_name] = values
+        self._compressed.pop(metric_name, None)
+        self._pyramids.pop(metric_name, None)
         if timestamps and not self.timestamps:
             self.timestamps = timestamps
+            self.quality_profile = quality_profile or DataQualityProfile.from_timestamps(timestamps)
+
+    def get_quality_profile(self) -> Optional[DataQualityProfile]:
+        """Data-quality profile of the timestamps, profiled on first use if not set at ingest."""
+        if self.quality_profile is None and self.timestamps:
+            self.quality_profile = DataQualityProfile.from_timestamps(self.timestamps)
+        return self.quality_profile
 
     def get_timeseries(self, metric_name: str) -> Optional[List[float]]:
-        """Get time series data for a specific metric."""
-        return self.timeseries_data.get(metric_name)
+        """Get time series data for a specific metric (decoded if only held compressed)."""
+        values = self.timeseries_data.get(metric_name)
+        if values is None and metric_name in self._compressed:
+            values = self._compressed[metric_name].decode()[1].tolist()
+        return values
+
+    def get_timeseries_data(self, metrics: Optional[List[str]] = None) -> Dict[str, List[float]]:
+        """
+        Metric series by name, like ``timeseries_data`` but including metrics
+        released by ``compress_timeseries(release=True)`` (decoded on demand,
+        not cached).
+
+        Args:
+            metrics: Metrics to return (default: all available metrics)
+        """
+        names = self.available_metrics if metrics is None else [m for m in metrics if m in self.available_metrics]
+        return {name: self.get_timeseries(name) for name in names}
+
+    def compress_timeseries(
+        self,
+        metrics: Optional[List[str]] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        release: bool = False,
+    ) -> Dict[str, CompressedSeries]:
+        """
+        Encode metric series into compressed blocks for resident storage.
+
+        Blocks carry min/max/count headers, so range and band queries on
+        ``compressed_series(metric)`` can skip or answer blocks without
+        decoding. Timestamps are parsed as UTC, so offsets that change
+        across DST are fine; compressed series of tz-aware timestamps return
+        UTC-indexed ``to_series()``, naive ones stay naive. Series whose
+        length differs from ``timestamps`` are left as they are.
+
+        Args:
+            metrics: Metrics to compress (default: all loaded metrics)
+            block_size: Samples per block
+            release: Drop the list copies of compressed metrics to free
+                memory. ``timestamps`` are kept as loaded; ``get_timeseries``
+                and the analysis methods decode released metrics on demand,
+                and ``decompress_timeseries()`` restores the lists
+
+        Returns:
+            Dictionary mapping metric -> CompressedSeries
+        """
+        if not self.timestamps:
+            return dict(self._compressed)
+        import pandas as pd
+
+        stamps = pd.DatetimeIndex(pd.to_datetime(self.timestamps, utc=True)).as_unit("ns").asi8
+        tz = "UTC" if pd.Timestamp(self.timestamps[0]).tzinfo is not None else None
+        for metric_name in metrics or list(self.timeseries_data):
+            values = self.timeseries_data.get(metric_name)
+            if values is None or len(values) != stamps.size:
+                continue
+            self._compressed[metric_name] = CompressedSeries.encode(stamps, values, block_size, tz=tz)
+            if release:
+                del self.timeseries_data[metric_name]
+        return dict(self._compressed)
+
+    def compressed_series(self, metric_name: str) -> Optional[CompressedSeries]:
+        """Compressed form of a metric series, if compress_timeseries() encoded it."""
+        return self._compressed.get(metric_name)
+
+    def decompress_timeseries(self) -> None:
+        """Restore list series released by compress_timeseries()."""
+        for metric_name, series in self._compressed.items():
+            if metric_name not in self.timeseries_data:
+                self.timeseries_data[metric_name] = series.decode()[1].tolist()
+
+    def build_rollup_pyramids(
+        self,
+        metrics: Optional[List[str]] = None,
+        resolutions: Optional[List[TimeResolution]] = None,
+    ) -> Dict[str, RollupPyramid]:
+        """
+        Roll metric series up into pyramids kept alongside the series.
+
+        Loaders call this at ingest when asked to; ``aggregate_timeseries``
+        calls it for metrics that have none yet. Existing pyramids are kept
+        unless they lack a requested resolution, and ``add_timeseries``
+        drops the pyramid of the metric it replaces. Released metrics are
+        decoded once for the build; series whose length differs from
+        ``timestamps`` are skipped.
+
+        Args:
+            metrics: Metrics to roll up (default: all available metrics)
+            resolutions: Levels to keep (default: hourly to yearly, plus
+                sub-hourly levels no finer than the sampling interval)
+
+        Returns:
+            Dictionary mapping metric -> RollupPyramid
+        """
+        if not self.timestamps:
+            return dict(self._pyramids)
+        import pandas as pd
+
+        wanted = set(resolutions or ())
+        columns: Dict[str, List[float]] = {}
+        for metric_name in metrics or self.available_metrics:
+            pyramid = self._pyramids.get(metric_name)
+            if pyramid is not None and wanted <= set(pyramid.levels):
+                continue
+            values = self.get_timeseries(metric_name)
+            if values is not None and len(values) == len(self.timestamps):
+                columns[metric_name] = values
+        if columns:
+            index = pd.DatetimeIndex(pd.to_datetime(self.timestamps))
+            self._pyramids.update(RollupPyramid.build_many(index, columns, resolutions))
+        return dict(self._pyramids)
+
+    def aggregate_timeseries(
+        self,
+        resolution: TimeResolution,
+        metrics: Optional[List[str]] = None,
+        method: Optional[AggregationMethod] = None,
+    ) -> Tuple[Dict[str, List[float]], List[datetime]]:
+        """
+        Metric series aggregated to a coarser resolution.
+
+        Answered from the room's rollup pyramids (built here if the loader
+        did not build them at ingest); only metrics a pyramid cannot answer,
+        such as medians, are materialized and resampled.
+
+        Args:
+            resolution: Target resolution
+            metrics: Metrics to aggregate (default: all available metrics)
+            method: Aggregation method (if None, uses the default per metric type)
+
+        Returns:
+            Tuple of (aggregated_dict, aggregated_timestamps)
+        """
+        import pandas as pd
+        from .timeseries_aggregator import TimeSeriesAggregator
+
+        available = self.available_metrics
+        names = available if metrics is None else [m for m in metrics if m in available]
+        if not names or not self.timestamps:
+            return {}, []
+
+        resolution = TimeResolution(resolution)
+        metric_types = {name: MetricType(name) for name in names if name in MetricType._value2member_map_}
+        pyramids = self.build_rollup_pyramids(names)
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps))
+
+        usable: Dict[str, RollupPyramid] = {}
+        raw: Dict[str, List[float]] = {}
+        for name in names:
+            pyramid = pyramids.get(name)
+            metric_method = TimeSeriesAggregator.resolve_method(method, metric_types.get(name))
+            if pyramid is not None and pyramid.supports(resolution, metric_method) and pyramid.covers(index):
+                usable[name] = pyramid
+            else:
+                raw[name] = self.get_timeseries(name)
+
+        aggregated, stamps = TimeSeriesAggregator.aggregate_dict_to_resolution(
+            raw, index, resolution, metric_types=metric_types, pyramids=usable, method=method
+        )
+        return {name: aggregated[name] for name in names}, stamps
+
+    def build_compliance_sketches(
+        self,
+        parameters: Optional[List[str]] = None,
+        occupancy_mask: Optional[Any] = None,
+        season: Optional[str] = "heating",
+        resolution: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build threshold-agnostic compliance sketches of this room's parameters.
+
+        Each sketch answers the compliance fraction of any threshold band,
+        split by occupancy and season, without re-reading the raw series.
+
+        Args:
+            parameters: Parameters to sketch (default: all loaded metrics)
+            occupancy_mask: Boolean mask or FilterPlan; defaults to the
+                opening-hours profile of the room's building type
+            season: Season or country period of the in-season cells
+            resolution: Optional rounding step of the value sketches
+
+        Returns:
+            Dictionary mapping parameter -> ComplianceSketch, also stored in
+            ``computed_metrics['compliance_sketches']``
+        """
+        import pandas as pd
+        from .compliance_sketch import build_compliance_sketch
+        from .schedules import generate_occupancy_mask, get_opening_profile_for_building_type
+
+        index = None
+        if self.timestamps:
+            try:
+                index = pd.DatetimeIndex(pd.to_datetime(self.timestamps))
+            except Exception:
+                index = None
+        if occupancy_mask is None and index is not None:
+            profile = get_opening_profile_for_building_type(self.building_type)
+            occupancy_mask = generate_occupancy_mask(index, profile).to_numpy()
+
+        quality = self.get_quality_profile()
+        sketches = {
+            parameter: build_compliance_sketch(
+                self.id,
+                parameter,
+                values,
+                index=index,
+                occupancy_mask=occupancy_mask,
+                season=season,
+                step_hours=quality.step_hours if quality is not None else None,
+                resolution=resolution,
+            )
+            for parameter, values in self.get_timeseries_data(parameters).items()
+        }
+        self.computed_metrics['compliance_sketches'] = sketches
+        return sketches
 
     def compute_metrics(
         self,
@@ -1635,11 +2018,22 @@ class Room(SpatialEntity):
 
         # Calculate basic statistics
         if 'basic' in analyses:
-            for metric_name, values in self.timeseries_data.items():
-                if values:
-                    results[f'{metric_name}_mean'] = sum(values) / len(values)
-                    results[f'{metric_name}_min'] = min(values)
-                    results[f'{metric_name}_max'] = max(values)
+            for metric_name in self.available_metrics:
+                values = self.timeseries_data.get(metric_name)
+                if values is None:
+                    # Released metric: answered from the block headers
+                    summary = self._compressed[metric_name].summary()
+                    if summary['count']:
+                        results[f'{metric_name}_mean'] = summary['mean']
+                        results[f'{metric_name}_min'] = summary['min']
+                        results[f'{metric_name}_max'] = summary['max']
+                else:
+                    # NaN-free like the header summary
+                    values = [value for value in values if not math.isnan(value)]
+                    if values:
+                        results[f'{metric_name}_mean'] = sum(values) / len(values)
+                        results[f'{metric_name}_min'] = min(values)
+                        results[f'{metric_name}_max'] = max(values)
 
         # Run en16798_1 compliance analysis
         if 'en16798' in analyses and self._has_en16798_data():
@@ -1668,7 +2062,9 @@ class Room(SpatialEntity):
     def _has_en16798_data(self) -> bool:
         """Check if room has necessary data for EN16798 analysis."""
         # At minimum, need temperature data
-        return 'temperature' in self.timeseries_data and len(self.timeseries_data['temperature']) > 0
+        if 'temperature' in self.timeseries_data:
+            return bool(self.timeseries_data['temperature'])
+        return len(self._compressed.get('temperature') or ()) > 0
 
     def _compute_en16798_compliance(
         self,
@@ -1680,7 +2076,8 @@ class Room(SpatialEntity):
 
         Args:
             season: "heating" or "cooling"
-            outdoor_temperature: Outdoor temperature data
+            outdoor_temperature: Outdoor temperature data; when omitted, the running mean
+                of the room's weather station is used if one is assigned
 
         Returns:
             Dictionary with EN16798 compliance results
@@ -1712,18 +2109,25 @@ class Room(SpatialEntity):
                 return pd.Series(values, index=fallback_index)
             return pd.Series(values)
 
-        if 'temperature' in self.timeseries_data:
-            temperature = _series(self.timeseries_data['temperature'], ts_index)
+        data = self.get_timeseries_data(['temperature', 'co2', 'humidity'])
+        if 'temperature' in data:
+            temperature = _series(data['temperature'], ts_index)
 
-        if 'co2' in self.timeseries_data:
-            co2 = _series(self.timeseries_data['co2'], ts_index)
+        if 'co2' in data:
+            co2 = _series(data['co2'], ts_index)
 
-        if 'humidity' in self.timeseries_data:
-            humidity = _series(self.timeseries_data['humidity'], ts_index)
+        if 'humidity' in data:
+            humidity = _series(data['humidity'], ts_index)
 
+        outdoor_running_mean = None
         if outdoor_temperature:
             outdoor_idx = ts_index if outdoor_temperature and ts_index is not None and len(outdoor_temperature) == len(ts_index) else None
             outdoor_temp = _series(outdoor_temperature, outdoor_idx)
+        else:
+            # Shared station: reuse its cached running mean instead of re-deriving it
+            station = self.get_weather_station()
+            if station is not None:
+                outdoor_running_mean = station.en16798_running_mean()
 
         # Determine ventilation type
         vent_type = CalcVentType.MECHANICAL
@@ -1741,7 +2145,8 @@ class Room(SpatialEntity):
             humidity=humidity,
             outdoor_temperature=outdoor_temp,
             season=season,
-            ventilation_type=vent_type
+            ventilation_type=vent_type,
+            outdoor_running_mean=outdoor_running_mean,
         )
 
         # Convert to dictionary
@@ -1793,7 +2198,8 @@ class Room(SpatialEntity):
             region: Region name (e.g., 'Europe', 'Nordic'). If None, tries to infer from building.
             building_type: Building type. If None, tries to infer from parent entities.
             season: Season for analysis ('winter', 'summer', 'all_year')
-            outdoor_temperature: Outdoor temperature data. If None, tries to get from hierarchy.
+            outdoor_temperature: Outdoor temperature data. If None, uses the shared weather
+                station (see ``weather_station_id``) or tries to get it from hierarchy.
             force_recompute: If True, recompute even if cached
             entity_lookup: Function to retrieve any entity by ID for hierarchy traversal
         
@@ -1831,6 +2237,15 @@ class Room(SpatialEntity):
         if self.ventilation_type and hasattr(self.ventilation_type, 'value'):
             vent_type_str = self.ventilation_type.value.lower()
         
+        # Prefer a shared weather station over copies of its series in the hierarchy
+        outdoor_running_mean = None
+        if outdoor_temperature is None:
+            station = self.get_weather_station(parent_lookup=entity_lookup)
+            if station is not None:
+                if self.timestamps:
+                    outdoor_temperature = station.aligned(self.timestamps).tolist()
+                outdoor_running_mean = station.en16798_running_mean()
+
         # If outdoor_temperature not provided, try to get it from hierarchy
         if outdoor_temperature is None and entity_lookup is not None:
             outdoor_temp_values = self.get_timeseries_from_hierarchy(
@@ -1852,14 +2267,28 @@ class Room(SpatialEntity):
             available_metrics=set(self.available_metrics),
         )
         
+        # Released (compressed-only) metrics are decoded once, for the standards
+        # that read values; EN16798 receives their compressed blocks instead
+        # and counts threshold bands without decoding where it can
+        released = {name: series for name, series in self._compressed.items() if name not in self.timeseries_data}
+        timeseries_data: Optional[Dict[str, List[float]]] = None
+
         # Run each applicable standard
         for standard_config in applicable_standards:
             try:
                 # Load the analysis function
                 analysis_func = registry.load_analysis_module(standard_config.analysis_module)
-                
+                standard_key = standard_config.id.replace('-', '_')
+
                 # Prepare timeseries dict
-                timeseries_dict = dict(self.timeseries_data)
+                extra: Dict[str, Any] = {}
+                if standard_key == 'en16798_1' and released:
+                    timeseries_dict = dict(self.timeseries_data)
+                    extra['compressed_series'] = released
+                else:
+                    if timeseries_data is None:
+                        timeseries_data = self.get_timeseries_data()
+                    timeseries_dict = dict(timeseries_data)
                 
                 # Run the analysis
                 analysis_result = analysis_func(
@@ -1868,10 +2297,12 @@ class Room(SpatialEntity):
                     timestamps=self.timestamps,
                     season=season,
                     outdoor_temperature=outdoor_temperature,
+                    outdoor_running_mean=outdoor_running_mean,
+                    quality_profile=self.get_quality_profile(),
+                    **extra,
                 )
                 
                 # Store results
-                standard_key = standard_config.id.replace('-', '_')
                 summary = analysis_result.summary_results
                 results[standard_key] = summary
                 
@@ -1900,9 +2331,20 @@ class Room(SpatialEntity):
         self.computed_metrics['standards_results'] = results
         return results
 
+    def _co2_series(self) -> Optional[Any]:
+        """Build the timestamp-indexed CO2 series used by CO2-driven simulations."""
+        import pandas as pd
+        
+        values = self.get_timeseries('co2')
+        if values is None or not self.timestamps or len(values) != len(self.timestamps):
+            return None
+        return pd.Series(values, index=pd.to_datetime(self.timestamps), dtype=float)
+
     def compute_simulations(
         self,
         force_recompute: bool = False,
+        co2_series: Optional[Any] = None,
+        precomputed: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Compute all applicable simulations for this room.
@@ -1911,22 +2353,27 @@ class Room(SpatialEntity):
         - Available sensor data
         - Entity type
         
+        The CO2 series is parsed once and shared by the occupancy and
+        ventilation simulations.
+        
         Args:
             force_recompute: If True, recompute even if cached
+            co2_series: Pre-parsed CO2 series (built from timeseries_data if omitted)
+            precomputed: Simulation results already computed in a batch,
+                keyed by simulation id (e.g. {'ventilation': VentilationRateResult})
         
         Returns:
             Dictionary with results from all applicable simulations
         """
         from dataclasses import asdict
         
-        import pandas as pd
-        
         from .standards_registry import get_registry
         
         if not force_recompute and 'simulation_results' in self.computed_metrics:
             return self.computed_metrics['simulation_results']
         
         results = {}
+        precomputed = precomputed or {}
         
         if not self.has_data:
             self.computed_metrics['simulation_results'] = results
@@ -1941,32 +2388,41 @@ class Room(SpatialEntity):
             available_metrics=set(self.available_metrics),
         )
         
+        if co2_series is None and 'co2' in self.available_metrics:
+            co2_series = self._co2_series()
+        
         # Run each applicable simulation
         for simulation_config in applicable_simulations:
             try:
-                # Load the simulation class
-                simulation_class = registry.load_simulation_class(simulation_config.module_path)
-                simulator = simulation_class()
-                
                 # Prepare data based on simulation type
                 if simulation_config.id == 'occupancy':
                     # Occupancy simulation needs CO2 as pandas Series
-                    if 'co2' in self.timeseries_data and self.timestamps:
-                        idx = pd.to_datetime(self.timestamps)
-                        co2_series = pd.Series(self.timeseries_data['co2'], index=idx)
-                        
-                        occupancy_result = simulator.detect_occupancy(co2_series)
+                    if co2_series is not None:
+                        if 'occupancy' in precomputed:
+                            occupancy_result = precomputed['occupancy']
+                        else:
+                            simulator = registry.load_simulation_class(simulation_config.module_path)()
+                            occupancy_result = simulator.detect_occupancy(co2_series)
                         results['occupancy'] = asdict(occupancy_result)
                         
                         # Store in metadata for backward compatibility
                         self.metadata['occupancy_simulation'] = asdict(occupancy_result)
                 
                 elif simulation_config.id == 'ventilation':
-                    # Ventilation simulation needs CO2
-                    if 'co2' in self.timeseries_data:
-                        # Implementation depends on VentilationCalculator interface
-                        # For now, skip if not implemented
-                        pass
+                    # Ventilation simulation needs CO2 decay periods
+                    if co2_series is not None:
+                        if 'ventilation' in precomputed:
+                            ventilation_result = precomputed['ventilation']
+                        else:
+                            simulator = registry.load_simulation_class(simulation_config.module_path)()
+                            ventilation_result = simulator.estimate_from_co2_decay(
+                                co2_series,
+                                volume_m3=self.volume_m3,
+                            )
+                        # No usable decay periods is a valid outcome, not an error
+                        if ventilation_result is not None:
+                            results['ventilation'] = asdict(ventilation_result)
+                            self.metadata['ventilation_simulation'] = asdict(ventilation_result)
                 
             except Exception as e:
                 print(f"Warning: Could not run simulation {simulation_config.id}: {e}")
@@ -1978,6 +2434,115 @@ class Room(SpatialEntity):
         self.computed_metrics['simulation_results'] = results
         return results
 
+    @classmethod
+    def compute_simulations_for_rooms(
+        cls,
+        rooms: List["Room"],
+        force_recompute: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute simulations for many rooms, batching the vectorized models.
+        
+        CO2 series are parsed once per room. Ventilation is estimated for all
+        rooms in a single VentilationCalculator.estimate_batch call; the
+        results are then handed to each room's compute_simulations.
+        
+        Args:
+            rooms: Rooms to simulate
+            force_recompute: If True, recompute even if cached
+        
+        Returns:
+            Dictionary mapping room ID to that room's simulation results
+        """
+        from .standards_registry import get_registry
+        
+        pending = [
+            room for room in rooms
+            if force_recompute or 'simulation_results' not in room.computed_metrics
+        ]
+        co2_by_room = {}
+        for room in pending:
+            if room.has_data:
+                series = room._co2_series()
+                if series is not None:
+                    co2_by_room[room.id] = series
+        
+        ventilation_results: Dict[str, Any] = {}
+        registry = get_registry()
+        ventilation_config = registry.simulations.get('ventilation')
+        if ventilation_config is not None and co2_by_room:
+            try:
+                calculator = registry.load_simulation_class(ventilation_config.module_path)()
+                ventilation_results = calculator.estimate_batch(
+                    co2_by_room,
+                    volumes={room.id: room.volume_m3 for room in pending},
+                )
+            except Exception as e:
+                print(f"Warning: Batch ventilation estimation failed, falling back per room: {e}")
+                ventilation_results = {}
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for room in rooms:
+            precomputed = {}
+            if room.id in ventilation_results:
+                precomputed['ventilation'] = ventilation_results[room.id]
+            results[room.id] = room.compute_simulations(
+                force_recompute=force_recompute,
+                co2_series=co2_by_room.get(room.id),
+                precomputed=precomputed,
+            )
+        return results
+
+    @classmethod
+    def estimate_occupant_counts_for_rooms(
+        cls,
+        rooms: List["Room"],
+        default_ach: float = 1.0,
+        smoothing_window: int = 3,
+    ) -> Dict[str, Optional[List[float]]]:
+        """
+        Time-resolved occupant counts for many rooms in one batched call.
+        
+        Uses each room's volume_m3 and, when available, the ACH from its
+        ventilation simulation. Results are cached per room in
+        computed_metrics['occupant_count_series'], aligned with timestamps.
+        
+        Args:
+            rooms: Rooms to evaluate (typically all rooms of a building)
+            default_ach: ACH used for rooms without a ventilation estimate
+            smoothing_window: Centered rolling-mean window applied to CO2 first
+        
+        Returns:
+            Dictionary mapping room ID to occupant counts (None if not computable)
+        """
+        from simulations.models.occupancy import OccupancyCalculator
+        
+        co2_by_room = {}
+        ach_by_room = {}
+        for room in rooms:
+            series = room._co2_series()
+            if series is None:
+                continue
+            co2_by_room[room.id] = series
+            ventilation = room.computed_metrics.get('simulation_results', {}).get('ventilation')
+            if isinstance(ventilation, dict):
+                ach_by_room[room.id] = ventilation.get('ach')
+        
+        estimates = OccupancyCalculator().estimate_occupant_series_batch(
+            co2_by_room,
+            volumes={room.id: room.volume_m3 for room in rooms},
+            ach_by_room=ach_by_room,
+            default_ach=default_ach,
+            smoothing_window=smoothing_window,
+        )
+        
+        results: Dict[str, Optional[List[float]]] = {}
+        for room in rooms:
+            series = estimates.get(room.id)
+            results[room.id] = series.round(2).tolist() if series is not None else None
+            room.computed_metrics['occupant_count_series'] = results[room.id]
+        return results
+
     def get_summary(self) -> Dict[str, Any]:
         """Get summary information about this room."""
         return {
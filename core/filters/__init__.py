@@ -5,10 +5,14 @@ Reusable filter utilities for time-series processing.
 from .time_filter import TimeFilter, TimeRange
 from .opening_hours_filter import OpeningHoursFilter
 from .seasonal_filter import SeasonalFilter
+from .filter_plan import FilterPlan, index_fingerprint, clear_mask_cache
 
 __all__ = [
     "TimeFilter",
     "TimeRange",
     "OpeningHoursFilter",
     "SeasonalFilter",
+    "FilterPlan",
+    "index_fingerprint",
+    "clear_mask_cache",
 ]
@@ -0,0 +1,312 @@
+"""Compiled filter plans.
+
+A ``FilterPlan`` describes a chain of time filters (months of a season or
+country profile, hours, weekdays, opening-hours profiles, holidays and
+custom periods) and compiles it into a single boolean mask in one
+vectorized pass over the index's integer timestamps. Masks are cached per
+(plan, index fingerprint), so rooms sharing a timestamp grid reuse them and
+the same mask can select from many arrays without re-scanning the index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date, time
+from typing import Any, FrozenSet, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.filters.time_filter import TimeRange
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_NS_PER_HOUR = 3_600 * 10**9
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MASK_CACHE_SIZE = 256
+_MASK_CACHE: "OrderedDict[Tuple[FilterPlan, Tuple[Any, ...]], np.ndarray]" = OrderedDict()
+
+# Daily windows as (weekday, start ns-of-day, end ns-of-day), both ends inclusive
+OpeningWindows = Tuple[Tuple[int, int, int], ...]
+
+
+def _time_ns(value: time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 10**9 + value.microsecond * 1000
+
+
+def _day_numbers(dates: Iterable[Any]) -> FrozenSet[int]:
+    stamps = pd.to_datetime(list(dates))
+    if len(stamps) == 0:
+        return frozenset()
+    if stamps.tz is not None:
+        stamps = stamps.tz_localize(None)
+    return frozenset(int(day) for day in stamps.as_unit("ns").asi8 // _NS_PER_DAY)
+
+
+def _wall_clock_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Integer nanoseconds of the index in local wall time."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def index_fingerprint(index: pd.DatetimeIndex) -> Tuple[Any, ...]:
+    """Return a hashable fingerprint of a DatetimeIndex (size, bounds, tz and content hash)."""
+    stamps = index.as_unit("ns").asi8
+    if stamps.size == 0:
+        return (0, str(index.tz))
+    digest = hashlib.blake2b(stamps.tobytes(), digest_size=16).hexdigest()
+    return (stamps.size, int(stamps[0]), int(stamps[-1]), str(index.tz), digest)
+
+
+@dataclass(frozen=True)
+class FilterPlan:
+    """
+    Declarative, hashable chain of time filters compiled to one boolean mask.
+
+    All criteria are combined with AND; ``invert`` complements the result.
+    Plans are immutable: the builder methods return new plans.
+    """
+
+    months: Optional[FrozenSet[int]] = None
+    hours: Optional[Tuple[int, int]] = None  # inclusive hour range, may wrap midnight
+    weekdays: Optional[FrozenSet[int]] = None  # Monday=0
+    opening_windows: Optional[OpeningWindows] = None
+    holidays: FrozenSet[int] = frozenset()  # day numbers since epoch
+    periods: Tuple[Tuple[int, int], ...] = ()  # inclusive ns ranges; any may match
+    invert: bool = False
+
+    # ------------------------------------------------------------------ builders
+    @classmethod
+    def for_season(cls, period: str) -> "FilterPlan":
+        """Plan restricted to a season or country period (e.g. ``"heating:DK"``)."""
+        from core.filters.seasonal_filter import SeasonalFilter
+
+        seasonal = SeasonalFilter(period)
+        return cls().with_months(None if seasonal.period_type == "all_year" else seasonal.months)
+
+    @classmethod
+    def for_opening_profile(
+        cls,
+        profile: Any,
+        holidays: Optional[Iterable[Any]] = None,
+    ) -> "FilterPlan":
+        """Plan selecting the opening windows of an ``OpeningHoursProfile``."""
+        from core.schedules import PROFILE_DEFINITIONS
+        from core.enums import OpeningHoursProfile
+
+        definition = PROFILE_DEFINITIONS.get(profile) or PROFILE_DEFINITIONS[OpeningHoursProfile.OFFICE_STANDARD]
+        windows = tuple(
+            (weekday, _time_ns(start), _time_ns(end))
+            for weekday, periods in sorted(definition.items())
+            for start, end in periods
+        )
+        plan = cls(opening_windows=windows)
+        return plan.excluding_holidays(holidays) if holidays else plan
+
+    def with_months(self, months: Optional[Iterable[int]]) -> "FilterPlan":
+        """Restrict to calendar months (None removes the restriction)."""
+        return replace(self, months=frozenset(int(m) for m in months) if months is not None else None)
+
+    def with_hours(self, start_hour: int, end_hour: int) -> "FilterPlan":
+        """Restrict to an inclusive hour range; ``start_hour > end_hour`` wraps midnight."""
+        return replace(self, hours=(int(start_hour), int(end_hour)))
+
+    def with_weekdays(self, weekdays: Optional[Iterable[int]] = range(5)) -> "FilterPlan":
+        """Restrict to weekdays (Monday=0); defaults to Monday-Friday."""
+        return replace(self, weekdays=frozenset(int(d) for d in weekdays) if weekdays is not None else None)
+
+    def excluding_holidays(self, holidays: Iterable[Any]) -> "FilterPlan":
+        """Exclude whole days (dates, datetimes or timestamps)."""
+        return replace(self, holidays=self.holidays | _day_numbers(holidays))
+
+    def within(self, *ranges: Union[TimeRange, Tuple[Any, Any]]) -> "FilterPlan":
+        """Restrict to custom periods (inclusive); a timestamp may match any of them."""
+        periods = list(self.periods)
+        for item in ranges:
+            if isinstance(item, TimeRange):
+                normalized = item.normalize()
+                start, end = normalized.start, normalized.end
+            else:
+                start, end = item
+            start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+            if start_ts.tz is not None:
+                start_ts = start_ts.tz_localize(None)
+            if end_ts.tz is not None:
+                end_ts = end_ts.tz_localize(None)
+            periods.append((start_ts.as_unit("ns").value, end_ts.as_unit("ns").value))
+        return replace(self, periods=tuple(sorted(periods)))
+
+    def inverse(self) -> "FilterPlan":
+        """Complement of this plan."""
+        return replace(self, invert=not self.invert)
+
+    # ------------------------------------------------------------------ compile
+    def compile(self, stamps: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the plan over wall-clock nanosecond timestamps.
+
+        Args:
+            stamps: int64 nanoseconds since epoch (local wall time)
+
+        Returns:
+            Boolean mask
+        """
+        stamps = np.asarray(stamps, dtype=np.int64)
+        mask = np.ones(stamps.shape, dtype=bool)
+        if stamps.size == 0:
+            return mask
+
+        days = stamps // _NS_PER_DAY
+        time_of_day = stamps - days * _NS_PER_DAY
+        needs_weekday = self.weekdays is not None or self.opening_windows is not None
+        weekday = (days + 3) % 7 if needs_weekday else None  # 1970-01-01 was a Thursday
+
+        if self.months is not None:
+            month = stamps.astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64) % 12 + 1
+            mask &= np.isin(month, np.fromiter(self.months, dtype=np.int64))
+
+        if self.hours is not None:
+            hour = time_of_day // _NS_PER_HOUR
+            start_hour, end_hour = self.hours
+            if start_hour <= end_hour:
+                mask &= (hour >= start_hour) & (hour <= end_hour)
+            else:
+                mask &= (hour >= start_hour) | (hour <= end_hour)
+
+        if self.weekdays is not None:
+            mask &= np.isin(weekday, np.fromiter(self.weekdays, dtype=np.int64))
+
+        if self.opening_windows is not None:
+            in_window = np.zeros(stamps.shape, dtype=bool)
+            for window_day, start_ns, end_ns in self.opening_windows:
+                in_window |= (weekday == window_day) & (time_of_day >= start_ns) & (time_of_day <= end_ns)
+            mask &= in_window
+
+        if self.holidays:
+            mask &= ~np.isin(days, np.fromiter(self.holidays, dtype=np.int64))
+
+        if self.periods:
+            starts = np.array([start for start, _ in self.periods], dtype=np.int64)
+            ends = np.array([end for _, end in self.periods], dtype=np.int64)
+            # Running max of ends handles overlapping periods
+            reach = np.maximum.accumulate(ends)
+            position = np.searchsorted(starts, stamps, side="right") - 1
+            covered = position >= 0
+            covered[covered] = stamps[covered] <= reach[position[covered]]
+            mask &= covered
+
+        if self.invert:
+            mask = ~mask
+        return mask
+
+    def matches(self, stamp: int) -> bool:
+        """
+        Evaluate the plan for a single wall-clock nanosecond timestamp.
+
+        Pure-Python counterpart of ``compile`` for streaming readings, where
+        building an array per sample would cost more than the test itself.
+        """
+        days, time_of_day = divmod(int(stamp), _NS_PER_DAY)
+        weekday = (days + 3) % 7
+        matched = True
+
+        if self.months is not None:
+            matched = date.fromordinal(_EPOCH_ORDINAL + days).month in self.months
+        if matched and self.hours is not None:
+            hour = time_of_day // _NS_PER_HOUR
+            start_hour, end_hour = self.hours
+            if start_hour <= end_hour:
+                matched = start_hour <= hour <= end_hour
+            else:
+                matched = hour >= start_hour or hour <= end_hour
+        if matched and self.weekdays is not None:
+            matched = weekday in self.weekdays
+        if matched and self.opening_windows is not None:
+            matched = any(
+                window_day == weekday and start_ns <= time_of_day <= end_ns
+                for window_day, start_ns, end_ns in self.opening_windows
+            )
+        if matched and self.holidays:
+            matched = days not in self.holidays
+        if matched and self.periods:
+            matched = any(start <= stamp <= end for start, end in self.periods)
+
+        return not matched if self.invert else matched
+
+    def mask(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Boolean mask for an index, cached per index fingerprint.
+
+        The returned array is read-only and shared between callers.
+        """
+        if not isinstance(index, pd.DatetimeIndex):
+            # Time criteria cannot be evaluated; keep everything, like the DataFrame filters
+            return np.ones(len(index), dtype=bool)
+        key = (self, index_fingerprint(index))
+        cached = _MASK_CACHE.get(key)
+        if cached is not None:
+            _MASK_CACHE.move_to_end(key)
+            return cached
+        compiled = self.compile(_wall_clock_ns(index))
+        compiled.setflags(write=False)
+        _MASK_CACHE[key] = compiled
+        if len(_MASK_CACHE) > _MASK_CACHE_SIZE:
+            _MASK_CACHE.popitem(last=False)
+        return compiled
+
+    def is_empty(self) -> bool:
+        """True when the plan has no criteria (selects everything)."""
+        return (
+            self.months is None
+            and self.hours is None
+            and self.weekdays is None
+            and self.opening_windows is None
+            and not self.holidays
+            and not self.periods
+        )
+
+    def occupancy_mask(self, index: pd.DatetimeIndex) -> pd.Series:
+        """Mask as a boolean Series, the form standards accept as an occupancy mask."""
+        return pd.Series(self.mask(index), index=index)
+
+    # ------------------------------------------------------------------ apply
+    def apply(self, df: Union[pd.DataFrame, pd.Series]) -> Union[pd.DataFrame, pd.Series]:
+        """Select the rows of a DataFrame/Series matched by the plan (one selection)."""
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return df
+        return df[self.mask(df.index)]
+
+    def apply_inverse(self, df: Union[pd.DataFrame, pd.Series]) -> Union[pd.DataFrame, pd.Series]:
+        """Select the rows not matched by the plan."""
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return df
+        return df[~self.mask(df.index)]
+
+    def select(self, values: np.ndarray, index: pd.DatetimeIndex, axis: int = -1) -> np.ndarray:
+        """
+        Select matched samples from an array (e.g. rooms x timestamps) sharing ``index``.
+
+        Args:
+            values: Array whose ``axis`` runs along ``index``
+            index: Timestamps of the samples
+            axis: Time axis of ``values``
+
+        Returns:
+            Array with only the matched samples along ``axis``
+        """
+        return np.compress(self.mask(index), values, axis=axis)
+
+
+def clear_mask_cache() -> None:
+    """Drop all cached masks."""
+    _MASK_CACHE.clear()
+
+
+__all__ = [
+    "FilterPlan",
+    "index_fingerprint",
+    "clear_mask_cache",
+]
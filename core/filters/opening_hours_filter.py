@@ -4,7 +4,7 @@ from datetime import datetime
 
 import pandas as pd
 
-from core.filters.time_filter import TimeFilter
+from core.filters.filter_plan import FilterPlan
 from core.enums.spatial import BuildingType
 from core.schedules import PROFILE_DEFINITIONS, get_opening_profile_for_building_type
 
@@ -41,6 +41,23 @@ class OpeningHoursFilter:
 
         self.holidays = holidays or []
 
+    def to_plan(self, exclude_weekends: bool = True) -> FilterPlan:
+        """
+        Compile this filter into a FilterPlan.
+
+        Args:
+            exclude_weekends: Whether to exclude weekend days
+
+        Returns:
+            FilterPlan selecting opening hours
+        """
+        plan = FilterPlan().with_hours(self.start_hour, self.end_hour)
+        if exclude_weekends:
+            plan = plan.with_weekdays(range(5))
+        if self.holidays:
+            plan = plan.excluding_holidays(self.holidays)
+        return plan
+
     def apply(self, df: pd.DataFrame, exclude_weekends: bool = True) -> pd.DataFrame:
         """
         Apply opening hours filter to DataFrame.
@@ -52,13 +69,7 @@ class OpeningHoursFilter:
         Returns:
             Filtered DataFrame containing only opening hours data
         """
-        return TimeFilter.get_operating_hours(
-            df,
-            start_hour=self.start_hour,
-            end_hour=self.end_hour,
-            exclude_weekends=exclude_weekends,
-            holidays=self.holidays,
-        )
+        return self.to_plan(exclude_weekends).apply(df)
 
     def apply_inverse(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -70,14 +81,8 @@ class OpeningHoursFilter:
         Returns:
             Filtered DataFrame containing only non-opening hours data
         """
-        if df.empty:
-            return df
-
-        opening_hours_df = self.apply(df)
-
-        # Return complement - data not in opening hours
-        mask = ~df.index.isin(opening_hours_df.index)
-        return df[mask].copy()
+        # Complement of the compiled mask; no second pass or index lookup needed
+        return self.to_plan().apply_inverse(df)
 
     def get_operating_periods(self, df: pd.DataFrame) -> list[tuple[datetime, datetime]]:
         """
@@ -145,7 +145,20 @@ class SeasonalFilter:
         if self.period_type == "all_year":
             return df
 
-        return TimeFilter.filter_by_months(df, self.months)
+        return self.to_plan().apply(df)
+
+    def to_plan(self) -> "FilterPlan":
+        """
+        Compile this filter into a FilterPlan.
+
+        Returns:
+            FilterPlan restricted to the period's months
+        """
+        from core.filters.filter_plan import FilterPlan
+
+        if self.period_type == "all_year":
+            return FilterPlan()
+        return FilterPlan().with_months(self.months)
 
     @staticmethod
     def filter_by_season(df: pd.DataFrame, season: str) -> pd.DataFrame:
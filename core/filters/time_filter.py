@@ -205,14 +205,15 @@ class TimeFilter:
         """
         if df.empty:
             return df
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return df
 
-        # Apply filters in sequence
-        filtered = TimeFilter.filter_by_hour_range(df, start_hour, end_hour)
+        # Compile hours, weekdays and holidays into one mask instead of chaining copies
+        from core.filters.filter_plan import FilterPlan
 
+        plan = FilterPlan().with_hours(start_hour, end_hour)
         if exclude_weekends:
-            filtered = TimeFilter.filter_by_weekdays(filtered, include_weekdays=True)
-
+            plan = plan.with_weekdays(range(5))
         if holidays:
-            filtered = TimeFilter.exclude_holidays(filtered, holidays)
-
-        return filtered
+            plan = plan.excluding_holidays(holidays)
+        return df[plan.mask(df.index)].copy()
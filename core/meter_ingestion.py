@@ -0,0 +1,480 @@
+"""
+Meter Reading Ingestion
+
+Turns bulk energy meter readings into interval consumption and hourly,
+daily, monthly and yearly rollups without creating a pydantic object per
+reading. Readings are held column-wise (meter code, timestamp, value,
+reading type) in a MeterReadingBatch; ``ingest_meter_readings`` converts
+them to intervals and rolls them up in one pass, and MeterRollups feeds
+``AggregatedEnergyData`` into Building.calculate_primary_energy_from_meters.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .metering import AggregatedEnergyData, EnergyMeter, EnergyMeterReading
+
+
+READING_TYPES = ("cumulative", "interval", "instantaneous")
+
+_NS_PER_HOUR = 3_600_000_000_000
+
+# Rollup levels, finest first
+RESOLUTIONS = ("hourly", "daily", "monthly", "yearly")
+
+
+def _timestamps_ns(timestamps) -> np.ndarray:
+    """Timestamps as int64 nanoseconds (timezone-aware values use local wall time)."""
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def _reading_type_codes(reading_types: Union[str, Sequence[str]], size: int) -> np.ndarray:
+    if isinstance(reading_types, str):
+        if reading_types not in READING_TYPES:
+            raise ValueError(f"Unknown reading type: {reading_types}")
+        return np.full(size, READING_TYPES.index(reading_types), dtype=np.int8)
+    codes = pd.Categorical(list(reading_types), categories=READING_TYPES).codes
+    if (codes < 0).any():
+        raise ValueError(f"Reading types must be one of {READING_TYPES}")
+    return codes.astype(np.int8)
+
+
+@dataclass
+class MeterReadingBatch:
+    """
+    Column-wise meter readings.
+
+    Attributes:
+        meter_ids: Distinct meter IDs; ``meter_codes`` index into this list
+        meter_codes: Meter of each reading (n,)
+        timestamps: Reading timestamps as int64 nanoseconds (n,)
+        values: Reading values in the meter's unit (n,)
+        reading_types: Index into READING_TYPES for each reading (n,)
+    """
+
+    meter_ids: List[str]
+    meter_codes: np.ndarray
+    timestamps: np.ndarray
+    values: np.ndarray
+    reading_types: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        meter_ids: Union[str, Sequence[str]],
+        timestamps,
+        values: Sequence[float],
+        reading_types: Union[str, Sequence[str]] = "cumulative",
+    ) -> "MeterReadingBatch":
+        """Build a batch from per-reading arrays (a single meter ID applies to all)."""
+        values = np.asarray(values, dtype=float)
+        if isinstance(meter_ids, str):
+            codes, ids = np.zeros(values.size, dtype=np.intp), [meter_ids]
+        else:
+            codes, uniques = pd.factorize(pd.Series(list(meter_ids), dtype=object))
+            ids = [str(meter_id) for meter_id in uniques]
+        return cls(
+            meter_ids=ids,
+            meter_codes=np.asarray(codes, dtype=np.intp),
+            timestamps=_timestamps_ns(timestamps),
+            values=values,
+            reading_types=_reading_type_codes(reading_types, values.size),
+        )
+
+    @classmethod
+    def from_series(
+        cls,
+        series_by_meter: Mapping[str, pd.Series],
+        reading_type: str = "cumulative",
+    ) -> "MeterReadingBatch":
+        """Build a batch from one value series per meter, indexed by timestamp."""
+        ids = list(series_by_meter)
+        lengths = [len(series_by_meter[meter_id]) for meter_id in ids]
+        total = int(sum(lengths))
+        if not ids:
+            return cls([], np.empty(0, np.intp), np.empty(0, np.int64), np.empty(0), np.empty(0, np.int8))
+        return cls(
+            meter_ids=[str(meter_id) for meter_id in ids],
+            meter_codes=np.repeat(np.arange(len(ids), dtype=np.intp), lengths),
+            timestamps=np.concatenate([_timestamps_ns(series_by_meter[m].index) for m in ids]),
+            values=np.concatenate([series_by_meter[m].to_numpy(dtype=float) for m in ids]),
+            reading_types=_reading_type_codes(reading_type, total),
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        meter_column: str = "meter_id",
+        timestamp_column: str = "timestamp",
+        value_column: str = "value_kwh",
+        type_column: Optional[str] = "reading_type",
+        default_type: str = "cumulative",
+    ) -> "MeterReadingBatch":
+        """Build a batch from a long-format DataFrame of readings."""
+        types = frame[type_column] if type_column and type_column in frame.columns else default_type
+        return cls.from_arrays(
+            frame[meter_column].astype(str),
+            frame[timestamp_column],
+            frame[value_column],
+            types if isinstance(types, str) else types.astype(str),
+        )
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[EnergyMeterReading]) -> "MeterReadingBatch":
+        """Build a batch from EnergyMeterReading objects."""
+        readings = list(readings)
+        return cls.from_arrays(
+            [r.meter_id for r in readings],
+            [r.timestamp for r in readings],
+            [r.value_kwh for r in readings],
+            [r.reading_type for r in readings],
+        )
+
+    def sorted(self) -> "MeterReadingBatch":
+        """Return the batch ordered by (meter, timestamp); no copy when already ordered."""
+        codes, times = self.meter_codes, self.timestamps
+        if codes.size < 2:
+            return self
+        same_meter = codes[1:] == codes[:-1]
+        if np.all(codes[1:] >= codes[:-1]) and np.all(~same_meter | (times[1:] >= times[:-1])):
+            return self
+        order = np.lexsort((times, codes))
+        return MeterReadingBatch(
+            meter_ids=self.meter_ids,
+            meter_codes=codes[order],
+            timestamps=times[order],
+            values=self.values[order],
+            reading_types=self.reading_types[order],
+        )
+
+
+@dataclass
+class MeterIntervals:
+    """
+    Interval consumption (kWh) per meter, ordered by (meter, interval start).
+
+    Attributes:
+        meter_ids: Distinct meter IDs
+        meter_codes: Meter of each interval
+        starts: Interval start as int64 nanoseconds
+        kwh: Consumption in kWh
+        rollovers: Register rollovers detected in cumulative readings
+        resets: Meter resets detected in cumulative readings
+    """
+
+    meter_ids: List[str]
+    meter_codes: np.ndarray
+    starts: np.ndarray
+    kwh: np.ndarray
+    rollovers: int = 0
+    resets: int = 0
+
+
+def _meter_attribute(
+    meter_ids: List[str],
+    meters: Optional[Mapping[str, EnergyMeter]],
+    overrides: Optional[Mapping[str, float]],
+    getter,
+    default: float,
+) -> np.ndarray:
+    """Per-meter float attribute aligned with ``meter_ids``."""
+    values = np.full(len(meter_ids), default, dtype=float)
+    for i, meter_id in enumerate(meter_ids):
+        if overrides and meter_id in overrides:
+            values[i] = overrides[meter_id]
+        elif meters and meter_id in meters:
+            value = getter(meters[meter_id])
+            if value is not None:
+                values[i] = value
+    return values
+
+
+def readings_to_intervals(
+    batch: MeterReadingBatch,
+    meters: Optional[Mapping[str, EnergyMeter]] = None,
+    rollover_values: Optional[Mapping[str, float]] = None,
+) -> MeterIntervals:
+    """
+    Convert readings to interval consumption in kWh.
+
+    - cumulative: difference to the next reading of the same meter, labelled
+      with the earlier timestamp. A drop larger than half the register range
+      (``rollover_values`` or meter metadata ``rollover_value``) is a
+      rollover; any other drop is a reset and the new reading counts from 0.
+    - interval: the reading is the consumption of the interval starting at
+      its timestamp.
+    - instantaneous: average power (kW) held until the next reading.
+
+    Values are multiplied by the meter's ``conversion_factor_to_kwh`` when set.
+
+    Args:
+        batch: Readings to convert
+        meters: EnergyMeter objects by ID (conversion factors, rollover metadata)
+        rollover_values: Register range per meter ID, overriding metadata
+
+    Returns:
+        MeterIntervals ordered by (meter, start)
+    """
+    batch = batch.sorted()
+    codes, times, values, types = batch.meter_codes, batch.timestamps, batch.values, batch.reading_types
+    n = values.size
+    kwh = np.full(n, np.nan)
+    rollovers = resets = 0
+
+    if n:
+        # Reading i pairs with reading i + 1 when both belong to the same meter
+        same_meter = codes[1:] == codes[:-1]
+
+        cumulative = types == 0
+        if cumulative.any():
+            pair = same_meter & cumulative[:-1] & cumulative[1:]
+            delta = values[1:] - values[:-1]
+            drops = np.flatnonzero(pair & (delta < 0))
+            if drops.size:
+                register = _meter_attribute(
+                    batch.meter_ids, meters, rollover_values,
+                    lambda meter: meter.metadata.get("rollover_value"), np.nan,
+                )[codes[drops]]
+                previous, current = values[drops], values[drops + 1]
+                wrapped = previous - current > register / 2
+                delta[drops] = np.where(wrapped, current - previous + register, current)
+                rollovers = int(wrapped.sum())
+                resets = int(drops.size - rollovers)
+            kwh[:-1][pair] = delta[pair]
+
+        interval = types == 1
+        if interval.any():
+            kwh[interval] = values[interval]
+
+        instantaneous = types == 2
+        if instantaneous.any():
+            pair = same_meter & instantaneous[:-1]
+            hours = (times[1:][pair] - times[:-1][pair]) / _NS_PER_HOUR
+            kwh[:-1][pair] = values[:-1][pair] * hours
+
+        factors = _meter_attribute(
+            batch.meter_ids, meters, None,
+            lambda meter: meter.conversion_factor_to_kwh, 1.0,
+        )
+        if np.any(factors != 1.0):
+            kwh *= factors[codes]
+
+    keep = ~np.isnan(kwh)
+    return MeterIntervals(
+        meter_ids=batch.meter_ids,
+        meter_codes=codes[keep],
+        starts=times[keep],
+        kwh=kwh[keep],
+        rollovers=rollovers,
+        resets=resets,
+    )
+
+
+@dataclass
+class RollupLevel:
+    """Consumption per meter and period at one resolution, ordered by (meter, period)."""
+
+    resolution: str
+    meter_codes: np.ndarray
+    periods: np.ndarray  # Period number: hours/days since epoch, months since 1970-01, or year
+    kwh: np.ndarray
+    counts: np.ndarray  # Intervals contributing to each period
+
+    def period_starts(self) -> pd.DatetimeIndex:
+        if self.resolution == "hourly":
+            return pd.DatetimeIndex(self.periods.astype("datetime64[h]"))
+        if self.resolution == "daily":
+            return pd.DatetimeIndex(self.periods.astype("datetime64[D]"))
+        if self.resolution == "monthly":
+            return pd.DatetimeIndex(self.periods.astype("datetime64[M]"))
+        return pd.DatetimeIndex((self.periods - 1970).astype("datetime64[Y]"))
+
+    def meter_slice(self, code: int) -> slice:
+        left, right = np.searchsorted(self.meter_codes, [code, code + 1])
+        return slice(int(left), int(right))
+
+
+def _reduce_runs(
+    meter_codes: np.ndarray,
+    periods: np.ndarray,
+    kwh: np.ndarray,
+    counts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Sum consecutive entries sharing (meter, period); inputs are ordered."""
+    if kwh.size == 0:
+        return meter_codes, periods, kwh, counts
+    change = np.ones(kwh.size, dtype=bool)
+    change[1:] = (meter_codes[1:] != meter_codes[:-1]) | (periods[1:] != periods[:-1])
+    starts = np.flatnonzero(change)
+    return (
+        meter_codes[starts],
+        periods[starts],
+        np.add.reduceat(kwh, starts),
+        np.add.reduceat(counts, starts),
+    )
+
+
+@dataclass
+class MeterRollups:
+    """Hourly, daily, monthly and yearly consumption for a set of meters."""
+
+    meter_ids: List[str]
+    levels: Dict[str, RollupLevel] = field(default_factory=dict)
+    rollovers: int = 0
+    resets: int = 0
+
+    @classmethod
+    def from_intervals(cls, intervals: MeterIntervals) -> "MeterRollups":
+        """
+        Roll intervals up to every resolution in one pass.
+
+        Each interval is attributed to the period containing its start;
+        every coarser level is reduced from the level below it.
+        """
+        hours = np.floor_divide(intervals.starts, _NS_PER_HOUR)
+        codes, periods, kwh, counts = _reduce_runs(
+            intervals.meter_codes, hours, intervals.kwh, np.ones(intervals.kwh.size, dtype=np.int64)
+        )
+        levels = {"hourly": RollupLevel("hourly", codes, periods, kwh, counts)}
+
+        coarser = {
+            "daily": lambda hour: np.floor_divide(hour, 24),
+            "monthly": lambda day: day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64),
+            "yearly": lambda month: np.floor_divide(month, 12) + 1970,
+        }
+        for resolution, to_period in coarser.items():
+            codes, periods, kwh, counts = _reduce_runs(codes, to_period(periods), kwh, counts)
+            levels[resolution] = RollupLevel(resolution, codes, periods, kwh, counts)
+
+        return cls(
+            meter_ids=intervals.meter_ids,
+            levels=levels,
+            rollovers=intervals.rollovers,
+            resets=intervals.resets,
+        )
+
+    def series(self, meter_id: str, resolution: str = "hourly") -> pd.Series:
+        """Consumption of one meter at one resolution."""
+        level = self.levels[resolution]
+        part = level.meter_slice(self.meter_ids.index(meter_id))
+        return pd.Series(level.kwh[part], index=level.period_starts()[part], name=meter_id)
+
+    def years(self) -> List[int]:
+        """Calendar years with data, ascending."""
+        return sorted(set(self.levels["yearly"].periods.tolist()))
+
+    def to_aggregated_energy_data(
+        self,
+        meters: Mapping[str, EnergyMeter],
+        year: Optional[int] = None,
+        include_profiles: bool = True,
+    ) -> List[AggregatedEnergyData]:
+        """
+        One AggregatedEnergyData per meter (and year) for primary energy workflows.
+
+        Args:
+            meters: EnergyMeter objects by ID (meters not listed are skipped)
+            year: Restrict to one calendar year; all years when None
+            include_profiles: Fill hourly/daily/monthly breakdown lists, dense
+                over the period with NaN for gaps
+
+        Returns:
+            List of AggregatedEnergyData with resolution "yearly"
+        """
+        yearly = self.levels["yearly"]
+        results: List[AggregatedEnergyData] = []
+        for code, meter_id in enumerate(self.meter_ids):
+            meter = meters.get(meter_id)
+            if meter is None:
+                continue
+            part = yearly.meter_slice(code)
+            for period, total in zip(yearly.periods[part], yearly.kwh[part]):
+                if year is not None and period != year:
+                    continue
+                if total < 0:
+                    print(f"Warning: Net negative consumption for meter {meter_id} in {period}, skipping")
+                    continue
+                start = pd.Timestamp(int(period), 1, 1)
+                end = pd.Timestamp(int(period) + 1, 1, 1)
+                hours = self._dense(code, "hourly", start, end)
+                profiles = {}
+                if include_profiles:
+                    profiles = {
+                        "hourly_data": hours.tolist(),
+                        "daily_data": self._dense(code, "daily", start, end).tolist(),
+                        "monthly_data": self._dense(code, "monthly", start, end).tolist(),
+                    }
+                observed = ~np.isnan(hours)
+                results.append(
+                    AggregatedEnergyData(
+                        spatial_entity_id=meter.spatial_entity_id,
+                        carrier=meter.carrier,
+                        period_start=start.to_pydatetime(),
+                        period_end=end.to_pydatetime(),
+                        resolution="yearly",
+                        total_kwh=float(total),
+                        average_kwh=float(hours[observed].mean()) if observed.any() else None,
+                        peak_kwh=float(hours[observed].max()) if observed.any() else None,
+                        metadata={"meter_id": meter_id, "year": int(period)},
+                        **profiles,
+                    )
+                )
+        return results
+
+    def _dense(self, code: int, resolution: str, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+        """Consumption of one meter from start to end, one entry per period (NaN for gaps)."""
+        if resolution == "hourly":
+            first, stop = start.value // _NS_PER_HOUR, end.value // _NS_PER_HOUR
+        elif resolution == "daily":
+            first, stop = start.value // (_NS_PER_HOUR * 24), end.value // (_NS_PER_HOUR * 24)
+        else:
+            first, stop = (start.year - 1970) * 12 + start.month - 1, (end.year - 1970) * 12 + end.month - 1
+        level = self.levels[resolution]
+        part = level.meter_slice(code)
+        periods, kwh = level.periods[part], level.kwh[part]
+        inside = (periods >= first) & (periods < stop)
+        dense = np.full(int(stop - first), np.nan)
+        dense[periods[inside] - first] = kwh[inside]
+        return dense
+
+
+def ingest_meter_readings(
+    batch: MeterReadingBatch,
+    meters: Optional[Mapping[str, EnergyMeter]] = None,
+    rollover_values: Optional[Mapping[str, float]] = None,
+) -> MeterRollups:
+    """
+    Convert readings to intervals and roll them up to all resolutions.
+
+    Args:
+        batch: Readings to ingest
+        meters: EnergyMeter objects by ID (conversion factors, rollover metadata)
+        rollover_values: Register range per meter ID, overriding metadata
+
+    Returns:
+        MeterRollups with hourly, daily, monthly and yearly levels
+    """
+    return MeterRollups.from_intervals(readings_to_intervals(batch, meters, rollover_values))
+
+
+__all__ = [
+    "READING_TYPES",
+    "RESOLUTIONS",
+    "MeterReadingBatch",
+    "MeterIntervals",
+    "RollupLevel",
+    "MeterRollups",
+    "readings_to_intervals",
+    "ingest_meter_readings",
+]
@@ -6,10 +6,21 @@ Models for sensors, metering points, and time series data.
 
 from __future__ import annotations
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel, Field
-
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
+
+from .data_quality import DataQualityProfile
+from .sensor_buffer import (
+    DEFAULT_CAPACITY,
+    SensorRingBuffer,
+    SensorWindow,
+    SpillSink,
+    TimestampLike,
+    to_epoch_ns,
+)
 from .enums import (
     MetricType,
     PointType,
@@ -172,21 +183,181 @@ class TimeSeriesRecord(BaseModel):
 
 class SensorSeries(BaseModel):
     """
-    Lightweight in-memory container for a sequence of sensor records.
+    In-memory buffer of the most recent readings of one sensor.
+
+    Readings live in a fixed-capacity NumPy ring buffer (timestamps, values,
+    quality); ``TimeSeriesRecord`` objects are only built when records are
+    requested. Readings evicted by newer ones go to ``spill`` when set
+    (e.g. a ``BinarySpillStore``). The ``type`` and ``metadata`` of records
+    added through ``add_record(s)`` are kept aside for the readings that
+    differ from the defaults (measured, no metadata) and restored on
+    ``to_records``; the spill sink only receives timestamps, values and
+    quality. ``records`` is a computed field, so ``model_dump`` still
+    materializes every buffered reading.
     """
 
     sensor_id: str
-    records: List[TimeSeriesRecord] = Field(default_factory=list)
+    capacity: int = Field(default=DEFAULT_CAPACITY, gt=0)
+    timezone: Optional[str] = None  # zone of tz-aware readings; buffered stamps are UTC
+
+    _buffer: SensorRingBuffer = PrivateAttr()
+    # Reading ordinal (count of readings ever buffered before it) -> (type, metadata)
+    _extras: Dict[int, Tuple[TimeSeriesType, Dict[str, Any]]] = PrivateAttr(default_factory=dict)
+
+    def __init__(
+        self,
+        records: Optional[Iterable[TimeSeriesRecord]] = None,
+        spill: Optional[SpillSink] = None,
+        **data: Any,
+    ):
+        super().__init__(**data)
+        self._buffer = SensorRingBuffer(self.sensor_id, self.capacity, spill)
+        if records:
+            self.add_records(
+                record if isinstance(record, TimeSeriesRecord) else TimeSeriesRecord.model_validate(record)
+                for record in records
+            )
+
+    @property
+    def buffer(self) -> SensorRingBuffer:
+        return self._buffer
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def set_spill(self, spill: Optional[SpillSink]) -> None:
+        """Route evicted readings to ``spill`` (None discards them)."""
+        self._buffer.spill = spill
+
+    # ------------------------------------------------------------------ writes
+    def append(self, timestamp: TimestampLike, value: float, quality: Optional[float] = None) -> None:
+        """Append one reading without building a record."""
+        if self.timezone is None and isinstance(timestamp, datetime) and timestamp.tzinfo is not None:
+            self.timezone = str(pd.Timestamp(timestamp).tz)
+        self._buffer.append(timestamp, value, quality)
+
+    def extend(
+        self,
+        timestamps: Union[np.ndarray, Sequence[TimestampLike], pd.DatetimeIndex],
+        values: Union[np.ndarray, Sequence[float]],
+        quality: Optional[Union[np.ndarray, Sequence[Optional[float]]]] = None,
+    ) -> int:
+        """Append a batch of readings; returns the number appended."""
+        if self.timezone is None and isinstance(timestamps, pd.DatetimeIndex) and timestamps.tz is not None:
+            self.timezone = str(timestamps.tz)
+        return self._buffer.extend(timestamps, values, quality)
 
     def add_record(self, record: TimeSeriesRecord) -> None:
         if record.sensor_id != self.sensor_id:
             raise ValueError("Record sensor_id does not match series sensor_id")
-        self.records.append(record)
+        before = self._ordinal()
+        self.append(record.timestamp, record.value, record.quality)
+        if self._ordinal() > before:
+            self._keep_extras([before], [record])
+
+    def add_records(self, records: Iterable[TimeSeriesRecord]) -> int:
+        """Append a batch of records with one buffer write."""
+        records = list(records)
+        if any(record.sensor_id != self.sensor_id for record in records):
+            raise ValueError("Record sensor_id does not match series sensor_id")
+        if not records:
+            return 0
+        stamps = [record.timestamp for record in records]
+        aware = stamps[0].tzinfo is not None
+        timestamps = pd.DatetimeIndex(pd.to_datetime(stamps, utc=aware))
+        if aware and self.timezone is None:
+            self.timezone = str(pd.Timestamp(stamps[0]).tz)
+
+        # Sort and drop late readings here (as extend would) so each kept
+        # record's ordinal is known
+        epoch = timestamps.as_unit("ns").asi8
+        order = np.argsort(epoch, kind="stable")
+        last = self._buffer.last_timestamp
+        if last is not None:
+            order = order[epoch[order] >= last]
+            self._buffer.late_count += len(records) - order.size
+        before = self._ordinal()
+        count = self.extend(
+            timestamps[order],
+            [records[i].value for i in order],
+            [records[i].quality for i in order],
+        )
+        self._keep_extras(range(before, before + count), [records[i] for i in order])
+        return count
+
+    # ------------------------------------------------------------------ reads
+    def window(self, start: Optional[TimestampLike] = None, end: Optional[TimestampLike] = None) -> SensorWindow:
+        """Zero-copy views of the buffered readings within ``[start, end]``."""
+        return self._buffer.window(start, end)
+
+    def last(self, count: int) -> SensorWindow:
+        """Zero-copy views of the ``count`` newest readings."""
+        return self._buffer.last(count)
+
+    def to_series(self, start: Optional[TimestampLike] = None, end: Optional[TimestampLike] = None) -> pd.Series:
+        """Buffered readings within ``[start, end]`` as a Series."""
+        return self.window(start, end).to_series(self.timezone)
+
+    def to_records(
+        self,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+    ) -> List[TimeSeriesRecord]:
+        """Materialize buffered readings as ``TimeSeriesRecord`` objects."""
+        buffered = self._buffer.window_at(0, len(self._buffer)).timestamps
+        lo = 0 if start is None else int(np.searchsorted(buffered, to_epoch_ns(start), side="left"))
+        hi = len(buffered) if end is None else int(np.searchsorted(buffered, to_epoch_ns(end), side="right"))
+        return self._records(self._buffer.window_at(lo, hi), lo)
+
+    @computed_field
+    @property
+    def records(self) -> List[TimeSeriesRecord]:
+        """All buffered readings as records (materialized on access)."""
+        return self.to_records()
 
     def latest(self) -> Optional[TimeSeriesRecord]:
-        if not self.records:
+        window = self.last(1)
+        if not len(window):
             return None
-        return max(self.records, key=lambda r: r.timestamp)
+        return self._records(window, len(self._buffer) - 1)[0]
+
+    def _ordinal(self) -> int:
+        """Ordinal the next buffered reading will get."""
+        return self._buffer.evicted_count + len(self._buffer)
+
+    def _keep_extras(self, ordinals: Iterable[int], records: Sequence[TimeSeriesRecord]) -> None:
+        for ordinal, record in zip(ordinals, records):
+            if record.type != TimeSeriesType.MEASURED or record.metadata:
+                self._extras[ordinal] = (record.type, record.metadata)
+        self._prune_extras()
+
+    def _prune_extras(self) -> None:
+        oldest = self._buffer.evicted_count
+        if self._extras and min(self._extras) < oldest:
+            self._extras = {ordinal: extra for ordinal, extra in self._extras.items() if ordinal >= oldest}
+
+    def _records(self, window: SensorWindow, offset: int) -> List[TimeSeriesRecord]:
+        """Records of ``window``, whose first reading is buffered reading ``offset``."""
+        self._prune_extras()
+        stamps = pd.DatetimeIndex(window.timestamps.astype("datetime64[ns]"))
+        if self.timezone is not None:
+            stamps = stamps.tz_localize("UTC").tz_convert(self.timezone)
+        first = self._buffer.evicted_count + offset
+        default = (TimeSeriesType.MEASURED, None)
+        records = []
+        for position, (stamp, value, quality) in enumerate(
+            zip(stamps.to_pydatetime(), window.values.tolist(), window.quality.tolist())
+        ):
+            kind, metadata = self._extras.get(first + position, default)
+            records.append(TimeSeriesRecord.model_construct(
+                timestamp=stamp,
+                value=value,
+                sensor_id=self.sensor_id,
+                quality=None if quality != quality else quality,
+                type=kind,
+                metadata={} if metadata is None else metadata,
+            ))
+        return records
 
 
 class TimeSeries(BaseModel):
@@ -205,6 +376,7 @@ class TimeSeries(BaseModel):
     start: Optional[datetime] = None
     end: Optional[datetime] = None
     granularity_seconds: Optional[int] = None
+    quality_profile: Optional[DataQualityProfile] = None  # computed once at ingest
 
     source: Optional[str] = None  # e.g. "sensor", "bms", "simulation", "analytics"
     metadata: Dict[str, Any] = Field(default_factory=dict)
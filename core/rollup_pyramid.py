@@ -0,0 +1,733 @@
+"""
+Multi-resolution rollup pyramids.
+
+A ``RollupPyramid`` keeps count/sum/min/max/first/last (plus the sum of
+squared deviations, for the standard deviation) of a series per bucket at
+several ``TimeResolution`` levels. The finest level is reduced from the raw
+samples in one pass and every coarser level from the finest level it nests
+in, so zooming between hourly, daily, weekly, monthly and yearly views (or
+sub-ranges of them) never touches the raw samples again. Appending samples
+only re-reduces the buckets they fall into.
+
+Buckets follow the pandas ``resample`` conventions used by
+``TimeSeriesAggregator.aggregate_to_resolution``: fixed-width buckets are
+labelled by their start, weeks end on Sunday and are labelled by that
+Sunday, months and years are labelled by their first day. For
+timezone-aware series, sub-daily levels bucket absolute (UTC) time, so
+the repeated hour of a DST fall-back stays two buckets, while days,
+weeks, months and years bucket local wall time, as ``resample`` does.
+A day whose local midnight does not exist is labelled at the shifted
+start; in zones that switch at midnight on a Sunday, ``resample`` counts
+that day's first hour into the previous week, the pyramid into its own.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_quality import get_quality_profile
+from .enums.timeseries import TimeResolution, AggregationMethod
+
+
+_NS_PER_SECOND = 10**9
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
+
+_FIXED_STEP_NS: Dict[TimeResolution, int] = {
+    TimeResolution.MINUTE: 60 * _NS_PER_SECOND,
+    TimeResolution.FIVE_MINUTES: 300 * _NS_PER_SECOND,
+    TimeResolution.FIFTEEN_MINUTES: 900 * _NS_PER_SECOND,
+    TimeResolution.THIRTY_MINUTES: 1_800 * _NS_PER_SECOND,
+    TimeResolution.HOURLY: 3_600 * _NS_PER_SECOND,
+    TimeResolution.DAILY: _NS_PER_DAY,
+}
+_CALENDAR_UNITS: Dict[TimeResolution, str] = {
+    TimeResolution.MONTHLY: "M",
+    TimeResolution.YEARLY: "Y",
+}
+
+# Methods answerable from bucket statistics alone
+PYRAMID_METHODS = frozenset({
+    AggregationMethod.MEAN,
+    AggregationMethod.SUM,
+    AggregationMethod.MIN,
+    AggregationMethod.MAX,
+    AggregationMethod.FIRST,
+    AggregationMethod.LAST,
+    AggregationMethod.COUNT,
+    AggregationMethod.STD,
+})
+
+DEFAULT_RESOLUTIONS: Tuple[TimeResolution, ...] = (
+    TimeResolution.HOURLY,
+    TimeResolution.DAILY,
+    TimeResolution.WEEKLY,
+    TimeResolution.MONTHLY,
+    TimeResolution.YEARLY,
+)
+
+
+def _utc_clock(resolution: TimeResolution) -> bool:
+    """Whether a level of a timezone-aware series buckets UTC rather than wall time."""
+    return resolution in _FIXED_STEP_NS and resolution != TimeResolution.DAILY
+
+
+def bucket_labels(resolution: TimeResolution, stamps: np.ndarray, origin: int = 0) -> np.ndarray:
+    """
+    Bucket label of each nanosecond timestamp at a resolution.
+
+    Args:
+        resolution: Target resolution
+        stamps: int64 nanoseconds since epoch, on the clock the level
+            buckets (UTC or local wall time)
+        origin: Timestamp fixed-width buckets are aligned to
+
+    Returns:
+        int64 bucket labels, matching the labels of ``Series.resample``
+    """
+    stamps = np.asarray(stamps, dtype=np.int64)
+    if resolution in _FIXED_STEP_NS:
+        step = _FIXED_STEP_NS[resolution]
+        return stamps - np.mod(stamps - origin, step)
+    if resolution == TimeResolution.WEEKLY:
+        days = np.floor_divide(stamps, _NS_PER_DAY)
+        weekday = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday=0
+        return (days + 6 - weekday) * _NS_PER_DAY
+    unit = _CALENDAR_UNITS[resolution]
+    return stamps.astype("datetime64[ns]").astype(f"datetime64[{unit}]").astype("datetime64[ns]").astype(np.int64)
+
+
+def _label_range(resolution: TimeResolution, first: int, last: int) -> np.ndarray:
+    """All bucket labels from ``first`` to ``last`` inclusive."""
+    if resolution in _FIXED_STEP_NS:
+        step = _FIXED_STEP_NS[resolution]
+        return np.arange(first, last + step, step, dtype=np.int64)
+    if resolution == TimeResolution.WEEKLY:
+        return np.arange(first, last + 7 * _NS_PER_DAY, 7 * _NS_PER_DAY, dtype=np.int64)
+    unit = _CALENDAR_UNITS[resolution]
+    bounds = np.array([first, last], dtype="datetime64[ns]").astype(f"datetime64[{unit}]")
+    return np.arange(bounds[0], bounds[1] + 1).astype("datetime64[ns]").astype(np.int64)
+
+
+def _nests(fine: TimeResolution, coarse: TimeResolution) -> bool:
+    """True when every ``fine`` bucket lies inside exactly one ``coarse`` bucket."""
+    if fine == coarse:
+        return False
+    if coarse in _FIXED_STEP_NS:
+        return fine in _FIXED_STEP_NS and _FIXED_STEP_NS[coarse] % _FIXED_STEP_NS[fine] == 0
+    if coarse == TimeResolution.YEARLY:
+        return fine in _FIXED_STEP_NS or fine == TimeResolution.MONTHLY
+    # Weeks and months are unions of whole days
+    return fine in _FIXED_STEP_NS
+
+
+def _ordered(resolutions: Iterable[TimeResolution]) -> List[TimeResolution]:
+    """Unique resolutions from finest to coarsest."""
+    wanted = {TimeResolution(r) for r in resolutions}
+    return [r for r in TimeResolution if r in wanted]
+
+
+def _wall_clock_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+@dataclass
+class PyramidLevel:
+    """Per-bucket statistics at one resolution, ordered by bucket label."""
+
+    resolution: TimeResolution
+    labels: np.ndarray    # int64 ns bucket labels (UTC for sub-daily levels of tz-aware series, else wall time)
+    count: np.ndarray     # non-NaN samples per bucket
+    total: np.ndarray     # sum of values
+    m2: np.ndarray        # sum of squared deviations from the bucket mean
+    minimum: np.ndarray
+    maximum: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+    first_ns: np.ndarray  # UTC timestamps of the first/last non-NaN value
+    last_ns: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.labels.size)
+
+    @classmethod
+    def from_samples(
+        cls,
+        resolution: TimeResolution,
+        stamps: np.ndarray,
+        values: np.ndarray,
+    ) -> "PyramidLevel":
+        """Treat every sample as its own bucket (input of the first reduction)."""
+        valid = ~np.isnan(values)
+        return cls(
+            resolution=resolution,
+            labels=stamps,
+            count=valid.astype(np.int64),
+            total=np.where(valid, values, 0.0),
+            m2=np.zeros(values.size),
+            minimum=values,
+            maximum=values,
+            first=values,
+            last=values,
+            first_ns=stamps,
+            last_ns=stamps,
+        )
+
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / np.maximum(self.count, 1), np.nan)
+
+    def take(self, selection: Union[slice, np.ndarray]) -> "PyramidLevel":
+        return PyramidLevel(
+            resolution=self.resolution,
+            labels=self.labels[selection],
+            count=self.count[selection],
+            total=self.total[selection],
+            m2=self.m2[selection],
+            minimum=self.minimum[selection],
+            maximum=self.maximum[selection],
+            first=self.first[selection],
+            last=self.last[selection],
+            first_ns=self.first_ns[selection],
+            last_ns=self.last_ns[selection],
+        )
+
+    @classmethod
+    def concat(cls, resolution: TimeResolution, parts: Sequence["PyramidLevel"]) -> "PyramidLevel":
+        def join(name: str) -> np.ndarray:
+            return np.concatenate([getattr(part, name) for part in parts])
+
+        return cls(
+            resolution=resolution,
+            labels=join("labels"),
+            count=join("count"),
+            total=join("total"),
+            m2=join("m2"),
+            minimum=join("minimum"),
+            maximum=join("maximum"),
+            first=join("first"),
+            last=join("last"),
+            first_ns=join("first_ns"),
+            last_ns=join("last_ns"),
+        )
+
+    def reduce(self, resolution: TimeResolution, bounds: np.ndarray, labels: np.ndarray) -> "PyramidLevel":
+        """
+        Combine runs of consecutive buckets into coarser buckets.
+
+        Buckets must be in time order; ``bounds`` are the run starts and
+        ``labels`` the label of each run.
+        """
+        size = len(self)
+        count = np.add.reduceat(self.count, bounds)
+        total = np.add.reduceat(self.total, bounds)
+        mean = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+        # Chan et al. parallel variance: within-bucket plus between-bucket spread
+        run = np.repeat(np.arange(bounds.size), np.diff(np.append(bounds, size)))
+        spread = np.where(self.count > 0, self.count * (self.mean() - mean[run]) ** 2, 0.0)
+        m2 = np.add.reduceat(self.m2 + spread, bounds)
+
+        valid = self.count > 0
+        position = np.arange(size)
+        first_pos = np.minimum.reduceat(np.where(valid, position, size), bounds)
+        last_pos = np.maximum.reduceat(np.where(valid, position, -1), bounds)
+        filled = count > 0
+
+        def pick(values: np.ndarray, positions: np.ndarray, fill) -> np.ndarray:
+            out = np.full(bounds.size, fill, dtype=values.dtype)
+            out[filled] = values[positions[filled]]
+            return out
+
+        return PyramidLevel(
+            resolution=resolution,
+            labels=labels,
+            count=count,
+            total=total,
+            m2=m2,
+            minimum=np.fmin.reduceat(self.minimum, bounds),
+            maximum=np.fmax.reduceat(self.maximum, bounds),
+            first=pick(self.first, first_pos, np.nan),
+            last=pick(self.last, last_pos, np.nan),
+            first_ns=pick(self.first_ns, first_pos, 0),
+            last_ns=pick(self.last_ns, last_pos, 0),
+        )
+
+    def coalesce(self) -> "PyramidLevel":
+        """Merge buckets sharing a label; buckets may come from overlapping batches."""
+        order = np.lexsort((np.where(self.count > 0, self.first_ns, np.iinfo(np.int64).max), self.labels))
+        merged = self.take(order)
+        bounds = _run_starts(merged.labels)
+        result = merged.reduce(self.resolution, bounds, merged.labels[bounds])
+        # Overlapping batches: the last value is the one with the latest timestamp
+        order = np.lexsort((np.where(self.count > 0, self.last_ns, np.iinfo(np.int64).min), self.labels))
+        latest = self.take(order)
+        ends = np.append(bounds[1:], len(latest)) - 1
+        filled = result.count > 0
+        result.last[filled] = latest.last[ends[filled]]
+        result.last_ns[filled] = latest.last_ns[ends[filled]]
+        return result
+
+
+def _run_starts(labels: np.ndarray) -> np.ndarray:
+    """Start positions of runs of equal, sorted labels."""
+    if labels.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    change = np.ones(labels.size, dtype=bool)
+    change[1:] = labels[1:] != labels[:-1]
+    return np.flatnonzero(change)
+
+
+@dataclass
+class _ReductionStep:
+    """How one level is reduced from the samples (``source=None``) or a finer level."""
+
+    resolution: TimeResolution
+    source: Optional[TimeResolution]
+    bounds: np.ndarray
+    labels: np.ndarray
+    order: Optional[np.ndarray] = None  # sample order by label, when wall time steps back
+
+
+def _reduction_plan(
+    utc: np.ndarray,
+    wall: np.ndarray,
+    resolutions: Sequence[TimeResolution],
+    aware: bool,
+    origin: int = 0,
+) -> List[_ReductionStep]:
+    """Group boundaries of every level; shared by all series on the same timestamps."""
+    steps: List[_ReductionStep] = []
+    built: Dict[TimeResolution, np.ndarray] = {}
+    for resolution in resolutions:
+        # UTC and wall-clock buckets of a tz-aware series need not nest
+        source = next(
+            (
+                fine for fine in reversed(list(built))
+                if _nests(fine, resolution) and (not aware or _utc_clock(fine) == _utc_clock(resolution))
+            ),
+            None,
+        )
+        on_utc = aware and _utc_clock(resolution)
+        if source is not None:
+            child_labels = built[source]
+        else:
+            child_labels = utc if not aware or on_utc else wall
+        per_child = bucket_labels(resolution, child_labels, origin if on_utc else 0)
+        order = None
+        if per_child.size > 1 and np.any(per_child[1:] < per_child[:-1]):
+            # Wall time stepped back across midnight (DST change at 00:00)
+            order = np.argsort(per_child, kind="stable")
+            per_child = per_child[order]
+        bounds = _run_starts(per_child)
+        labels = per_child[bounds]
+        steps.append(_ReductionStep(resolution, source, bounds, labels, order))
+        built[resolution] = labels
+    return steps
+
+
+def _apply_plan(
+    steps: Sequence[_ReductionStep],
+    stamps: np.ndarray,
+    values: np.ndarray,
+) -> Dict[TimeResolution, PyramidLevel]:
+    levels: Dict[TimeResolution, PyramidLevel] = {}
+    for step in steps:
+        if step.bounds.size == 0:
+            levels[step.resolution] = PyramidLevel.from_samples(step.resolution, stamps, values)
+            continue
+        child = (
+            PyramidLevel.from_samples(step.resolution, stamps, values)
+            if step.source is None
+            else levels[step.source]
+        )
+        if step.order is not None:
+            child = child.take(step.order)
+        levels[step.resolution] = child.reduce(step.resolution, step.bounds, step.labels)
+    return levels
+
+
+def _in_zone(
+    timestamps: Union[pd.DatetimeIndex, Sequence, np.ndarray],
+    timezone,
+) -> pd.DatetimeIndex:
+    """Timestamps expressed in a pyramid's timezone (naive wall time when it has none)."""
+    index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if timezone is None:
+        return index.tz_localize(None) if index.tz is not None else index
+    if index.tz is None:
+        return index.tz_localize(timezone, ambiguous=np.ones(len(index), dtype=bool), nonexistent="shift_forward")
+    return index.tz_convert(timezone)
+
+
+def _prepare(
+    timestamps: Union[pd.DatetimeIndex, Sequence, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], pd.DatetimeIndex]:
+    """
+    UTC and wall-clock ns timestamps in time order, plus the sort order if one was needed.
+
+    Naive timestamps are their own wall time and are used as both.
+    """
+    index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(timestamps))
+    utc = index.as_unit("ns").asi8
+    wall = _wall_clock_ns(index) if index.tz is not None else utc
+    if utc.size > 1 and np.any(utc[1:] < utc[:-1]):
+        order = np.argsort(utc, kind="stable")
+        return utc[order], wall[order], order, index
+    return utc, wall, None, index
+
+
+def _utc_origin(index: pd.DatetimeIndex) -> int:
+    """
+    UTC ns of the local midnight starting the first day, modulo one day.
+
+    ``resample`` aligns fixed-width buckets of tz-aware series to it,
+    which differs from UTC alignment in zones with sub-hour offsets.
+    """
+    if index.tz is None or len(index) == 0:
+        return 0
+    midnight = pd.Timestamp(index.min().tz_localize(None).normalize()).tz_localize(
+        index.tz, ambiguous=True, nonexistent="shift_forward"
+    )
+    return int(midnight.as_unit("ns").value % _NS_PER_DAY)
+
+
+def _default_resolutions(index: pd.DatetimeIndex) -> List[TimeResolution]:
+    """Every default level, plus sub-hourly levels no finer than the sampling interval."""
+    resolutions = list(DEFAULT_RESOLUTIONS)
+    if len(index) > 1:
+        step_seconds = get_quality_profile(index).dominant_step_seconds
+        if step_seconds is not None:
+            interval = step_seconds * _NS_PER_SECOND
+            resolutions += [r for r, step in _FIXED_STEP_NS.items() if interval <= step < _FIXED_STEP_NS[TimeResolution.HOURLY]]
+    return _ordered(resolutions)
+
+
+class RollupPyramid:
+    """
+    Precomputed count/sum/min/max/first/last of one series at several resolutions.
+
+    Build with ``RollupPyramid.build`` (or ``build_many`` for several series
+    on the same timestamps), extend with ``append`` and query with
+    ``aggregate``. Medians cannot be derived from bucket statistics and must
+    be computed from the raw samples. ``covers`` tells whether the pyramid
+    still describes a given timestamp list (same length and latest stamp).
+    """
+
+    def __init__(
+        self,
+        levels: Dict[TimeResolution, PyramidLevel],
+        timezone=None,
+        name=None,
+        index_name=None,
+        unit: str = "ns",
+        origin_ns: int = 0,
+        samples: int = 0,
+        last_sample_ns: Optional[int] = None,
+    ):
+        self.levels = levels
+        self.timezone = timezone
+        self.origin_ns = origin_ns
+        self.name = name
+        self.index_name = index_name
+        self.unit = unit
+        # Rows folded in (NaN included) and the latest of their timestamps
+        self.samples = samples
+        self.last_sample_ns = last_sample_ns
+        self.last_timestamp_ns: Optional[int] = None
+        self._refresh_last_timestamp()
+
+    # ------------------------------------------------------------------ build
+    @classmethod
+    def build(
+        cls,
+        data: pd.Series,
+        resolutions: Optional[Iterable[TimeResolution]] = None,
+    ) -> "RollupPyramid":
+        """
+        Build a pyramid from a Series with a DatetimeIndex in one pass.
+
+        Args:
+            data: Raw samples
+            resolutions: Levels to keep (default: hourly to yearly, plus
+                sub-hourly levels no finer than the sampling interval)
+
+        Returns:
+            RollupPyramid
+        """
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise ValueError("Data must have a DatetimeIndex")
+        return cls.build_many(data.index, {data.name: data.to_numpy()}, resolutions)[data.name]
+
+    @classmethod
+    def build_many(
+        cls,
+        timestamps: Union[pd.DatetimeIndex, Sequence, np.ndarray],
+        columns: Mapping[object, Sequence[float]],
+        resolutions: Optional[Iterable[TimeResolution]] = None,
+    ) -> Dict[object, "RollupPyramid"]:
+        """
+        Build pyramids for several series sharing one set of timestamps.
+
+        Bucket boundaries are computed once and reused for every series.
+
+        Args:
+            timestamps: Timestamps shared by all columns
+            columns: Mapping of series name to values
+            resolutions: Levels to keep (see ``build``)
+
+        Returns:
+            Dictionary mapping series name to RollupPyramid
+        """
+        utc, wall, order, index = _prepare(timestamps)
+        levels = _ordered(resolutions) if resolutions is not None else _default_resolutions(index)
+        origin = _utc_origin(index)
+        steps = _reduction_plan(utc, wall, levels, aware=index.tz is not None, origin=origin)
+        unit = getattr(index, "unit", "ns")
+        last_sample = int(utc[-1]) if utc.size else None
+
+        pyramids: Dict[object, RollupPyramid] = {}
+        for name, values in columns.items():
+            array = np.asarray(values, dtype=float)
+            if array.size != utc.size:
+                raise ValueError(f"Series '{name}' has {array.size} values for {utc.size} timestamps")
+            if order is not None:
+                array = array[order]
+            pyramids[name] = cls(
+                _apply_plan(steps, utc, array),
+                timezone=index.tz,
+                name=name,
+                index_name=index.name,
+                unit=unit,
+                origin_ns=origin,
+                samples=int(utc.size),
+                last_sample_ns=last_sample,
+            )
+        return pyramids
+
+    def covers(self, timestamps: Union[pd.DatetimeIndex, Sequence, np.ndarray]) -> bool:
+        """
+        Whether the pyramid still describes a series on these timestamps.
+
+        A cheap staleness check: the number of rows and the latest timestamp
+        must match what was folded in, and both must be naive or tz-aware.
+        """
+        index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(timestamps))
+        if len(index) != self.samples or (index.tz is None) != (self.timezone is None):
+            return False
+        if len(index) == 0:
+            return True
+        return int(index.as_unit("ns").asi8.max()) == self.last_sample_ns
+
+    def _refresh_last_timestamp(self) -> None:
+        """Timestamp of the latest non-NaN sample, which decides whether appends are in order."""
+        latest = [int(level.last_ns[level.count > 0].max()) for level in self.levels.values() if np.any(level.count > 0)]
+        self.last_timestamp_ns = max(latest) if latest else None
+
+    # ------------------------------------------------------------------ append
+    def append(self, data: pd.Series) -> "RollupPyramid":
+        """
+        Fold new samples into every level.
+
+        Samples after the last known timestamp only re-reduce the trailing
+        bucket of each level; late samples are merged into their buckets.
+
+        Args:
+            data: New samples with a DatetimeIndex
+
+        Returns:
+            self
+        """
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise ValueError("Data must have a DatetimeIndex")
+        return self.append_arrays(data.index, data.to_numpy())
+
+    def append_arrays(
+        self,
+        timestamps: Union[pd.DatetimeIndex, Sequence, np.ndarray],
+        values: Sequence[float],
+    ) -> "RollupPyramid":
+        """Array form of ``append``."""
+        utc, wall, order, _ = _prepare(_in_zone(timestamps, self.timezone))
+        array = np.asarray(values, dtype=float)
+        if order is not None:
+            array = array[order]
+        if utc.size == 0:
+            return self
+        self.samples += int(utc.size)
+        self.last_sample_ns = int(utc[-1]) if self.last_sample_ns is None else max(self.last_sample_ns, int(utc[-1]))
+
+        in_order = self.last_timestamp_ns is None or utc[0] >= self.last_timestamp_ns
+        steps = _reduction_plan(utc, wall, list(self.levels), aware=self.timezone is not None, origin=self.origin_ns)
+        incoming = _apply_plan(steps, utc, array)
+
+        for resolution, existing in self.levels.items():
+            new = incoming[resolution]
+            if len(existing) == 0:
+                self.levels[resolution] = new
+            elif in_order and new.labels[0] >= existing.labels[-1]:
+                # Only the trailing bucket can be shared with the new samples
+                split = len(existing) - 1
+                tail = PyramidLevel.concat(resolution, [existing.take(slice(split, None)), new])
+                bounds = _run_starts(tail.labels)
+                merged = tail.reduce(resolution, bounds, tail.labels[bounds])
+                self.levels[resolution] = PyramidLevel.concat(resolution, [existing.take(slice(0, split)), merged])
+            else:
+                self.levels[resolution] = PyramidLevel.concat(resolution, [existing, new]).coalesce()
+
+        self._refresh_last_timestamp()
+        return self
+
+    # ------------------------------------------------------------------ query
+    @property
+    def resolutions(self) -> List[TimeResolution]:
+        return list(self.levels)
+
+    def supports(self, resolution: TimeResolution, method: AggregationMethod) -> bool:
+        """True when ``aggregate(resolution, method)`` can be answered from the pyramid."""
+        return resolution in self.levels and AggregationMethod(method) in PYRAMID_METHODS
+
+    def level(self, resolution: TimeResolution) -> PyramidLevel:
+        if resolution not in self.levels:
+            raise KeyError(f"Resolution {TimeResolution(resolution).value} is not part of this pyramid")
+        return self.levels[resolution]
+
+    def _utc_level(self, resolution: TimeResolution) -> bool:
+        return self.timezone is not None and _utc_clock(resolution)
+
+    def _bound(self, resolution: TimeResolution, value) -> Optional[int]:
+        if value is None:
+            return None
+        stamp = pd.Timestamp(value)
+        origin = 0
+        if self._utc_level(resolution):
+            origin = self.origin_ns
+            if stamp.tz is None:
+                stamp = stamp.tz_localize(self.timezone, ambiguous=True, nonexistent="shift_forward")
+        elif stamp.tz is not None:
+            stamp = stamp.tz_convert(self.timezone).tz_localize(None) if self.timezone is not None else stamp.tz_localize(None)
+        return int(bucket_labels(resolution, np.array([stamp.as_unit("ns").value]), origin)[0])
+
+    def _index(self, resolution: TimeResolution, labels: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(labels.astype("datetime64[ns]"), name=self.index_name)
+        if self._utc_level(resolution):
+            index = index.tz_localize("UTC").tz_convert(self.timezone)
+        elif self.timezone is not None:
+            # A day whose midnight is skipped by DST is labelled at the first valid time
+            index = index.tz_localize(
+                self.timezone,
+                ambiguous=np.ones(labels.size, dtype=bool),
+                nonexistent="shift_forward",
+            )
+        return index.as_unit(self.unit)
+
+    def dense(
+        self,
+        resolution: TimeResolution,
+        start=None,
+        end=None,
+    ) -> Tuple[np.ndarray, np.ndarray, PyramidLevel]:
+        """
+        Buckets covering [start, end] on a gap-free label grid.
+
+        Returns:
+            Tuple of (all labels in range, positions of stored buckets in
+            that grid, stored buckets in range)
+        """
+        level = self.level(resolution)
+        if len(level) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), level
+        lower = self._bound(resolution, start)
+        upper = self._bound(resolution, end)
+        left = 0 if lower is None else int(np.searchsorted(level.labels, lower, side="left"))
+        right = len(level) if upper is None else int(np.searchsorted(level.labels, upper, side="right"))
+        stored = level.take(slice(left, right))
+        if len(stored) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), stored
+        grid = _label_range(resolution, int(stored.labels[0]), int(stored.labels[-1]))
+        return grid, np.searchsorted(grid, stored.labels), stored
+
+    def aggregate(
+        self,
+        resolution: TimeResolution,
+        method: AggregationMethod = AggregationMethod.MEAN,
+        start=None,
+        end=None,
+    ) -> pd.Series:
+        """
+        Aggregate at a stored resolution without touching raw samples.
+
+        The result matches ``Series.resample(resolution.pandas_freq)`` for
+        the method: empty buckets inside the range are NaN (0 for sum and
+        count). ``start``/``end`` select whole buckets that contain them.
+
+        Args:
+            resolution: Stored resolution
+            method: Aggregation method (not MEDIAN)
+            start: Optional first timestamp of the range
+            end: Optional last timestamp of the range
+
+        Returns:
+            Aggregated pandas Series
+        """
+        method = AggregationMethod(method)
+        if method not in PYRAMID_METHODS:
+            raise ValueError(f"Aggregation method '{method.value}' cannot be answered from a rollup pyramid")
+
+        grid, slots, stored = self.dense(resolution, start, end)
+        if method == AggregationMethod.COUNT:
+            values = np.zeros(grid.size, dtype=np.int64)
+            values[slots] = stored.count
+        else:
+            values = np.full(grid.size, 0.0 if method == AggregationMethod.SUM else np.nan)
+            filled = stored.count > 0
+            if method == AggregationMethod.MEAN:
+                bucket = stored.mean()
+            elif method == AggregationMethod.SUM:
+                bucket = stored.total
+            elif method == AggregationMethod.MIN:
+                bucket = stored.minimum
+            elif method == AggregationMethod.MAX:
+                bucket = stored.maximum
+            elif method == AggregationMethod.FIRST:
+                bucket = stored.first
+            elif method == AggregationMethod.LAST:
+                bucket = stored.last
+            else:
+                filled = stored.count > 1
+                bucket = np.sqrt(stored.m2 / np.maximum(stored.count - 1, 1))
+            values[slots[filled]] = bucket[filled]
+
+        return pd.Series(values, index=self._index(resolution, grid), name=self.name)
+
+    def to_frame(self, resolution: TimeResolution, start=None, end=None) -> pd.DataFrame:
+        """All stored statistics of the buckets in range, one row per non-empty bucket label."""
+        _, _, stored = self.dense(resolution, start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(stored.count > 1, np.sqrt(stored.m2 / np.maximum(stored.count - 1, 1)), np.nan)
+        return pd.DataFrame(
+            {
+                "count": stored.count,
+                "sum": stored.total,
+                "mean": stored.mean(),
+                "min": stored.minimum,
+                "max": stored.maximum,
+                "first": stored.first,
+                "last": stored.last,
+                "std": std,
+            },
+            index=self._index(resolution, stored.labels),
+        )
+
+
+__all__ = [
+    "RollupPyramid",
+    "PyramidLevel",
+    "bucket_labels",
+    "PYRAMID_METHODS",
+    "DEFAULT_RESOLUTIONS",
+]
@@ -76,30 +76,19 @@ def generate_occupancy_mask(
 ) -> pd.Series:
     """
     Generate boolean mask for occupied timestamps.
+
+    The profile is compiled into a cached ``FilterPlan``, so the mask is built
+    in one vectorized pass and reused for indexes seen before.
     """
+    from .filters.filter_plan import FilterPlan
+
     if index.tz is not None:
         local_index = index.tz_convert("UTC").tz_localize(None)
     else:
         local_index = index
 
-    holidays_lookup = set(pd.to_datetime(list(holiday_dates or [])))
-    profile_def = PROFILE_DEFINITIONS.get(profile) or PROFILE_DEFINITIONS[OpeningHoursProfile.OFFICE_STANDARD]
-
-    mask_values: List[bool] = []
-    for ts in local_index:
-        day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
-        if day in holidays_lookup:
-            mask_values.append(False)
-            continue
-        weekday = ts.weekday()
-        periods = profile_def.get(weekday, [])
-        in_period = False
-        for start, end in periods:
-            if start <= ts.time() <= end:
-                in_period = True
-                break
-        mask_values.append(in_period)
-    return pd.Series(mask_values, index=index)
+    plan = FilterPlan.for_opening_profile(profile, holidays=list(holiday_dates or []))
+    return pd.Series(plan.mask(local_index), index=index)
 
 
 __all__ = [
@@ -0,0 +1,305 @@
+"""
+Sensor Ring Buffers
+
+Fixed-capacity NumPy storage for live sensor readings. Timestamps (int64
+ns), values and quality (float64, NaN when unknown) are kept in mirrored
+arrays of twice the ring length: every sample is written at its slot and
+at slot + ring length, so any window of buffered samples is one contiguous
+slice and reads return views without copying. Rings are allocated on the
+first append and double as samples arrive until they reach the capacity,
+so sparse or idle sensors do not pay for a full day of 1 Hz slots. Samples
+evicted by new data are handed to an optional spill sink (e.g.
+``BinarySpillStore``) before they are overwritten.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# 24 hours of 1 Hz readings
+DEFAULT_CAPACITY = 86_400
+
+# Ring length allocated on the first append; doubled until the capacity
+INITIAL_SLOTS = 1_024
+
+TimestampLike = Union[int, np.integer, datetime, pd.Timestamp, str]
+
+# Called with (sensor_id, timestamps, values, quality) of evicted samples, oldest first
+SpillSink = Callable[[str, np.ndarray, np.ndarray, np.ndarray], None]
+
+SPILL_DTYPE = np.dtype([("timestamp", "<i8"), ("value", "<f8"), ("quality", "<f8")])
+
+
+def to_epoch_ns(timestamp: TimestampLike) -> int:
+    """Nanoseconds since epoch of a timestamp (UTC for tz-aware inputs)."""
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    return pd.Timestamp(timestamp).as_unit("ns").value
+
+
+def _as_epoch_ns(timestamps: Any) -> np.ndarray:
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "i":
+        return timestamps.astype(np.int64, copy=False)
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "M":
+        return timestamps.astype("datetime64[ns]").astype(np.int64)
+    index = pd.DatetimeIndex(timestamps) if not isinstance(timestamps, pd.DatetimeIndex) else timestamps
+    return index.as_unit("ns").asi8
+
+
+class SensorWindow(NamedTuple):
+    """Read-only views of a contiguous run of buffered samples."""
+
+    timestamps: np.ndarray  # int64 ns since epoch
+    values: np.ndarray
+    quality: np.ndarray  # NaN where unknown
+
+    def __len__(self) -> int:
+        return self.timestamps.size
+
+    def to_series(self, tz: Optional[str] = None) -> pd.Series:
+        """Values as a Series indexed by timestamp (copies)."""
+        index = pd.DatetimeIndex(self.timestamps.astype("datetime64[ns]"))
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        return pd.Series(self.values.copy(), index=index)
+
+
+class SensorRingBuffer:
+    """
+    Fixed-capacity buffer of the most recent samples of one sensor.
+
+    Samples must arrive in non-decreasing time order; samples older than
+    the newest buffered one are dropped and counted in ``late_count``.
+    Storage grows geometrically up to ``capacity``; eviction only starts
+    once ``capacity`` samples are buffered.
+    """
+
+    __slots__ = ("sensor_id", "capacity", "spill", "_timestamps", "_values", "_quality",
+                 "_slots", "_head", "_size", "_last", "evicted_count", "late_count")
+
+    def __init__(self, sensor_id: str, capacity: int = DEFAULT_CAPACITY, spill: Optional[SpillSink] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.sensor_id = sensor_id
+        self.capacity = int(capacity)
+        self.spill = spill
+        self._timestamps = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros(0)
+        self._quality = np.zeros(0)
+        self._slots = 0  # ring length; the arrays hold twice as many
+        self._head = 0  # slot of the oldest sample
+        self._size = 0
+        self._last: Optional[int] = None  # newest timestamp as a Python int for the scalar path
+        self.evicted_count = 0
+        self.late_count = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return self._last if self._size else None
+
+    @property
+    def allocated(self) -> int:
+        """Number of samples the current arrays can hold before growing."""
+        return self._slots
+
+    # ------------------------------------------------------------------ writes
+    def append(self, timestamp: TimestampLike, value: float, quality: Optional[float] = None) -> None:
+        """Append one sample."""
+        stamp = to_epoch_ns(timestamp)
+        if self._size and stamp < self._last:
+            self.late_count += 1
+            return
+        if self._size == self.capacity:
+            self._evict(1)
+        self._reserve(self._size + 1)
+        slot = (self._head + self._size) % self._slots
+        mirror = slot + self._slots
+        quality = np.nan if quality is None else quality
+        self._timestamps[slot] = self._timestamps[mirror] = stamp
+        self._values[slot] = self._values[mirror] = value
+        self._quality[slot] = self._quality[mirror] = quality
+        self._size += 1
+        self._last = stamp
+
+    def extend(
+        self,
+        timestamps: Union[np.ndarray, Sequence[TimestampLike], pd.DatetimeIndex],
+        values: Union[np.ndarray, Sequence[float]],
+        quality: Optional[Union[np.ndarray, Sequence[Optional[float]]]] = None,
+    ) -> int:
+        """
+        Append a batch of samples with vectorized writes.
+
+        The batch is sorted by time if needed; samples older than the newest
+        buffered sample are dropped.
+
+        Returns:
+            Number of samples appended
+        """
+        stamps = _as_epoch_ns(timestamps)
+        values = np.asarray(values, dtype=np.float64)
+        if quality is None:
+            quality = np.full(stamps.size, np.nan)
+        elif isinstance(quality, np.ndarray):
+            quality = quality.astype(np.float64, copy=False)
+        else:
+            quality = np.array([np.nan if q is None else q for q in quality], dtype=np.float64)
+        if not (stamps.size == values.size == quality.size):
+            raise ValueError("timestamps, values and quality must have the same length")
+        if stamps.size > 1 and np.any(stamps[1:] < stamps[:-1]):
+            order = np.argsort(stamps, kind="stable")
+            stamps, values, quality = stamps[order], values[order], quality[order]
+        if self._size:
+            keep = int(np.searchsorted(stamps, self._last, side="left"))
+            if keep:
+                self.late_count += keep
+                stamps, values, quality = stamps[keep:], values[keep:], quality[keep:]
+
+        count = stamps.size
+        if count == 0:
+            return 0
+        if count > self.capacity:
+            # Older part of the batch never enters the buffer
+            self._evict(self._size)
+            overflow = count - self.capacity
+            self._spill(stamps[:overflow], values[:overflow], quality[:overflow])
+            stamps, values, quality = stamps[overflow:], values[overflow:], quality[overflow:]
+            self._head = 0
+        else:
+            excess = self._size + count - self.capacity
+            if excess > 0:
+                self._evict(excess)
+
+        self._reserve(self._size + stamps.size)
+        start = (self._head + self._size) % self._slots
+        first = min(stamps.size, self._slots - start)
+        for source, target in ((stamps, self._timestamps), (values, self._values), (quality, self._quality)):
+            for offset in (0, self._slots):
+                target[offset + start: offset + start + first] = source[:first]
+                target[offset: offset + source.size - first] = source[first:]
+        self._size += stamps.size
+        self._last = int(stamps[-1])
+        return count
+
+    def _reserve(self, count: int) -> None:
+        """Grow the ring (doubling, at most to ``capacity``) so it holds ``count`` samples."""
+        if count <= self._slots:
+            return
+        slots = min(self.capacity, max(count, 2 * self._slots, INITIAL_SLOTS))
+        buffered = self.window_at(0, self._size)
+        timestamps = np.zeros(2 * slots, dtype=np.int64)
+        values = np.full(2 * slots, np.nan)
+        quality = np.full(2 * slots, np.nan)
+        for source, target in zip(buffered, (timestamps, values, quality)):
+            target[:self._size] = source
+            target[slots: slots + self._size] = source
+        self._timestamps, self._values, self._quality = timestamps, values, quality
+        self._slots = slots
+        self._head = 0
+
+    def _evict(self, count: int) -> None:
+        if count <= 0:
+            return
+        window = self.window_at(0, count)
+        self._spill(window.timestamps, window.values, window.quality)
+        self._head = (self._head + count) % self._slots
+        self._size -= count
+
+    def _spill(self, stamps: np.ndarray, values: np.ndarray, quality: np.ndarray) -> None:
+        self.evicted_count += stamps.size
+        if self.spill is not None and stamps.size:
+            self.spill(self.sensor_id, stamps, values, quality)
+
+    def flush(self) -> int:
+        """Spill and drop all buffered samples; returns the number spilled."""
+        count = self._size
+        self._evict(count)
+        self._head = 0
+        return count
+
+    # ------------------------------------------------------------------ reads
+    def window_at(self, start: int, stop: int) -> SensorWindow:
+        """Views of buffered samples ``start:stop`` (0 = oldest)."""
+        start = max(0, min(start, self._size))
+        stop = max(start, min(stop, self._size))
+        offset = self._head
+        return SensorWindow(
+            self._view(self._timestamps, offset + start, offset + stop),
+            self._view(self._values, offset + start, offset + stop),
+            self._view(self._quality, offset + start, offset + stop),
+        )
+
+    @staticmethod
+    def _view(array: np.ndarray, start: int, stop: int) -> np.ndarray:
+        view = array[start:stop]
+        view.flags.writeable = False
+        return view
+
+    def window(
+        self,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+    ) -> SensorWindow:
+        """Views of the buffered samples with ``start <= timestamp <= end``."""
+        stamps = self._timestamps[self._head: self._head + self._size]
+        lo = 0 if start is None else int(np.searchsorted(stamps, to_epoch_ns(start), side="left"))
+        hi = self._size if end is None else int(np.searchsorted(stamps, to_epoch_ns(end), side="right"))
+        return self.window_at(lo, hi)
+
+    def last(self, count: int) -> SensorWindow:
+        """Views of the ``count`` newest samples."""
+        return self.window_at(self._size - count, self._size)
+
+
+class BinarySpillStore:
+    """
+    On-disk sink for evicted samples: one append-only file of
+    ``SPILL_DTYPE`` records per sensor.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sensor_id: str) -> Path:
+        safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in sensor_id)
+        return self.directory / f"{safe}.bin"
+
+    def __call__(self, sensor_id: str, timestamps: np.ndarray, values: np.ndarray, quality: np.ndarray) -> None:
+        records = np.empty(timestamps.size, dtype=SPILL_DTYPE)
+        records["timestamp"] = timestamps
+        records["value"] = values
+        records["quality"] = quality
+        with open(self.path_for(sensor_id), "ab") as handle:
+            records.tofile(handle)
+
+    def read(self, sensor_id: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All spilled (timestamps, values, quality) of a sensor, oldest first."""
+        path = self.path_for(sensor_id)
+        if not os.path.exists(path):
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty, empty
+        records = np.fromfile(path, dtype=SPILL_DTYPE)
+        return records["timestamp"].copy(), records["value"].copy(), records["quality"].copy()
+
+
+__all__ = [
+    "DEFAULT_CAPACITY",
+    "INITIAL_SLOTS",
+    "SPILL_DTYPE",
+    "SpillSink",
+    "SensorWindow",
+    "SensorRingBuffer",
+    "BinarySpillStore",
+    "to_epoch_ns",
+]
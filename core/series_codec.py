@@ -0,0 +1,390 @@
+"""
+Compressed Series Blocks
+
+Lossless in-memory encoding of long sensor series, so a portfolio's
+history can stay resident at a fraction of its float64 footprint.
+
+A series is cut into blocks of a few thousand samples. Each block keeps
+
+- a header: sample count, NaN count, first/last timestamp and the
+  min/max/sum of its values, so range filters and band counts can skip a
+  block or answer it without decoding;
+- delta-of-delta timestamps, zigzag-mapped and bit-packed at the block's
+  widest value (a regular sampling interval packs to zero bits);
+- values as either quantized integers (when every value is an exact
+  decimal with up to ``MAX_DECIMALS`` digits, as sensor readings usually
+  are) delta-encoded and bit-packed with a bitmap of NaN positions, or Gorilla-style XORs of consecutive
+  float64 bit patterns packed within the block's common bit window,
+  whichever is smaller, with raw float64 as the fallback.
+
+Encoding and decoding are vectorized NumPy operations per block; decoding
+reproduces the input bit for bit (NaNs come back as the canonical NaN).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_BLOCK_SIZE = 4096
+MAX_DECIMALS = 3
+
+_U64 = np.uint64
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64, copy=False)
+    return ((values << 1) ^ (values >> 63)).view(_U64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    return (values >> _U64(1)).view(np.int64) ^ -(values & _U64(1)).view(np.int64)
+
+
+def _pack(values: np.ndarray, width: int) -> bytes:
+    """Bit-pack unsigned values at a fixed width, most significant bit first."""
+    if width == 0 or values.size == 0:
+        return b""
+    shifts = np.arange(width - 1, -1, -1, dtype=_U64)
+    bits = ((values[:, None] >> shifts) & _U64(1)).astype(np.uint8)
+    return np.packbits(bits, axis=None).tobytes()
+
+
+def _unpack(data: bytes, width: int, count: int) -> np.ndarray:
+    if width == 0 or count == 0:
+        return np.zeros(count, dtype=_U64)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count * width)
+    shifts = np.arange(width - 1, -1, -1, dtype=_U64)
+    return (bits.reshape(count, width).astype(_U64) << shifts).sum(axis=1, dtype=_U64)
+
+
+def _bit_width(values: np.ndarray) -> int:
+    return int(np.bitwise_or.reduce(values)).bit_length() if values.size else 0
+
+
+@dataclass(frozen=True)
+class SeriesBlock:
+    """One encoded block and its summary header."""
+
+    count: int
+    nan_count: int
+    t_first: int  # ns since epoch
+    t_last: int
+    v_min: float  # NaN when the block holds only NaN
+    v_max: float
+    v_sum: float
+    t_delta: int  # first timestamp step
+    t_width: int
+    t_payload: bytes
+    encoding: str  # "quantized", "xor" or "raw"
+    v_first: int  # first quantized integer or float64 bit pattern
+    v_width: int
+    v_shift: int  # decimals ("quantized") or trailing-zero shift ("xor")
+    v_payload: bytes
+    nan_bitmap: bytes = b""  # NaN positions of "quantized" blocks
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size: payloads plus a fixed header."""
+        return len(self.t_payload) + len(self.v_payload) + len(self.nan_bitmap) + 96
+
+    # ------------------------------------------------------------------ encode
+    @classmethod
+    def encode(cls, timestamps: np.ndarray, values: np.ndarray) -> SeriesBlock:
+        """Encode aligned int64 ns timestamps and float64 values."""
+        count = int(values.size)
+        nan_mask = np.isnan(values)
+        nan_count = int(nan_mask.sum())
+        finite = values[~nan_mask]
+        v_min = float(finite.min()) if finite.size else float("nan")
+        v_max = float(finite.max()) if finite.size else float("nan")
+        v_sum = float(finite.sum()) if finite.size else 0.0
+
+        t_delta, t_width, t_payload = 0, 0, b""
+        if count > 1:
+            deltas = np.diff(timestamps)
+            t_delta = int(deltas[0])
+            dod = _zigzag(np.diff(deltas))
+            t_width = _bit_width(dod)
+            t_payload = _pack(dod, t_width)
+
+        encoding, v_first, v_width, v_shift, v_payload = cls._encode_xor(values)
+        nan_bitmap = b""
+        quantized = cls._encode_quantized(finite) if finite.size else None
+        if quantized is not None:
+            bitmap = np.packbits(nan_mask).tobytes() if nan_count else b""
+            if len(quantized[3]) + len(bitmap) < len(v_payload):
+                encoding = "quantized"
+                v_first, v_width, v_shift, v_payload = quantized
+                nan_bitmap = bitmap
+        if len(v_payload) + len(nan_bitmap) >= 8 * count:
+            encoding, v_first, v_width, v_shift, v_payload = "raw", 0, 64, 0, values.astype("<f8").tobytes()
+            nan_bitmap = b""
+
+        return cls(
+            count=count,
+            nan_count=nan_count,
+            t_first=int(timestamps[0]),
+            t_last=int(timestamps[-1]),
+            v_min=v_min,
+            v_max=v_max,
+            v_sum=v_sum,
+            t_delta=t_delta,
+            t_width=t_width,
+            t_payload=t_payload,
+            encoding=encoding,
+            v_first=v_first,
+            v_width=v_width,
+            v_shift=v_shift,
+            v_payload=v_payload,
+            nan_bitmap=nan_bitmap,
+        )
+
+    @staticmethod
+    def _encode_xor(values: np.ndarray) -> Tuple[str, int, int, int, bytes]:
+        bits = values.astype(np.float64).view(_U64)
+        xors = bits[1:] ^ bits[:-1]
+        combined = int(np.bitwise_or.reduce(xors)) if xors.size else 0
+        if combined == 0:
+            return "xor", int(bits[0]), 0, 0, b""
+        shift = (combined & -combined).bit_length() - 1
+        width = combined.bit_length() - shift
+        return "xor", int(bits[0]), width, shift, _pack(xors >> _U64(shift), width)
+
+    @staticmethod
+    def _encode_quantized(values: np.ndarray) -> Optional[Tuple[int, int, int, bytes]]:
+        if np.any(np.signbit(values) & (values == 0)):
+            return None  # -0.0 does not survive the integer round trip
+        for decimals in range(MAX_DECIMALS + 1):
+            scale = 10.0 ** decimals
+            scaled = np.rint(values * scale)
+            if np.abs(scaled).max() >= 2 ** 53:
+                return None
+            if np.array_equal((scaled / scale).view(_U64), values.view(_U64)):
+                integers = scaled.astype(np.int64)
+                deltas = _zigzag(np.diff(integers))
+                width = _bit_width(deltas)
+                return int(integers[0]), width, decimals, _pack(deltas, width)
+        return None
+
+    # ------------------------------------------------------------------ decode
+    def decode_timestamps(self) -> np.ndarray:
+        """int64 ns timestamps of the block."""
+        if self.count == 1:
+            return np.array([self.t_first], dtype=np.int64)
+        dod = _unzigzag(_unpack(self.t_payload, self.t_width, self.count - 2))
+        deltas = self.t_delta + np.concatenate(([0], np.cumsum(dod)))
+        return self.t_first + np.concatenate(([0], np.cumsum(deltas)))
+
+    def decode_values(self) -> np.ndarray:
+        """float64 values of the block."""
+        if self.encoding == "raw":
+            return np.frombuffer(self.v_payload, dtype="<f8").astype(np.float64)
+        if self.encoding == "quantized":
+            valid = self.count - self.nan_count
+            deltas = _unzigzag(_unpack(self.v_payload, self.v_width, valid - 1))
+            integers = self.v_first + np.concatenate(([0], np.cumsum(deltas)))
+            finite = integers / 10.0 ** self.v_shift
+            if not self.nan_count:
+                return finite
+            nan_mask = np.unpackbits(np.frombuffer(self.nan_bitmap, dtype=np.uint8), count=self.count).astype(bool)
+            values = np.full(self.count, np.nan)
+            values[~nan_mask] = finite
+            return values
+        xors = _unpack(self.v_payload, self.v_width, self.count - 1) << _U64(self.v_shift)
+        bits = np.bitwise_xor.accumulate(np.concatenate((np.array([self.v_first], dtype=_U64), xors)))
+        return bits.view(np.float64)
+
+    # ------------------------------------------------------------------ summaries
+    def overlaps(self, start: Optional[int], end: Optional[int]) -> bool:
+        return (start is None or self.t_last >= start) and (end is None or self.t_first <= end)
+
+    def inside(self, start: Optional[int], end: Optional[int]) -> bool:
+        return (start is None or self.t_first >= start) and (end is None or self.t_last <= end)
+
+
+def _to_ns(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return pd.Timestamp(value).as_unit("ns").value
+
+
+class CompressedSeries:
+    """
+    A time series held as a list of encoded blocks.
+
+    Timestamps must be non-decreasing and are stored as UTC ns (naive
+    timestamps as they are). Queries take optional inclusive ``start``/``end``
+    bounds (timestamps or int ns) and touch only the blocks that overlap
+    them. ``tz`` records the zone of tz-aware input for ``to_series``.
+    """
+
+    __slots__ = ("blocks", "block_size", "tz")
+
+    def __init__(self, blocks: Sequence[SeriesBlock], block_size: int = DEFAULT_BLOCK_SIZE, tz: Any = None):
+        self.blocks: List[SeriesBlock] = list(blocks)
+        self.block_size = block_size
+        self.tz = tz
+
+    @classmethod
+    def encode(
+        cls,
+        timestamps: Any,
+        values: Any,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        tz: Any = None,
+    ) -> CompressedSeries:
+        """
+        Encode a series.
+
+        Args:
+            timestamps: int64 ns array, datetime64 array, DatetimeIndex or
+                timestamp strings (UTC offsets may differ, e.g. across DST)
+            values: Values aligned with the timestamps (None/NaN allowed)
+            block_size: Samples per block
+            tz: Zone ``to_series`` converts to (default: the zone of a
+                tz-aware DatetimeIndex, UTC for tz-aware strings, else naive)
+
+        Raises:
+            ValueError: On length mismatch or unsorted timestamps
+        """
+        if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "i":
+            stamps = timestamps.astype(np.int64, copy=False)
+        else:
+            if tz is None and isinstance(timestamps, pd.DatetimeIndex):
+                tz = timestamps.tz
+            elif tz is None and len(timestamps) and pd.Timestamp(timestamps[0]).tzinfo is not None:
+                tz = "UTC"
+            stamps = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True)).as_unit("ns").asi8
+        values = np.asarray(values, dtype=np.float64)
+        if stamps.size != values.size:
+            raise ValueError("timestamps and values must have the same length")
+        if stamps.size > 1 and np.any(stamps[1:] < stamps[:-1]):
+            raise ValueError("timestamps must be sorted")
+        blocks = [
+            SeriesBlock.encode(stamps[offset: offset + block_size], values[offset: offset + block_size])
+            for offset in range(0, stamps.size, block_size)
+        ]
+        return cls(blocks, block_size, tz)
+
+    def __len__(self) -> int:
+        return sum(block.count for block in self.blocks)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.blocks)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Raw int64 + float64 size over encoded size."""
+        return 16 * len(self) / self.nbytes if self.blocks else 1.0
+
+    def _selected(self, start: Any, end: Any) -> Tuple[Optional[int], Optional[int], List[SeriesBlock]]:
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        return start_ns, end_ns, [block for block in self.blocks if block.overlaps(start_ns, end_ns)]
+
+    def decode(self, start: Any = None, end: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(int64 ns timestamps, float64 values) within the bounds."""
+        start_ns, end_ns, blocks = self._selected(start, end)
+        if not blocks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        stamps = np.concatenate([block.decode_timestamps() for block in blocks])
+        values = np.concatenate([block.decode_values() for block in blocks])
+        if start_ns is not None or end_ns is not None:
+            lo = 0 if start_ns is None else int(np.searchsorted(stamps, start_ns, side="left"))
+            hi = stamps.size if end_ns is None else int(np.searchsorted(stamps, end_ns, side="right"))
+            stamps, values = stamps[lo:hi], values[lo:hi]
+        return stamps, values
+
+    def to_series(self, start: Any = None, end: Any = None) -> pd.Series:
+        stamps, values = self.decode(start, end)
+        index = pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.Series(values, index=index)
+
+    def count_within(
+        self,
+        lower: Optional[float] = None,
+        upper: Optional[float] = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> Tuple[int, int]:
+        """
+        Count non-NaN samples with ``lower <= value <= upper``.
+
+        Blocks wholly inside the time bounds are answered from their
+        headers when their value range is entirely inside or outside the
+        band; only straddling blocks are decoded.
+
+        Returns:
+            (samples within the band, non-NaN samples considered)
+        """
+        start_ns, end_ns, blocks = self._selected(start, end)
+        low = -np.inf if lower is None else lower
+        high = np.inf if upper is None else upper
+        within = total = 0
+        for block in blocks:
+            valid = block.count - block.nan_count
+            if block.inside(start_ns, end_ns):
+                if valid == 0 or block.v_max < low or block.v_min > high:
+                    total += valid
+                    continue
+                if block.v_min >= low and block.v_max <= high:
+                    within += valid
+                    total += valid
+                    continue
+            values = block.decode_values()
+            if not block.inside(start_ns, end_ns):
+                stamps = block.decode_timestamps()
+                keep = np.ones(values.size, dtype=bool)
+                if start_ns is not None:
+                    keep &= stamps >= start_ns
+                if end_ns is not None:
+                    keep &= stamps <= end_ns
+                values = values[keep]
+            values = values[~np.isnan(values)]
+            within += int(np.count_nonzero((values >= low) & (values <= high)))
+            total += values.size
+        return within, total
+
+    def summary(self, start: Any = None, end: Any = None) -> dict:
+        """count/min/max/mean of non-NaN values, from headers where possible."""
+        start_ns, end_ns, blocks = self._selected(start, end)
+        count, total, v_min, v_max = 0, 0.0, np.inf, -np.inf
+        for block in blocks:
+            if block.inside(start_ns, end_ns):
+                valid = block.count - block.nan_count
+                if valid:
+                    count += valid
+                    total += block.v_sum
+                    v_min, v_max = min(v_min, block.v_min), max(v_max, block.v_max)
+                continue
+            stamps, values = block.decode_timestamps(), block.decode_values()
+            keep = ~np.isnan(values)
+            if start_ns is not None:
+                keep &= stamps >= start_ns
+            if end_ns is not None:
+                keep &= stamps <= end_ns
+            values = values[keep]
+            if values.size:
+                count += values.size
+                total += float(values.sum())
+                v_min, v_max = min(v_min, float(values.min())), max(v_max, float(values.max()))
+        if not count:
+            return {"count": 0, "min": None, "max": None, "mean": None}
+        return {"count": count, "min": v_min, "max": v_max, "mean": total / count}
+
+
+__all__ = [
+    "DEFAULT_BLOCK_SIZE",
+    "MAX_DECIMALS",
+    "SeriesBlock",
+    "CompressedSeries",
+]
@@ -6,6 +6,7 @@ Enhanced entities (Portfolio, Building, Floor, Room) are in entities.py.
 """
 
 from __future__ import annotations
+from collections import deque
 from typing import Any, Callable, Dict, List, Optional
 
 from pydantic import BaseModel, Field
@@ -14,12 +15,14 @@ from .aggregators import Aggregator
 from .analysis import AnalysisContext, AnalysisResult, SimulationResult
 from .access import AccessControlEntry, UserContext
 from .enums import (
+    AggregatorType,
     PermissionScope,
     SpatialEntityType,
     VentilationType,
     SpatialEntityType,
 )
 from .metering import SensorDefinition, SensorGroup, SensorSource, SensorSourceType
+from .summary_stats import StatisticalSummary, TimeseriesSummary
 
 
 class SpatialEntity(BaseModel):
@@ -40,6 +43,7 @@ class SpatialEntity(BaseModel):
     country: Optional[str] = None        # e.g. "EU", "US", "DK"
     region: Optional[str] = None         # e.g. "NA", "Nordic", state, etc.
     climate_zone: Optional[str] = None   # any scheme you want
+    weather_station_id: Optional[str] = None  # shared station in the WeatherService
 
     # Semantic building metadata
     building_type: Optional[str] = None  # e.g. "office", "school", ...
@@ -398,6 +402,29 @@ class SpatialEntity(BaseModel):
         
         return None
 
+    def get_weather_station(
+        self,
+        parent_lookup: Optional[Callable[[str], Optional["SpatialEntity"]]] = None,
+        service: Optional[Any] = None,
+    ) -> Optional[Any]:
+        """
+        Resolve the shared weather station for this entity.
+
+        Uses this entity's ``weather_station_id`` or, when unset, the first
+        parent that references a station.
+
+        Args:
+            parent_lookup: Function to retrieve parent entities by ID
+            service: WeatherService to resolve against (defaults to the global one)
+
+        Returns:
+            WeatherStation if found, None otherwise
+        """
+        from .weather import get_weather_service
+
+        service = service or get_weather_service()
+        return service.station_for(self, parent_lookup=parent_lookup)
+
     def get_available_parameters(
         self,
         include_parents: bool = True,
@@ -482,21 +509,261 @@ class SpatialEntity(BaseModel):
         
         return available
 
+    def _own_timeseries(self, parameter: str) -> Optional[List[float]]:
+        """Return this entity's own timeseries for a parameter, if any."""
+        if parameter not in self.sensor_groups:
+            return None
+        return self.get_timeseries_from_hierarchy(parameter, prefer_parents=False)
+
+    def _own_timeseries_with_timestamps(
+        self,
+        parameter: str,
+    ) -> Optional[tuple]:
+        """Return (timestamps, values) of this entity's own sensor, if timestamped."""
+        group = self.sensor_groups.get(parameter)
+        if group is None or not group.sensors:
+            return None
+        ts_data = group.sensors[0].metadata.get('timeseries')
+        if not isinstance(ts_data, dict) or not ts_data:
+            return None
+        first_ts = next(iter(ts_data.values()))
+        if not isinstance(first_ts, dict):
+            return None
+        timestamps = first_ts.get('timestamps')
+        values = first_ts.get('values')
+        if not timestamps or not values:
+            return None
+        return timestamps, values
+
+    def _descendants(
+        self,
+        child_lookup: Callable[[str], Optional["SpatialEntity"]],
+        recursive: bool = True,
+    ) -> List["SpatialEntity"]:
+        """Return each descendant once (direct children only if not recursive)."""
+        found: List["SpatialEntity"] = []
+        seen = {self.id}
+        queue = deque([self])
+        while queue:
+            entity = queue.popleft()
+            for child_id in entity.child_ids:
+                if child_id in seen:
+                    continue
+                child = child_lookup(child_id)
+                if child is None:
+                    continue
+                seen.add(child_id)
+                found.append(child)
+                if recursive:
+                    queue.append(child)
+        return found
+
+    def _align_child_timeseries(
+        self,
+        parameter: str,
+        entities: List["SpatialEntity"],
+        resolution_seconds: Optional[int] = None,
+    ) -> Optional[tuple]:
+        """Align the timestamped series of the given entities on a common grid."""
+        from .timeseries_aggregator import TimeSeriesAggregator
+
+        series = []
+        for entity in entities:
+            data = entity._own_timeseries_with_timestamps(parameter)
+            if data is not None:
+                series.append(data)
+
+        if not series:
+            return None
+
+        return TimeSeriesAggregator.align_to_grid(series, resolution_seconds)
+
+    def aggregate_aligned_timeseries_from_children(
+        self,
+        parameter: str,
+        child_lookup: Callable[[str], Optional["SpatialEntity"]],
+        aggregation_method: str = "mean",
+        recursive: bool = True,
+        resolution_seconds: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate child timeseries after aligning them on their timestamps.
+        
+        Each descendant owning the parameter contributes one row on a common
+        grid (the union of all timestamps, or bins of ``resolution_seconds``).
+        Reductions ignore missing values, so a short or shifted series only
+        affects the timestamps it actually covers.
+        
+        Args:
+            parameter: Parameter name to aggregate (e.g., 'temperature', 'co2')
+            child_lookup: Function to retrieve child entities by ID
+            aggregation_method: How to aggregate ('mean', 'median', 'min', 'max', 'sum')
+            recursive: If True, aggregate from all descendants; if False, only direct children
+            resolution_seconds: Optional grid resolution (e.g. 3600 for hourly)
+        
+        Returns:
+            Dictionary with 'timestamps', 'values' and 'contributor_counts',
+            or None if no timestamped data found
+        
+        Examples:
+            # Hourly mean temperature across all rooms in a building
+            aligned = building.aggregate_aligned_timeseries_from_children(
+                'temperature',
+                child_lookup=get_entity,
+                resolution_seconds=3600,
+            )
+        """
+        from .timeseries_aggregator import TimeSeriesAggregator
+
+        aligned = self._align_child_timeseries(
+            parameter,
+            self._descendants(child_lookup, recursive=recursive),
+            resolution_seconds,
+        )
+        if aligned is None:
+            return None
+
+        grid, matrix = aligned
+        values, counts = TimeSeriesAggregator.reduce_aligned(matrix, aggregation_method)
+
+        return {
+            'timestamps': [ts.isoformat() for ts in grid],
+            'values': values.tolist(),
+            'contributor_counts': counts.tolist(),
+        }
+
+    def summarize_sensor_data_from_children(
+        self,
+        child_lookup: Callable[[str], Optional["SpatialEntity"]],
+        parameters: Optional[List[str]] = None,
+        recursive: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build mergeable summaries of child sensor data in a single post-order pass.
+
+        Every descendant is visited once. Each node is summarised from its
+        children's summaries (count/sum/sum-of-squares/min/max plus a quantile
+        sketch), so raw samples are only read at the entity that owns them.
+
+        Args:
+            child_lookup: Function to retrieve child entities by ID
+            parameters: Restrict to these parameters (default: all found)
+            recursive: If True, include all descendants; if False, only direct children
+
+        Returns:
+            Dictionary mapping parameter -> {'timeseries': TimeseriesSummary,
+            'statistics': StatisticalSummary}
+        """
+        wanted = set(parameters) if parameters is not None else None
+
+        def own_summaries(entity: "SpatialEntity") -> Dict[str, Dict[str, Any]]:
+            result: Dict[str, Dict[str, Any]] = {}
+            for parameter in entity.sensor_groups.keys():
+                if wanted is not None and parameter not in wanted:
+                    continue
+                ts_data = entity._own_timeseries(parameter)
+                if not ts_data:
+                    continue
+                stats = StatisticalSummary.from_values(ts_data)
+                if entity.type == SpatialEntityType.ROOM:
+                    stats.rooms_analyzed = 1
+                result[parameter] = {
+                    'timeseries': TimeseriesSummary.from_values(ts_data),
+                    'statistics': stats,
+                }
+            return result
+
+        def combine(parts: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+            by_parameter: Dict[str, List[Dict[str, Any]]] = {}
+            for part in parts:
+                for parameter, summary in part.items():
+                    by_parameter.setdefault(parameter, []).append(summary)
+
+            combined: Dict[str, Dict[str, Any]] = {}
+            for parameter, summaries in by_parameter.items():
+                stats = summaries[0]['statistics']
+                for summary in summaries[1:]:
+                    stats = stats.merge(summary['statistics'])
+                combined[parameter] = {
+                    'timeseries': TimeseriesSummary.combine([s['timeseries'] for s in summaries]),
+                    'statistics': stats,
+                }
+            return combined
+
+        def children_of(entity: "SpatialEntity") -> List["SpatialEntity"]:
+            children = []
+            for child_id in entity.child_ids:
+                child = child_lookup(child_id)
+                if child is not None:
+                    children.append(child)
+            return children
+
+        if not recursive:
+            return combine([own_summaries(child) for child in children_of(self)])
+
+        # Iterative post-order traversal; summaries of shared descendants are reused
+        descendant_summaries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        own_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        children_cache: Dict[str, List["SpatialEntity"]] = {}
+        on_path: set = set()
+        stack: List[tuple] = [(self, False)]
+
+        while stack:
+            entity, expanded = stack.pop()
+            if entity.id in descendant_summaries:
+                continue
+            if entity.id not in children_cache:
+                children_cache[entity.id] = children_of(entity)
+            children = children_cache[entity.id]
+
+            if not expanded:
+                on_path.add(entity.id)
+                stack.append((entity, True))
+                for child in children:
+                    # Skip finished subtrees and back-edges (cycles)
+                    if child.id in descendant_summaries or child.id in on_path:
+                        continue
+                    stack.append((child, False))
+                continue
+
+            parts = []
+            for child in children:
+                if child.id not in own_cache:
+                    own_cache[child.id] = own_summaries(child)
+                parts.append(own_cache[child.id])
+                if child.child_ids and child.id in descendant_summaries:
+                    parts.append(descendant_summaries[child.id])
+            descendant_summaries[entity.id] = combine(parts)
+            on_path.discard(entity.id)
+
+        return descendant_summaries[self.id]
+
     def aggregate_timeseries_from_children(
         self,
         parameter: str,
         child_lookup: Callable[[str], Optional["SpatialEntity"]],
         aggregation_method: str = "mean",
         recursive: bool = True,
+        alignment: str = "position",
+        resolution_seconds: Optional[int] = None,
     ) -> Optional[List[float]]:
         """
         Aggregate timeseries data from all child entities.
         
+        With ``alignment="position"`` (default) series are aligned by index
+        and truncated to the shortest one. With ``alignment="timestamp"``
+        they are merged on their timestamps, see
+        ``aggregate_aligned_timeseries_from_children``.
+        Mean, min, max and sum are taken over every contributing series;
+        the median is the median of each child's contribution.
+        
         Args:
             parameter: Parameter name to aggregate (e.g., 'temperature', 'co2')
             child_lookup: Function to retrieve child entities by ID
             aggregation_method: How to aggregate ('mean', 'median', 'min', 'max', 'sum')
             recursive: If True, aggregate from all descendants; if False, only direct children
+            alignment: 'position' or 'timestamp'
+            resolution_seconds: Grid resolution for timestamp alignment
         
         Returns:
             Aggregated timeseries values, or None if no data found
@@ -509,61 +776,31 @@ class SpatialEntity(BaseModel):
                 aggregation_method='mean'
             )
         """
-        import numpy as np
-        
-        # Collect timeseries from all children
-        all_timeseries = []
-        
-        for child_id in self.child_ids:
-            child = child_lookup(child_id)
-            if child is None:
-                continue
-            
-            # Get data from direct child
-            if parameter in child.sensor_groups:
-                ts_data = child.get_timeseries_from_hierarchy(
-                    parameter,
-                    prefer_parents=False,
-                )
-                if ts_data:
-                    all_timeseries.append(ts_data)
-            
-            # Recursively get from grandchildren
-            if recursive and child.child_ids:
-                child_agg = child.aggregate_timeseries_from_children(
-                    parameter,
-                    child_lookup=child_lookup,
-                    aggregation_method=aggregation_method,
-                    recursive=True,
-                )
-                if child_agg:
-                    all_timeseries.append(child_agg)
-        
-        if not all_timeseries:
-            return None
-        
-        # Find minimum length to align all series
-        min_length = min(len(ts) for ts in all_timeseries)
-        aligned_series = [ts[:min_length] for ts in all_timeseries]
-        
-        # Convert to numpy array for easy aggregation
-        array = np.array(aligned_series)
-        
-        # Apply aggregation method
-        if aggregation_method == "mean":
-            result = np.mean(array, axis=0)
-        elif aggregation_method == "median":
-            result = np.median(array, axis=0)
-        elif aggregation_method == "min":
-            result = np.min(array, axis=0)
-        elif aggregation_method == "max":
-            result = np.max(array, axis=0)
-        elif aggregation_method == "sum":
-            result = np.sum(array, axis=0)
-        else:
+        if aggregation_method not in ("mean", "median", "min", "max", "sum"):
             raise ValueError(f"Unknown aggregation method: {aggregation_method}")
-        
-        return result.tolist()
+
+        if alignment == "timestamp":
+            aligned = self.aggregate_aligned_timeseries_from_children(
+                parameter,
+                child_lookup=child_lookup,
+                aggregation_method=aggregation_method,
+                recursive=recursive,
+                resolution_seconds=resolution_seconds,
+            )
+            return aligned['values'] if aligned else None
+        if alignment != "position":
+            raise ValueError(f"Unknown alignment: {alignment}")
+
+        summaries = self.summarize_sensor_data_from_children(
+            child_lookup,
+            parameters=[parameter],
+            recursive=recursive,
+        )
+        summary = summaries.get(parameter)
+        if summary is None or summary['timeseries'] is None:
+            return None
+
+        return summary['timeseries'].series(aggregation_method)
 
     def compute_statistics_from_children(
         self,
@@ -574,6 +811,10 @@ class SpatialEntity(BaseModel):
         """
         Compute statistical summary of a parameter across all children.
         
+        Statistics are merged from per-entity summaries rather than from a
+        concatenation of raw samples; median and quartiles come from a
+        quantile sketch and are exact while the children hold up to 512 samples in total.
+        
         Args:
             parameter: Parameter name to analyze
             child_lookup: Function to retrieve child entities by ID
@@ -597,80 +838,40 @@ class SpatialEntity(BaseModel):
             #     'rooms_analyzed': 10
             # }
         """
-        import numpy as np
-        
-        # Collect all values from children
-        all_values = []
-        rooms_analyzed = 0
-        
-        for child_id in self.child_ids:
-            child = child_lookup(child_id)
-            if child is None:
-                continue
-            
-            # Get timeseries from child
-            ts_data = None
-            if parameter in child.sensor_groups:
-                ts_data = child.get_timeseries_from_hierarchy(
-                    parameter,
-                    prefer_parents=False,
-                )
-            
-            if ts_data:
-                all_values.extend(ts_data)
-                if child.type == SpatialEntityType.ROOM:
-                    rooms_analyzed += 1
-            
-            # Recursively get from descendants
-            if recursive and child.child_ids:
-                child_stats = child.compute_statistics_from_children(
-                    parameter,
-                    child_lookup=child_lookup,
-                    recursive=True,
-                )
-                if child_stats and 'values' in child_stats:
-                    values = child_stats['values']
-                    if isinstance(values, list):
-                        all_values.extend(values)
-                    else:
-                        all_values.append(values)
-                    rooms_analyzed += child_stats.get('rooms_analyzed', 0)
-        
-        if not all_values:
+        summaries = self.summarize_sensor_data_from_children(
+            child_lookup,
+            parameters=[parameter],
+            recursive=recursive,
+        )
+        summary = summaries.get(parameter)
+        if summary is None or not summary['statistics'].count:
             return None
-        
-        # Compute statistics
-        values_array = np.array(all_values)
-        
-        stats = {
-            'mean': float(np.mean(values_array)),
-            'median': float(np.median(values_array)),
-            'min': float(np.min(values_array)),
-            'max': float(np.max(values_array)),
-            'std': float(np.std(values_array)),
-            'q25': float(np.percentile(values_array, 25)),
-            'q75': float(np.percentile(values_array, 75)),
-            'count': len(all_values),
-            'rooms_analyzed': rooms_analyzed,
-            'values': all_values,  # Include raw values for potential re-aggregation
-        }
-        
-        return stats
+
+        return summary['statistics'].to_dict()
 
     def auto_aggregate_sensor_data(
         self,
         child_lookup: Callable[[str], Optional["SpatialEntity"]],
         force_recompute: bool = False,
+        alignment: str = "position",
+        resolution_seconds: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Automatically aggregate sensor data from all children.
         
         Creates aggregated timeseries and statistics for all sensor parameters
-        found in child entities. Results are cached in computed_metrics.
+        found in child entities, using one bottom-up pass over the subtree.
+        Results are cached in computed_metrics.
+        
+        With ``alignment="timestamp"`` the timeseries are merged on their
+        timestamps and each parameter also carries 'timestamps' and
+        'contributor_counts'.
         
         Args:
             child_lookup: Function to retrieve child entities by ID
             force_recompute: If True, recompute even if cached
+            alignment: 'position' or 'timestamp'
+            resolution_seconds: Grid resolution for timestamp alignment
         
         Returns:
             Dictionary with aggregated data:
@@ -702,53 +903,38 @@ class SpatialEntity(BaseModel):
         if not self.child_ids:
             return {}
         
-        # Find all parameters available in children
-        available_params = set()
-        for child_id in self.child_ids:
-            child = child_lookup(child_id)
-            if child is None:
-                continue
-            
-            child_params = child.get_available_parameters(
-                include_parents=False,
-                include_children=True,
-                child_lookup=child_lookup,
-            )
-            available_params.update(child_params.keys())
+        if alignment not in ("position", "timestamp"):
+            raise ValueError(f"Unknown alignment: {alignment}")
+        
+        summaries = self.summarize_sensor_data_from_children(child_lookup, recursive=True)
+        descendants = self._descendants(child_lookup) if alignment == "timestamp" else []
         
         # Aggregate each parameter
         aggregated = {}
         
-        for parameter in available_params:
+        for parameter, summary in summaries.items():
             param_data = {}
             
-            # Compute aggregated timeseries
-            for method in ['mean', 'median', 'min', 'max']:
-                try:
-                    ts = self.aggregate_timeseries_from_children(
-                        parameter,
-                        child_lookup=child_lookup,
-                        aggregation_method=method,
-                        recursive=True,
-                    )
-                    if ts:
-                        param_data[f'{method}_timeseries'] = ts
-                except Exception as e:
-                    print(f"Warning: Could not aggregate {parameter} with {method}: {e}")
+            if alignment == "timestamp":
+                from .timeseries_aggregator import TimeSeriesAggregator
+                
+                aligned = self._align_child_timeseries(parameter, descendants, resolution_seconds)
+                if aligned is not None:
+                    grid, matrix = aligned
+                    for method in ['mean', 'median', 'min', 'max']:
+                        values, counts = TimeSeriesAggregator.reduce_aligned(matrix, method)
+                        param_data[f'{method}_timeseries'] = values.tolist()
+                    param_data['timestamps'] = [ts.isoformat() for ts in grid]
+                    param_data['contributor_counts'] = counts.tolist()
+            else:
+                timeseries_summary = summary['timeseries']
+                if timeseries_summary is not None and len(timeseries_summary):
+                    for method in ['mean', 'median', 'min', 'max']:
+                        param_data[f'{method}_timeseries'] = timeseries_summary.series(method)
             
-            # Compute statistics
-            try:
-                stats = self.compute_statistics_from_children(
-                    parameter,
-                    child_lookup=child_lookup,
-                    recursive=True,
-                )
-                if stats:
-                    # Remove raw values from cached stats to save memory
-                    stats_without_values = {k: v for k, v in stats.items() if k != 'values'}
-                    param_data['statistics'] = stats_without_values
-            except Exception as e:
-                print(f"Warning: Could not compute statistics for {parameter}: {e}")
+            stats_summary = summary['statistics']
+            if stats_summary.count:
+                param_data['statistics'] = stats_summary.to_dict()
             
             if param_data:
                 aggregated[parameter] = param_data
@@ -758,6 +944,94 @@ class SpatialEntity(BaseModel):
         
         return aggregated
 
+    def aggregate_simulation_results(
+        self,
+        child_lookup: Callable[[str], Optional["SpatialEntity"]],
+        force_recompute: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Roll up room-level simulation results to this entity.
+        
+        Follows the ``aggregation`` block of each simulation model's
+        config.yaml: the configured metric is combined across descendant
+        entities of the ``rollup_from_children`` types when this entity's
+        type is listed in ``rollup_targets``. For weighted averages the
+        first weight property available on every contributor is used.
+        
+        Args:
+            child_lookup: Function to retrieve child entities by ID
+            force_recompute: If True, recompute even if cached
+        
+        Returns:
+            Dictionary keyed by simulation id, e.g.
+            {'ventilation': {'metric': 'ach', 'value': 3.2, 'weight_property': 'area_m2',
+                             'min': 1.1, 'max': 5.4, 'entities_analyzed': 12}}
+        """
+        from simulations.config.registry import load_all_simulation_configs
+        
+        cache_key = 'simulation_rollup'
+        
+        if not force_recompute and cache_key in self.computed_metrics:
+            return self.computed_metrics[cache_key]
+        
+        entity_type = self.type.value if isinstance(self.type, SpatialEntityType) else str(self.type)
+        descendants = self._descendants(child_lookup)
+        rollup = {}
+        
+        for model_id, config in load_all_simulation_configs().items():
+            aggregation_config = config.get('aggregation') or {}
+            metric = aggregation_config.get('metric')
+            if not metric or entity_type not in aggregation_config.get('rollup_targets', []):
+                continue
+            
+            source_types = config.get('spatial_scope', {}).get('rollup_from_children') or ['room']
+            contributors = []
+            values = []
+            for entity in descendants:
+                if entity.type.value not in source_types:
+                    continue
+                sim_result = entity.computed_metrics.get('simulation_results', {}).get(model_id)
+                if not isinstance(sim_result, dict) or sim_result.get(metric) is None:
+                    continue
+                contributors.append(entity)
+                values.append(float(sim_result[metric]))
+            
+            if not values:
+                continue
+            
+            aggregator_type = AggregatorType(aggregation_config.get('type', AggregatorType.AVERAGE.value))
+            weights = None
+            weight_property = None
+            if aggregator_type in (AggregatorType.WEIGHTED_AVERAGE, AggregatorType.MULTI_PROPERTY_WEIGHTED):
+                for candidate in aggregation_config.get('weight_properties', []):
+                    candidate_weights = [getattr(entity, candidate, None) for entity in contributors]
+                    if all(w is not None for w in candidate_weights):
+                        weights = [float(w) for w in candidate_weights]
+                        weight_property = candidate
+                        break
+                if weights is None:
+                    aggregator_type = AggregatorType.AVERAGE
+            
+            aggregator = Aggregator(
+                id=f"{model_id}_rollup",
+                name=f"{model_id} rollup",
+                type=aggregator_type,
+                weight_properties=[weight_property] if weight_property else [],
+            )
+            
+            rollup[model_id] = {
+                'metric': metric,
+                'value': aggregator.aggregate(values, weights),
+                'aggregation': aggregator_type.value,
+                'weight_property': weight_property,
+                'min': min(values),
+                'max': max(values),
+                'entities_analyzed': len(values),
+            }
+        
+        self.computed_metrics[cache_key] = rollup
+        return rollup
+
     def _aggregate_br18_results(
         self,
         child_results: List[Dict[str, Any]],
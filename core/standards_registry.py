@@ -10,7 +10,7 @@ from __future__ import annotations
 import importlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 import yaml
 
@@ -155,9 +155,30 @@ class StandardConfig:
                     # Top-level required input
                     if key not in available_metrics:
                         return False
-        
+
         return True
 
+    def input_metrics(self, include_optional: bool = True) -> Set[str]:
+        """
+        Metric names listed in the required inputs.
+
+        Args:
+            include_optional: Also return inputs marked ``false`` (used when present)
+
+        Returns:
+            Set of metric names, flattened across nested domains
+        """
+        metrics: Set[str] = set()
+        pending = [self.required_inputs or {}]
+        while pending:
+            inputs = pending.pop()
+            for key, value in inputs.items():
+                if isinstance(value, dict):
+                    pending.append(value)
+                elif value is True or include_optional:
+                    metrics.add(key)
+        return metrics
+
 
 @dataclass
 class SimulationConfig:
@@ -396,9 +417,38 @@ def get_registry() -> AnalysisRegistry:
     return _registry
 
 
+def metrics_for_standards(standards: Iterable[str], include_optional: bool = True) -> Set[str]:
+    """
+    Metric columns needed to evaluate the given standards.
+
+    Standards are looked up in the analysis registry by id; an id that is a
+    prefix of exactly one registered id (``"en16798"`` -> ``"en16798_1"``)
+    is accepted as well.
+
+    Args:
+        standards: Standard ids
+        include_optional: Also read inputs the standard uses when present
+
+    Returns:
+        Union of the standards' input metric names
+    """
+    registered = get_registry().standards
+    metrics: Set[str] = set()
+    for standard in standards:
+        config = registered.get(standard)
+        if config is None:
+            matches = [sid for sid in registered if sid.startswith(standard)]
+            if len(matches) != 1:
+                raise ValueError(f"Unknown standard: {standard}")
+            config = registered[matches[0]]
+        metrics |= config.input_metrics(include_optional=include_optional)
+    return metrics
+
+
 __all__ = [
     "StandardConfig",
     "SimulationConfig",
     "AnalysisRegistry",
     "get_registry",
+    "metrics_for_standards",
 ]
@@ -0,0 +1,485 @@
+"""
+Streaming Compliance Counters
+
+Incremental counterpart of the batch EN16798/TAIL assessments for live
+sensor feeds. Each room keeps running accumulators per parameter (EN16798
+category counts, TAIL colour counts, running mean/min/max and the
+exceedance episode in progress) that are updated in O(1) per reading, so
+compliance can be read at any moment without re-scanning history.
+
+Readings outside the room's occupancy plan only update the unoccupied
+counter, as the batch standards evaluate occupied samples only. Readings of
+several parameters with the same timestamp are combined into one joint
+EN16798 sample, like the batch assessment does; readings are joined within
+a bounded window of recent timestamps, so feeds should be roughly
+interleaved in time (see ``ingest_frame``).
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .filters.filter_plan import FilterPlan
+
+
+EN16798_CATEGORIES: Tuple[str, ...] = ("I", "II", "III", "IV")
+TAIL_COLORS: Tuple[str, ...] = ("green", "yellow", "orange", "red")
+
+# Share of occupied samples that must comply for an EN16798 category
+CATEGORY_COMPLIANCE_PCT = 95.0
+
+# Timestamps kept open for joining readings of other parameters
+JOIN_WINDOW = 64
+
+Band = Tuple[Optional[float], Optional[float]]
+TimestampLike = Union[int, datetime, pd.Timestamp, str]
+
+
+def _wall_clock_ns(timestamp: TimestampLike) -> int:
+    """Integer wall-clock nanoseconds of a reading's timestamp."""
+    if isinstance(timestamp, int):
+        return timestamp
+    stamp = pd.Timestamp(timestamp)
+    if stamp.tz is not None:
+        stamp = stamp.tz_localize(None)
+    return stamp.value
+
+
+def _inside(value: float, band: Band) -> bool:
+    lower, upper = band
+    return (lower is None or value >= lower) and (upper is None or value <= upper)
+
+
+@dataclass
+class StreamingBands:
+    """Threshold bands evaluated per reading for one parameter."""
+
+    parameter: str
+    categories: Optional[Tuple[Band, ...]] = None  # EN16798 I-IV
+    tail: Optional[Tuple[Tuple[str, Optional[float], Optional[float]], ...]] = None
+    tail_percentile: Optional[float] = None  # rate the colour of this percentile instead of the worst colour
+    tail_value_range: Optional[Band] = None  # readings outside are not rated by TAIL
+    tail_round: bool = False
+    episode_band: Optional[Band] = None  # leaving it starts an exceedance episode
+
+    @classmethod
+    def default(
+        cls,
+        parameter: str,
+        season: str = "heating",
+        building_type: Optional[str] = None,
+        outdoor_co2: Optional[float] = None,
+    ) -> "StreamingBands":
+        """
+        EN16798 and TAIL bands of a parameter, as used by the batch standards.
+
+        Episodes track departures from the EN16798 category II band (or the
+        TAIL yellow limit for parameters without EN16798 limits).
+        """
+        from standards.en16798.analysis import EN16798Calculator, EN16798Category
+        from standards.tail.calculator import TAILCalculator
+
+        name = TAILCalculator.PARAMETER_ALIASES.get(parameter.lower().strip(), parameter.lower().strip())
+        cooling = season.lower() == "cooling"
+        categories = list(EN16798Category)
+        outdoor_co2 = EN16798Calculator.OUTDOOR_CO2 if outdoor_co2 is None else outdoor_co2
+
+        if name == "temperature":
+            table = EN16798Calculator.TEMP_COOLING if cooling else EN16798Calculator.TEMP_HEATING
+            bands = tuple((table[c]["lower"], table[c]["upper"]) for c in categories)
+            tail_season = "non_heating" if cooling else "heating"
+            return cls(
+                parameter=name,
+                categories=bands,
+                tail=tuple(TAILCalculator.TEMPERATURE_THRESHOLDS[tail_season]),
+                episode_band=bands[1],
+            )
+        if name == "co2":
+            bands = tuple((None, outdoor_co2 + EN16798Calculator.CO2_ABOVE_OUTDOOR[c]) for c in categories)
+            return cls(
+                parameter=name,
+                categories=bands,
+                tail=tuple(TAILCalculator.CO2_THRESHOLDS),
+                tail_percentile=95.0,
+                episode_band=bands[1],
+            )
+        if name == "relative_humidity":
+            bands = tuple((EN16798Calculator.HUMIDITY[c]["lower"], EN16798Calculator.HUMIDITY[c]["upper"]) for c in categories)
+            key = (building_type or "default").lower()
+            return cls(
+                parameter=name,
+                categories=bands,
+                tail=tuple(TAILCalculator.RH_THRESHOLDS.get(key, TAILCalculator.RH_THRESHOLDS["default"])),
+                tail_value_range=(1.0, 100.0),
+                tail_round=True,
+                episode_band=bands[1],
+            )
+        if name in TAILCalculator.POLLUTANT_THRESHOLDS:
+            thresholds = tuple(TAILCalculator.POLLUTANT_THRESHOLDS[name])
+            return cls(parameter=name, tail=thresholds, episode_band=(None, thresholds[1][2]))
+        return cls(parameter=name)
+
+
+@dataclass
+class ExceedanceEpisode:
+    """A run of consecutive occupied readings outside the episode band."""
+
+    start: int  # wall-clock ns
+    end: int
+    samples: int
+    peak_deviation: float
+
+    @property
+    def duration_hours(self) -> float:
+        return (self.end - self.start) / 3.6e12
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": pd.Timestamp(self.start).isoformat(),
+            "end": pd.Timestamp(self.end).isoformat(),
+            "samples": self.samples,
+            "duration_hours": round(self.duration_hours, 3),
+            "peak_deviation": round(self.peak_deviation, 3),
+        }
+
+
+class ParameterAccumulator:
+    """Running counters of one parameter in one room."""
+
+    __slots__ = (
+        "bands", "count", "mean", "m2", "minimum", "maximum", "last_timestamp",
+        "category_counts", "tail_counts", "tail_count", "episode", "episode_count",
+        "longest_episode", "unoccupied",
+    )
+
+    def __init__(self, bands: StreamingBands):
+        self.bands = bands
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.last_timestamp: Optional[int] = None
+        self.category_counts = [0] * len(bands.categories or ())
+        self.tail_counts = [0] * len(TAIL_COLORS)
+        self.tail_count = 0
+        self.episode: Optional[ExceedanceEpisode] = None
+        self.episode_count = 0
+        self.longest_episode: Optional[ExceedanceEpisode] = None
+        self.unoccupied = 0
+
+    def update(self, stamp: int, value: float) -> Optional[List[bool]]:
+        """
+        Fold in one occupied reading.
+
+        Returns:
+            Per-category compliance of the reading (None if it has no EN16798 bands)
+        """
+        self.last_timestamp = stamp
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+        bands = self.bands
+        compliant = None
+        if bands.categories:
+            compliant = [_inside(value, band) for band in bands.categories]
+            for position, ok in enumerate(compliant):
+                if ok:
+                    self.category_counts[position] += 1
+
+        if bands.tail:
+            rated = value
+            if bands.tail_value_range is None or _inside(value, bands.tail_value_range):
+                if bands.tail_round:
+                    rated = float(round(value))
+                color = len(bands.tail)  # red unless a band matches
+                for position, (_, lower, upper) in enumerate(bands.tail):
+                    if _inside(rated, (lower, upper)):
+                        color = position
+                        break
+                self.tail_counts[color] += 1
+                self.tail_count += 1
+
+        if bands.episode_band is not None:
+            lower, upper = bands.episode_band
+            deviation = 0.0
+            if lower is not None and value < lower:
+                deviation = lower - value
+            elif upper is not None and value > upper:
+                deviation = value - upper
+            if deviation > 0:
+                if self.episode is None:
+                    self.episode = ExceedanceEpisode(stamp, stamp, 1, deviation)
+                    self.episode_count += 1
+                else:
+                    self.episode.end = stamp
+                    self.episode.samples += 1
+                    self.episode.peak_deviation = max(self.episode.peak_deviation, deviation)
+                if self.longest_episode is None or self.episode.end - self.episode.start > self.longest_episode.end - self.longest_episode.start:
+                    self.longest_episode = ExceedanceEpisode(**vars(self.episode))
+            else:
+                self.episode = None
+        return compliant
+
+    def tail_color(self) -> Optional[str]:
+        """TAIL colour: worst colour seen, or the colour of the configured percentile."""
+        if not self.tail_count:
+            return None
+        if self.bands.tail_percentile is not None:
+            # Bands are contiguous on the value axis, so the percentile's colour follows from the counts
+            needed = self.bands.tail_percentile / 100.0 * self.tail_count
+            running = 0
+            for position, count in enumerate(self.tail_counts):
+                running += count
+                if running >= needed:
+                    return TAIL_COLORS[position]
+        for position in range(len(TAIL_COLORS) - 1, -1, -1):
+            if self.tail_counts[position]:
+                return TAIL_COLORS[position]
+        return TAIL_COLORS[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "samples": self.count,
+            "unoccupied_samples": self.unoccupied,
+            "mean": round(self.mean, 3) if self.count else None,
+            "std": round(math.sqrt(self.m2 / (self.count - 1)), 3) if self.count > 1 else None,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+            "last_timestamp": pd.Timestamp(self.last_timestamp).isoformat() if self.last_timestamp is not None else None,
+        }
+        if self.category_counts:
+            result["en16798_compliance"] = {
+                category: round(100.0 * hits / self.count, 2) if self.count else 0.0
+                for category, hits in zip(EN16798_CATEGORIES, self.category_counts)
+            }
+        if self.bands.tail:
+            total = self.tail_count
+            result["tail_distribution"] = {
+                color: round(100.0 * hits / total, 2) if total else 0.0
+                for color, hits in zip(TAIL_COLORS, self.tail_counts)
+            }
+            result["tail_color"] = self.tail_color()
+        if self.bands.episode_band is not None:
+            result["episodes"] = {
+                "count": self.episode_count,
+                "in_progress": self.episode.to_dict() if self.episode is not None else None,
+                "longest": self.longest_episode.to_dict() if self.longest_episode is not None else None,
+            }
+        return result
+
+
+class RoomStreamState:
+    """Accumulators of one room, plus the joint EN16798 counters across parameters."""
+
+    def __init__(
+        self,
+        room_id: str,
+        occupancy: Optional[FilterPlan] = None,
+        season: str = "heating",
+        building_type: Optional[str] = None,
+        bands: Optional[Dict[str, StreamingBands]] = None,
+        join_window: int = JOIN_WINDOW,
+    ):
+        self.room_id = room_id
+        self.occupancy = occupancy
+        self.season = season
+        self.building_type = building_type
+        self.bands: Dict[str, StreamingBands] = dict(bands or {})
+        self.parameters: Dict[str, ParameterAccumulator] = {}
+        self.readings = 0
+
+        # Joint compliance: readings sharing a timestamp form one sample
+        self.joint_counts = [0] * len(EN16798_CATEGORIES)
+        self.joint_samples = 0
+        self.join_window = max(1, join_window)
+        self._pending: "OrderedDict[int, List[bool]]" = OrderedDict()
+
+    def accumulator(self, parameter: str) -> ParameterAccumulator:
+        accumulator = self.parameters.get(parameter)
+        if accumulator is None:
+            bands = self.bands.get(parameter) or StreamingBands.default(parameter, self.season, self.building_type)
+            accumulator = self.parameters[parameter] = ParameterAccumulator(bands)
+        return accumulator
+
+    def update(self, parameter: str, stamp: int, value: float) -> None:
+        """Fold in one reading (wall-clock ns timestamp); NaN readings are ignored."""
+        if value != value:
+            return
+        self.readings += 1
+        accumulator = self.accumulator(parameter)
+        if self.occupancy is not None and not self.occupancy.matches(stamp):
+            accumulator.unoccupied += 1
+            accumulator.episode = None  # episodes do not span unoccupied periods
+            return
+
+        compliant = accumulator.update(stamp, value)
+        if compliant is None:
+            return
+        pending = self._pending.get(stamp)
+        if pending is None:
+            self._pending[stamp] = compliant
+            if len(self._pending) > self.join_window:
+                self._settle(self._pending.popitem(last=False)[1])
+        else:
+            self._pending[stamp] = [a and b for a, b in zip(pending, compliant)]
+
+    def _settle(self, compliant: List[bool]) -> None:
+        self.joint_samples += 1
+        for position, ok in enumerate(compliant):
+            if ok:
+                self.joint_counts[position] += 1
+
+    def joint_compliance(self) -> Dict[str, float]:
+        """EN16798 compliance (%) per category over joint samples, including pending ones."""
+        counts = list(self.joint_counts)
+        samples = self.joint_samples + len(self._pending)
+        for compliant in self._pending.values():
+            counts = [count + int(ok) for count, ok in zip(counts, compliant)]
+        return {
+            category: round(100.0 * hits / samples, 2) if samples else 0.0
+            for category, hits in zip(EN16798_CATEGORIES, counts)
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        compliance = self.joint_compliance()
+        achieved = next(
+            (category for category in EN16798_CATEGORIES if compliance[category] >= CATEGORY_COMPLIANCE_PCT),
+            None,
+        )
+        colors = [acc.tail_color() for acc in self.parameters.values()]
+        colors = [color for color in colors if color is not None]
+        worst = max(colors, key=TAIL_COLORS.index) if colors else None
+        return {
+            "room_id": self.room_id,
+            "readings": self.readings,
+            "season": self.season,
+            "en16798": {
+                "compliance_by_category": compliance,
+                "achieved_category": achieved,
+            },
+            "tail_worst_color": worst,
+            "parameters": {name: acc.snapshot() for name, acc in self.parameters.items()},
+        }
+
+
+class StreamingComplianceEngine:
+    """
+    Live compliance for many rooms, fed one reading at a time.
+
+    Example:
+        engine = StreamingComplianceEngine(season="heating")
+        engine.register_room("room_1", building_type="office")
+        engine.ingest("room_1", "co2", "2024-01-08 09:00", 845.0)
+        engine.snapshot("room_1")["en16798"]["achieved_category"]
+    """
+
+    def __init__(
+        self,
+        season: str = "heating",
+        occupancy: Optional[FilterPlan] = None,
+        use_opening_hours: bool = True,
+    ):
+        """
+        Args:
+            season: EN16798/TAIL season of the temperature bands ("heating" or "cooling")
+            occupancy: Default occupancy plan of rooms registered without one
+            use_opening_hours: Without a plan, derive one from the room's building type
+        """
+        self.season = season
+        self.occupancy = occupancy
+        self.use_opening_hours = use_opening_hours
+        self.rooms: Dict[str, RoomStreamState] = {}
+
+    def register_room(
+        self,
+        room_id: str,
+        building_type: Optional[str] = None,
+        occupancy: Optional[FilterPlan] = None,
+        bands: Optional[Dict[str, StreamingBands]] = None,
+    ) -> RoomStreamState:
+        """Create (or replace) the state of a room."""
+        plan = occupancy or self.occupancy
+        if plan is None and self.use_opening_hours:
+            from .schedules import get_opening_profile_for_building_type
+
+            plan = FilterPlan.for_opening_profile(get_opening_profile_for_building_type(building_type))
+        state = RoomStreamState(room_id, plan, self.season, building_type, bands)
+        self.rooms[room_id] = state
+        return state
+
+    def room(self, room_id: str) -> RoomStreamState:
+        state = self.rooms.get(room_id)
+        return state if state is not None else self.register_room(room_id)
+
+    def ingest(self, room_id: str, parameter: str, timestamp: TimestampLike, value: float) -> None:
+        """Fold one reading into a room's counters (registers unknown rooms)."""
+        self.room(room_id).update(parameter, _wall_clock_ns(timestamp), float(value))
+
+    def ingest_record(self, room_id: str, parameter: str, record: Any) -> None:
+        """Fold in a ``TimeSeriesRecord``."""
+        self.ingest(room_id, parameter, record.timestamp, record.value)
+
+    def ingest_many(
+        self,
+        room_id: str,
+        parameter: str,
+        timestamps: Sequence[TimestampLike],
+        values: Sequence[float],
+    ) -> int:
+        """
+        Fold in a batch of readings of one parameter in order.
+
+        Use ``ingest_frame`` to feed several parameters with joint compliance.
+
+        Returns:
+            Number of readings
+        """
+        state = self.room(room_id)
+        stamps = pd.DatetimeIndex(pd.to_datetime(list(timestamps)))
+        if stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+        for stamp, value in zip(stamps.as_unit("ns").asi8.tolist(), values):
+            state.update(parameter, stamp, float(value))
+        return len(stamps)
+
+    def ingest_frame(self, room_id: str, frame: pd.DataFrame) -> int:
+        """Fold in a wide frame (DatetimeIndex, one column per parameter) row by row."""
+        state = self.room(room_id)
+        stamps = frame.index
+        if stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+        columns = [(str(name), frame[name].to_numpy(dtype=float).tolist()) for name in frame.columns]
+        for position, stamp in enumerate(stamps.as_unit("ns").asi8.tolist()):
+            for name, values in columns:
+                state.update(name, stamp, values[position])
+        return len(stamps) * len(columns)
+
+    def snapshot(self, room_id: Optional[str] = None) -> Dict[str, Any]:
+        """Current compliance of one room, or of all rooms keyed by ID."""
+        if room_id is not None:
+            return self.room(room_id).snapshot()
+        return {rid: state.snapshot() for rid, state in self.rooms.items()}
+
+
+__all__ = [
+    "StreamingBands",
+    "ExceedanceEpisode",
+    "ParameterAccumulator",
+    "RoomStreamState",
+    "StreamingComplianceEngine",
+    "CATEGORY_COMPLIANCE_PCT",
+    "JOIN_WINDOW",
+]
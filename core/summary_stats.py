@@ -0,0 +1,249 @@
+"""
+Mergeable Summary Statistics
+
+Summaries that can be combined without revisiting raw samples. Used by the
+bottom-up sensor aggregation in SpatialEntity so that each node in the
+hierarchy is summarised once and parents are built from child summaries.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+DEFAULT_SKETCH_CENTROIDS = 512
+
+
+@dataclass
+class QuantileSketch:
+    """
+    Compact, mergeable quantile sketch.
+
+    Keeps at most ``max_centroids`` weighted centroids sorted by value.
+    While the number of samples is below that bound the sketch is exact;
+    beyond it adjacent centroids are merged, which keeps quantile error
+    small for the median and quartiles.
+    """
+
+    max_centroids: int = DEFAULT_SKETCH_CENTROIDS
+    means: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=float))
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=float))
+
+    @classmethod
+    def from_values(
+        cls,
+        values: Iterable[float],
+        max_centroids: int = DEFAULT_SKETCH_CENTROIDS,
+    ) -> "QuantileSketch":
+        """Build a sketch from raw samples (NaNs are ignored)."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = np.sort(arr[~np.isnan(arr)])
+        sketch = cls(max_centroids=max_centroids, means=arr, weights=np.ones(arr.size))
+        sketch._compress()
+        return sketch
+
+    @property
+    def total_weight(self) -> float:
+        return float(self.weights.sum())
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Return a new sketch combining this sketch with another."""
+        means = np.concatenate([self.means, other.means])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(means, kind="mergesort")
+        merged = QuantileSketch(
+            max_centroids=min(self.max_centroids, other.max_centroids),
+            means=means[order],
+            weights=weights[order],
+        )
+        merged._compress()
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile (0 <= q <= 1).
+
+        Uses the same linear interpolation as ``numpy.percentile`` when the
+        sketch is still exact.
+        """
+        if self.means.size == 0:
+            return None
+        if self.means.size == 1:
+            return float(self.means[0])
+
+        # Position of each centroid on the 0..N-1 rank axis (centre of its mass)
+        cumulative = np.cumsum(self.weights)
+        positions = cumulative - (self.weights + 1.0) / 2.0
+        target = q * (cumulative[-1] - 1.0)
+        return float(np.interp(target, positions, self.means))
+
+    def _compress(self) -> None:
+        """Merge adjacent centroids until the size bound is respected."""
+        n = self.means.size
+        if n <= self.max_centroids:
+            return
+
+        # Equal-weight buckets over the cumulative rank keep tails and centre balanced
+        cumulative = np.cumsum(self.weights)
+        total = cumulative[-1]
+        bucket = np.minimum(
+            ((cumulative - self.weights / 2.0) / total * self.max_centroids).astype(int),
+            self.max_centroids - 1,
+        )
+        weights = np.bincount(bucket, weights=self.weights, minlength=self.max_centroids)
+        sums = np.bincount(bucket, weights=self.means * self.weights, minlength=self.max_centroids)
+        keep = weights > 0
+        self.weights = weights[keep]
+        self.means = sums[keep] / self.weights
+
+
+@dataclass
+class StatisticalSummary:
+    """
+    Mergeable summary of a set of scalar samples.
+
+    Tracks count, sum, sum of squares, min and max exactly, plus a
+    QuantileSketch for median and quartiles.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    rooms_analyzed: int = 0
+
+    @classmethod
+    def from_values(
+        cls,
+        values: Iterable[float],
+        max_centroids: int = DEFAULT_SKETCH_CENTROIDS,
+    ) -> "StatisticalSummary":
+        """Summarise raw samples (NaNs are ignored)."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return cls(sketch=QuantileSketch(max_centroids=max_centroids))
+        return cls(
+            count=int(arr.size),
+            total=float(arr.sum()),
+            total_sq=float(np.dot(arr, arr)),
+            minimum=float(arr.min()),
+            maximum=float(arr.max()),
+            sketch=QuantileSketch.from_values(arr, max_centroids=max_centroids),
+        )
+
+    def merge(self, other: "StatisticalSummary") -> "StatisticalSummary":
+        """Return a new summary combining this summary with another."""
+        return StatisticalSummary(
+            count=self.count + other.count,
+            total=self.total + other.total,
+            total_sq=self.total_sq + other.total_sq,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum),
+            sketch=self.sketch.merge(other.sketch),
+            rooms_analyzed=self.rooms_analyzed + other.rooms_analyzed,
+        )
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation (matches ``numpy.std``)."""
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return float(np.sqrt(variance))
+
+    def to_dict(self) -> Dict[str, float]:
+        """Export in the format used by ``compute_statistics_from_children``."""
+        return {
+            'mean': float(self.mean),
+            'median': self.sketch.quantile(0.5),
+            'min': float(self.minimum),
+            'max': float(self.maximum),
+            'std': self.std,
+            'q25': self.sketch.quantile(0.25),
+            'q75': self.sketch.quantile(0.75),
+            'count': self.count,
+            'rooms_analyzed': self.rooms_analyzed,
+        }
+
+
+@dataclass
+class TimeseriesSummary:
+    """
+    Mergeable per-timestep summary of several position-aligned series.
+
+    Mean, min, max and sum are exact over every contributing series. The
+    median series is the element-wise median of the contributions passed
+    to ``combine`` (each child subtree contributes its own median), which
+    is what the recursive aggregation has always produced.
+    """
+
+    count: np.ndarray
+    total: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    median: np.ndarray
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "TimeseriesSummary":
+        arr = np.asarray(values, dtype=float).ravel()
+        valid = ~np.isnan(arr)
+        return cls(
+            count=valid.astype(np.int64),
+            total=np.where(valid, arr, 0.0),
+            minimum=np.where(valid, arr, np.inf),
+            maximum=np.where(valid, arr, -np.inf),
+            median=arr.copy(),
+        )
+
+    def __len__(self) -> int:
+        return int(self.count.size)
+
+    @classmethod
+    def combine(cls, parts: List["TimeseriesSummary"]) -> Optional["TimeseriesSummary"]:
+        """
+        Combine summaries, truncating to the shortest one so that
+        contributions stay position-aligned.
+        """
+        if not parts:
+            return None
+        length = min(len(p) for p in parts)
+        count = np.sum([p.count[:length] for p in parts], axis=0)
+        total = np.sum([p.total[:length] for p in parts], axis=0)
+        minimum = np.min([p.minimum[:length] for p in parts], axis=0)
+        maximum = np.max([p.maximum[:length] for p in parts], axis=0)
+        median = np.median([p.median[:length] for p in parts], axis=0)
+        return cls(count=count, total=total, minimum=minimum, maximum=maximum, median=median)
+
+    def series(self, method: str) -> List[float]:
+        """Return the aggregated series for ``mean``/``median``/``min``/``max``/``sum``."""
+        if method == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = np.where(self.count > 0, self.total / np.maximum(self.count, 1), np.nan)
+        elif method == "median":
+            result = self.median
+        elif method == "min":
+            result = np.where(self.count > 0, self.minimum, np.nan)
+        elif method == "max":
+            result = np.where(self.count > 0, self.maximum, np.nan)
+        elif method == "sum":
+            result = self.total
+        else:
+            raise ValueError(f"Unknown aggregation method: {method}")
+        return result.tolist()
+
+
+__all__ = [
+    "QuantileSketch",
+    "StatisticalSummary",
+    "TimeseriesSummary",
+]
@@ -2,19 +2,24 @@
 Time Series Aggregation Utilities
 
 Provides utilities for resampling and aggregating time series data
-to ensure minimum resolution requirements are met.
+to ensure minimum resolution requirements are met. Series queried at
+several resolutions can be rolled up once into a ``RollupPyramid`` and
+answered from it.
 """
 
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
 from .enums.timeseries import TimeResolution, AggregationMethod, DataCategory
 from .enums import MetricType
+from .data_quality import DataQualityProfile, get_quality_profile
+from .rollup_pyramid import RollupPyramid, _NS_PER_DAY, _utc_origin, _wall_clock_ns
 
 
 class TimeSeriesAggregator:
@@ -63,43 +68,33 @@ class TimeSeriesAggregator:
     def detect_resolution(
         cls,
         timestamps: Union[List[datetime], pd.DatetimeIndex],
+        profile: Optional[DataQualityProfile] = None,
     ) -> Optional[int]:
         """
         Detect the time resolution (in seconds) from timestamps.
 
+        The resolution is the dominant step of the timestamps' data-quality
+        profile; pass the profile stored at ingest to skip profiling.
+
         Args:
             timestamps: List of datetime objects or DatetimeIndex
+            profile: Optional precomputed profile of ``timestamps``
 
         Returns:
             Detected resolution in seconds or None if cannot be determined
         """
-        if isinstance(timestamps, list):
+        if profile is None:
             if len(timestamps) < 2:
                 return None
-            timestamps = pd.to_datetime(timestamps)
-
-        if len(timestamps) < 2:
-            return None
-
-        # Calculate time differences
-        diffs = timestamps.to_series().diff().dropna()
-
-        if len(diffs) == 0:
-            return None
-
-        # Get the most common interval (mode)
-        most_common_diff = diffs.mode()
-
-        if len(most_common_diff) == 0:
-            return None
-
-        return int(most_common_diff.iloc[0].total_seconds())
+            profile = get_quality_profile(timestamps)
+        return profile.resolution_seconds
 
     @classmethod
     def validate_resolution(
         cls,
         timestamps: Union[List[datetime], pd.DatetimeIndex],
         metric_type: MetricType,
+        profile: Optional[DataQualityProfile] = None,
     ) -> Tuple[bool, Optional[str]]:
         """
         Validate if data resolution meets minimum requirements.
@@ -107,11 +102,12 @@ class TimeSeriesAggregator:
         Args:
             timestamps: List of datetime objects or DatetimeIndex
             metric_type: Type of metric being validated
+            profile: Optional precomputed profile of ``timestamps``
 
         Returns:
             Tuple of (is_valid, message)
         """
-        detected_seconds = cls.detect_resolution(timestamps)
+        detected_seconds = cls.detect_resolution(timestamps, profile=profile)
 
         if detected_seconds is None:
             return False, "Could not detect time resolution"
@@ -128,6 +124,19 @@ class TimeSeriesAggregator:
 
         return True, None
 
+    @classmethod
+    def resolve_method(
+        cls,
+        method: Optional[AggregationMethod] = None,
+        metric_type: Optional[MetricType] = None,
+    ) -> AggregationMethod:
+        """Explicit method, else the metric type's default, else the mean."""
+        if method is not None:
+            return AggregationMethod(method)
+        if metric_type is not None:
+            return cls.get_data_category(metric_type).default_aggregation
+        return AggregationMethod.MEAN
+
     @classmethod
     def aggregate_to_resolution(
         cls,
@@ -135,6 +144,7 @@ class TimeSeriesAggregator:
         target_resolution: TimeResolution,
         method: Optional[AggregationMethod] = None,
         metric_type: Optional[MetricType] = None,
+        pyramid: Optional[RollupPyramid] = None,
     ) -> pd.Series:
         """
         Aggregate time series data to a target resolution.
@@ -144,6 +154,9 @@ class TimeSeriesAggregator:
             target_resolution: Target resolution to aggregate to
             method: Aggregation method (if None, uses default for metric type)
             metric_type: Type of metric (used to determine default method)
+            pyramid: Optional rollup pyramid of ``data``; answers the query
+                without resampling when it holds the resolution and method
+                and still covers ``data`` (same length and last timestamp)
 
         Returns:
             Aggregated pandas Series
@@ -151,12 +164,12 @@ class TimeSeriesAggregator:
         if not isinstance(data.index, pd.DatetimeIndex):
             raise ValueError("Data must have a DatetimeIndex")
 
-        # Determine aggregation method
-        if method is None and metric_type is not None:
-            category = cls.get_data_category(metric_type)
-            method = category.default_aggregation
-        elif method is None:
-            method = AggregationMethod.MEAN
+        method = cls.resolve_method(method, metric_type)
+
+        if pyramid is not None and pyramid.supports(target_resolution, method):
+            if pyramid.covers(data.index):
+                return pyramid.aggregate(target_resolution, method)
+            print(f"Warning: rollup pyramid of '{pyramid.name}' is stale for this data; resampling instead")
 
         # Resample data
         freq = target_resolution.pandas_freq
@@ -190,6 +203,7 @@ class TimeSeriesAggregator:
         data: pd.Series,
         metric_type: MetricType,
         method: Optional[AggregationMethod] = None,
+        profile: Optional[DataQualityProfile] = None,
     ) -> pd.Series:
         """
         Ensure data meets minimum resolution requirement for its type.
@@ -201,6 +215,7 @@ class TimeSeriesAggregator:
             data: pandas Series with DatetimeIndex
             metric_type: Type of metric
             method: Aggregation method (if None, uses default for metric type)
+            profile: Optional precomputed profile of ``data.index``
 
         Returns:
             Aggregated pandas Series meeting minimum resolution
@@ -209,7 +224,7 @@ class TimeSeriesAggregator:
             raise ValueError("Data must have a DatetimeIndex")
 
         # Detect current resolution
-        detected_seconds = cls.detect_resolution(data.index)
+        detected_seconds = cls.detect_resolution(data.index, profile=profile)
 
         if detected_seconds is None:
             # Cannot detect resolution, return as-is
@@ -235,23 +250,35 @@ class TimeSeriesAggregator:
     def aggregate_dict_to_resolution(
         cls,
         timeseries_dict: Dict[str, List[float]],
-        timestamps: List[datetime],
+        timestamps: Union[List[datetime], pd.DatetimeIndex],
         target_resolution: TimeResolution,
         metric_types: Optional[Dict[str, MetricType]] = None,
+        pyramids: Optional[Dict[str, RollupPyramid]] = None,
+        method: Optional[AggregationMethod] = None,
     ) -> Tuple[Dict[str, List[float]], List[datetime]]:
         """
         Aggregate a dictionary of time series to a target resolution.
 
+        Metrics whose pyramid holds the resolution and method and still
+        covers ``timestamps`` are answered from it without building a
+        Series; a metric with such a pyramid may be left out of
+        ``timeseries_dict``. Everything else is resampled.
+
         Args:
             timeseries_dict: Dictionary mapping metric names to value lists
-            timestamps: List of timestamps
+            timestamps: List of timestamps or DatetimeIndex
             target_resolution: Target resolution to aggregate to
             metric_types: Optional mapping of metric names to MetricType
+            pyramids: Optional rollup pyramids per metric (see ``build_pyramids``)
+            method: Aggregation method for every metric (if None, uses the
+                default per metric type)
 
         Returns:
             Tuple of (aggregated_dict, aggregated_timestamps)
         """
-        if not timeseries_dict:
+        pyramids = pyramids or {}
+        names = list(dict.fromkeys([*timeseries_dict, *pyramids]))
+        if not names:
             return {}, []
 
         # Convert timestamps to DatetimeIndex
@@ -260,19 +287,24 @@ class TimeSeriesAggregator:
         aggregated_dict: Dict[str, List[float]] = {}
         aggregated_index: Optional[pd.DatetimeIndex] = None
 
-        for metric_name, values in timeseries_dict.items():
-            # Create Series
-            series = pd.Series(values, index=dt_index)
-
+        for metric_name in names:
             # Determine metric type and aggregation method
             metric_type = metric_types.get(metric_name) if metric_types else None
-
-            # Aggregate
-            aggregated = cls.aggregate_to_resolution(
-                series,
-                target_resolution,
-                metric_type=metric_type,
-            )
+            metric_method = cls.resolve_method(method, metric_type)
+            pyramid = pyramids.get(metric_name)
+
+            if pyramid is not None and pyramid.supports(target_resolution, metric_method) and pyramid.covers(dt_index):
+                aggregated = pyramid.aggregate(target_resolution, metric_method)
+            elif metric_name in timeseries_dict:
+                if pyramid is not None and pyramid.supports(target_resolution, metric_method):
+                    print(f"Warning: rollup pyramid of '{metric_name}' is stale for these timestamps; resampling instead")
+                series = pd.Series(timeseries_dict[metric_name], index=dt_index)
+                aggregated = cls.aggregate_to_resolution(series, target_resolution, method=metric_method)
+            else:
+                raise ValueError(
+                    f"No values for '{metric_name}' and no rollup pyramid covering these timestamps answers "
+                    f"{metric_method.value} at {target_resolution.value}"
+                )
 
             # Store aggregated values
             aggregated_dict[metric_name] = aggregated.tolist()
@@ -286,6 +318,171 @@ class TimeSeriesAggregator:
 
         return aggregated_dict, aggregated_timestamps
 
+    @classmethod
+    def build_pyramid(
+        cls,
+        data: pd.Series,
+        resolutions: Optional[Sequence[TimeResolution]] = None,
+    ) -> RollupPyramid:
+        """
+        Roll a series up into count/sum/min/max/first/last per resolution.
+
+        Args:
+            data: pandas Series with DatetimeIndex
+            resolutions: Levels to keep (default: hourly to yearly, plus
+                sub-hourly levels no finer than the sampling interval)
+
+        Returns:
+            RollupPyramid answering ``aggregate_to_resolution`` queries
+        """
+        return RollupPyramid.build(data, resolutions)
+
+    @classmethod
+    def build_pyramids(
+        cls,
+        timeseries_dict: Dict[str, List[float]],
+        timestamps: List[datetime],
+        resolutions: Optional[Sequence[TimeResolution]] = None,
+    ) -> Dict[str, RollupPyramid]:
+        """
+        Roll up every metric of a dictionary sharing one timestamp list.
+
+        Bucket boundaries are computed once for all metrics.
+
+        Args:
+            timeseries_dict: Dictionary mapping metric names to value lists
+            timestamps: List of timestamps
+            resolutions: Levels to keep (see ``build_pyramid``)
+
+        Returns:
+            Dictionary mapping metric names to RollupPyramid
+        """
+        if not timeseries_dict:
+            return {}
+        return RollupPyramid.build_many(pd.to_datetime(timestamps), timeseries_dict, resolutions)
+
+    @classmethod
+    def align_to_grid(
+        cls,
+        series: List[Tuple[Sequence, Sequence[float]]],
+        resolution_seconds: Optional[int] = None,
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Align several (timestamps, values) series on a common time grid.
+
+        Without a resolution the grid is the sorted union of all timestamps.
+        With a resolution, timestamps are floored to that bin width and values
+        falling into the same bin are averaged. Timestamps missing from a
+        series are NaN in its row.
+
+        Bins follow ``resample``: naive timestamps are binned as they are.
+        Tz-aware series are converted to the zone of the first one; bins of
+        a day or longer start at local midnight (so daily bins are local
+        days, 23 or 25 hours long across DST), shorter bins are counted in
+        absolute time from the local midnight of the first timestamp.
+
+        Args:
+            series: List of (timestamps, values) pairs
+            resolution_seconds: Optional bin width of the target grid
+
+        Returns:
+            Tuple of (grid index, float32 matrix of shape [len(series), len(grid)])
+
+        Raises:
+            ValueError: If tz-aware and naive series are mixed
+        """
+        if not series:
+            return pd.DatetimeIndex([]), np.empty((0, 0), dtype=np.float32)
+
+        indexes = [pd.DatetimeIndex(pd.to_datetime(list(timestamps))) for timestamps, _ in series]
+        aware = {index.tz is not None for index in indexes}
+        if len(aware) > 1:
+            raise ValueError("Cannot align tz-aware and naive timestamps; localize the naive series first")
+        timezone = indexes[0].tz if aware == {True} else None
+        if timezone is not None:
+            indexes = [index.tz_convert(timezone) for index in indexes]
+
+        step = int(resolution_seconds) * 1_000_000_000 if resolution_seconds else None
+        origin = 0
+        if timezone is not None and step is not None and step < _NS_PER_DAY:
+            starts = [index.min() for index in indexes if len(index)]
+            origin = _utc_origin(pd.DatetimeIndex([min(starts)])) if starts else 0
+
+        positions: List[np.ndarray] = []
+        arrays: List[np.ndarray] = []
+
+        for index, (_, values) in zip(indexes, series):
+            stamps = index.as_unit("ns").asi8
+            if step is not None and timezone is not None and step >= _NS_PER_DAY:
+                wall = _wall_clock_ns(index)
+                floored = pd.DatetimeIndex((wall - np.mod(wall, step)).astype("datetime64[ns]"))
+                stamps = floored.tz_localize(
+                    timezone, ambiguous=np.ones(len(floored), dtype=bool), nonexistent="shift_forward"
+                ).as_unit("ns").asi8
+            elif step is not None:
+                stamps = stamps - np.mod(stamps - origin, step)
+            length = min(len(stamps), len(values))
+            positions.append(stamps[:length])
+            arrays.append(np.asarray(values[:length], dtype=float))
+
+        grid = np.unique(np.concatenate(positions))
+        matrix = np.full((len(positions), grid.size), np.nan, dtype=np.float32)
+
+        for row, (stamps, values) in enumerate(zip(positions, arrays)):
+            if stamps.size == 0:
+                continue
+            slots = np.searchsorted(grid, stamps)
+            valid = ~np.isnan(values)
+            sums = np.bincount(slots[valid], weights=values[valid], minlength=grid.size)
+            counts = np.bincount(slots[valid], minlength=grid.size)
+            filled = counts > 0
+            matrix[row, filled] = sums[filled] / counts[filled]
+
+        grid_index = pd.DatetimeIndex(grid.astype("datetime64[ns]"))
+        if timezone is not None:
+            grid_index = grid_index.tz_localize("UTC").tz_convert(timezone)
+        return grid_index, matrix
+
+    @classmethod
+    def reduce_aligned(
+        cls,
+        matrix: np.ndarray,
+        method: str = "mean",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        NaN-aware column reduction of an aligned matrix.
+
+        Args:
+            matrix: Matrix produced by ``align_to_grid``
+            method: 'mean', 'median', 'min', 'max' or 'sum'
+
+        Returns:
+            Tuple of (reduced values, per-timestamp contributor counts).
+            Timestamps without contributors are NaN for every method.
+        """
+        counts = np.count_nonzero(~np.isnan(matrix), axis=0)
+        empty = counts == 0
+
+        if method == "mean":
+            totals = np.nansum(matrix, axis=0, dtype=np.float64)
+            result = totals / np.maximum(counts, 1)
+        elif method == "sum":
+            result = np.nansum(matrix, axis=0, dtype=np.float64)
+        elif method == "min":
+            result = np.fmin.reduce(matrix, axis=0).astype(np.float64)
+        elif method == "max":
+            result = np.fmax.reduce(matrix, axis=0).astype(np.float64)
+        elif method == "median":
+            # Only reduce covered columns; nanmedian warns on all-NaN slices
+            result = np.full(matrix.shape[1], np.nan)
+            if (~empty).any():
+                result[~empty] = np.nanmedian(matrix[:, ~empty], axis=0)
+        else:
+            raise ValueError(f"Unknown aggregation method: {method}")
+
+        result = np.where(empty, np.nan, result)
+        return result, counts
+
 
 class ResamplingConfig(BaseModel):
     """
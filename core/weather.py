@@ -0,0 +1,403 @@
+"""
+Shared weather stations.
+
+Outdoor climate series are usually identical for every building served by
+the same station. ``WeatherService`` stores each distinct series once,
+keyed by station ID or by a hash of its content, and entities keep a
+``weather_station_id`` reference instead of a copy of the data.
+
+Derived series (daily means, the EN 16798-1 running mean, degree-days and
+seasonal flags) are computed lazily on first use and cached on the
+station, so rooms sharing a station reuse them instead of re-deriving them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def _as_series(
+    values: Union[pd.Series, Sequence[float]],
+    timestamps: Optional[Sequence[Any]] = None,
+) -> pd.Series:
+    """Build a sorted, float, DatetimeIndex-ed series (tz-aware input becomes local wall time)."""
+    if isinstance(values, pd.Series) and timestamps is None:
+        series = values
+    else:
+        series = pd.Series(list(values), index=pd.to_datetime(list(timestamps if timestamps is not None else [])))
+    series = pd.to_numeric(series, errors="coerce").astype(float)
+    if not isinstance(series.index, pd.DatetimeIndex):
+        series.index = pd.to_datetime(series.index)
+    if series.index.tz is not None:
+        series = series.tz_localize(None)
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index()
+    return series
+
+
+def series_fingerprint(series: pd.Series) -> str:
+    """Return a content hash of a series' timestamps and values."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(series.index.as_unit("ns").asi8.tobytes())
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype=float, na_value=np.nan)).tobytes())
+    return digest.hexdigest()
+
+
+def _index_key(index: pd.DatetimeIndex) -> Tuple[int, int, int, str]:
+    """Cheap cache key for a target timestamp index."""
+    stamps = index.as_unit("ns").asi8
+    if stamps.size == 0:
+        return (0, 0, 0, "")
+    digest = hashlib.blake2b(stamps.tobytes(), digest_size=8).hexdigest()
+    return (stamps.size, int(stamps[0]), int(stamps[-1]), digest)
+
+
+class WeatherStation:
+    """
+    One outdoor climate record shared by every entity that references it.
+
+    Derived series are cached on first access; call ``invalidate`` after
+    mutating the underlying series.
+    """
+
+    # Degree-day base temperatures (°C)
+    HEATING_BASE_C = 17.0
+    COOLING_BASE_C = 22.0
+
+    # EN 16798-1 running-mean weighting and adaptive-model applicability range
+    RUNNING_MEAN_ALPHA = 0.8
+    HEATING_SEASON_RUNNING_MEAN_C = 15.0
+    ADAPTIVE_RANGE_C = (10.0, 30.0)
+
+    def __init__(
+        self,
+        station_id: str,
+        temperature: pd.Series,
+        humidity: Optional[pd.Series] = None,
+        content_hash: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a station.
+
+        Args:
+            station_id: Station identifier
+            temperature: Outdoor air temperature series (°C)
+            humidity: Optional outdoor relative humidity series (%)
+            content_hash: Precomputed fingerprint of the temperature series
+            metadata: Free-form station metadata (source file, location, ...)
+        """
+        self.station_id = station_id
+        self.temperature = _as_series(temperature)
+        self.humidity = _as_series(humidity) if humidity is not None else None
+        self.content_hash = content_hash or series_fingerprint(self.temperature)
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+        self._cache: Dict[Any, Any] = {}
+
+    def __repr__(self) -> str:
+        return f"WeatherStation(station_id={self.station_id!r}, points={len(self.temperature)})"
+
+    def cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """Return a cached derived value, computing it with ``factory`` on first use."""
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    def invalidate(self) -> None:
+        """Drop all cached derived series."""
+        self._cache.clear()
+
+    def daily_mean(self) -> pd.Series:
+        """Daily mean outdoor temperature (days without data are dropped)."""
+        return self.cached(
+            "daily_mean",
+            lambda: self.temperature.resample("D").mean().dropna(),
+        )
+
+    def running_mean(self, alpha: Optional[float] = None) -> pd.Series:
+        """
+        EN 16798-1 exponentially weighted running mean outdoor temperature.
+
+        The value for day d is ``(1 - alpha) * T_daily(d-1) + alpha * T_rm(d-1)``,
+        seeded with the first daily mean.
+
+        Args:
+            alpha: Weighting constant (defaults to 0.8)
+
+        Returns:
+            Daily running mean series aligned with ``daily_mean()``
+        """
+        alpha = self.RUNNING_MEAN_ALPHA if alpha is None else float(alpha)
+
+        def _compute() -> pd.Series:
+            daily = self.daily_mean()
+            values = daily.to_numpy(dtype=float)
+            if values.size == 0:
+                return daily.copy()
+            smoothed, _ = lfilter([1.0 - alpha], [1.0, -alpha], values, zi=[alpha * values[0]])
+            running = np.empty_like(values)
+            running[0] = values[0]
+            running[1:] = smoothed[:-1]
+            return pd.Series(running, index=daily.index, name="running_mean")
+
+        return self.cached(("running_mean", alpha), _compute)
+
+    def en16798_running_mean(self) -> Optional[float]:
+        """
+        Representative running mean used by the EN 16798-1 calculator.
+
+        Matches ``EN16798Calculator.calculate_running_mean_outdoor_temp`` over
+        the station's daily means, so results equal those obtained from the
+        raw outdoor series.
+        """
+        def _compute() -> Optional[float]:
+            from standards.en16798.analysis import EN16798Calculator
+
+            return EN16798Calculator.calculate_running_mean_outdoor_temp(self.daily_mean().tolist())
+
+        return self.cached("en16798_running_mean", _compute)
+
+    def degree_days(
+        self,
+        heating_base_c: Optional[float] = None,
+        cooling_base_c: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Daily heating and cooling degree-days.
+
+        Args:
+            heating_base_c: Heating base temperature (defaults to 17 °C)
+            cooling_base_c: Cooling base temperature (defaults to 22 °C)
+
+        Returns:
+            DataFrame with ``hdd`` and ``cdd`` columns indexed by day
+        """
+        heating_base = self.HEATING_BASE_C if heating_base_c is None else float(heating_base_c)
+        cooling_base = self.COOLING_BASE_C if cooling_base_c is None else float(cooling_base_c)
+
+        def _compute() -> pd.DataFrame:
+            daily = self.daily_mean()
+            return pd.DataFrame(
+                {
+                    "hdd": np.maximum(heating_base - daily.to_numpy(), 0.0),
+                    "cdd": np.maximum(daily.to_numpy() - cooling_base, 0.0),
+                },
+                index=daily.index,
+            )
+
+        return self.cached(("degree_days", heating_base, cooling_base), _compute)
+
+    def season_flags(self, heating_threshold_c: Optional[float] = None) -> pd.DataFrame:
+        """
+        Daily seasonal flags derived from the running mean.
+
+        Args:
+            heating_threshold_c: Running mean below which a day counts as
+                heating season (defaults to 15 °C)
+
+        Returns:
+            DataFrame with boolean ``heating_season``, ``cooling_season`` and
+            ``adaptive_applicable`` columns indexed by day
+        """
+        threshold = (
+            self.HEATING_SEASON_RUNNING_MEAN_C if heating_threshold_c is None else float(heating_threshold_c)
+        )
+
+        def _compute() -> pd.DataFrame:
+            running = self.running_mean().to_numpy()
+            lower, upper = self.ADAPTIVE_RANGE_C
+            heating = running < threshold
+            return pd.DataFrame(
+                {
+                    "heating_season": heating,
+                    "cooling_season": ~heating,
+                    "adaptive_applicable": (running >= lower) & (running <= upper),
+                },
+                index=self.running_mean().index,
+            )
+
+        return self.cached(("season_flags", threshold), _compute)
+
+    def aligned(self, timestamps: Union[pd.DatetimeIndex, Sequence[Any]], parameter: str = "temperature") -> np.ndarray:
+        """
+        Station values at the given timestamps (last observation carried forward).
+
+        Alignments are cached per target index, so rooms sharing a timestamp
+        grid pay for the lookup once.
+
+        Args:
+            timestamps: Target timestamps (e.g. a room's sample times)
+            parameter: "temperature" or "humidity"
+
+        Returns:
+            Array of values, NaN before the first observation
+        """
+        index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.to_datetime(list(timestamps))
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        def _compute() -> np.ndarray:
+            source = self.temperature if parameter == "temperature" else self.humidity
+            if source is None or source.empty:
+                return np.full(len(index), np.nan)
+            stamps = source.index.as_unit("ns").asi8
+            positions = np.searchsorted(stamps, index.as_unit("ns").asi8, side="right") - 1
+            values = source.to_numpy(dtype=float)
+            aligned = values[np.maximum(positions, 0)]
+            aligned[positions < 0] = np.nan
+            return aligned
+
+        return self.cached(("aligned", parameter, _index_key(index)), _compute)
+
+
+class WeatherService:
+    """
+    Registry of shared weather stations.
+
+    Series registered under an existing station ID, or with content that
+    matches an existing station, resolve to the same ``WeatherStation``.
+    """
+
+    def __init__(self) -> None:
+        self._stations: Dict[str, WeatherStation] = {}
+        self._by_hash: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def __contains__(self, station_id: object) -> bool:
+        return station_id in self._stations
+
+    @property
+    def stations(self) -> Dict[str, WeatherStation]:
+        """Registered stations keyed by station ID."""
+        return dict(self._stations)
+
+    def register(
+        self,
+        temperature: Union[pd.Series, Sequence[float]],
+        timestamps: Optional[Sequence[Any]] = None,
+        station_id: Optional[str] = None,
+        humidity: Optional[Union[pd.Series, Sequence[float]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> WeatherStation:
+        """
+        Register an outdoor series, reusing an existing station when possible.
+
+        Args:
+            temperature: Outdoor temperature series, or values with ``timestamps``
+            timestamps: Timestamps for list input
+            station_id: Known station ID; when omitted the content hash is used
+            humidity: Optional outdoor humidity (series, or values sharing ``timestamps``)
+            metadata: Station metadata; keys already set on an existing station are kept
+
+        Returns:
+            The shared WeatherStation
+        """
+        if station_id is not None and station_id in self._stations:
+            station = self._stations[station_id]
+            self._merge_metadata(station, metadata)
+            return station
+
+        series = _as_series(temperature, timestamps)
+        content_hash = series_fingerprint(series)
+        existing_id = self._by_hash.get(content_hash)
+        if existing_id is not None:
+            station = self._stations[existing_id]
+            self._merge_metadata(station, metadata)
+            if station_id is not None and station_id != existing_id:
+                # Alias the caller's ID to the stored station
+                self._stations[station_id] = station
+            return station
+
+        humidity_series = None
+        if humidity is not None:
+            humidity_series = _as_series(humidity, timestamps if not isinstance(humidity, pd.Series) else None)
+
+        station = WeatherStation(
+            station_id=station_id or f"station_{content_hash[:12]}",
+            temperature=series,
+            humidity=humidity_series,
+            content_hash=content_hash,
+            metadata=metadata,
+        )
+        self._stations[station.station_id] = station
+        self._by_hash[content_hash] = station.station_id
+        return station
+
+    @staticmethod
+    def _merge_metadata(station: WeatherStation, metadata: Optional[Dict[str, Any]]) -> None:
+        for key, value in (metadata or {}).items():
+            station.metadata.setdefault(key, value)
+
+    def get(self, station_id: Optional[str]) -> Optional[WeatherStation]:
+        """Return a station by ID."""
+        if station_id is None:
+            return None
+        return self._stations.get(station_id)
+
+    def assign(self, entities: Iterable[Any], station: Union[WeatherStation, str]) -> None:
+        """Point entities at a station by setting their ``weather_station_id``."""
+        station_id = station.station_id if isinstance(station, WeatherStation) else station
+        if station_id not in self._stations:
+            raise KeyError(f"Unknown weather station: {station_id}")
+        for entity in entities:
+            entity.weather_station_id = station_id
+
+    def station_for(
+        self,
+        entity: Any,
+        parent_lookup: Optional[Callable[[str], Any]] = None,
+    ) -> Optional[WeatherStation]:
+        """
+        Resolve the station referenced by an entity or, failing that, its parents.
+
+        Args:
+            entity: Spatial entity
+            parent_lookup: Function to retrieve parent entities by ID
+
+        Returns:
+            WeatherStation or None
+        """
+        visited = set()
+        pending: List[Any] = [entity]
+        while pending:
+            current = pending.pop(0)
+            if current is None or current.id in visited:
+                continue
+            visited.add(current.id)
+            station = self.get(getattr(current, "weather_station_id", None))
+            if station is not None:
+                return station
+            if parent_lookup is not None:
+                pending.extend(parent_lookup(pid) for pid in getattr(current, "parent_ids", []))
+        return None
+
+    def clear(self) -> None:
+        """Remove all stations."""
+        self._stations.clear()
+        self._by_hash.clear()
+
+
+_weather_service: Optional[WeatherService] = None
+
+
+def get_weather_service() -> WeatherService:
+    """Return the process-wide weather service."""
+    global _weather_service
+    if _weather_service is None:
+        _weather_service = WeatherService()
+    return _weather_service
+
+
+__all__ = [
+    "WeatherStation",
+    "WeatherService",
+    "get_weather_service",
+    "series_fingerprint",
+]
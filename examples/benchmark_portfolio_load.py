@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-room construction cost of portfolio loading.
+
+Writes a synthetic dummy_data tree (hourly temperature/CO2/humidity per
+room), then reports per room:
+
+- the previous wide-CSV parse (``DictReader``, one row loop and one
+  timestamp profile per metric) against ``CSVDataLoader.load_wide_format``,
+  which parses each file once and profiles its timestamps once;
+- a full ``PortfolioLoader`` load and a SQLite store hydration;
+- the cost of the pydantic objects a room load creates, validated and
+  through ``model_construct``, for comparison with the totals above.
+
+    python examples/benchmark_portfolio_load.py --rooms 50 --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.data_quality import DataQualityProfile  # noqa: E402
+from core.entities import Room  # noqa: E402
+from core.enums import MetricType, PointType, SensorSourceType, SpatialEntityType, TimeSeriesType  # noqa: E402
+from core.metering import MeteringPoint, SensorDefinition, SensorSource, TimeSeries  # noqa: E402
+from connectors.csv import CSVDataLoader, PortfolioLoader  # noqa: E402
+from connectors.sqlite import SQLitePortfolioLoader, SQLiteSeriesStore, write_portfolio  # noqa: E402
+
+
+def write_tree(root: Path, rooms: int, days: int) -> List[Path]:
+    """One building, rooms split over two levels, plus a climate file."""
+    rng = np.random.default_rng(0)
+    hours = days * 24
+    stamps = np.datetime_as_string(
+        np.datetime64("2024-01-01T00:00") + np.arange(hours).astype("timedelta64[h]"), unit="s"
+    )
+    stamps = [stamp.replace("T", " ") for stamp in stamps]
+
+    building = root / "building_1"
+    building.mkdir(parents=True)
+    (building / "metadata.json").write_text(json.dumps({"name": "Benchmark Building", "type": "office"}))
+    with open(building / "climate_data.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "temperature", "humidity"])
+        writer.writerows(zip(stamps, np.round(rng.normal(8, 6, hours), 1), np.round(rng.uniform(50, 95, hours), 1)))
+
+    room_files = []
+    for index in range(rooms):
+        level = building / f"level_{index % 2}"
+        level.mkdir(exist_ok=True)
+        path = level / f"room_{index:03d}.csv"
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "temperature", "co2", "humidity"])
+            writer.writerows(zip(
+                stamps,
+                np.round(rng.normal(22, 1.5, hours), 1),
+                np.round(rng.normal(700, 150, hours)),
+                np.round(rng.uniform(30, 60, hours), 1),
+            ))
+        room_files.append(path)
+    return room_files
+
+
+def legacy_parse(csv_path: Path) -> Dict[str, Tuple[List[str], List[float], DataQualityProfile]]:
+    """Reference copy of the previous wide-CSV parse (per-metric row loop and profile)."""
+    with open(csv_path, "r") as f:
+        rows = list(csv.DictReader(f))
+    parsed = {}
+    for column in [col for col in rows[0].keys() if col != "timestamp"]:
+        timestamps, values = [], []
+        for row in rows:
+            try:
+                timestamps.append(row["timestamp"])
+                values.append(float(row[column]))
+            except (ValueError, KeyError):
+                continue
+        parsed[column] = (timestamps, values, DataQualityProfile.from_timestamps(timestamps))
+    return parsed
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def object_costs(samples: int, number: int = 2000) -> List[Tuple[str, float, float]]:
+    """Microseconds per object, validated and via model_construct."""
+    values = [21.5] * samples
+    cases = [
+        (MeteringPoint, dict(
+            id="p", name="Room co2", type=PointType.SENSOR, spatial_entity_id="r",
+            metric=MetricType.CO2, unit="ppm", timeseries_ids=[],
+        )),
+        (TimeSeries, dict(
+            id="t", point_id="p", type=TimeSeriesType.MEASURED, metric=MetricType.CO2, unit="ppm",
+            start=datetime(2024, 1, 1), source="csv", metadata={"values": values},
+        )),
+        (SensorDefinition, dict(
+            id="s", spatial_entity_id="r", metric=MetricType.CO2, parameter="co2", unit="ppm", metadata={},
+        )),
+        (SensorSource, dict(id="s:csv", type=SensorSourceType.CSV, config={})),
+        (Room, dict(id="r", name="Room", type=SpatialEntityType.ROOM)),
+    ]
+    costs = []
+    for model, kwargs in cases:
+        validated = best_of(lambda: [model(**kwargs) for _ in range(number)]) / number
+        constructed = best_of(lambda: [model.model_construct(**kwargs) for _ in range(number)]) / number
+        costs.append((model.__name__, validated * 1e6, constructed * 1e6))
+    return costs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "dummy_data"
+        room_files = write_tree(root, args.rooms, args.days)
+        rooms = len(room_files)
+
+        # Both parses must yield the same series
+        loader = CSVDataLoader()
+        _, _, series = loader.load_wide_format(room_files[0], "r", "Room")
+        legacy = legacy_parse(room_files[0])
+        for ts in series.values():
+            timestamps, values, profile = legacy[ts.metadata["csv_column"]]
+            assert ts.metadata["timestamps"] == timestamps and ts.metadata["values"] == values
+            assert ts.quality_profile == profile
+
+        legacy_seconds = best_of(lambda: [legacy_parse(path) for path in room_files])
+        current_seconds = best_of(
+            lambda: [CSVDataLoader().load_wide_format(path, path.stem, path.stem) for path in room_files]
+        )
+        portfolio_seconds = best_of(lambda: PortfolioLoader().load_portfolio(root))
+
+        store = SQLiteSeriesStore(Path(tmp) / "portfolio.sqlite")
+        write_portfolio(store, PortfolioLoader().load_portfolio(root))
+        sqlite_seconds = best_of(lambda: SQLitePortfolioLoader().load_portfolio(store))
+
+    per_room = 1e3 / rooms
+    print(f"{rooms} rooms x {args.days} days (3 metrics, {args.days * 24:,} hourly rows each)")
+    print(f"  previous wide-CSV parse : {legacy_seconds * per_room:8.2f} ms/room")
+    print(f"  load_wide_format        : {current_seconds * per_room:8.2f} ms/room")
+    print(f"  speed-up                : {legacy_seconds / current_seconds:8.1f} x")
+    print(f"  PortfolioLoader (CSV)   : {portfolio_seconds * per_room:8.2f} ms/room")
+    print(f"  SQLite hydration        : {sqlite_seconds * per_room:8.2f} ms/room")
+    print()
+    print(f"  {'model':<17} {'validated':>10} {'construct':>10}   (us/object)")
+    for name, validated, constructed in object_costs(args.days * 24):
+        print(f"  {name:<17} {validated:10.2f} {constructed:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
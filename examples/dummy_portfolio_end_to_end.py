@@ -234,9 +234,16 @@ def run_room_standards_and_simulations(
             force_recompute=True,
             entity_lookup=entity_lookup,  # Enable hierarchy traversal
         )
-        
-        # Compute all applicable simulations
-        room.compute_simulations(force_recompute=True)
+    
+    # Compute all applicable simulations (ventilation is batched across rooms)
+    Room.compute_simulations_for_rooms(
+        [room for room in rooms.values() if room.timestamps],
+        force_recompute=True,
+    )
+    
+    # Roll simulation results up as declared in each model's config.yaml
+    for entity in [*floors.values(), *buildings.values(), portfolio]:
+        entity.aggregate_simulation_results(child_lookup=entity_lookup, force_recompute=True)
 
 
 def get_outdoor_temperature_series(room: Room, buildings: Dict[str, Building]) -> Optional[list[float]]:
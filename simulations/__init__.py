@@ -3,7 +3,7 @@ Simulation models package.
 
 This namespace hosts analytical models that operate on telemetry to
 produce simulation-style outputs (occupancy inference, ventilation
-rates, RC thermal dynamics, EPC estimation, etc.).
+rates, RC thermal dynamics, EPC estimation, energy signatures, etc.).
 """
 
 from .models.occupancy import OccupancyCalculator, OccupancyPattern
@@ -13,8 +13,19 @@ from .models.rc_thermal import (
     RCModelParameters,
     RCModelResult,
     RCModelType,
+    RCEnsembleResult,
+    RCCalibrationResult,
+    calibrate_rc_parameters,
+    calibrate_rc_portfolio,
+)
+from .models.real_epc import calculate_epc_rating, calculate_epc_ratings
+from .models.energy_signature import (
+    EnergySignatureResult,
+    EnergySignatureBatch,
+    fit_energy_signature,
+    fit_energy_signatures,
+    fit_portfolio_signatures,
 )
-from .models.real_epc import calculate_epc_rating
 from .config import (
     list_simulation_models,
     load_simulation_config,
@@ -31,7 +42,17 @@ __all__ = [
     "RCModelParameters",
     "RCModelResult",
     "RCModelType",
+    "RCEnsembleResult",
+    "RCCalibrationResult",
+    "calibrate_rc_parameters",
+    "calibrate_rc_portfolio",
     "calculate_epc_rating",
+    "calculate_epc_ratings",
+    "EnergySignatureResult",
+    "EnergySignatureBatch",
+    "fit_energy_signature",
+    "fit_energy_signatures",
+    "fit_portfolio_signatures",
     "list_simulation_models",
     "load_simulation_config",
     "load_all_simulation_configs",
@@ -4,8 +4,15 @@ Building simulation model implementations.
 
 from .occupancy import OccupancyCalculator, OccupancyPattern
 from .ventilation import VentilationCalculator, VentilationRateResult
-from .rc_thermal import RCThermalModel, RCModelParameters, RCModelResult, RCModelType
-from .real_epc import calculate_epc_rating
+from .rc_thermal import RCThermalModel, RCModelParameters, RCModelResult, RCModelType, RCEnsembleResult
+from .real_epc import calculate_epc_rating, calculate_epc_ratings
+from .energy_signature import (
+    EnergySignatureResult,
+    EnergySignatureBatch,
+    fit_energy_signature,
+    fit_energy_signatures,
+    fit_portfolio_signatures,
+)
 
 __all__ = [
     "OccupancyCalculator",
@@ -16,5 +23,12 @@ __all__ = [
     "RCModelParameters",
     "RCModelResult",
     "RCModelType",
+    "RCEnsembleResult",
     "calculate_epc_rating",
+    "calculate_epc_ratings",
+    "EnergySignatureResult",
+    "EnergySignatureBatch",
+    "fit_energy_signature",
+    "fit_energy_signatures",
+    "fit_portfolio_signatures",
 ]
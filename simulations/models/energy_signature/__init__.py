@@ -0,0 +1,17 @@
+"""Energy signature simulation package."""
+
+from .model import (
+    EnergySignatureResult,
+    EnergySignatureBatch,
+    fit_energy_signature,
+    fit_energy_signatures,
+    fit_portfolio_signatures,
+)
+
+__all__ = [
+    "EnergySignatureResult",
+    "EnergySignatureBatch",
+    "fit_energy_signature",
+    "fit_energy_signatures",
+    "fit_portfolio_signatures",
+]
@@ -0,0 +1,390 @@
+"""
+Change-point energy signature fitting.
+
+Fits the three-parameter heating model
+
+    E = base_load + heating_slope * max(balance_point - T_out, 0)
+
+to daily energy use against daily mean outdoor temperature. For every
+candidate balance point the regression has a closed-form least-squares
+solution, so the fit reduces to a grid search over balance points.
+
+The grid search is batched across buildings: daily points are binned
+against the balance-point grid once and the regression sums for every
+(building, candidate) pair are obtained from cumulative per-bin sums. A
+portfolio of thousands of building-years is fitted in a handful of array
+passes without any per-building optimisation loop.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Default candidate balance points (°C)
+DEFAULT_BALANCE_POINTS = np.arange(8.0, 22.0 + 0.25, 0.25)
+
+
+@dataclass
+class EnergySignatureResult:
+    """Fitted energy signature of a single building."""
+    base_load_kwh_per_day: float  # Temperature-independent daily energy
+    heating_slope_kwh_per_k_day: float  # Energy per degree-day below balance point
+    balance_point_c: Optional[float]  # None when no heating dependence was found
+    r_squared: float
+    cv_rmse: Optional[float]
+    n_days: int
+    n_heating_days: int
+    model_type: str  # "3PH" (heating change-point) or "mean"
+
+    def predict(self, outdoor_temperature: Union[float, Sequence[float], np.ndarray]) -> np.ndarray:
+        """Predict daily energy for the given daily mean outdoor temperatures."""
+        temperature = np.asarray(outdoor_temperature, dtype=float)
+        if self.balance_point_c is None:
+            return np.full_like(temperature, self.base_load_kwh_per_day)
+        degree_days = np.maximum(self.balance_point_c - temperature, 0.0)
+        return self.base_load_kwh_per_day + self.heating_slope_kwh_per_k_day * degree_days
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the result for storage on ``computed_metrics``."""
+        return {
+            "model_type": self.model_type,
+            "base_load_kwh_per_day": self.base_load_kwh_per_day,
+            "heating_slope_kwh_per_k_day": self.heating_slope_kwh_per_k_day,
+            "balance_point_c": self.balance_point_c,
+            "r_squared": self.r_squared,
+            "cv_rmse": self.cv_rmse,
+            "n_days": self.n_days,
+            "n_heating_days": self.n_heating_days,
+        }
+
+    def to_analysis(self, spatial_entity_id: str, name: Optional[str] = None):
+        """
+        Convert the fit into an ``EnergySignatureAnalysis`` record.
+
+        Args:
+            spatial_entity_id: ID of the building the signature belongs to
+            name: Optional analysis name
+
+        Returns:
+            Completed EnergySignatureAnalysis
+        """
+        # Lazy import to avoid circular imports with core.entities
+        from core.analysis import EnergySignatureAnalysis
+        from core.enums import AnalysisStatus
+
+        return EnergySignatureAnalysis(
+            id=f"{spatial_entity_id}_energy_signature",
+            name=name or f"Energy signature {spatial_entity_id}",
+            spatial_entity_id=spatial_entity_id,
+            model_id="energy_signature",
+            regression_params=self.to_dict(),
+            r2=self.r_squared,
+            status=AnalysisStatus.COMPLETED,
+        )
+
+
+@dataclass
+class EnergySignatureBatch:
+    """Energy signatures for many buildings, stored column-wise."""
+    entity_ids: List[str]
+    base_load_kwh_per_day: np.ndarray
+    heating_slope_kwh_per_k_day: np.ndarray
+    balance_point_c: np.ndarray  # NaN where the mean model was selected
+    r_squared: np.ndarray
+    cv_rmse: np.ndarray
+    n_days: np.ndarray
+    n_heating_days: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.entity_ids)
+
+    def result(self, index: int) -> Optional[EnergySignatureResult]:
+        """Return the fit for one building (None when it had no usable days)."""
+        if self.n_days[index] == 0:
+            return None
+        balance_point = self.balance_point_c[index]
+        has_heating = bool(np.isfinite(balance_point))
+        cv_rmse = self.cv_rmse[index]
+        return EnergySignatureResult(
+            base_load_kwh_per_day=float(self.base_load_kwh_per_day[index]),
+            heating_slope_kwh_per_k_day=float(self.heating_slope_kwh_per_k_day[index]),
+            balance_point_c=float(balance_point) if has_heating else None,
+            r_squared=float(self.r_squared[index]),
+            cv_rmse=float(cv_rmse) if np.isfinite(cv_rmse) else None,
+            n_days=int(self.n_days[index]),
+            n_heating_days=int(self.n_heating_days[index]),
+            model_type="3PH" if has_heating else "mean",
+        )
+
+    def results(self) -> Dict[str, Optional[EnergySignatureResult]]:
+        """Return the fits keyed by entity ID."""
+        return {entity_id: self.result(i) for i, entity_id in enumerate(self.entity_ids)}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the fits as a DataFrame indexed by entity ID."""
+        return pd.DataFrame(
+            {
+                "base_load_kwh_per_day": self.base_load_kwh_per_day,
+                "heating_slope_kwh_per_k_day": self.heating_slope_kwh_per_k_day,
+                "balance_point_c": self.balance_point_c,
+                "r_squared": self.r_squared,
+                "cv_rmse": self.cv_rmse,
+                "n_days": self.n_days,
+                "n_heating_days": self.n_heating_days,
+            },
+            index=pd.Index(self.entity_ids, name="entity_id"),
+        )
+
+
+def fit_energy_signatures(
+    energy: np.ndarray,
+    outdoor_temperature: np.ndarray,
+    entity_ids: Optional[Sequence[str]] = None,
+    balance_points: Optional[Sequence[float]] = None,
+    min_heating_days: int = 10,
+) -> EnergySignatureBatch:
+    """
+    Fit heating change-point signatures for a batch of buildings.
+
+    Rows are buildings and columns are days; rows may be padded with NaN
+    when buildings cover different numbers of days.
+
+    Args:
+        energy: Daily energy use, shape (buildings, days)
+        outdoor_temperature: Daily mean outdoor temperature, same shape
+        entity_ids: Optional IDs for the rows
+        balance_points: Candidate balance points (°C); defaults to 8-22 °C in 0.25 K steps
+        min_heating_days: Minimum days below a candidate balance point for it to be eligible
+
+    Returns:
+        EnergySignatureBatch with one fit per row
+    """
+    energy = np.atleast_2d(np.asarray(energy, dtype=float))
+    temperature = np.atleast_2d(np.asarray(outdoor_temperature, dtype=float))
+    if energy.shape != temperature.shape:
+        raise ValueError("energy and outdoor_temperature must have the same shape")
+    grid = np.sort(np.asarray(
+        DEFAULT_BALANCE_POINTS if balance_points is None else balance_points, dtype=float
+    ))
+    n_rows = energy.shape[0]
+    n_grid = grid.size
+
+    valid = np.isfinite(energy) & np.isfinite(temperature)
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    mean_e = np.where(valid, energy, 0.0).sum(axis=1) / safe_n
+
+    # Center energy per row to keep the sums well conditioned
+    rows, cols = np.nonzero(valid)
+    t = temperature[rows, cols]
+    e = energy[rows, cols] - mean_e[rows]
+    syy = np.bincount(rows, weights=e * e, minlength=n_rows)
+
+    # Bin k holds points with grid[k-1] <= T < grid[k]; cumulative sums over
+    # bins 0..g therefore cover exactly the days with T < grid[g].
+    bins = np.searchsorted(grid, t, side="right")
+    flat = rows * (n_grid + 1) + bins
+    size = n_rows * (n_grid + 1)
+
+    def _cumulative(weights: Optional[np.ndarray]) -> np.ndarray:
+        sums = np.bincount(flat, weights=weights, minlength=size).reshape(n_rows, n_grid + 1)
+        return np.cumsum(sums, axis=1)[:, :n_grid]
+
+    c = _cumulative(None)
+    st = _cumulative(t)
+    stt = _cumulative(t * t)
+    se = _cumulative(e)
+    ste = _cumulative(t * e)
+
+    # Regression sums for x = max(Tb - T, 0); energy is already centered
+    tb = grid[None, :]
+    nn = safe_n[:, None].astype(float)
+    sx = tb * c - st
+    sxx = tb * tb * c - 2.0 * tb * st + stt
+    sxy = tb * se - ste
+    var_x = sxx - sx * sx / nn
+    slope = np.divide(sxy, var_x, out=np.zeros_like(var_x), where=var_x > 1e-9)
+    sse = syy[:, None] - slope * sxy
+    eligible = (c >= min_heating_days) & (var_x > 1e-9) & (slope > 0)
+    sse = np.where(eligible, sse, np.inf)
+
+    best = np.argmin(sse, axis=1)
+    take = np.arange(n_rows)
+    has_heating = eligible[take, best]
+
+    best_slope = np.where(has_heating, slope[take, best], 0.0)
+    best_sse = np.where(has_heating, sse[take, best], syy)
+    mean_x = np.where(has_heating, sx[take, best] / nn[:, 0], 0.0)
+    base_load = mean_e - best_slope * mean_x
+    best_sse = np.maximum(best_sse, 0.0)
+
+    r_squared = np.divide(
+        syy - best_sse, syy, out=np.zeros(n_rows), where=syy > 0
+    )
+    dof = n - np.where(has_heating, 3, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv_rmse = np.where(
+            (dof > 0) & (mean_e != 0),
+            np.sqrt(best_sse / np.maximum(dof, 1)) / np.abs(mean_e),
+            np.nan,
+        )
+
+    empty = n == 0
+    base_load = np.where(empty, np.nan, base_load)
+
+    ids = list(entity_ids) if entity_ids is not None else [str(i) for i in range(n_rows)]
+    if len(ids) != n_rows:
+        raise ValueError("entity_ids must match the number of rows")
+
+    return EnergySignatureBatch(
+        entity_ids=ids,
+        base_load_kwh_per_day=base_load,
+        heating_slope_kwh_per_k_day=best_slope,
+        balance_point_c=np.where(has_heating, grid[best], np.nan),
+        r_squared=r_squared,
+        cv_rmse=cv_rmse,
+        n_days=n,
+        n_heating_days=np.where(has_heating, c[take, best], 0),
+    )
+
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def _daily(series: pd.Series, how: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a timestamped series to daily values.
+
+    Returns sorted day numbers (days since epoch, local wall time) and the
+    daily sum (energy) or mean (temperature) of the finite samples.
+    """
+    index = series.index
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(pd.to_datetime(index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    stamps = index.as_unit("ns").asi8
+    values = np.asarray(series.to_numpy(dtype=float, na_value=np.nan), dtype=float)
+
+    finite = np.isfinite(values)
+    stamps = stamps[finite]
+    values = values[finite]
+    if stamps.size > 1 and np.any(stamps[1:] < stamps[:-1]):
+        order = np.argsort(stamps, kind="stable")
+        stamps = stamps[order]
+        values = values[order]
+
+    days = stamps // _NS_PER_DAY
+    if days.size == 0:
+        return days, values
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    if starts.size == days.size:
+        return days, values
+    totals = np.add.reduceat(values, starts)
+    if how == "mean":
+        totals = totals / np.diff(np.r_[starts, days.size])
+    return days[starts], totals
+
+
+def _aligned_rows(
+    energy: Mapping[str, pd.Series],
+    outdoor_temperature: Union[pd.Series, Mapping[str, pd.Series]],
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Align each building's daily energy with its outdoor temperature into padded matrices."""
+    shared = _daily(outdoor_temperature, "mean") if isinstance(outdoor_temperature, pd.Series) else None
+    daily_temperature: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    ids: List[str] = []
+    pairs: List[Tuple[np.ndarray, np.ndarray]] = []
+    for entity_id, series in energy.items():
+        if shared is not None:
+            temperature_days, temperature_values = shared
+        else:
+            raw = outdoor_temperature.get(entity_id)
+            if raw is None:
+                print(f"Warning: No outdoor temperature for {entity_id}; skipping energy signature")
+                continue
+            # Buildings commonly share one station series; reduce it only once
+            key = id(raw)
+            if key not in daily_temperature:
+                daily_temperature[key] = _daily(raw, "mean")
+            temperature_days, temperature_values = daily_temperature[key]
+
+        days, daily_energy = _daily(series, "sum")
+        aligned = np.full(days.size, np.nan)
+        if temperature_days.size:
+            positions = np.minimum(np.searchsorted(temperature_days, days), temperature_days.size - 1)
+            matched = temperature_days[positions] == days
+            aligned[matched] = temperature_values[positions[matched]]
+        ids.append(entity_id)
+        pairs.append((daily_energy, aligned))
+
+    width = max((len(e) for e, _ in pairs), default=0)
+    energy_matrix = np.full((len(pairs), width), np.nan)
+    temperature_matrix = np.full((len(pairs), width), np.nan)
+    for row, (e, t) in enumerate(pairs):
+        energy_matrix[row, : len(e)] = e
+        temperature_matrix[row, : len(t)] = t
+    return ids, energy_matrix, temperature_matrix
+
+
+def fit_portfolio_signatures(
+    energy: Mapping[str, pd.Series],
+    outdoor_temperature: Union[pd.Series, Mapping[str, pd.Series]],
+    balance_points: Optional[Sequence[float]] = None,
+    min_heating_days: int = 10,
+) -> EnergySignatureBatch:
+    """
+    Fit energy signatures for many buildings from timestamped series.
+
+    Energy series are summed to daily totals and temperatures averaged to
+    daily means when they are recorded at a finer resolution.
+
+    Args:
+        energy: Energy use series per building ID (kWh)
+        outdoor_temperature: One outdoor temperature series shared by all
+            buildings, or a series per building ID
+        balance_points: Candidate balance points (°C)
+        min_heating_days: Minimum days below a candidate balance point
+
+    Returns:
+        EnergySignatureBatch for the buildings that had temperature data
+    """
+    ids, energy_matrix, temperature_matrix = _aligned_rows(energy, outdoor_temperature)
+    return fit_energy_signatures(
+        energy_matrix,
+        temperature_matrix,
+        entity_ids=ids,
+        balance_points=balance_points,
+        min_heating_days=min_heating_days,
+    )
+
+
+def fit_energy_signature(
+    energy: pd.Series,
+    outdoor_temperature: pd.Series,
+    balance_points: Optional[Sequence[float]] = None,
+    min_heating_days: int = 10,
+) -> Optional[EnergySignatureResult]:
+    """
+    Fit the energy signature of a single building.
+
+    Args:
+        energy: Energy use series (kWh)
+        outdoor_temperature: Outdoor temperature series (°C)
+        balance_points: Candidate balance points (°C)
+        min_heating_days: Minimum days below a candidate balance point
+
+    Returns:
+        EnergySignatureResult, or None when no day has both values
+    """
+    batch = fit_portfolio_signatures(
+        {"entity": energy},
+        outdoor_temperature,
+        balance_points=balance_points,
+        min_heating_days=min_heating_days,
+    )
+    return batch.result(0)
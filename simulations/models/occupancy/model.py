@@ -3,10 +3,12 @@ Occupancy detection and estimation from CO2 patterns.
 
 Infers occupancy patterns from CO2 concentration changes.
 Higher CO2 indicates occupancy, decreasing CO2 indicates vacancy.
+Time-resolved occupant counts follow from the dynamic CO2 mass balance.
 """
 
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -181,33 +183,134 @@ class OccupancyCalculator:
 
         return max(1, int(round(n_occupants)))
 
+    def estimate_occupant_series(
+        self,
+        co2_series: pd.Series,
+        volume_m3: float,
+        ventilation_ach: float,
+        smoothing_window: int = 3,
+    ) -> pd.Series:
+        """
+        Estimate a time-resolved occupant count from the dynamic CO2 mass balance.
+
+        V * dC/dt = Q * (C_out - C) + N * G, solved for N at every sample.
+
+        Args:
+            co2_series: CO2 measurements (ppm) with a DatetimeIndex
+            volume_m3: Room volume (m³)
+            ventilation_ach: Air change rate (ACH), e.g. from VentilationCalculator
+            smoothing_window: Centered rolling-mean window applied to CO2 first
+
+        Returns:
+            Series of estimated occupants (>= 0) on the same index
+        """
+        results = self.estimate_occupant_series_batch(
+            {"room": co2_series},
+            volumes={"room": volume_m3},
+            ach_by_room={"room": ventilation_ach},
+            smoothing_window=smoothing_window,
+        )
+        return results["room"]
+
+    def estimate_occupant_series_batch(
+        self,
+        co2_by_room: Mapping[str, pd.Series],
+        volumes: Mapping[str, Optional[float]],
+        ach_by_room: Optional[Mapping[str, Optional[float]]] = None,
+        default_ach: float = 1.0,
+        smoothing_window: int = 3,
+    ) -> Dict[str, Optional[pd.Series]]:
+        """
+        Time-resolved occupant counts for many rooms in one vectorized pass.
+
+        All rooms are concatenated into flat arrays; derivatives are taken
+        within each room only, so a whole building is evaluated at once.
+
+        Args:
+            co2_by_room: Mapping of room id -> CO2 series with a DatetimeIndex
+            volumes: Mapping of room id -> volume (m³); rooms without volume yield None
+            ach_by_room: Mapping of room id -> air change rate (ACH)
+            default_ach: ACH used for rooms without an estimate
+            smoothing_window: Centered rolling-mean window applied to CO2 first
+
+        Returns:
+            Mapping of room id -> occupant-count series (None if not computable)
+        """
+        ach_by_room = ach_by_room or {}
+        results: Dict[str, Optional[pd.Series]] = {}
+
+        room_ids = []
+        values, seconds, lengths, room_volume, room_ach = [], [], [], [], []
+        for room_id, series in co2_by_room.items():
+            volume = volumes.get(room_id)
+            if not volume or not isinstance(series.index, pd.DatetimeIndex) or len(series) < 2:
+                results[room_id] = None
+                continue
+            co2 = series.astype(float)
+            if smoothing_window and smoothing_window > 1:
+                co2 = co2.rolling(smoothing_window, center=True, min_periods=1).mean()
+            room_ids.append(room_id)
+            values.append(co2.to_numpy())
+            seconds.append(series.index.as_unit("ns").asi8 / 1e9)
+            lengths.append(len(series))
+            room_volume.append(float(volume))
+            ach = ach_by_room.get(room_id)
+            room_ach.append(float(ach) if ach else default_ach)
+
+        if not room_ids:
+            return results
+
+        lengths_arr = np.asarray(lengths)
+        c = np.concatenate(values)
+        t = np.concatenate(seconds)
+        volume_m3 = np.repeat(room_volume, lengths_arr)
+        ach = np.repeat(room_ach, lengths_arr)
+
+        # Forward slopes, invalid across room boundaries
+        same_room = np.ones(c.size - 1, dtype=bool)
+        same_room[np.cumsum(lengths_arr)[:-1] - 1] = False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            forward = np.where(same_room, np.diff(c) / np.diff(t), np.nan)
+        ahead = np.append(forward, np.nan)
+        behind = np.insert(forward, 0, np.nan)
+        dcdt = np.where(
+            np.isnan(ahead), behind, np.where(np.isnan(behind), ahead, (ahead + behind) / 2)
+        )
+
+        # ppm/s -> L/s of CO2: V[L] * dC * 1e-6 ; supply Q[L/s] = ACH * V * 1000 / 3600
+        volume_l = volume_m3 * 1000.0
+        supply_l_s = ach * volume_l / 3600.0
+        co2_flux_l_s = (volume_l * dcdt + supply_l_s * (c - self.outdoor_co2)) * 1e-6
+        occupants = np.clip(co2_flux_l_s / self.CO2_GENERATION_RATE_PER_PERSON, 0.0, None)
+
+        offsets = np.concatenate([[0], np.cumsum(lengths_arr)])
+        for k, room_id in enumerate(room_ids):
+            results[room_id] = pd.Series(
+                occupants[offsets[k]:offsets[k + 1]],
+                index=co2_by_room[room_id].index,
+                name="occupants",
+            )
+
+        return results
+
     def _identify_periods(
         self,
         index: pd.Index,
         mask: pd.Series,
     ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
-        """Identify continuous periods where mask is True."""
+        """Identify continuous periods where mask is True (run-length encoded)."""
         if not isinstance(index, pd.DatetimeIndex):
             return []
 
-        periods = []
-        in_period = False
-        period_start = None
-
-        for i, (ts, is_occupied) in enumerate(zip(index, mask, strict=False)):
-            if is_occupied and not in_period:
-                in_period = True
-                period_start = ts
-            elif not is_occupied and in_period:
-                periods.append((period_start, index[i - 1]))
-                in_period = False
-                period_start = None
+        flags = np.asarray(mask, dtype=np.int8)
+        if flags.size == 0:
+            return []
 
-        # Handle period extending to end
-        if in_period and period_start is not None:
-            periods.append((period_start, index[-1]))
+        edges = np.diff(np.concatenate(([0], flags, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
 
-        return periods
+        return list(zip(index[starts], index[ends]))
 
     def _format_hours(self, hours: List[int]) -> str:
         """Format list of hours into readable string."""
@@ -1,10 +1,15 @@
 """RC thermal simulation package."""
 
-from .model import RCThermalModel, RCModelParameters, RCModelResult, RCModelType
+from .model import RCThermalModel, RCModelParameters, RCModelResult, RCModelType, RCEnsembleResult
+from .calibration import RCCalibrationResult, calibrate_rc_parameters, calibrate_rc_portfolio
 
 __all__ = [
     "RCThermalModel",
     "RCModelParameters",
     "RCModelResult",
     "RCModelType",
+    "RCEnsembleResult",
+    "RCCalibrationResult",
+    "calibrate_rc_parameters",
+    "calibrate_rc_portfolio",
 ]
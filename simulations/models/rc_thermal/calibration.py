@@ -0,0 +1,492 @@
+"""
+Calibration of RC thermal model parameters against measured indoor temperature.
+
+Fits resistances, capacitances, the solar aperture (g_solar * A_window) and
+internal gains by nonlinear least squares on the simulated indoor
+temperature. Each Jacobian is built from one batched simulation of the
+base point and all finite-difference perturbations.
+
+Without setpoints the room is treated as free-floating. The network is then
+linear, so each variant is simulated through its modal decomposition with
+first-order IIR filters (scipy.signal.lfilter), a few milliseconds per
+room-year, and the gains are solved linearly for each trial network.
+With setpoints, the HVAC-clamped kernel is used instead.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares, nnls
+from scipy.signal import lfilter
+
+from .kernels import continuous_state_space, discretize, simulate_clamped
+from .model import RCModelParameters, RCModelType, RCThermalModel
+
+
+# Parameters fitted in log space for each network order
+_NETWORK_PARAMETERS = {
+    RCModelType.ONE_R_ONE_C: ("R_exterior", "C_interior"),
+    RCModelType.TWO_R_TWO_C: ("R_exterior", "C_interior", "R_interior", "C_exterior"),
+    RCModelType.THREE_R_THREE_C: (
+        "R_exterior", "C_interior", "R_interior", "C_exterior", "R_boundary", "C_air"
+    ),
+}
+
+# Relative finite-difference step (log-space parameters use it as an absolute step)
+_FD_STEP = 1e-6
+
+# Fitted resistances and capacitances stay within this factor of the initial guess
+_PARAMETER_RANGE = 100.0
+
+
+@dataclass
+class RCCalibrationResult:
+    """Result of calibrating an RC model against measured temperature."""
+    parameters: RCModelParameters  # Fitted parameters
+    model_type: RCModelType  # Network that was fitted
+    rmse: float  # Root-mean-square error (K)
+    mae: float  # Mean absolute error (K)
+    r_squared: float  # Coefficient of determination
+    cv_rmse: float  # RMSE / mean measured temperature
+    u_value: float  # From RCThermalModel.estimate_u_value (W/(m²·K))
+    time_constant_hours: float  # From RCThermalModel.estimate_thermal_time_constant
+    solar_aperture_m2: float  # Fitted g_solar * A_window
+    internal_gains_w: float  # Fitted mean internal gains (W)
+    n_points: int  # Measured samples used in the fit
+    n_evaluations: int  # Objective evaluations
+    converged: bool
+    message: str = ""
+
+    def model(self) -> RCThermalModel:
+        """RCThermalModel built from the fitted parameters."""
+        return RCThermalModel(self.parameters, self.model_type)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "parameters": self.parameters.__dict__.copy(),
+            "model_type": self.model_type.value,
+            "rmse": self.rmse,
+            "mae": self.mae,
+            "r_squared": self.r_squared,
+            "cv_rmse": self.cv_rmse,
+            "u_value": self.u_value,
+            "time_constant_hours": self.time_constant_hours,
+            "solar_aperture_m2": self.solar_aperture_m2,
+            "internal_gains_w": self.internal_gains_w,
+            "n_points": self.n_points,
+            "n_evaluations": self.n_evaluations,
+            "converged": self.converged,
+            "message": self.message,
+        }
+
+
+def _infer_dt_hours(index: pd.Index) -> float:
+    """Median spacing of a DatetimeIndex in hours (1.0 for other indexes)."""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return 1.0
+    from core.data_quality import get_quality_profile
+
+    median_step = get_quality_profile(index).median_step_seconds
+    return median_step / 3600.0 if median_step is not None else 1.0
+
+
+def _modal_responses(Ad: np.ndarray, Bd: np.ndarray, drives: np.ndarray, x0: np.ndarray) -> np.ndarray:
+    """
+    Indoor temperature of N linear (unclamped) networks via modal IIR filters.
+
+    Args:
+        Ad: Discrete state matrices (N, n, n)
+        Bd: Discrete input matrices (N, n, 2)
+        drives: Input scenarios (S, T, 2) of [T_outdoor, Q], shared by all variants
+        x0: Initial node temperatures per scenario (S, n)
+
+    Returns:
+        Indoor temperature (N, S, T)
+    """
+    size = Ad.shape[0]
+    scenarios, steps = drives.shape[:2]
+    output = np.empty((size, scenarios, steps))
+    eigenvalues, vectors = np.linalg.eig(Ad)
+
+    for i in range(size):
+        lam, modes = eigenvalues[i], vectors[i]
+        if np.abs(lam.imag).max() > 1e-9:
+            # RC networks have real modes; use the recurrence otherwise
+            for s in range(scenarios):
+                output[i, s] = simulate_clamped(
+                    Ad[i], Bd[i], drives[s, :, 0], drives[s, :, 1],
+                    np.full(steps, -np.inf), np.full(steps, np.inf), x0[s],
+                )[0]
+            continue
+        lam, modes = lam.real, modes.real
+        inverse = np.linalg.inv(modes)
+        modal_drive = drives[:, 1:] @ (inverse @ Bd[i]).T  # (S, T-1, n)
+        modal_state = x0 @ inverse.T  # (S, n)
+        output[i, :, 0] = x0[:, 0]
+        response = np.zeros((scenarios, steps - 1))
+        for j in range(lam.size):
+            mode, _ = lfilter(
+                [1.0], [1.0, -lam[j]], modal_drive[:, :, j], axis=-1,
+                zi=(lam[j] * modal_state[:, j])[:, None],
+            )
+            response += modes[0, j] * mode
+        output[i, :, 1:] = response
+    return output
+
+
+class _CalibrationProblem:
+    """
+    Maps parameter vectors to simulated indoor temperature.
+
+    A full vector holds the log network parameters followed by the solar
+    aperture (m²) and the internal gains (W, or a scale on the profile).
+    """
+
+    def __init__(
+        self,
+        initial: RCModelParameters,
+        model_type: RCModelType,
+        outdoor: np.ndarray,
+        solar: np.ndarray,
+        internal: Optional[np.ndarray],
+        setpoint_heating: Optional[np.ndarray],
+        setpoint_cooling: Optional[np.ndarray],
+        initial_temperature: float,
+        dt_hours: float,
+    ):
+        self.initial = initial
+        self.model_type = model_type
+        self.network = _NETWORK_PARAMETERS[model_type]
+        self.outdoor = outdoor
+        self.solar = solar
+        self.internal = internal
+        self.setpoint_heating = setpoint_heating
+        self.setpoint_cooling = setpoint_cooling
+        self.initial_temperature = initial_temperature
+        self.dt_hours = dt_hours
+
+    @property
+    def free_floating(self) -> bool:
+        return self.setpoint_heating is None and self.setpoint_cooling is None
+
+    def initial_vector(self) -> np.ndarray:
+        p = self.initial
+        internal = 1.0 if self.internal is not None else p.q_internal * p.A_floor
+        return np.array(
+            [np.log(getattr(p, name)) for name in self.network]
+            + [p.g_solar * p.A_window, internal]
+        )
+
+    def bounds(self) -> tuple:
+        """Network parameters stay within _PARAMETER_RANGE of the initial guess."""
+        network = self.initial_vector()[:len(self.network)]
+        span = np.log(_PARAMETER_RANGE)
+        return np.r_[network - span, 0.0, 0.0], np.r_[network + span, np.inf, np.inf]
+
+    def discretize(self, network: np.ndarray) -> tuple:
+        """Discretize a batch of log network parameter vectors (N, P_network)."""
+        values = {name: np.exp(network[:, i]) for i, name in enumerate(self.network)}
+        A, B = continuous_state_space(
+            self.model_type.value,
+            values["R_exterior"],
+            values["C_interior"],
+            R_interior=values.get("R_interior"),
+            C_exterior=values.get("C_exterior"),
+            R_boundary=values.get("R_boundary"),
+            C_air=values.get("C_air"),
+        )
+        return discretize(A, B, self.dt_hours * 3600)
+
+    def basis(self, network: np.ndarray) -> np.ndarray:
+        """
+        Free-floating responses (N, 3, T) to outdoor temperature plus the
+        initial state, to unit solar aperture and to unit internal gains.
+        Indoor temperature is linear in the two gain coefficients.
+        """
+        Ad, Bd = self.discretize(network)
+        steps = self.outdoor.size
+        drives = np.zeros((3, steps, 2))
+        drives[0, :, 0] = self.outdoor
+        drives[1, :, 1] = self.solar
+        drives[2, :, 1] = self.internal if self.internal is not None else 1.0
+        x0 = np.zeros((3, Ad.shape[1]))
+        x0[0] = self.initial_temperature
+        return _modal_responses(Ad, Bd, drives, x0)
+
+    def simulate(self, vectors: np.ndarray) -> np.ndarray:
+        """Indoor temperature for a batch of full parameter vectors (N, P) -> (N, T)."""
+        count = len(self.network)
+        if self.free_floating:
+            basis = self.basis(vectors[:, :count])
+            return basis[:, 0] + vectors[:, count, None] * basis[:, 1] + vectors[:, count + 1, None] * basis[:, 2]
+
+        Ad, Bd = self.discretize(vectors[:, :count])
+        internal = self.internal if self.internal is not None else 1.0
+        steps = self.outdoor.size
+        sp_heat = self.setpoint_heating if self.setpoint_heating is not None else np.full(steps, -np.inf)
+        sp_cool = self.setpoint_cooling if self.setpoint_cooling is not None else np.full(steps, np.inf)
+        output = np.empty((vectors.shape[0], steps))
+        for i, vector in enumerate(vectors):
+            gains = vector[count] * self.solar + vector[count + 1] * internal
+            output[i] = simulate_clamped(
+                Ad[i], Bd[i], self.outdoor, gains, sp_heat, sp_cool,
+                np.full(Ad.shape[1], self.initial_temperature),
+            )[0]
+        return output
+
+    def parameters(self, vector: np.ndarray) -> RCModelParameters:
+        """Convert a fitted vector back to RCModelParameters."""
+        count = len(self.network)
+        fitted = {name: float(np.exp(vector[i])) for i, name in enumerate(self.network)}
+        aperture, internal = float(vector[count]), float(vector[count + 1])
+        p = self.initial
+        if p.A_window > 0:
+            fitted["g_solar"] = aperture / p.A_window
+        else:
+            fitted["A_window"], fitted["g_solar"] = aperture, 1.0
+        if self.internal is None:
+            fitted["q_internal"] = internal / p.A_floor if p.A_floor > 0 else internal
+        return replace(p, **fitted)
+
+    def internal_gains_w(self, vector: np.ndarray) -> float:
+        scale = float(vector[len(self.network) + 1])
+        if self.internal is not None:
+            return scale * float(np.mean(self.internal))
+        return scale
+
+
+def _gain_coefficients(
+    basis: np.ndarray,
+    target: np.ndarray,
+    fixed_internal: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Non-negative least-squares gain coefficients for each variant's basis (N, 3, M).
+
+    With ``fixed_internal`` only the solar aperture is solved for.
+    """
+    coefficients = np.empty((basis.shape[0], 2))
+    for i, (offset, solar, internal) in enumerate(basis):
+        if fixed_internal is None:
+            coefficients[i] = nnls(np.column_stack([solar, internal]), target - offset)[0]
+        else:
+            remainder = target - offset - fixed_internal * internal
+            coefficients[i] = nnls(solar[:, None], remainder)[0][0], fixed_internal
+    return coefficients
+
+
+def calibrate_rc_parameters(
+    measured_temperature: pd.Series,
+    outdoor_temperature: pd.Series,
+    solar_irradiance: pd.Series,
+    initial_parameters: RCModelParameters,
+    internal_gains: Optional[pd.Series] = None,
+    model_type: RCModelType = RCModelType.TWO_R_TWO_C,
+    setpoint_heating: Optional[Union[float, pd.Series]] = None,
+    setpoint_cooling: Optional[Union[float, pd.Series]] = None,
+    dt_hours: Optional[float] = None,
+    fit_internal_gains: bool = True,
+    max_evaluations: int = 200,
+) -> RCCalibrationResult:
+    """
+    Fit RC parameters so that simulated indoor temperature matches measurements.
+
+    Fits the network resistances and capacitances (log space, within a factor
+    of 100 of the initial guess), the solar aperture g_solar * A_window and
+    the internal gains: a constant in W, or a non-negative scale on
+    ``internal_gains`` when a profile is given.
+
+    For free-floating data (no setpoints) the gains enter linearly and are
+    solved exactly for every trial network (variable projection), leaving
+    only the R/C values to the nonlinear solver. Free-floating data fixes
+    the time constant but only the products of R with the heat inputs, so
+    keep internal gains fixed (``fit_internal_gains=False``) when they are
+    known and an absolute U-value is needed.
+
+    Args:
+        measured_temperature: Measured indoor temperature (°C); reindexed to
+            the outdoor index, NaNs are excluded from the fit
+        outdoor_temperature: Outdoor temperature time series (°C)
+        solar_irradiance: Solar irradiance time series (W/m²)
+        initial_parameters: Starting point, e.g. from
+            RCModelParameters.estimate_from_building_properties
+        internal_gains: Internal gains profile (W), optional
+        model_type: Network to fit (falls back when parameters are missing)
+        setpoint_heating: Heating setpoint (°C); None means free-floating
+        setpoint_cooling: Cooling setpoint (°C); None means free-floating
+        dt_hours: Time step in hours (inferred from the index when None)
+        fit_internal_gains: Fit internal gains; when False they stay at
+            ``internal_gains`` or q_internal * A_floor
+        max_evaluations: Maximum objective evaluations
+
+    Returns:
+        RCCalibrationResult with fitted parameters and goodness of fit
+    """
+    index = outdoor_temperature.index
+    n_steps = len(index)
+    measured = measured_temperature.reindex(index).to_numpy(dtype=float)
+    valid = ~np.isnan(measured)
+    if valid.sum() < 10:
+        raise ValueError("At least 10 measured temperature samples are required for calibration")
+
+    def per_step(setpoint):
+        if setpoint is None:
+            return None
+        return np.broadcast_to(np.asarray(setpoint, dtype=float), (n_steps,))
+
+    problem = _CalibrationProblem(
+        initial=initial_parameters,
+        model_type=RCThermalModel._resolve_model_type(model_type, initial_parameters),
+        outdoor=outdoor_temperature.to_numpy(dtype=float),
+        solar=np.asarray(solar_irradiance, dtype=float),
+        internal=None if internal_gains is None else np.asarray(internal_gains, dtype=float),
+        setpoint_heating=per_step(setpoint_heating),
+        setpoint_cooling=per_step(setpoint_cooling),
+        initial_temperature=float(measured[valid][0]),
+        dt_hours=dt_hours if dt_hours is not None else _infer_dt_hours(index),
+    )
+    target = measured[valid]
+    lower, upper = problem.bounds()
+    count = len(problem.network)
+    fixed_internal = None if fit_internal_gains else float(problem.initial_vector()[count + 1])
+
+    if problem.free_floating:
+        lower, upper = lower[:count], upper[:count]
+
+        def simulate_batch(network: np.ndarray) -> np.ndarray:
+            basis = problem.basis(network)[:, :, valid]
+            coefficients = _gain_coefficients(basis, target, fixed_internal)
+            return basis[:, 0] + np.einsum("nk,nkt->nt", coefficients, basis[:, 1:])
+    else:
+        if fixed_internal is not None:
+            lower, upper = lower[:count + 1], upper[:count + 1]
+
+        def simulate_batch(vectors: np.ndarray) -> np.ndarray:
+            if fixed_internal is not None:
+                vectors = np.column_stack([vectors, np.full(vectors.shape[0], fixed_internal)])
+            return problem.simulate(vectors)[:, valid]
+
+    def residuals(vector: np.ndarray) -> np.ndarray:
+        return simulate_batch(vector[None, :])[0] - target
+
+    def jacobian(vector: np.ndarray) -> np.ndarray:
+        # Base point and every perturbation simulated in one batch
+        steps = _FD_STEP * np.maximum(1.0, np.abs(vector))
+        batch = np.vstack([vector, vector + np.diag(steps)])
+        simulated = simulate_batch(batch)
+        return ((simulated[1:] - simulated[0]) / steps[:, None]).T
+
+    start = np.clip(problem.initial_vector()[:lower.size], lower, upper)
+    fit = least_squares(
+        residuals,
+        start,
+        jac=jacobian,
+        bounds=(lower, upper),
+        x_scale="jac",
+        max_nfev=max_evaluations,
+    )
+
+    vector = fit.x
+    if problem.free_floating:
+        basis = problem.basis(vector[None, :])[:, :, valid]
+        vector = np.r_[vector, _gain_coefficients(basis, target, fixed_internal)[0]]
+    elif fixed_internal is not None:
+        vector = np.r_[vector, fixed_internal]
+
+    error = fit.fun
+    rmse = float(np.sqrt(np.mean(error ** 2)))
+    variance = float(np.var(target))
+    parameters = problem.parameters(vector)
+    model = RCThermalModel(parameters, problem.model_type)
+    return RCCalibrationResult(
+        parameters=parameters,
+        model_type=problem.model_type,
+        rmse=rmse,
+        mae=float(np.mean(np.abs(error))),
+        r_squared=float(1.0 - np.mean(error ** 2) / variance) if variance > 0 else 0.0,
+        cv_rmse=rmse / float(np.mean(target)) if np.mean(target) else float("nan"),
+        u_value=model.estimate_u_value(),
+        time_constant_hours=model.estimate_thermal_time_constant(),
+        solar_aperture_m2=float(vector[count]),
+        internal_gains_w=problem.internal_gains_w(vector),
+        n_points=int(valid.sum()),
+        n_evaluations=int(fit.nfev),
+        converged=bool(fit.success),
+        message=str(fit.message),
+    )
+
+
+def _calibrate_job(kwargs: dict) -> RCCalibrationResult:
+    return calibrate_rc_parameters(**kwargs)
+
+
+def calibrate_rc_portfolio(
+    measured_temperature: Dict[str, pd.Series],
+    outdoor_temperature: Union[pd.Series, Dict[str, pd.Series]],
+    solar_irradiance: Union[pd.Series, Dict[str, pd.Series]],
+    initial_parameters: Dict[str, RCModelParameters],
+    internal_gains: Optional[Dict[str, pd.Series]] = None,
+    max_workers: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, Optional[RCCalibrationResult]]:
+    """
+    Calibrate many rooms, optionally in a process pool.
+
+    Weather inputs may be shared Series or dicts keyed by room id. Rooms
+    without initial parameters, or whose fit fails, map to None.
+
+    Args:
+        measured_temperature: Measured indoor temperature per room id
+        outdoor_temperature: Outdoor temperature, shared or per room id
+        solar_irradiance: Solar irradiance, shared or per room id
+        initial_parameters: Starting RCModelParameters per room id
+        internal_gains: Internal gains profile per room id, optional
+        max_workers: Process pool size (None or 1 runs sequentially)
+        **kwargs: Passed to calibrate_rc_parameters
+
+    Returns:
+        Dictionary mapping room id to RCCalibrationResult (or None)
+    """
+    def pick(value, room_id):
+        return value.get(room_id) if isinstance(value, dict) else value
+
+    jobs: Dict[str, dict] = {}
+    for room_id, measured in measured_temperature.items():
+        if room_id not in initial_parameters:
+            continue
+        jobs[room_id] = dict(
+            measured_temperature=measured,
+            outdoor_temperature=pick(outdoor_temperature, room_id),
+            solar_irradiance=pick(solar_irradiance, room_id),
+            initial_parameters=initial_parameters[room_id],
+            internal_gains=(internal_gains or {}).get(room_id),
+            **kwargs,
+        )
+
+    results: Dict[str, Optional[RCCalibrationResult]] = {room_id: None for room_id in measured_temperature}
+    if max_workers is not None and max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {room_id: executor.submit(_calibrate_job, job) for room_id, job in jobs.items()}
+            for room_id, future in futures.items():
+                try:
+                    results[room_id] = future.result()
+                except Exception as e:
+                    print(f"Warning: RC calibration failed for {room_id}: {e}")
+    else:
+        for room_id, job in jobs.items():
+            try:
+                results[room_id] = _calibrate_job(job)
+            except Exception as e:
+                print(f"Warning: RC calibration failed for {room_id}: {e}")
+    return results
+
+
+__all__ = [
+    "RCCalibrationResult",
+    "calibrate_rc_parameters",
+    "calibrate_rc_portfolio",
+]
@@ -6,6 +6,10 @@ Implements simplified RC models for building thermal dynamics:
 - 2R2C: Two thermal mass model (wall + interior)
 - 3R3C: Three thermal mass model (detailed)
 
+Networks are discretized exactly (matrix exponential, zero-order hold),
+so large timesteps stay stable, and the HVAC-clamped recurrence runs in a
+tight kernel (see kernels.py).
+
 These models predict indoor temperature based on:
 - Outdoor temperature
 - Solar gains
@@ -14,12 +18,15 @@ These models predict indoor temperature based on:
 - Building thermal properties
 """
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from enum import Enum
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Sequence, Union
 import numpy as np
 import pandas as pd
 
+from .kernels import continuous_state_space, discretize, simulate_clamped, simulate_clamped_ensemble
+
 
 class RCModelType(str, Enum):
     """Types of RC models."""
@@ -119,6 +126,136 @@ class RCModelResult:
     metrics: Dict[str, float]  # Summary metrics
 
 
+@dataclass
+class RCEnsembleResult:
+    """Result of an ensemble simulation over N parameter variants."""
+    index: pd.Index  # Time index shared by all variants
+    temperature: np.ndarray  # Predicted indoor temperature (N, T)
+    heating_power: np.ndarray  # Required heating power (W), (N, T)
+    cooling_power: np.ndarray  # Required cooling power (W), (N, T)
+    metrics: Dict[str, np.ndarray]  # Summary metrics, one value per variant
+    model_type: "RCModelType"  # Network actually simulated for every variant
+
+    def __len__(self) -> int:
+        return int(self.temperature.shape[0])
+
+    def variant(self, i: int) -> Dict[str, pd.Series]:
+        """Return the time series of variant ``i`` as pandas Series."""
+        return {
+            "temperature": pd.Series(self.temperature[i], index=self.index),
+            "heating_power": pd.Series(self.heating_power[i], index=self.index),
+            "cooling_power": pd.Series(self.cooling_power[i], index=self.index),
+        }
+
+    def metrics_frame(self) -> pd.DataFrame:
+        """Per-variant metrics as a DataFrame (one row per variant)."""
+        return pd.DataFrame(self.metrics)
+
+
+def _summary_metrics(
+    temperature: np.ndarray,
+    heating_power: np.ndarray,
+    cooling_power: np.ndarray,
+    solar_gains: np.ndarray,
+    internal_gains: np.ndarray,
+    dt_hours: float,
+) -> Dict[str, np.ndarray]:
+    """Summary metrics along the last (time) axis."""
+    return {
+        "avg_temperature": np.mean(temperature, axis=-1),
+        "min_temperature": np.min(temperature, axis=-1),
+        "max_temperature": np.max(temperature, axis=-1),
+        "total_heating_kwh": np.sum(heating_power, axis=-1) * dt_hours / 1000,
+        "total_cooling_kwh": np.sum(cooling_power, axis=-1) * dt_hours / 1000,
+        "total_solar_gains_kwh": np.sum(solar_gains, axis=-1) * dt_hours / 1000,
+        "total_internal_gains_kwh": np.sum(internal_gains, axis=-1) * dt_hours / 1000,
+        "peak_heating_kw": np.max(heating_power, axis=-1) / 1000,
+        "peak_cooling_kw": np.max(cooling_power, axis=-1) / 1000,
+    }
+
+
+_PARAMETER_FIELDS = {f.name: f for f in fields(RCModelParameters)}
+
+
+def _stack_parameters(
+    parameters: Union[Sequence[RCModelParameters], Dict[str, Sequence[float]]]
+) -> Dict[str, np.ndarray]:
+    """
+    Stack variant parameters into float arrays of length N.
+
+    Optional resistances/capacitances are only included when every variant
+    provides them; other missing fields take the dataclass defaults.
+    """
+    if isinstance(parameters, dict):
+        unknown = set(parameters) - set(_PARAMETER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown RC parameters: {sorted(unknown)}")
+        columns = {name: np.atleast_1d(np.asarray(values, dtype=float)) for name, values in parameters.items()
+                   if values is not None}
+    else:
+        if len(parameters) == 0:
+            raise ValueError("At least one parameter variant is required")
+        columns = {}
+        for name in _PARAMETER_FIELDS:
+            values = [getattr(p, name) for p in parameters]
+            if all(v is not None for v in values):
+                columns[name] = np.asarray(values, dtype=float)
+
+    for name in ("R_exterior", "C_interior"):
+        if name not in columns:
+            raise ValueError(f"Missing required RC parameter: {name}")
+
+    size = max(values.size for values in columns.values())
+    stacked = {}
+    for name, field_info in _PARAMETER_FIELDS.items():
+        if name in columns:
+            stacked[name] = np.broadcast_to(columns[name], (size,)).astype(float)
+        elif field_info.default is not None:
+            stacked[name] = np.full(size, float(field_info.default))
+    return stacked
+
+
+def _ensemble_setpoint(
+    setpoint: Union[float, Sequence[float], np.ndarray, pd.Series],
+    size: int,
+    n_steps: int,
+) -> np.ndarray:
+    """
+    Broadcast a setpoint to (N, T) without copying.
+
+    A Series is a per-step schedule shared by all variants; any other 1-D
+    sequence holds one setpoint per variant.
+    """
+    if isinstance(setpoint, pd.Series):
+        return np.broadcast_to(setpoint.to_numpy(dtype=float)[None, :], (size, n_steps))
+    values = np.asarray(setpoint, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return np.broadcast_to(values, (size, n_steps))
+
+
+def _simulate_ensemble_chunked(args: tuple, max_workers: int, chunk_size: int) -> tuple:
+    """Split variants into chunks and simulate them in a process pool."""
+    Ad, Bd, T_outdoor, gains, sp_heat, sp_cool, initial = args
+    bounds = range(0, Ad.shape[0], chunk_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                simulate_clamped_ensemble,
+                Ad[start:start + chunk_size],
+                Bd[start:start + chunk_size],
+                T_outdoor,
+                np.ascontiguousarray(gains[start:start + chunk_size]),
+                np.ascontiguousarray(sp_heat[start:start + chunk_size]),
+                np.ascontiguousarray(sp_cool[start:start + chunk_size]),
+                initial[start:start + chunk_size],
+            )
+            for start in bounds
+        ]
+        parts = [future.result() for future in futures]
+    return tuple(np.concatenate([part[i] for part in parts]) for i in range(3))
+
+
 class RCThermalModel:
     """
     RC thermal model for building simulation.
@@ -158,8 +295,8 @@ class RCThermalModel:
             outdoor_temperature: Outdoor temperature time series (°C)
             solar_irradiance: Solar irradiance time series (W/m²)
             internal_gains: Internal gains time series (W), optional
-            setpoint_heating: Heating setpoint (°C)
-            setpoint_cooling: Cooling setpoint (°C)
+            setpoint_heating: Heating setpoint (°C), scalar or per-step
+            setpoint_cooling: Cooling setpoint (°C), scalar or per-step
             initial_temperature: Initial indoor temperature (°C)
             dt_hours: Time step in hours
 
@@ -167,137 +304,208 @@ class RCThermalModel:
             RCModelResult with predicted temperatures and loads
         """
         n_steps = len(outdoor_temperature)
-
-        # Initialize arrays
-        T_indoor = np.zeros(n_steps)
-        T_indoor[0] = initial_temperature
-
-        heating_power = np.zeros(n_steps)
-        cooling_power = np.zeros(n_steps)
-        solar_gains = np.zeros(n_steps)
-        internal_gains_array = np.zeros(n_steps)
-
-        # Calculate gains
-        for i in range(n_steps):
-            # Solar gains through windows
-            solar_gains[i] = (
-                self.params.g_solar *
-                self.params.A_window *
-                solar_irradiance.iloc[i]
-            )
-
-            # Internal gains
-            if internal_gains is not None:
-                internal_gains_array[i] = internal_gains.iloc[i]
-            else:
-                internal_gains_array[i] = self.params.q_internal * self.params.A_floor
-
-        # Simulate based on model type
-        if self.model_type == RCModelType.ONE_R_ONE_C:
-            T_indoor, heating_power, cooling_power = self._simulate_1r1c(
-                outdoor_temperature.to_numpy(),
-                solar_gains,
-                internal_gains_array,
-                setpoint_heating,
-                setpoint_cooling,
-                initial_temperature,
-                dt_hours
-            )
-        elif self.model_type == RCModelType.TWO_R_TWO_C:
-            T_indoor, heating_power, cooling_power = self._simulate_2r2c(
-                outdoor_temperature.to_numpy(),
-                solar_gains,
-                internal_gains_array,
-                setpoint_heating,
-                setpoint_cooling,
-                initial_temperature,
-                dt_hours
-            )
-        else:  # 3R3C
-            T_indoor, heating_power, cooling_power = self._simulate_2r2c(
-                outdoor_temperature.to_numpy(),
-                solar_gains,
-                internal_gains_array,
-                setpoint_heating,
-                setpoint_cooling,
-                initial_temperature,
-                dt_hours
-            )
+        T_outdoor = outdoor_temperature.to_numpy(dtype=float)
+
+        # Solar gains through windows and internal gains, as array expressions
+        solar_gains = self.params.g_solar * self.params.A_window * np.asarray(solar_irradiance, dtype=float)
+        if internal_gains is not None:
+            internal_gains_array = np.asarray(internal_gains, dtype=float)
+        else:
+            internal_gains_array = np.full(n_steps, self.params.q_internal * self.params.A_floor)
+
+        T_indoor, heating_power, cooling_power = self._simulate_network(
+            T_outdoor,
+            solar_gains + internal_gains_array,
+            np.broadcast_to(np.asarray(setpoint_heating, dtype=float), (n_steps,)),
+            np.broadcast_to(np.asarray(setpoint_cooling, dtype=float), (n_steps,)),
+            initial_temperature,
+            dt_hours,
+        )
 
         # Create series with same index as input
+        index = outdoor_temperature.index
         result = RCModelResult(
-            temperature=pd.Series(T_indoor, index=outdoor_temperature.index),
-            heating_power=pd.Series(heating_power, index=outdoor_temperature.index),
-            cooling_power=pd.Series(cooling_power, index=outdoor_temperature.index),
-            solar_gains=pd.Series(solar_gains, index=outdoor_temperature.index),
-            internal_gains=pd.Series(internal_gains_array, index=outdoor_temperature.index),
+            temperature=pd.Series(T_indoor, index=index),
+            heating_power=pd.Series(heating_power, index=index),
+            cooling_power=pd.Series(cooling_power, index=index),
+            solar_gains=pd.Series(solar_gains, index=index),
+            internal_gains=pd.Series(internal_gains_array, index=index),
             metrics=self._calculate_metrics(
-                T_indoor, heating_power, cooling_power, solar_gains, internal_gains_array
+                T_indoor, heating_power, cooling_power, solar_gains, internal_gains_array,
+                dt_hours=dt_hours,
             )
         )
 
         return result
 
-    def _simulate_1r1c(
-        self,
-        T_outdoor: np.ndarray,
-        solar_gains: np.ndarray,
-        internal_gains: np.ndarray,
-        setpoint_heating: float,
-        setpoint_cooling: float,
-        T_initial: float,
-        dt: float
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Simulate 1R1C model."""
-        n = len(T_outdoor)
-        T_indoor = np.zeros(n)
-        T_indoor[0] = T_initial
-
-        heating = np.zeros(n)
-        cooling = np.zeros(n)
-
-        R = self.params.R_exterior
-        C = self.params.C_interior
-        dt_seconds = dt * 3600
-
-        for i in range(1, n):
-            # Heat balance: C * dT/dt = (T_out - T_in)/R + Q_solar + Q_internal + Q_hvac
-            T_in = T_indoor[i-1]
-            T_out = T_outdoor[i]
-
-            # Free-floating temperature change
-            Q_total = (T_out - T_in) / R + solar_gains[i] + internal_gains[i]
-            dT = (Q_total / C) * dt_seconds
-            T_new = T_in + dT
-
-            # Apply HVAC control
-            if T_new < setpoint_heating:
-                heating[i] = ((setpoint_heating - T_new) * C) / dt_seconds
-                T_indoor[i] = setpoint_heating
-            elif T_new > setpoint_cooling:
-                cooling[i] = ((T_new - setpoint_cooling) * C) / dt_seconds
-                T_indoor[i] = setpoint_cooling
-            else:
-                T_indoor[i] = T_new
-
-        return T_indoor, heating, cooling
-
-    def _simulate_2r2c(
+    @classmethod
+    def simulate_ensemble(
+        cls,
+        parameters: Union[Sequence[RCModelParameters], Dict[str, Sequence[float]]],
+        outdoor_temperature: pd.Series,
+        solar_irradiance: pd.Series,
+        internal_gains: Optional[Union[pd.Series, np.ndarray]] = None,
+        setpoint_heating: Union[float, Sequence[float], np.ndarray, pd.Series] = 20.0,
+        setpoint_cooling: Union[float, Sequence[float], np.ndarray, pd.Series] = 26.0,
+        initial_temperature: Union[float, Sequence[float]] = 20.0,
+        dt_hours: float = 1.0,
+        model_type: RCModelType = RCModelType.TWO_R_TWO_C,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 512,
+    ) -> RCEnsembleResult:
+        """
+        Simulate N parameter variants against the same weather in one pass.
+
+        All variants are discretized together and advanced as an N x T state
+        matrix, which is much faster than N separate ``simulate()`` calls for
+        retrofit screening and parameter sweeps.
+
+        Args:
+            parameters: List of RCModelParameters, or a dict mapping
+                RCModelParameters field names to arrays of length N (missing
+                optional fields take the dataclass defaults)
+            outdoor_temperature: Outdoor temperature time series (°C)
+            solar_irradiance: Solar irradiance time series (W/m²)
+            internal_gains: Internal gains (W), a Series shared by all variants
+                or an (N, T) array; defaults to q_internal * A_floor per variant
+            setpoint_heating: Heating setpoint (°C): scalar, per-variant
+                sequence (N,), per-step Series (T,) or (N, T) array
+            setpoint_cooling: Cooling setpoint (°C), same forms as heating
+            initial_temperature: Initial indoor temperature (°C), scalar or (N,)
+            dt_hours: Time step in hours
+            model_type: Requested network; the ensemble runs the highest order
+                that every variant fully specifies
+            max_workers: Run chunks of variants in a process pool of this size
+                (None or 1 simulates in-process)
+            chunk_size: Variants per process-pool task
+
+        Returns:
+            RCEnsembleResult with stacked (N, T) temperatures and loads
+        """
+        stacked = _stack_parameters(parameters)
+        size = stacked["R_exterior"].size
+        n_steps = len(outdoor_temperature)
+        T_outdoor = outdoor_temperature.to_numpy(dtype=float)
+
+        order = cls._ensemble_model_type(model_type, stacked)
+        A, B = continuous_state_space(
+            order.value,
+            stacked["R_exterior"],
+            stacked["C_interior"],
+            R_interior=stacked.get("R_interior"),
+            C_exterior=stacked.get("C_exterior"),
+            R_boundary=stacked.get("R_boundary"),
+            C_air=stacked.get("C_air"),
+        )
+        Ad, Bd = discretize(A, B, dt_hours * 3600)
+
+        solar = np.asarray(solar_irradiance, dtype=float)
+        solar_gains = (stacked["g_solar"] * stacked["A_window"])[:, None] * solar[None, :]
+        if internal_gains is not None:
+            internal = np.broadcast_to(np.asarray(internal_gains, dtype=float), (size, n_steps))
+        else:
+            internal = np.broadcast_to((stacked["q_internal"] * stacked["A_floor"])[:, None], (size, n_steps))
+        gains = solar_gains + internal
+
+        sp_heat = _ensemble_setpoint(setpoint_heating, size, n_steps)
+        sp_cool = _ensemble_setpoint(setpoint_cooling, size, n_steps)
+        initial = np.repeat(
+            np.broadcast_to(np.asarray(initial_temperature, dtype=float), (size,))[:, None],
+            Ad.shape[1],
+            axis=1,
+        )
+
+        args = (Ad, Bd, T_outdoor, gains, sp_heat, sp_cool, initial)
+        if max_workers is not None and max_workers > 1 and size > chunk_size:
+            temperature, heating, cooling = _simulate_ensemble_chunked(args, max_workers, chunk_size)
+        else:
+            temperature, heating, cooling = simulate_clamped_ensemble(*args)
+
+        return RCEnsembleResult(
+            index=outdoor_temperature.index,
+            temperature=temperature,
+            heating_power=heating,
+            cooling_power=cooling,
+            metrics=_summary_metrics(temperature, heating, cooling, solar_gains, internal, dt_hours),
+            model_type=order,
+        )
+
+    @classmethod
+    def _ensemble_model_type(cls, model_type: RCModelType, stacked: Dict[str, np.ndarray]) -> RCModelType:
+        """Highest-order network up to ``model_type`` that every variant specifies."""
+        optional = ("R_interior", "R_boundary", "C_exterior", "C_air")
+        complete = RCModelParameters(
+            R_exterior=1.0,
+            C_interior=1.0,
+            **{name: (1.0 if name in stacked else None) for name in optional},
+        )
+        return cls._resolve_model_type(model_type, complete)
+
+    @property
+    def effective_model_type(self) -> RCModelType:
+        """
+        Model type actually simulated.
+
+        Falls back to a lower-order network when the parameters needed for
+        the requested one are missing.
+        """
+        return self._resolve_model_type(self.model_type, self.params)
+
+    @staticmethod
+    def _resolve_model_type(model_type: RCModelType, p: RCModelParameters) -> RCModelType:
+        """Highest-order network up to ``model_type`` that ``p`` fully specifies."""
+        if model_type == RCModelType.THREE_R_THREE_C and None not in (
+            p.R_interior, p.C_exterior, p.R_boundary, p.C_air
+        ):
+            return RCModelType.THREE_R_THREE_C
+        if model_type in (RCModelType.TWO_R_TWO_C, RCModelType.THREE_R_THREE_C) and None not in (
+            p.R_interior, p.C_exterior
+        ):
+            return RCModelType.TWO_R_TWO_C
+        return RCModelType.ONE_R_ONE_C
+
+    def discretize(self, dt_hours: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Exact zero-order-hold discretization of the thermal network.
+
+        Args:
+            dt_hours: Time step in hours
+
+        Returns:
+            Tuple (Ad, Bd) for x[k+1] = Ad x[k] + Bd [T_outdoor, Q_gains]
+        """
+        p = self.params
+        A, B = continuous_state_space(
+            self.effective_model_type.value,
+            p.R_exterior,
+            p.C_interior,
+            R_interior=p.R_interior,
+            C_exterior=p.C_exterior,
+            R_boundary=p.R_boundary,
+            C_air=p.C_air,
+        )
+        Ad, Bd = discretize(A, B, dt_hours * 3600)
+        return Ad[0], Bd[0]
+
+    def _simulate_network(
         self,
         T_outdoor: np.ndarray,
-        solar_gains: np.ndarray,
-        internal_gains: np.ndarray,
-        setpoint_heating: float,
-        setpoint_cooling: float,
+        gains: np.ndarray,
+        setpoint_heating: np.ndarray,
+        setpoint_cooling: np.ndarray,
         T_initial: float,
         dt: float
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Simulate 2R2C model (simplified version)."""
-        # For simplicity, using 1R1C with adjusted parameters
-        # Full 2R2C would need state space representation
-        return self._simulate_1r1c(
-            T_outdoor, solar_gains, internal_gains,
-            setpoint_heating, setpoint_cooling, T_initial, dt
+        """Simulate the discretized network with ideal HVAC clamping."""
+        Ad, Bd = self.discretize(dt)
+        return simulate_clamped(
+            Ad,
+            Bd,
+            T_outdoor,
+            gains,
+            setpoint_heating,
+            setpoint_cooling,
+            np.full(Ad.shape[0], float(T_initial)),
         )
 
     def _calculate_metrics(
@@ -306,20 +514,14 @@ class RCThermalModel:
         heating_power: np.ndarray,
         cooling_power: np.ndarray,
         solar_gains: np.ndarray,
-        internal_gains: np.ndarray
+        internal_gains: np.ndarray,
+        dt_hours: float = 1.0,
     ) -> Dict[str, float]:
-        """Calculate summary metrics."""
-        return {
-            "avg_temperature": float(np.mean(temperature)),
-            "min_temperature": float(np.min(temperature)),
-            "max_temperature": float(np.max(temperature)),
-            "total_heating_kwh": float(np.sum(heating_power) / 1000),
-            "total_cooling_kwh": float(np.sum(cooling_power) / 1000),
-            "total_solar_gains_kwh": float(np.sum(solar_gains) / 1000),
-            "total_internal_gains_kwh": float(np.sum(internal_gains) / 1000),
-            "peak_heating_kw": float(np.max(heating_power) / 1000),
-            "peak_cooling_kw": float(np.max(cooling_power) / 1000),
-        }
+        """Calculate summary metrics (energies integrate power over dt_hours)."""
+        metrics = _summary_metrics(
+            temperature, heating_power, cooling_power, solar_gains, internal_gains, dt_hours
+        )
+        return {name: float(value) for name, value in metrics.items()}
 
     def estimate_u_value(self) -> float:
         """
@@ -1,7 +1,8 @@
 """Real EPC simulation package."""
 
-from .model import calculate_epc_rating
+from .model import calculate_epc_rating, calculate_epc_ratings
 
 __all__ = [
     "calculate_epc_rating",
+    "calculate_epc_ratings",
 ]
@@ -4,8 +4,13 @@ EPC rating calculator using configuration-backed EU thresholds.
 
 from __future__ import annotations
 
+import math
+from bisect import bisect_left
 from functools import lru_cache
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 from core.config import load_epc_thresholds
 from core.enums.country import CountryCode
@@ -47,6 +52,68 @@ def _thresholds_for_country(
     return [(entry["rating"], float(entry["limit"])) for entry in entries]
 
 
+@lru_cache(maxsize=None)
+def _compiled_thresholds(
+    country_code: Optional[str | CountryCode],
+) -> Tuple[Tuple[Optional[str], ...], Tuple[float, ...]]:
+    """
+    Country thresholds resolved once into (labels, sorted limits).
+
+    Limits are the running maximum of the configured limits, so the first
+    sorted limit >= a value selects the same label as scanning the
+    configured list in order.
+    """
+    thresholds = _thresholds_for_country(country_code)
+    labels = tuple(label for label, _ in thresholds)
+    limits = tuple(np.maximum.accumulate([limit for _, limit in thresholds]).tolist()) if thresholds else ()
+    return labels, limits
+
+
+def calculate_epc_ratings(
+    primary_energy_kwh_m2: Union[Sequence[Optional[float]], np.ndarray, pd.Series],
+    country_codes: Optional[Union[str, CountryCode, Sequence[Optional[str | CountryCode]]]] = None,
+) -> np.ndarray:
+    """
+    Compute EPC ratings for many primary energy intensities at once.
+
+    Thresholds are resolved once per distinct country and each country's
+    buildings are rated with a single ``searchsorted``.
+
+    Args:
+        primary_energy_kwh_m2: Primary energy intensities (None/NaN give no rating)
+        country_codes: One country code for all values, or one per value
+
+    Returns:
+        Object array of rating labels (None where no rating applies)
+    """
+    values = np.asarray(primary_energy_kwh_m2)
+    if values.dtype.kind not in "fiu":
+        # Optional values (None) arrive as an object array
+        values = pd.to_numeric(pd.Series(values.ravel(), dtype=object), errors="coerce").to_numpy(dtype=float)
+    values = values.astype(float, copy=False).ravel()
+    ratings = np.full(values.size, None, dtype=object)
+
+    if country_codes is None or isinstance(country_codes, (str, CountryCode)):
+        codes = np.zeros(values.size, dtype=np.intp)
+        countries = [country_codes]
+    else:
+        codes, countries = pd.factorize(pd.Series(list(country_codes), dtype=object), use_na_sentinel=False)
+        if codes.size != values.size:
+            raise ValueError("country_codes must match primary_energy_kwh_m2 in length")
+        countries = [None if pd.isna(country) else country for country in countries]
+
+    valid = ~np.isnan(values)
+    for group, country in enumerate(countries):
+        labels, limits = _compiled_thresholds(country)
+        if not labels:
+            continue
+        members = np.flatnonzero((codes == group) & valid)
+        positions = np.searchsorted(limits, values[members], side="left")
+        rated = positions < len(labels)
+        ratings[members[rated]] = np.asarray(labels, dtype=object)[positions[rated]]
+    return ratings
+
+
 def calculate_epc_rating(
     primary_energy_kwh_m2: Optional[float],
     country_code: Optional[str | CountryCode] = None,
@@ -58,10 +125,10 @@ def calculate_epc_rating(
         return {"rating": None, "primary_energy_kwh_m2": None}
 
     rating = None
-    for label, limit in _thresholds_for_country(country_code):
-        if primary_energy_kwh_m2 <= limit:
-            rating = label
-            break
+    if not math.isnan(primary_energy_kwh_m2):
+        labels, limits = _compiled_thresholds(country_code)
+        position = bisect_left(limits, primary_energy_kwh_m2)
+        rating = labels[position] if position < len(labels) else None
 
     return {
         "rating": rating,
@@ -5,10 +5,15 @@ Estimates air change rate (ACH) by analyzing exponential CO2 decay
 when room becomes unoccupied.
 
 Based on: CO2(t) = CO2_outdoor + (CO2_initial - CO2_outdoor) * exp(-ACH * t)
+
+Decay segments are located with vectorized diff/searchsorted operations and
+fitted in closed form on the log-transformed excess concentration; all
+segments of all rooms can be fitted in one batched call. Nonlinear curve
+fitting is kept as an optional refinement.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 import numpy as np
 import pandas as pd
 from scipy.optimize import curve_fit
@@ -54,11 +59,19 @@ class VentilationCalculator:
         """
         self.outdoor_co2 = outdoor_co2
 
+    # Bounds applied to fitted ACH values (same as the curve_fit bounds)
+    ACH_BOUNDS = (0.1, 20.0)
+
+    # Minimum samples per decay segment and minimum R² for a usable fit
+    MIN_SEGMENT_POINTS = 5
+    MIN_R_SQUARED = 0.7
+
     def estimate_from_co2_decay(
         self,
         co2_series: pd.Series,
         volume_m3: Optional[float] = None,
-        min_decay_threshold: float = 100.0
+        min_decay_threshold: float = 100.0,
+        refine: bool = False,
     ) -> Optional[VentilationRateResult]:
         """
         Estimate ventilation rate from CO2 decay.
@@ -67,36 +80,135 @@ class VentilationCalculator:
             co2_series: Time series of CO2 measurements
             volume_m3: Room volume for L/s calculation
             min_decay_threshold: Minimum CO2 drop to consider (ppm)
+            refine: If True, refine each accepted fit with nonlinear least squares
 
         Returns:
             VentilationRateResult if decay found, None otherwise
         """
-        # Identify decay periods
-        decay_segments = self._identify_decay_periods(co2_series, min_decay_threshold)
+        results = self.estimate_batch(
+            {"room": co2_series},
+            volumes={"room": volume_m3},
+            min_decay_threshold=min_decay_threshold,
+            refine=refine,
+        )
+        return results["room"]
 
-        if not decay_segments:
-            return None
+    def estimate_batch(
+        self,
+        co2_by_room: Mapping[str, pd.Series],
+        volumes: Optional[Mapping[str, Optional[float]]] = None,
+        min_decay_threshold: float = 100.0,
+        refine: bool = False,
+    ) -> Dict[str, Optional[VentilationRateResult]]:
+        """
+        Estimate ventilation rates for many rooms at once.
 
-        # Analyze all segments and average
-        results = []
-        for segment in decay_segments:
-            result = self._analyze_decay_segment(segment, volume_m3)
-            if result and result.r_squared > 0.7:  # Only good fits
-                results.append(result)
+        Decay segments of all rooms are fitted together in a single
+        vectorized pass using the closed-form log-linear estimator.
 
-        if not results:
+        Args:
+            co2_by_room: Mapping of room id -> CO2 time series
+            volumes: Optional mapping of room id -> volume (m³)
+            min_decay_threshold: Minimum CO2 drop to consider (ppm)
+            refine: If True, refine each accepted fit with nonlinear least squares
+
+        Returns:
+            Mapping of room id -> VentilationRateResult (None if no usable decay)
+        """
+        volumes = volumes or {}
+        room_ids = list(co2_by_room.keys())
+
+        times: List[np.ndarray] = []
+        concentrations: List[np.ndarray] = []
+        segment_ids: List[np.ndarray] = []
+        initial: List[np.ndarray] = []
+        bounds_by_room: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        first_segment: Dict[str, int] = {}
+        n_segments = 0
+
+        for room_id in room_ids:
+            series = co2_by_room[room_id]
+            values = np.asarray(series, dtype=float)
+            starts, ends = self._decay_bounds(values, min_decay_threshold)
+            bounds_by_room[room_id] = (starts, ends)
+            first_segment[room_id] = n_segments
+            if starts.size == 0:
+                continue
+
+            hours = self._time_hours(series.index)
+            lengths = ends - starts
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            positions = np.arange(int(lengths.sum())) + offsets
+
+            ids = np.repeat(np.arange(n_segments, n_segments + starts.size), lengths)
+            times.append(hours[positions] - np.repeat(hours[starts], lengths))
+            concentrations.append(values[positions])
+            segment_ids.append(ids)
+            initial.append(values[starts])
+            n_segments += starts.size
+
+        if n_segments == 0:
+            return {room_id: None for room_id in room_ids}
+
+        ach, r_squared = self._fit_segments(
+            np.concatenate(times),
+            np.concatenate(concentrations),
+            np.concatenate(segment_ids),
+            np.concatenate(initial),
+        )
+        c0 = np.concatenate(initial)
+
+        results: Dict[str, Optional[VentilationRateResult]] = {}
+        for room_id in room_ids:
+            starts, ends = bounds_by_room[room_id]
+            first = first_segment[room_id]
+            sl = slice(first, first + starts.size)
+            room_ach, room_r2 = ach[sl].copy(), r_squared[sl].copy()
+
+            if refine:
+                series = co2_by_room[room_id]
+                for k, (start, end) in enumerate(zip(starts, ends)):
+                    if not room_r2[k] > self.MIN_R_SQUARED:
+                        continue
+                    refined = self._analyze_decay_segment(
+                        series.iloc[start:end],
+                        volumes.get(room_id),
+                        initial_ach=float(room_ach[k]),
+                    )
+                    if refined is not None:
+                        room_ach[k], room_r2[k] = refined.ach, refined.r_squared
+
+            results[room_id] = self._combine_segment_fits(
+                room_ach,
+                room_r2,
+                c0[sl],
+                volumes.get(room_id),
+            )
+
+        return results
+
+    def _combine_segment_fits(
+        self,
+        ach: np.ndarray,
+        r_squared: np.ndarray,
+        initial_co2: np.ndarray,
+        volume_m3: Optional[float],
+    ) -> Optional[VentilationRateResult]:
+        """Combine per-segment fits of one room into an R²-weighted result."""
+        good = np.isfinite(ach) & (r_squared > self.MIN_R_SQUARED)
+        if not good.any():
             return None
 
-        # Weight by R²
-        total_weight = sum(r.r_squared for r in results)
+        ach_values = ach[good]
+        weights = r_squared[good]
+        total_weight = float(weights.sum())
         if total_weight == 0:
             return None
 
-        weighted_ach = sum(r.ach * r.r_squared for r in results) / total_weight
-        avg_r_squared = sum(r.r_squared for r in results) / len(results)
+        weighted_ach = float(np.dot(ach_values, weights) / total_weight)
+        avg_r_squared = float(weights.mean())
 
         # Calculate pooled confidence interval
-        ach_values = [r.ach for r in results]
         ci_lower = float(np.percentile(ach_values, 2.5))
         ci_upper = float(np.percentile(ach_values, 97.5))
 
@@ -109,7 +221,7 @@ class VentilationCalculator:
         quality_score = avg_r_squared
 
         description = (
-            f"Estimated {weighted_ach:.2f} ACH ({category}) from {len(results)} decay periods. "
+            f"Estimated {weighted_ach:.2f} ACH ({category}) from {int(good.sum())} decay periods. "
             f"Average R²={avg_r_squared:.3f}."
         )
 
@@ -117,7 +229,7 @@ class VentilationCalculator:
             ach=round(weighted_ach, 2),
             ventilation_l_s=round(ventilation_l_s, 1) if ventilation_l_s else None,
             r_squared=round(avg_r_squared, 3),
-            initial_co2=round(float(np.mean([r.initial_co2 for r in results])), 1),
+            initial_co2=round(float(np.mean(initial_co2[good])), 1),
             final_co2=self.outdoor_co2,
             outdoor_co2=self.outdoor_co2,
             confidence_interval=(round(ci_lower, 2), round(ci_upper, 2)),
@@ -126,48 +238,132 @@ class VentilationCalculator:
             description=description,
         )
 
+    def _fit_segments(
+        self,
+        time_hours: np.ndarray,
+        co2_values: np.ndarray,
+        segment_ids: np.ndarray,
+        initial_co2: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closed-form ACH fit for many decay segments at once.
+
+        With C0 fixed at the first sample, z = ln((C - C_out) / (C0 - C_out)) = -ACH * t
+        is a regression through the origin, so ACH = -Σ(w·t·z) / Σ(w·t²) per
+        segment, with weights w = (C - C_out)².
+        R² is evaluated on the exponential model in concentration space.
+
+        Returns:
+            Tuple of (ach, r_squared) arrays, one entry per segment
+        """
+        n_segments = initial_co2.size
+        excess0 = (initial_co2 - self.outdoor_co2)[segment_ids]
+        excess = co2_values - self.outdoor_co2
+
+        finite = np.isfinite(co2_values) & np.isfinite(time_hours)
+        usable = finite & (excess > 0) & (excess0 > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(usable, np.log(np.where(usable, excess / excess0, 1.0)), 0.0)
+        t = np.where(usable, time_hours, 0.0)
+
+        # Weighting by the squared excess keeps noise near outdoor level from
+        # dominating the log residuals (approximates the nonlinear fit)
+        w = np.where(usable, excess, 0.0) ** 2
+        stt = np.bincount(segment_ids, weights=w * t * t, minlength=n_segments)
+        stz = np.bincount(segment_ids, weights=w * t * z, minlength=n_segments)
+        n_usable = np.bincount(segment_ids, weights=usable, minlength=n_segments)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ach = np.where(stt > 0, -stz / stt, np.nan)
+        ach = np.clip(ach, *self.ACH_BOUNDS)
+
+        # R² of the exponential model on the observed concentrations
+        y = np.where(finite, co2_values, 0.0)
+        n_finite = np.bincount(segment_ids, weights=finite, minlength=n_segments)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.bincount(segment_ids, weights=y, minlength=n_segments) / n_finite
+            predicted = self.outdoor_co2 + excess0 * np.exp(-ach[segment_ids] * time_hours)
+        ss_res = np.bincount(
+            segment_ids,
+            weights=np.where(finite, (y - predicted) ** 2, 0.0),
+            minlength=n_segments,
+        )
+        ss_tot = np.bincount(
+            segment_ids,
+            weights=np.where(finite, (y - mean[segment_ids]) ** 2, 0.0),
+            minlength=n_segments,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 0.0)
+        r_squared = np.where(np.isfinite(ach) & (n_usable >= 2), r_squared, np.nan)
+
+        return ach, r_squared
+
+    @staticmethod
+    def _time_hours(index: pd.Index) -> np.ndarray:
+        """Elapsed time in hours for each sample (sample count if not datetime-indexed)."""
+        if isinstance(index, pd.DatetimeIndex):
+            return index.as_unit("ns").asi8 / 3.6e12
+        return np.arange(len(index), dtype=float)
+
+    def _decay_bounds(
+        self,
+        values: np.ndarray,
+        min_decay: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Locate decay segments as [start, end) index pairs.
+
+        A decay starts at i - 2 when samples i - 1 and i both decrease and the
+        total drop exceeds ``min_decay``; it ends at the next rise of more
+        than 5 ppm. Later start candidates before that rise belong to the
+        same decay, so the first candidate between two rises opens a segment.
+        """
+        n = values.size
+        empty = np.empty(0, dtype=np.int64)
+        if n < 3:
+            return empty, empty
+
+        diff = np.empty(n)
+        diff[0] = np.nan
+        diff[1:] = np.diff(values)
+
+        candidates = np.flatnonzero(
+            (diff[2:] < 0) & (diff[1:-1] < 0) & (values[:-2] > values[2:] + min_decay)
+        ) + 2
+        if candidates.size == 0:
+            return empty, empty
+
+        rises = np.flatnonzero(diff > 5)
+        next_rise = np.searchsorted(rises, candidates, side="right")
+        opens = np.ones(candidates.size, dtype=bool)
+        opens[1:] = next_rise[1:] != next_rise[:-1]
+
+        starts = candidates[opens] - 2
+        rise_slot = next_rise[opens]
+        ends = np.full(starts.size, n, dtype=np.int64)
+        closed = rise_slot < rises.size
+        ends[closed] = rises[rise_slot[closed]]
+
+        keep = (ends - starts) >= self.MIN_SEGMENT_POINTS
+        return starts[keep], ends[keep]
+
     def _identify_decay_periods(
         self,
         co2_series: pd.Series,
         min_decay: float
     ) -> List[pd.Series]:
         """Identify periods where CO2 is decaying."""
-        segments = []
-        co2_diff = co2_series.diff()
-
-        in_decay = False
-        decay_start = None
-
-        for i in range(1, len(co2_series)):
-            if not in_decay:
-                # Look for start of decay (2 consecutive decreases)
-                if i >= 2 and co2_diff.iloc[i] < 0 and co2_diff.iloc[i - 1] < 0:
-                    if co2_series.iloc[i - 2] > co2_series.iloc[i] + min_decay:
-                        in_decay = True
-                        decay_start = i - 2
-            else:
-                # Look for end of decay (increase or plateau)
-                if co2_diff.iloc[i] > 5:
-                    segment = co2_series.iloc[decay_start:i]
-                    if len(segment) >= 5:
-                        segments.append(segment)
-                    in_decay = False
-                    decay_start = None
-
-        # Handle decay extending to end
-        if in_decay and decay_start is not None:
-            segment = co2_series.iloc[decay_start:]
-            if len(segment) >= 5:
-                segments.append(segment)
-
-        return segments
+        starts, ends = self._decay_bounds(np.asarray(co2_series, dtype=float), min_decay)
+        return [co2_series.iloc[start:end] for start, end in zip(starts, ends)]
 
     def _analyze_decay_segment(
         self,
         co2_segment: pd.Series,
-        volume_m3: Optional[float]
+        volume_m3: Optional[float],
+        initial_ach: float = 1.0,
     ) -> Optional[VentilationRateResult]:
-        """Analyze a single decay segment to estimate ACH."""
+        """Analyze a single decay segment with nonlinear least squares."""
         if len(co2_segment) < 5:
             return None
 
@@ -194,8 +390,8 @@ class VentilationCalculator:
                 decay_func,
                 time_hours,
                 co2_values,
-                p0=[1.0],
-                bounds=([0.1], [20.0]),
+                p0=[min(max(initial_ach, self.ACH_BOUNDS[0]), self.ACH_BOUNDS[1])],
+                bounds=([self.ACH_BOUNDS[0]], [self.ACH_BOUNDS[1]]),
             )
 
             ach = float(popt[0])
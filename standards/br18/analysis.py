@@ -6,10 +6,12 @@ requirements using the refactored compute_standards API shape.
 
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import yaml
 
@@ -19,6 +21,7 @@ from core.analysis import (
     AnalysisStatus,
     AnalysisType,
 )
+from core.data_quality import DataQualityProfile, get_quality_profile
 from core.spacial_entity import SpatialEntity
 
 
@@ -56,24 +59,21 @@ def _series_from_timeseries(
     return series.dropna()
 
 
-def _estimate_step_hours(index: pd.Index) -> Optional[float]:
-    """Best-effort estimate of the sampling step in hours."""
+def _estimate_step_hours(
+    index: pd.Index,
+    profile: Optional[DataQualityProfile] = None,
+) -> Optional[float]:
+    """Sampling step in hours, from the ingest profile when available."""
 
+    if profile is not None:
+        return profile.step_hours
     if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
         return None
+    return get_quality_profile(index).step_hours
 
-    diffs = index.to_series().diff().dropna().dt.total_seconds()
-    diffs = diffs[diffs > 0]
-    if diffs.empty:
-        return None
-    return float(diffs.median()) / 3600.0
-
-
-def _evaluate_rule(series: pd.Series, rule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Evaluate a single BR18 rule and compute compliance statistics."""
 
-    if series is None or series.empty:
-        return None
+def _rule_mask(series: pd.Series, rule_config: Dict[str, Any]) -> Optional[pd.Series]:
+    """Boolean compliance mask of a series under a BR18 rule (None if not evaluable)."""
 
     operator = (rule_config.get("operator") or "").lower()
     mask: Optional[pd.Series] = None
@@ -97,14 +97,19 @@ def _evaluate_rule(series: pd.Series, rule_config: Dict[str, Any]) -> Optional[D
             return None
         mask = series >= target
 
-    if mask is None or mask.empty:
-        return None
+    return mask
+
+
+def _rule_summary(
+    rule_config: Dict[str, Any],
+    total_points: int,
+    compliant_points: int,
+    step_hours: float,
+) -> Dict[str, Any]:
+    """Compliance statistics of a rule from its sample counts."""
 
-    total_points = len(mask)
-    compliant_points = int(mask.sum())
     compliance_rate = (compliant_points / total_points) * 100.0 if total_points else 0.0
 
-    step_hours = _estimate_step_hours(series.index) or 1.0
     total_hours = total_points * step_hours
     non_compliant_points = total_points - compliant_points
     non_compliant_hours = non_compliant_points * step_hours
@@ -123,7 +128,7 @@ def _evaluate_rule(series: pd.Series, rule_config: Dict[str, Any]) -> Optional[D
         "rule_id": rule_config.get("id", rule_config.get("name", "br18_rule")),
         "name": rule_config.get("name", "BR18 Rule"),
         "metric": rule_config.get("metric"),
-        "operator": operator,
+        "operator": (rule_config.get("operator") or "").lower(),
         "compliance_rate": compliance_rate,
         "total_hours": total_hours,
         "non_compliant_hours": non_compliant_hours,
@@ -141,6 +146,129 @@ def _evaluate_rule(series: pd.Series, rule_config: Dict[str, Any]) -> Optional[D
     }
 
 
+def _evaluate_rule(
+    series: pd.Series,
+    rule_config: Dict[str, Any],
+    profile: Optional[DataQualityProfile] = None,
+) -> Optional[Dict[str, Any]]:
+    """Evaluate a single BR18 rule and compute compliance statistics."""
+
+    if series is None or series.empty:
+        return None
+
+    mask = _rule_mask(series, rule_config)
+    if mask is None or mask.empty:
+        return None
+
+    step_hours = _estimate_step_hours(series.index, profile) or 1.0
+    return _rule_summary(rule_config, len(mask), int(mask.sum()), step_hours)
+
+
+class BR18PartialState:
+    """
+    Mergeable partial state of the BR18 rule evaluation.
+
+    Keeps (evaluated, compliant) sample counts per rule and, per metric, a
+    histogram of sampling steps plus the first and last timestamps, so the
+    step across each chunk edge is counted and the dominant step (and hence
+    the hours per rule) matches an evaluation of the whole series. Chunks
+    must be time-ordered; states of consecutive time ranges merge in order.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[Dict[str, Any]]] = None,
+        profile: Optional[DataQualityProfile] = None,
+    ):
+        self.rules = rules if rules is not None else load_config().get("rules", [])
+        self.profile = profile
+        self.rule_counts: Dict[str, List[int]] = {}
+        self.steps: Dict[str, Counter] = {}
+        self.bounds: Dict[str, List[int]] = {}  # metric -> [first ns, last ns]
+
+    @staticmethod
+    def _rule_key(rule_config: Dict[str, Any]) -> str:
+        return str(rule_config.get("id", rule_config.get("name", "br18_rule")))
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold in one chunk of the room's data (columns named by rule metric)."""
+        metrics = {rule.get("metric") for rule in self.rules}
+        series_by_metric: Dict[str, pd.Series] = {}
+        for metric in metrics:
+            if metric not in chunk:
+                continue
+            series = pd.to_numeric(chunk[metric], errors="coerce").dropna()
+            if not isinstance(series.index, pd.DatetimeIndex) or series.empty:
+                continue
+            series_by_metric[metric] = series
+            self._add_steps(metric, np.sort(series.index.as_unit("ns").asi8))
+
+        for rule in self.rules:
+            series = series_by_metric.get(rule.get("metric"))
+            if series is None:
+                continue
+            mask = _rule_mask(series, rule)
+            if mask is None or mask.empty:
+                continue
+            counts = self.rule_counts.setdefault(self._rule_key(rule), [0, 0])
+            counts[0] += len(mask)
+            counts[1] += int(mask.sum())
+
+    def _add_steps(self, metric: str, stamps: np.ndarray) -> None:
+        bounds = self.bounds.get(metric)
+        if bounds is not None:
+            stamps = np.concatenate(([bounds[1]], stamps))
+        steps = np.diff(stamps)
+        values, counts = np.unique(steps[steps > 0], return_counts=True)
+        histogram = self.steps.setdefault(metric, Counter())
+        histogram.update(dict(zip(values.tolist(), counts.tolist())))
+        if bounds is None:
+            self.bounds[metric] = [int(stamps[0]), int(stamps[-1])]
+        else:
+            bounds[1] = int(stamps[-1])
+
+    def merge(self, other: "BR18PartialState") -> "BR18PartialState":
+        """Append the state of the following time range."""
+        for key, (total, compliant) in other.rule_counts.items():
+            counts = self.rule_counts.setdefault(key, [0, 0])
+            counts[0] += total
+            counts[1] += compliant
+        for metric, (first, last) in other.bounds.items():
+            histogram = self.steps.setdefault(metric, Counter())
+            histogram.update(other.steps.get(metric, {}))
+            bounds = self.bounds.get(metric)
+            if bounds is None:
+                self.bounds[metric] = [first, last]
+                continue
+            if first < bounds[1]:
+                raise ValueError("BR18 partial states must be merged in time order")
+            if first > bounds[1]:
+                histogram[first - bounds[1]] += 1
+            bounds[1] = last
+        return self
+
+    def step_hours(self, metric: str) -> float:
+        """Dominant sampling step of a metric in hours (1.0 when unknown)."""
+        if self.profile is not None:
+            return self.profile.step_hours or 1.0
+        histogram = self.steps.get(metric)
+        if not histogram:
+            return 1.0
+        # Most frequent step, the smallest on ties
+        dominant = min(histogram, key=lambda step: (-histogram[step], step))
+        return (dominant / 1e9) / 3600.0
+
+    def result(self) -> List[Dict[str, Any]]:
+        """Rule evaluations, in config order, as ``_evaluate_rule`` returns them."""
+        evaluations = []
+        for rule in self.rules:
+            counts = self.rule_counts.get(self._rule_key(rule))
+            if not counts or not counts[0]:
+                continue
+            evaluations.append(_rule_summary(rule, counts[0], counts[1], self.step_hours(rule.get("metric"))))
+        return evaluations
+
+
 def run(
     spatial_entity: SpatialEntity,
     timeseries_dict: Dict[str, List[float]],
@@ -193,7 +321,11 @@ def run(
     for rule_cfg in config.get("rules", []):
         metric = rule_cfg.get("metric")
         series = series_cache.get(metric)
-        evaluation = _evaluate_rule(series, rule_cfg) if series is not None else None
+        evaluation = (
+            _evaluate_rule(series, rule_cfg, kwargs.get("quality_profile"))
+            if series is not None
+            else None
+        )
         if not evaluation:
             continue
 
@@ -6,10 +6,10 @@ refactored service architecture with RuleSet and TestRule models.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import timezone
 
 import numpy as np
@@ -31,6 +31,7 @@ from core.analysis import (
     AnalysisType,
 )
 from core.spacial_entity import SpatialEntity
+from core.filters.filter_plan import FilterPlan
 from core.enums import (
     MetricType,
     RuleOperator,
@@ -533,6 +534,47 @@ class EN16798Calculator:
             adaptive_model_used=bool(adaptive_used),
         )
 
+    @staticmethod
+    def _select_occupied(
+        series: Optional[pd.Series],
+        occupancy_mask: Optional[Union[pd.Series, FilterPlan]],
+    ) -> Optional[pd.Series]:
+        """Restrict a series to occupied samples (boolean Series or compiled FilterPlan)."""
+        if series is None or occupancy_mask is None:
+            return series
+        if isinstance(occupancy_mask, FilterPlan):
+            return occupancy_mask.apply(series)
+        return series[occupancy_mask]
+
+    @staticmethod
+    def _joint_compliance_counts(
+        temperature: Optional[pd.Series],
+        co2: Optional[pd.Series],
+        humidity: Optional[pd.Series],
+        season: str,
+        thresholds: EN16798Thresholds,
+    ) -> Tuple[int, int]:
+        """(compliant, total) timestamps where every given parameter is within the thresholds."""
+        compliances = []
+
+        if temperature is not None:
+            temp_thresh = thresholds.temperature_heating if season.lower() == "heating" else thresholds.temperature_cooling
+            temp_compliant = (temperature >= temp_thresh["lower"]) & (temperature <= temp_thresh["upper"])
+            compliances.append(temp_compliant)
+
+        if co2 is not None:
+            co2_compliant = co2 <= thresholds.co2_ppm
+            compliances.append(co2_compliant)
+
+        if humidity is not None:
+            rh_compliant = (humidity >= thresholds.humidity_lower) & (humidity <= thresholds.humidity_upper)
+            compliances.append(rh_compliant)
+
+        if not compliances:
+            return 0, 0
+        overall_compliant = pd.concat(compliances, axis=1).all(axis=1)
+        return int(overall_compliant.sum()), len(overall_compliant)
+
     @classmethod
     def assess_timeseries_compliance(
         cls,
@@ -544,13 +586,23 @@ class EN16798Calculator:
         ventilation_type: VentilationType = VentilationType.MECHANICAL,
         outdoor_co2: float = OUTDOOR_CO2,
         categories_to_check: Optional[List[EN16798Category]] = None,
+        outdoor_running_mean: Optional[float] = None,
+        occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None,
     ) -> Dict[str, Any]:
-        """Assess compliance over time series data."""
+        """Assess compliance over time series data.
+
+        A precomputed ``outdoor_running_mean`` (e.g. from a shared weather
+        station) takes precedence over deriving it from ``outdoor_temperature``.
+        ``occupancy_mask`` may be a boolean Series or a compiled FilterPlan.
+        """
         if categories_to_check is None:
             categories_to_check = list(EN16798Category)
 
-        outdoor_running_mean = None
-        if outdoor_temperature is not None and len(outdoor_temperature) > 0:
+        temperature = cls._select_occupied(temperature, occupancy_mask)
+        co2 = cls._select_occupied(co2, occupancy_mask)
+        humidity = cls._select_occupied(humidity, occupancy_mask)
+
+        if outdoor_running_mean is None and outdoor_temperature is not None and len(outdoor_temperature) > 0:
             daily_temps = outdoor_temperature.resample("D").mean().dropna().tolist()
             outdoor_running_mean = cls.calculate_running_mean_outdoor_temp(daily_temps)
 
@@ -560,26 +612,55 @@ class EN16798Calculator:
                 category, season, outdoor_running_mean, ventilation_type, outdoor_co2
             )
 
-            compliances = []
+            compliant, total = cls._joint_compliance_counts(temperature, co2, humidity, season, thresholds)
+            compliance_rate = (compliant / total) * 100 if total else 0.0
 
-            if temperature is not None:
-                temp_thresh = thresholds.temperature_heating if season.lower() == "heating" else thresholds.temperature_cooling
-                temp_compliant = (temperature >= temp_thresh["lower"]) & (temperature <= temp_thresh["upper"])
-                compliances.append(temp_compliant)
+            results[category.value] = {
+                "compliance_rate": round(compliance_rate, 2),
+                "thresholds": thresholds,
+            }
 
-            if co2 is not None:
-                co2_compliant = co2 <= thresholds.co2_ppm
-                compliances.append(co2_compliant)
+        return results
 
-            if humidity is not None:
-                rh_compliant = (humidity >= thresholds.humidity_lower) & (humidity <= thresholds.humidity_upper)
-                compliances.append(rh_compliant)
+    @classmethod
+    def assess_band_compliance(
+        cls,
+        parameter: str,
+        count_within: Callable[[Optional[float], Optional[float]], Tuple[int, int]],
+        total: int,
+        season: str = "heating",
+        ventilation_type: VentilationType = VentilationType.MECHANICAL,
+        outdoor_co2: float = OUTDOOR_CO2,
+        categories_to_check: Optional[List[EN16798Category]] = None,
+        outdoor_running_mean: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Single-parameter ``assess_timeseries_compliance`` from band counts.
+
+        With one parameter and no occupancy mask, the compliance of a
+        category is the share of samples inside one threshold band, so it
+        can be answered by a ``count_within(lower, upper)`` callable such as
+        ``CompressedSeries.count_within`` without materializing the series.
+        ``total`` is the number of samples including NaN, which count as
+        non-compliant like in the Series path.
+        """
+        if categories_to_check is None:
+            categories_to_check = list(EN16798Category)
 
-            if compliances:
-                overall_compliant = pd.concat(compliances, axis=1).all(axis=1)
-                compliance_rate = (overall_compliant.sum() / len(overall_compliant)) * 100
+        results: Dict[str, Any] = {}
+        for category in categories_to_check:
+            thresholds = cls.get_thresholds(
+                category, season, outdoor_running_mean, ventilation_type, outdoor_co2
+            )
+            if parameter == "temperature":
+                temp_thresh = thresholds.temperature_heating if season.lower() == "heating" else thresholds.temperature_cooling
+                compliant, _ = count_within(temp_thresh["lower"], temp_thresh["upper"])
+            elif parameter == "co2":
+                compliant, _ = count_within(None, thresholds.co2_ppm)
+            elif parameter == "humidity":
+                compliant, _ = count_within(thresholds.humidity_lower, thresholds.humidity_upper)
             else:
-                compliance_rate = 0.0
+                raise ValueError(f"Unknown EN16798 parameter '{parameter}'")
+            compliance_rate = (compliant / total) * 100 if total else 0.0
 
             results[category.value] = {
                 "compliance_rate": round(compliance_rate, 2),
@@ -598,8 +679,9 @@ class EN16798Calculator:
         season: str = "heating",
         ventilation_type: VentilationType = VentilationType.MECHANICAL,
         outdoor_co2: float = OUTDOOR_CO2,
-        occupancy_mask: Optional[pd.Series] = None,
+        occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None,
         categories_to_check: Optional[List[EN16798Category]] = None,
+        outdoor_running_mean: Optional[float] = None,
     ) -> EN16798DetailedResult:
         """Perform comprehensive EN 16798-1 analysis with detailed metrics."""
         from datetime import datetime
@@ -607,18 +689,13 @@ class EN16798Calculator:
         if categories_to_check is None:
             categories_to_check = list(EN16798Category)
 
-        outdoor_running_mean = None
-        if outdoor_temperature is not None and len(outdoor_temperature) > 0:
+        if outdoor_running_mean is None and outdoor_temperature is not None and len(outdoor_temperature) > 0:
             daily_temps = outdoor_temperature.resample("D").mean().dropna().tolist()
             outdoor_running_mean = cls.calculate_running_mean_outdoor_temp(daily_temps)
 
-        if occupancy_mask is not None:
-            if temperature is not None:
-                temperature = temperature[occupancy_mask]
-            if co2 is not None:
-                co2 = co2[occupancy_mask]
-            if humidity is not None:
-                humidity = humidity[occupancy_mask]
+        temperature = cls._select_occupied(temperature, occupancy_mask)
+        co2 = cls._select_occupied(co2, occupancy_mask)
+        humidity = cls._select_occupied(humidity, occupancy_mask)
 
         total_points = 0
         if temperature is not None:
@@ -858,6 +935,78 @@ class EN16798Calculator:
 
         return metrics
 
+
+@dataclass
+class EN16798PartialState:
+    """
+    Mergeable partial state of ``EN16798Calculator.assess_timeseries_compliance``.
+
+    Holds (compliant, total) joint counts per category so that time-ordered
+    chunks of a wide frame (columns ``temperature``, ``co2``, ``humidity``)
+    can be evaluated one at a time. Adaptive limits need the outdoor running
+    mean up front, as the thresholds must be known before the first chunk.
+    """
+
+    season: str = "heating"
+    ventilation_type: VentilationType = VentilationType.MECHANICAL
+    outdoor_co2: float = EN16798Calculator.OUTDOOR_CO2
+    categories: Optional[List[EN16798Category]] = None
+    outdoor_running_mean: Optional[float] = None
+    occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None
+    counts: Dict[str, List[int]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.categories is None:
+            self.categories = list(EN16798Category)
+        self._thresholds = {
+            category: EN16798Calculator.get_thresholds(
+                category, self.season, self.outdoor_running_mean, self.ventilation_type, self.outdoor_co2
+            )
+            for category in self.categories
+        }
+        for category in self.categories:
+            self.counts.setdefault(category.value, [0, 0])
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold in one chunk of the room's data.
+
+        Rows stay aligned across columns: as in the in-memory assessment, a
+        row with a missing value counts towards the total but not as compliant.
+        """
+        series = {
+            name: EN16798Calculator._select_occupied(chunk[name], self.occupancy_mask) if name in chunk else None
+            for name in ("temperature", "co2", "humidity")
+        }
+        for category, thresholds in self._thresholds.items():
+            compliant, total = EN16798Calculator._joint_compliance_counts(
+                series["temperature"], series["co2"], series["humidity"], self.season, thresholds
+            )
+            counts = self.counts[category.value]
+            counts[0] += compliant
+            counts[1] += total
+
+    def merge(self, other: "EN16798PartialState") -> "EN16798PartialState":
+        """Add the counts of a state evaluated with the same settings."""
+        for key, (compliant, total) in other.counts.items():
+            counts = self.counts.setdefault(key, [0, 0])
+            counts[0] += compliant
+            counts[1] += total
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        """Same shape as ``assess_timeseries_compliance``."""
+        results: Dict[str, Any] = {}
+        for category, thresholds in self._thresholds.items():
+            compliant, total = self.counts[category.value]
+            compliance_rate = (compliant / total) * 100 if total else 0.0
+            results[category.value] = {
+                "compliance_rate": round(compliance_rate, 2),
+                "thresholds": thresholds,
+            }
+        return results
+
+
 def load_config() -> Dict[str, Any]:
     """Load the en16798_1 configuration file."""
     config_path = Path(__file__).parent / "config.yaml"
@@ -974,7 +1123,13 @@ def run(
         timestamps: List of timestamp strings
         season: "winter" or "summer"
         categories: List of categories to check (default: all)
-        **kwargs: Additional configuration
+        **kwargs: Additional configuration (``outdoor_running_mean`` skips
+            re-deriving the running mean from the outdoor series;
+            ``occupancy_mask`` accepts a boolean Series or FilterPlan;
+            ``compressed_series`` maps metrics missing from
+            ``timeseries_dict`` to their CompressedSeries, whose threshold
+            bands are counted without decoding when a single indoor
+            parameter is assessed without an occupancy mask)
 
     Returns:
         ComplianceAnalysis object with results
@@ -994,13 +1149,27 @@ def run(
     # Use EN16798Calculator for actual computation
     calculator = EN16798Calculator()
 
+    compressed = kwargs.get('compressed_series') or {}
+    occupancy_mask = kwargs.get('occupancy_mask')
+    indoor = [m for m in ('temperature', 'co2', 'humidity') if m in timeseries_dict or m in compressed]
+    band_metric = None
+    if len(indoor) == 1 and indoor[0] not in timeseries_dict and occupancy_mask is None:
+        band_metric = indoor[0]
+
     # Convert timeseries to pandas Series
     ts_data = {}
     ts_index = pd.to_datetime(timestamps) if timestamps else None
 
-    for metric, values in timeseries_dict.items():
-        if metric in ['temperature', 'co2', 'humidity', 'outdoor_temperature']:
-            ts_data[metric] = pd.Series(values, index=ts_index) if ts_index is not None else pd.Series(values)
+    for metric in ['temperature', 'co2', 'humidity', 'outdoor_temperature']:
+        if metric == band_metric:
+            continue
+        if metric in timeseries_dict:
+            values = timeseries_dict[metric]
+        elif metric in compressed:
+            values = compressed[metric].decode()[1]
+        else:
+            continue
+        ts_data[metric] = pd.Series(values, index=ts_index) if ts_index is not None else pd.Series(values)
 
     # Determine ventilation type
     vent_type_map = {
@@ -1029,15 +1198,34 @@ def run(
     }
     calc_season = season_map.get(season.lower(), 'heating')
 
-    calc_result = calculator.assess_timeseries_compliance(
-        temperature=ts_data.get('temperature'),
-        co2=ts_data.get('co2'),
-        humidity=ts_data.get('humidity'),
-        outdoor_temperature=ts_data.get('outdoor_temperature'),
-        season=calc_season,
-        ventilation_type=vent_type,
-        categories_to_check=categories_to_check,
-    )
+    if band_metric is not None:
+        outdoor_running_mean = kwargs.get('outdoor_running_mean')
+        outdoor = ts_data.get('outdoor_temperature')
+        if outdoor_running_mean is None and outdoor is not None and len(outdoor) > 0:
+            daily_temps = outdoor.resample("D").mean().dropna().tolist()
+            outdoor_running_mean = calculator.calculate_running_mean_outdoor_temp(daily_temps)
+        series = compressed[band_metric]
+        calc_result = calculator.assess_band_compliance(
+            band_metric,
+            series.count_within,
+            len(series),
+            season=calc_season,
+            ventilation_type=vent_type,
+            categories_to_check=categories_to_check,
+            outdoor_running_mean=outdoor_running_mean,
+        )
+    else:
+        calc_result = calculator.assess_timeseries_compliance(
+            temperature=ts_data.get('temperature'),
+            co2=ts_data.get('co2'),
+            humidity=ts_data.get('humidity'),
+            outdoor_temperature=ts_data.get('outdoor_temperature'),
+            season=calc_season,
+            ventilation_type=vent_type,
+            categories_to_check=categories_to_check,
+            outdoor_running_mean=kwargs.get('outdoor_running_mean'),
+            occupancy_mask=occupancy_mask,
+        )
 
     # Convert calculator results to TestResult objects
     test_results = []
@@ -187,7 +187,8 @@ def run(
         timeseries_dict: Dict mapping metric names to value lists
         timestamps: List of timestamp strings
         custom_thresholds: Optional custom thresholds override
-        **kwargs: Additional configuration
+        **kwargs: Additional configuration (``occupancy_mask`` accepts a
+            boolean Series or FilterPlan)
 
     Returns:
         ComplianceAnalysis object with TAIL results
@@ -250,6 +251,7 @@ def run(
         thresholds,
         metadata=metadata,
         building_name=spatial_entity.name,
+        occupancy_mask=kwargs.get('occupancy_mask'),
     )
 
     # Create TestResult for each domain
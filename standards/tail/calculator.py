@@ -8,13 +8,16 @@ measurements per parameter-specific logic, and returns graph-ready data.
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from core.compliance_sketch import ValueSketch
+from core.filters.filter_plan import FilterPlan
 from core.schedules import (
     generate_occupancy_mask,
     get_opening_profile_for_building_type,
@@ -215,6 +218,13 @@ class TAILCalculator:
         "default": 300.0,
     }
 
+    # Applied to the 95th percentile of the CO2 series
+    CO2_THRESHOLDS: List[Tuple[str, Optional[float], Optional[float]]] = [
+        ("green", None, 800.0),
+        ("yellow", 800.0, 1000.0),
+        ("orange", 1000.0, 1400.0),
+    ]
+
     DAYLIGHT_THRESHOLDS = [
         ("green", 2.0, None),
         ("yellow", 1.5, 2.0),
@@ -223,6 +233,15 @@ class TAILCalculator:
 
     VENTILATION_PER_PERSON_LPS = 10.0  # l/s per occupant per ALDREN guidance
 
+    # Applied to the ratio of measured to required ventilation
+    VENTILATION_RATIO_THRESHOLDS: List[Tuple[str, Optional[float], Optional[float]]] = [
+        ("green", 1.0, None),
+        ("yellow", 0.8, 1.0),
+        ("orange", 0.6, 0.8),
+    ]
+
+    HEATING_MONTHS = frozenset({10, 11, 12, 1, 2, 3})
+
     @classmethod
     def assess_instant_values(
         cls,
@@ -246,13 +265,19 @@ class TAILCalculator:
         thresholds: Dict[str, Dict[str, float]],
         metadata: Optional[Dict[str, Any]] = None,
         building_name: Optional[str] = None,
+        occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None,
     ) -> TAILOverallResult:
         """
         Assess TAIL rating from time series data following the TAIL algorithm.
+
+        ``occupancy_mask`` (boolean Series or compiled FilterPlan) replaces the
+        default schedule derived from the building type.
         """
 
         metadata = metadata or {}
-        filtered_series = cls._prepare_series(timeseries_data, metadata.get("building_type"))
+        filtered_series = cls._prepare_series(
+            timeseries_data, metadata.get("building_type"), occupancy_mask=occupancy_mask
+        )
 
         parameter_results: List[TAILParameterResult] = []
 
@@ -272,6 +297,16 @@ class TAILCalculator:
             if result:
                 parameter_results.append(result)
 
+        return cls._overall_result(parameter_results, metadata, building_name)
+
+    @classmethod
+    def _overall_result(
+        cls,
+        parameter_results: List[TAILParameterResult],
+        metadata: Dict[str, Any],
+        building_name: Optional[str] = None,
+    ) -> TAILOverallResult:
+        """Roll parameter results up into domain and overall ratings."""
         category_results = cls._build_category_results(parameter_results)
         overall_rating, overall_compliance = cls._summarize_overall(category_results)
         visualization = cls._build_visualization(
@@ -299,11 +334,22 @@ class TAILCalculator:
         cls,
         timeseries_data: Dict[str, pd.Series],
         building_type: Optional[str],
+        occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None,
     ) -> Dict[str, pd.Series]:
         """Filter data by weekdays/working hours."""
 
         filtered: Dict[str, pd.Series] = {}
-        mask = cls._build_schedule_mask(timeseries_data, building_type)
+        if isinstance(occupancy_mask, FilterPlan):
+            # Compiled plans are evaluated (and cached) per series index directly
+            for param, series in timeseries_data.items():
+                if not isinstance(series, pd.Series) or series.empty:
+                    continue
+                filtered[param] = occupancy_mask.apply(series).dropna()
+            return filtered
+
+        mask = occupancy_mask
+        if mask is None:
+            mask = cls._build_schedule_mask(timeseries_data, building_type)
 
         for param, series in timeseries_data.items():
             if not isinstance(series, pd.Series) or series.empty:
@@ -457,7 +503,7 @@ class TAILCalculator:
             return None
 
         p95 = float(series.quantile(0.95))
-        thresholds = [("green", None, 800.0), ("yellow", 800.0, 1000.0), ("orange", 1000.0, 1400.0)]
+        thresholds = list(cls.CO2_THRESHOLDS)
         label_counts = cls._counts_from_single_value(p95, thresholds)
 
         return cls._build_parameter_result(
@@ -479,11 +525,7 @@ class TAILCalculator:
 
         required = cls._ventilation_requirement(metadata)
         ratio_series = series / required["per_person_rate_lps"]
-        thresholds = [
-            ("green", 1.0, None),
-            ("yellow", 0.8, 1.0),
-            ("orange", 0.6, 0.8),
-        ]
+        thresholds = list(cls.VENTILATION_RATIO_THRESHOLDS)
         counts = cls._count_by_thresholds(ratio_series, thresholds)
 
         return cls._build_parameter_result(
@@ -849,8 +891,7 @@ class TAILCalculator:
             return "heating" if season_hint == "heating" else "non_heating"
 
         if isinstance(index, pd.DatetimeIndex) and not index.empty:
-            heating_months = {10, 11, 12, 1, 2, 3}
-            heating_count = sum(1 for month in index.month if month in heating_months)
+            heating_count = sum(1 for month in index.month if month in cls.HEATING_MONTHS)
             return "heating" if heating_count >= len(index) / 2 else "non_heating"
 
         return "heating"
@@ -870,3 +911,212 @@ class TAILCalculator:
             "assumed_occupancy": occupancy,
             "area_m2": area,
         }
+
+
+# Parameters whose rating needs a percentile of the whole series
+_TAIL_PERCENTILES = {"co2": 0.95, "noise": 0.05}
+
+
+@dataclass
+class _TAILParameterState:
+    """Sufficient statistics of one TAIL parameter."""
+
+    parameter: str
+    samples: int = 0
+    total: float = 0.0
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)  # per threshold set
+    heating_samples: int = 0
+    sketch: Optional[ValueSketch] = None
+    hits: int = 0
+
+    def add_counts(self, key: str, counts: Dict[str, int]) -> None:
+        current = self.counts.setdefault(key, {color: 0 for color in TAILCalculator.COLOR_ORDER})
+        for color, count in counts.items():
+            current[color] += count
+
+    def update(self, series: pd.Series, metadata: Dict[str, Any], resolution: Optional[float]) -> None:
+        calc = TAILCalculator
+        series = calc._numeric_series(series)
+        if self.parameter == "relative_humidity":
+            series = series[(series >= 1.0) & (series <= 100.0)].round()
+        if series.empty:
+            return
+
+        self.samples += int(series.size)
+        self.total += float(series.sum())
+        if self.parameter == "temperature":
+            for season, thresholds in calc.TEMPERATURE_THRESHOLDS.items():
+                self.add_counts(season, calc._count_by_thresholds(series, thresholds))
+            self.heating_samples += int(np.isin(series.index.month, list(calc.HEATING_MONTHS)).sum())
+        elif self.parameter == "relative_humidity":
+            self.add_counts("default", calc._count_by_thresholds(series, calc.RH_THRESHOLDS[_rh_key(metadata)]))
+        elif self.parameter in calc.POLLUTANT_THRESHOLDS:
+            self.add_counts("default", calc._count_by_thresholds(series, calc.POLLUTANT_THRESHOLDS[self.parameter]))
+        elif self.parameter == "daylight_factor":
+            self.add_counts("default", calc._count_by_thresholds(series, calc.DAYLIGHT_THRESHOLDS))
+        elif self.parameter == "ventilation":
+            ratio = series / calc._ventilation_requirement(metadata)["per_person_rate_lps"]
+            self.add_counts("default", calc._count_by_thresholds(ratio, calc.VENTILATION_RATIO_THRESHOLDS))
+        elif self.parameter in _TAIL_PERCENTILES:
+            sketch = ValueSketch.from_values(series.to_numpy(), resolution)
+            self.sketch = sketch if self.sketch is None else self.sketch.merge(sketch)
+        elif self.parameter == "illuminance":
+            self.hits += int((series >= _illuminance_target(metadata)).sum())
+
+    def merge(self, other: "_TAILParameterState") -> None:
+        self.samples += other.samples
+        self.total += other.total
+        for key, counts in other.counts.items():
+            self.add_counts(key, counts)
+        self.heating_samples += other.heating_samples
+        if other.sketch is not None:
+            self.sketch = other.sketch if self.sketch is None else self.sketch.merge(other.sketch)
+        self.hits += other.hits
+
+    def result(self, metadata: Dict[str, Any]) -> Optional[TAILParameterResult]:
+        """Parameter result as the batch evaluator builds it."""
+        calc = TAILCalculator
+        if not self.samples:
+            return None
+        mean = round(self.total / self.samples, 2)
+        category = calc.PARAMETER_CATEGORIES[self.parameter]
+
+        if self.parameter == "temperature":
+            season_hint = metadata.get("season_hint")
+            if season_hint in ("heating", "non_heating"):
+                season = season_hint
+            else:
+                season = "heating" if self.heating_samples >= self.samples / 2 else "non_heating"
+            thresholds = calc.TEMPERATURE_THRESHOLDS[season]
+            return calc._build_parameter_result(
+                parameter="temperature", category=category, counts=self.counts[season],
+                sample_count=self.samples, summary_value=mean,
+                metadata={"season": season, "thresholds": thresholds},
+            )
+        if self.parameter == "relative_humidity":
+            building_type = _rh_key(metadata)
+            return calc._build_parameter_result(
+                parameter="relative_humidity", category=category, counts=self.counts["default"],
+                sample_count=self.samples, summary_value=mean,
+                metadata={"building_type": building_type, "thresholds": calc.RH_THRESHOLDS[building_type]},
+            )
+        if self.parameter in calc.POLLUTANT_THRESHOLDS or self.parameter == "daylight_factor":
+            thresholds = calc.POLLUTANT_THRESHOLDS.get(self.parameter, calc.DAYLIGHT_THRESHOLDS)
+            return calc._build_parameter_result(
+                parameter=self.parameter, category=category, counts=self.counts["default"],
+                sample_count=self.samples, summary_value=mean, metadata={"thresholds": thresholds},
+            )
+        if self.parameter == "ventilation":
+            return calc._build_parameter_result(
+                parameter="ventilation", category=category, counts=self.counts["default"],
+                sample_count=self.samples, summary_value=mean,
+                metadata={
+                    "requirement": calc._ventilation_requirement(metadata),
+                    "thresholds": list(calc.VENTILATION_RATIO_THRESHOLDS),
+                },
+            )
+        if self.parameter == "co2":
+            p95 = self.sketch.percentile(_TAIL_PERCENTILES["co2"])
+            thresholds = list(calc.CO2_THRESHOLDS)
+            return calc._build_parameter_result(
+                parameter="co2", category=category, counts=calc._counts_from_single_value(p95, thresholds),
+                sample_count=1, summary_value=round(p95, 2),
+                metadata={"percentile": 95, "thresholds": thresholds},
+            )
+        if self.parameter == "noise":
+            noise_p5 = self.sketch.percentile(_TAIL_PERCENTILES["noise"])
+            room_type = (metadata.get("room_type") or metadata.get("building_type") or "default").lower()
+            if room_type not in calc.NOISE_THRESHOLDS:
+                room_type = "default"
+            threshold = calc.NOISE_THRESHOLDS[room_type]
+            counts = calc._counts_from_single_value(noise_p5, [
+                ("green", None, threshold["green"]),
+                ("yellow", threshold["green"], threshold["yellow"]),
+                ("orange", threshold["yellow"], threshold["orange"]),
+            ])
+            return calc._build_parameter_result(
+                parameter="noise", category=category, counts=counts, sample_count=1,
+                summary_value=round(noise_p5, 2), metadata={"room_type": room_type, "thresholds": threshold},
+            )
+        if self.parameter == "illuminance":
+            target = _illuminance_target(metadata)
+            compliance_pct = float(self.hits / self.samples * 100.0)
+            counts = calc._counts_from_single_value(
+                compliance_pct,
+                [("green", 95.0, None), ("yellow", 70.0, 95.0), ("orange", 50.0, 70.0)],
+                red_if_below=True,
+            )
+            return calc._build_parameter_result(
+                parameter="illuminance", category=category, counts=counts, sample_count=1,
+                summary_value=round(compliance_pct, 2),
+                metadata={"target_lux": target, "percentage_compliant": compliance_pct},
+            )
+        return None
+
+
+def _rh_key(metadata: Dict[str, Any]) -> str:
+    building_type = (metadata.get("building_type") or "default").lower()
+    return building_type if building_type in TAILCalculator.RH_THRESHOLDS else "default"
+
+
+def _illuminance_target(metadata: Dict[str, Any]) -> float:
+    building_type = (metadata.get("building_type") or "default").lower()
+    return TAILCalculator.ILLUMINANCE_TARGETS.get(building_type, TAILCalculator.ILLUMINANCE_TARGETS["default"])
+
+
+@dataclass
+class TAILPartialState:
+    """
+    Mergeable partial state of ``TAILCalculator.assess_timeseries``.
+
+    Keeps colour counts, sums and season month counts per parameter, and an
+    exact value sketch for the percentile-rated parameters (CO2, noise), so
+    time-ordered chunks of a wide frame can be evaluated one at a time.
+    Percentile sketches grow with the number of distinct values; a
+    ``sketch_resolution`` bounds them at the cost of exactness. Mold
+    descriptions and parameters rated by custom thresholds are not supported.
+    """
+
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    occupancy_mask: Optional[Union[pd.Series, FilterPlan]] = None
+    building_name: Optional[str] = None
+    sketch_resolution: Optional[float] = None
+    parameters: Dict[str, _TAILParameterState] = field(default_factory=dict)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold in one chunk of the room's data."""
+        filtered = TAILCalculator._prepare_series(
+            {name: chunk[name] for name in chunk.columns},
+            self.metadata.get("building_type"),
+            occupancy_mask=self.occupancy_mask,
+        )
+        for name, series in filtered.items():
+            state = self.parameters.get(name)
+            if state is None:
+                normalized = TAILCalculator._normalize_parameter_name(name)
+                if normalized not in TAILCalculator.PARAMETER_CATEGORIES:
+                    continue
+                if normalized == "mold" or TAILCalculator._get_parameter_evaluator(normalized) is None:
+                    print(f"Warning: TAIL parameter '{name}' is not supported in chunked evaluation, skipping")
+                    normalized = None
+                state = self.parameters[name] = _TAILParameterState(parameter=normalized or "")
+            if state.parameter:
+                state.update(series, self.metadata, self.sketch_resolution)
+
+    def merge(self, other: "TAILPartialState") -> "TAILPartialState":
+        """Add the statistics of a state evaluated with the same settings."""
+        for name, state in other.parameters.items():
+            if name in self.parameters:
+                self.parameters[name].merge(state)
+            else:
+                self.parameters[name] = copy.deepcopy(state)
+        return self
+
+    def result(self) -> TAILOverallResult:
+        """Same result as ``assess_timeseries`` over all chunks."""
+        parameter_results = []
+        for state in self.parameters.values():
+            result = state.result(self.metadata) if state.parameter else None
+            if result:
+                parameter_results.append(result)
+        return TAILCalculator._overall_result(parameter_results, self.metadata, self.building_name)